@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Async Server Benchmark
+Starts the async (ASGI) server and the production WSGI server on the project's
+data and fires bursts of concurrent vehicle-search webhooks at each, reporting
+how many requests completed, the burst time and the latency percentiles
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlencode
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+SERVERS = {
+    'async': ['src/services/async_server.py'],
+    'wsgi': ['src/services/production_server.py', '--workers', '1']
+}
+
+
+def wait_for_server(port, timeout=60.0):
+    """Wait until the server answers /health"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1) as connection:
+                connection.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if connection.recv(12).startswith(b"HTTP/1.1 200"):
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+async def post_webhook(port, payload):
+    """POST one webhook on its own connection; returns (seconds, status line ok)"""
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"POST /webhook HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                     b"Content-Type: application/x-www-form-urlencoded\r\n"
+                     + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return time.perf_counter() - start, response.startswith(b"HTTP/1.1 200")
+    except OSError:
+        return time.perf_counter() - start, False
+
+
+async def burst(port, payload, concurrency):
+    """Send concurrency requests at once; returns (seconds, completed, sorted latencies)"""
+    start = time.perf_counter()
+    results = await asyncio.gather(*[post_webhook(port, payload) for _ in range(concurrency)])
+    latencies = sorted(seconds for seconds, ok in results if ok)
+    return time.perf_counter() - start, len(latencies), latencies
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000 if values else float('nan')
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark concurrent webhooks against the async and WSGI servers')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[100, 1000, 2000],
+                        help='Requests in flight per burst')
+    parser.add_argument('--port', type=int, default=5099, help='Port to run the servers on')
+    parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['async', 'wsgi'])
+    args = parser.parse_args()
+
+    with open(os.path.join(project_root, 'data', 'large_vehicle_catalog.json'), 'r', encoding='utf-8') as f:
+        plate = json.load(f)['vehicles'][0]['license_plate']
+    payload = urlencode({'Body': f"חיפוש {plate}", 'From': 'whatsapp:+10000000000'}).encode()
+
+    print("Async Server Benchmark")
+    print("=" * 72)
+    print(f"{'Server':<8} {'In flight':>10} {'Completed':>10} {'Burst':>8} {'p50':>9} {'p99':>9} {'Req/s':>8}")
+    for name in args.servers:
+        command = [sys.executable] + SERVERS[name] + ['--port', str(args.port)]
+        server = subprocess.Popen(command, cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_server(args.port):
+                print(f"{name:<8} did not start")
+                continue
+            for concurrency in args.concurrency:
+                seconds, completed, latencies = asyncio.run(burst(args.port, payload, concurrency))
+                print(f"{name:<8} {concurrency:>10} {completed:>10} {seconds:>7.2f}s "
+                      f"{percentile(latencies, 0.5):>7.0f}ms {percentile(latencies, 0.99):>7.0f}ms "
+                      f"{completed / seconds:>8.0f}")
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Catalog Snapshot Benchmark
+Compares a cold load of the pretty-printed vehicle catalog JSON with a load of
+its compact snapshot, checks that the snapshot rows equal the JSON rows and
+measures the private memory a server process needs to serve plate lookups
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import generate_fleet_sheet
+from scripts.excel_sync_manager import ExcelSyncManager
+from src.core.atomic_json import write_json_atomic
+from src.core.catalog_snapshot import CatalogSnapshot, snapshot_path, write_catalog_snapshot
+from src.core.vehicle_repository import VehicleRepository
+
+
+def timed(function, *args):
+    """Run a function once and return (seconds, result)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['vehicles']
+
+
+def first_lookup(catalog_path, records_path, license_plate):
+    """Cold repository start followed by one plate lookup, as the server does"""
+    repository = VehicleRepository(catalog_path, records_path)
+    return repository.find_vehicle_by_license_plate(license_plate)
+
+
+# Run in a child process so each repository mode starts from a clean heap
+LOOKUP_MEMORY_SCRIPT = """
+import json, sys
+sys.path.insert(0, {root!r})
+from src.core import catalog_snapshot
+from src.core.vehicle_repository import VehicleRepository
+
+def anonymous_mb():
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Anonymous:'):
+                return int(line.split()[1]) / 1024
+
+mode, catalog_path, records_path, plates = sys.argv[1], sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+if mode == 'json':
+    catalog_snapshot.CatalogSnapshot.load = classmethod(lambda cls, *args, **kwargs: None)
+before = anonymous_mb()
+repository = VehicleRepository(catalog_path, records_path, memory_map=mode == 'mmap')
+for plate in plates:
+    assert repository.find_vehicle_by_license_plate(plate)['license_plate'] == plate
+print(anonymous_mb() - before)
+"""
+
+
+def lookup_memory_mb(mode, catalog_path, records_path, plates):
+    """Private (anonymous) memory a fresh process gains serving lookups, or None off Linux"""
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        return None
+    output = subprocess.run(
+        [sys.executable, '-c', LOOKUP_MEMORY_SCRIPT.format(root=project_root), mode,
+         catalog_path, records_path, json.dumps(plates)],
+        capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+
+def format_mb(value):
+    return f"{value:.1f}MB" if value is not None else 'n/a'
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark loading the vehicle catalog JSON vs its snapshot')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Catalog vehicle counts to benchmark')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    manager = ExcelSyncManager()
+    timestamp = datetime.now().isoformat()
+    mismatches = 0
+
+    print("Catalog Snapshot Benchmark")
+    print("=" * 84)
+    print(f"{'Vehicles':>8} {'JSON MB':>8} {'Snap MB':>8} {'json.load':>10} {'Snapshot':>10} "
+          f"{'Lookup JSON':>12} {'Lookup snap':>12} {'Identical':>10}")
+    memory_rows = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        catalog_path = os.path.join(data_dir, 'large_vehicle_catalog.json')
+        records_path = os.path.join(data_dir, 'maintenance_records.json')
+        write_json_atomic(records_path, {'records': []})
+
+        for size in args.sizes:
+            vehicles = manager.build_vehicles(generate_fleet_sheet(size), timestamp)
+            catalog = {'vehicles': vehicles, 'total_vehicles': len(vehicles), 'last_updated': timestamp}
+            write_json_atomic(catalog_path, catalog)
+            write_catalog_snapshot(catalog_path, catalog)
+            plate = vehicles[-1]['license_plate']
+
+            json_time, json_rows = timed(load_json, catalog_path)
+            snapshot_time, snapshot = timed(CatalogSnapshot.load, catalog_path)
+            identical = snapshot is not None and list(snapshot.rows) == json_rows
+            mapped = CatalogSnapshot.load(catalog_path, memory_map=True, cache_rows=False)
+            identical = identical and mapped is not None and list(mapped.rows) == json_rows
+
+            snapshot_lookup_time, snapshot_vehicle = timed(first_lookup, catalog_path, records_path, plate)
+            os.remove(snapshot_path(catalog_path))
+            json_lookup_time, json_vehicle = timed(first_lookup, catalog_path, records_path, plate)
+            identical = identical and snapshot_vehicle == json_vehicle == vehicles[-1]
+            if not identical:
+                mismatches += 1
+
+            json_mb = os.path.getsize(catalog_path) / 1024 / 1024
+            write_catalog_snapshot(catalog_path, catalog)
+            snapshot_mb = os.path.getsize(snapshot_path(catalog_path)) / 1024 / 1024
+            print(f"{len(vehicles):>8} {json_mb:>8.1f} {snapshot_mb:>8.1f} {json_time * 1000:>8.0f}ms "
+                  f"{snapshot_time * 1000:>8.1f}ms {json_lookup_time * 1000:>10.0f}ms "
+                  f"{snapshot_lookup_time * 1000:>10.1f}ms {'yes' if identical else 'NO':>10}")
+
+            plates = [vehicle['license_plate'] for vehicle in vehicles[::max(1, len(vehicles) // 1000)]]
+            memory_rows.append((len(vehicles), [lookup_memory_mb(mode, catalog_path, records_path, plates)
+                                                 for mode in ('json', 'cached', 'mmap')]))
+
+    print()
+    print("Private memory of a process serving ~1000 plate lookups")
+    print(f"{'Vehicles':>8} {'JSON':>10} {'Snapshot':>10} {'Mapped':>10}")
+    for count, (json_memory, cached_memory, mapped_memory) in memory_rows:
+        print(f"{count:>8} {format_mb(json_memory):>10} {format_mb(cached_memory):>10} {format_mb(mapped_memory):>10}")
+
+    if mismatches:
+        print(f"{mismatches} snapshots did not match their catalog")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
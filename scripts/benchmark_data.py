@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark Data Generator
+Builds synthetic fleets shaped like large_vehicle_catalog.json and maintenance_records.json,
+and fleet workbook sheets shaped like the Excel file the sync reads
+"""
+
+import os
+import json
+import random
+from datetime import datetime, timedelta
+
+MAKES_MODELS = [
+    ('Toyota', 'Corolla'), ('Toyota', 'Hilux'), ('Mazda', 'Mazda3'), ('Renault', 'Trafic'),
+    ('Mercedes', 'C-Class'), ('Ford', 'Transit'), ('Hyundai', 'i30'), ('Kia', 'Sportage')
+]
+COLORS = ['White', 'Black', 'Blue', 'Silver', 'Red', 'Gray']
+FUEL_TYPES = ['gasoline', 'diesel', 'hybrid', 'electric']
+DRIVER_NAMES = ['נועה כהן', 'דני ישראלי', 'אלון ישראלי', 'מיכל לוי', 'יוסי אברהם', 'שירה מזרחי']
+FAULT_TYPES = ['בלמים', 'מנוע', 'חשמל', 'Brakes', 'Tires']
+LOCATIONS = ['תל אביב', 'חיפה', 'ירושלים', 'באר שבע']
+SERVICE_TYPES = ['oil_change', 'brake_inspection', 'tire_rotation', 'engine_service',
+                 'transmission_service', 'general_inspection', 'preventive_maintenance']
+
+
+def make_license_plate(index):
+    """Build a unique NN-NNN-NN license plate for a vehicle index"""
+    digits = f"{index:07d}"
+    return f"{digits[:2]}-{digits[2:5]}-{digits[5:]}"
+
+
+def generate_vehicles(count, seed=42):
+    """Generate a list of vehicle dicts in the catalog format"""
+    rng = random.Random(seed)
+    vehicles = []
+    for index in range(count):
+        make, model = rng.choice(MAKES_MODELS)
+        driver_name = rng.choice(DRIVER_NAMES)
+        vehicles.append({
+            'id': f"V{index:05d}",
+            'license_plate': make_license_plate(index),
+            'vin': f"1HGBH41JXMN{index:06d}",
+            'make': make,
+            'model': model,
+            'year': rng.randint(2015, 2024),
+            'type': '',
+            'category': '',
+            'status': 'active',
+            'location': '',
+            'driver': {
+                'name': driver_name,
+                'id': f"D{rng.randint(0, 999):03d}",
+                'phone': f"+972-5{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}",
+                'email': f"driver{index}@company.co.il",
+                'license_number': rng.randint(10000000, 99999999)
+            },
+            'specifications': {
+                'seating_capacity': rng.randint(2, 9),
+                'fuel_type': rng.choice(FUEL_TYPES),
+                'transmission': 'automatic',
+                'engine_size': f"{rng.choice([1.4, 1.6, 2.0, 3.0])}L",
+                'horsepower': rng.randint(90, 300),
+                'color': rng.choice(COLORS)
+            }
+        })
+    return vehicles
+
+
+def generate_maintenance_records(vehicles, records_per_vehicle=3, seed=42):
+    """Generate maintenance records spread over the last two years for each vehicle"""
+    rng = random.Random(seed)
+    today = datetime.now()
+    records = []
+    for vehicle in vehicles:
+        for _ in range(records_per_vehicle):
+            service_date = today - timedelta(days=rng.randint(0, 730))
+            records.append({
+                'id': f"M{len(records):07d}",
+                'vehicle_id': vehicle['id'],
+                'license_plate': vehicle['license_plate'],
+                'date': service_date.strftime('%Y-%m-%d'),
+                'type': rng.choice(SERVICE_TYPES),
+                'description': f"Maintenance for vehicle {vehicle['license_plate']}",
+                'cost': round(rng.uniform(50, 2500), 2),
+                'status': 'Completed'
+            })
+    return records
+
+
+def write_dataset(directory, vehicle_count, records_per_vehicle=3, seed=42):
+    """
+    Write a synthetic catalog and maintenance records file into a directory
+
+    Returns:
+        Tuple of (vehicle_catalog_path, maintenance_records_path, vehicles)
+    """
+    vehicles = generate_vehicles(vehicle_count, seed)
+    records = generate_maintenance_records(vehicles, records_per_vehicle, seed)
+
+    os.makedirs(os.path.join(directory, 'vehicles'), exist_ok=True)
+    catalog_path = os.path.join(directory, 'large_vehicle_catalog.json')
+    records_path = os.path.join(directory, 'vehicles', 'maintenance_records.json')
+
+    with open(catalog_path, 'w', encoding='utf-8') as f:
+        json.dump({'vehicles': vehicles, 'total_vehicles': len(vehicles)}, f, ensure_ascii=False, indent=2)
+    with open(records_path, 'w', encoding='utf-8') as f:
+        json.dump({'records': records, 'total_records': len(records)}, f, ensure_ascii=False, indent=2)
+
+    return catalog_path, records_path, vehicles
+
+
+def generate_fleet_sheet(rows, seed=42):
+    """
+    Generate a fleet workbook sheet (pandas DataFrame) with the columns ExcelSyncManager reads
+
+    Includes the messy cells real workbooks have: missing plates, years and mileage,
+    text in the cost column, date cells and fault columns that are mostly empty.
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    data = []
+    for index in range(rows):
+        make, model = rng.choice(MAKES_MODELS)
+        driver_name = rng.choice(DRIVER_NAMES + [None])
+        has_fault = rng.random() < 0.3
+        data.append({
+            'Vehicle ID': f"V{index:05d}" if rng.random() > 0.05 else None,
+            'License Plate': make_license_plate(index) if rng.random() > 0.01 else None,
+            'VIN': f"1HGBH41JXMN{index:06d}",
+            'Make': make,
+            'Model': model,
+            'Year': rng.choice([rng.randint(2015, 2024), None]) if rng.random() < 0.1 else rng.randint(2015, 2024),
+            'Vehicle Type': rng.choice(['Car', 'Van', 'Truck']),
+            'Category Name': rng.choice(['Operations', 'Sales', '']),
+            'Status': rng.choice(['active', 'maintenance', None]),
+            'Location Name': rng.choice(LOCATIONS),
+            'Driver Name': driver_name,
+            'Driver ID': f"D{rng.randint(0, 999):03d}",
+            'Driver Phone': f"+972-5{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}",
+            'Driver Email': f"driver{index}@company.co.il",
+            'Driver License': rng.randint(10000000, 99999999),
+            'Color': rng.choice(COLORS),
+            'Engine Size': rng.choice(['1.4L', '1.6L', '2.0L', None]),
+            'Transmission': rng.choice(['automatic', 'manual']),
+            'Fuel Type': rng.choice(FUEL_TYPES),
+            'Insurance Provider': rng.choice(['הראל', 'מגדל', 'Clal']),
+            'Policy Number': f"P{rng.randint(100000, 999999)}",
+            'Insurance Expires': today + timedelta(days=rng.randint(-30, 365)),
+            'Last Maintenance': (today - timedelta(days=rng.randint(0, 365))).strftime('%Y-%m-%d'),
+            'Next Maintenance': (today + timedelta(days=rng.randint(0, 180))).strftime('%Y-%m-%d'),
+            'Mileage': rng.choice([rng.randint(1000, 300000), None]) if rng.random() < 0.1 else rng.randint(1000, 300000),
+            'עלות תיקון (₪)': rng.choice([round(rng.uniform(100, 5000), 2), None, 'לא ידוע']) if has_fault else None,
+            'Repair Cost': rng.choice([round(rng.uniform(100, 5000), 2), None]),
+            'Fault Type': rng.choice(FAULT_TYPES) if has_fault else None,
+            'Fault Description': 'תקלה שדווחה על ידי הנהג' if has_fault else None,
+            'Report Date': (today - timedelta(days=rng.randint(0, 60))).strftime('%Y-%m-%d') if has_fault else None,
+            'Fault Status': rng.choice(['Open', 'Closed', None]) if has_fault else None,
+            'Reported By': rng.choice([driver_name, 'מוקד', None]) if has_fault else None
+        })
+    return pd.DataFrame(data)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Fleet Datastore Benchmark
+Compares plate lookups and date-range queries against the JSON files with the
+same queries against the SQLite datastore, and measures reader latency while a
+full sync is being written
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import generate_fleet_sheet
+from scripts.excel_sync_manager import ExcelSyncManager
+from src.core.atomic_json import write_json_atomic
+from src.core.fleet_datastore import FleetDatastore
+from src.core.vehicle_repository import VehicleRepository
+
+
+def timed(function, *args):
+    """Run a function once and return (seconds, result)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def json_range_query(repository, start_date, end_date):
+    """The JSON equivalent of get_maintenance_records_between: scan every record"""
+    records = [record for record in repository.get_maintenance_records()
+               if start_date <= record.get('date', '')[:10] <= end_date]
+    return sorted(records, key=lambda record: record.get('date', ''))
+
+
+def reader_latencies(datastore, plates, stop):
+    """Plate lookups from another thread until stop is set; returns per-lookup seconds"""
+    latencies = []
+    while not stop.is_set():
+        plate = random.choice(plates)
+        start = time.perf_counter()
+        datastore.find_vehicle_by_license_plate(plate)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark the SQLite fleet datastore against the JSON files')
+    parser.add_argument('--rows', type=int, default=100000, help='Sheet rows to generate')
+    parser.add_argument('--lookups', type=int, default=1000, help='Plate lookups to time')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    manager = ExcelSyncManager()
+    timestamp = datetime.now().isoformat()
+    sheet = generate_fleet_sheet(args.rows)
+    vehicles = manager.build_vehicles(sheet, timestamp)
+    records, row_faults = manager.build_maintenance_records(sheet, timestamp)
+
+    random.seed(0)
+    plates = [vehicle['license_plate'] for vehicle in random.sample(vehicles, min(args.lookups, len(vehicles)))]
+    today = datetime.now().date()
+    start_date, end_date = str(today - timedelta(days=60)), str(today - timedelta(days=30))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        catalog_path = os.path.join(data_dir, 'large_vehicle_catalog.json')
+        records_path = os.path.join(data_dir, 'maintenance_records.json')
+        write_json_atomic(catalog_path, {'vehicles': vehicles})
+        write_json_atomic(records_path, {'records': records})
+
+        datastore = FleetDatastore(os.path.join(data_dir, 'fleet.db'))
+        write_time, _ = timed(lambda: (datastore.write_vehicles(vehicles, None, 'benchmark'),
+                                       datastore.write_maintenance(records, row_faults, None, 'benchmark')))
+
+        repository = VehicleRepository(catalog_path, records_path)
+        json_load_time, _ = timed(repository.refresh, True)
+        json_lookup_time, json_found = timed(lambda: [repository.find_vehicle_by_license_plate(p) for p in plates])
+        json_range_time, json_range = timed(json_range_query, repository, start_date, end_date)
+
+        sqlite_lookup_time, sqlite_found = timed(lambda: [datastore.find_vehicle_by_license_plate(p) for p in plates])
+        sqlite_range_time, sqlite_range = timed(datastore.get_maintenance_records_between, start_date, end_date)
+        identical = json_found == sqlite_found and json_range == sqlite_range
+
+        # Readers during a full rewrite: WAL readers never wait for the writer
+        stop = threading.Event()
+        results = []
+        reader = threading.Thread(target=lambda: results.append(reader_latencies(datastore, plates, stop)))
+        reader.start()
+        rewrite_time, _ = timed(datastore.write_vehicles, vehicles, None, 'benchmark-2')
+        stop.set()
+        reader.join()
+        latencies = sorted(results[0]) or [0.0]
+
+    print("Fleet Datastore Benchmark")
+    print("=" * 60)
+    print(f"Vehicles: {len(vehicles)}, maintenance records: {len(records)}")
+    print(f"Datastore population:            {write_time:8.2f}s")
+    print(f"JSON repository load:            {json_load_time:8.2f}s")
+    print(f"{len(plates)} plate lookups   JSON (loaded): {json_lookup_time * 1000:8.1f}ms   "
+          f"SQLite: {sqlite_lookup_time * 1000:8.1f}ms")
+    print(f"Date range {start_date}..{end_date}   JSON scan: {json_range_time * 1000:8.1f}ms   "
+          f"SQLite: {sqlite_range_time * 1000:8.1f}ms ({len(sqlite_range)} records)")
+    print(f"Reads during a {rewrite_time:.2f}s catalog rewrite: {len(latencies)} lookups, "
+          f"median {latencies[len(latencies) // 2] * 1000:.2f}ms, max {latencies[-1] * 1000:.1f}ms")
+    print(f"Identical results: {'yes' if identical else 'NO'}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Excel Sync Conversion Benchmark
+Compares the row-by-row (iterrows) sheet-to-JSON conversion with the column-wise
+builders in ExcelSyncManager and checks that both produce identical JSON.
+The row-by-row reference assigns ids like the current sync: the Vehicle ID cell,
+or "V-<license plate>" for rows without one (older syncs used the row position,
+"V000").
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import generate_fleet_sheet
+from scripts.excel_sync_manager import ExcelSyncManager
+
+
+def legacy_build_vehicles(df, timestamp):
+    """Pre-vectorization vehicle conversion: one iterrows() pass with row.get() per field"""
+    vehicles = []
+    for _, row in df.iterrows():
+        license_plate = str(row.get('License Plate', '')).strip()
+        vehicle = {
+            'id': str(row.get('Vehicle ID', f"V-{license_plate}")).strip(),
+            'license_plate': license_plate,
+            'vin': str(row.get('VIN', '')).strip(),
+            'make': str(row.get('Make', '')).strip(),
+            'model': str(row.get('Model', '')).strip(),
+            'year': int(row.get('Year', 0)) if pd.notna(row.get('Year')) else 0,
+            'type': str(row.get('Vehicle Type', '')).strip(),
+            'category': str(row.get('Category Name', '')).strip(),
+            'status': str(row.get('Status', 'active')).strip(),
+            'location': str(row.get('Location Name', '')).strip(),
+            'driver': {
+                'name': str(row.get('Driver Name', '')).strip(),
+                'id': str(row.get('Driver ID', 'D000')).strip(),
+                'phone': str(row.get('Driver Phone', '')).strip(),
+                'email': str(row.get('Driver Email', '')).strip(),
+                'license_number': str(row.get('Driver License', '')).strip()
+            },
+            'specifications': {
+                'color': str(row.get('Color', '')).strip(),
+                'engine': str(row.get('Engine Size', '')).strip(),
+                'transmission': str(row.get('Transmission', '')).strip(),
+                'fuel_type': str(row.get('Fuel Type', '')).strip()
+            },
+            'insurance': {
+                'provider': str(row.get('Insurance Provider', '')).strip(),
+                'policy_number': str(row.get('Policy Number', '')).strip(),
+                'expiry_date': str(row.get('Insurance Expires', '')).strip()
+            },
+            'last_updated': timestamp
+        }
+        if vehicle['license_plate'] and vehicle['license_plate'] != 'nan':
+            vehicles.append(vehicle)
+    return vehicles
+
+
+def legacy_build_maintenance_records(df, timestamp):
+    """Pre-vectorization maintenance/fault conversion: one iterrows() pass"""
+    maintenance_data = []
+    row_faults = []
+    for _, row in df.iterrows():
+        license_plate = str(row.get('License Plate', '')).strip()
+        if not license_plate or license_plate == 'nan':
+            continue
+        vehicle_id = str(row.get('Vehicle ID', f"V-{license_plate}")).strip()
+
+        driver_name = str(row.get('Driver Name', '')).strip()
+
+        repair_cost = 0
+        for col in ['עלות תיקון (₪)', 'עלות תיקון (שקל)', 'עלות תיקון', 'Repair Cost']:
+            if col in row and pd.notna(row[col]):
+                try:
+                    repair_cost = float(row[col])
+                    break
+                except (ValueError, TypeError):
+                    continue
+
+        maintenance_data.append({
+            'vehicle_id': vehicle_id,
+            'license_plate': license_plate,
+            'driver_name': driver_name,
+            'date': str(row.get('Last Maintenance', '')).strip(),
+            'type': 'Routine Maintenance',
+            'description': f"Maintenance for vehicle {license_plate}",
+            'cost': repair_cost,
+            'status': 'Completed',
+            'provider': 'Internal',
+            'mileage': int(row.get('Mileage', 0)) if pd.notna(row.get('Mileage')) else 0,
+            'next_service': str(row.get('Next Maintenance', '')).strip(),
+            'created_at': timestamp
+        })
+
+        fault_record = None
+        fault_type = str(row.get('Fault Type', '')).strip()
+        if fault_type and fault_type != 'nan' and fault_type != 'None':
+            fault_record = {
+                'vehicle_id': vehicle_id,
+                'license_plate': license_plate,
+                'driver_name': driver_name,
+                'fault_type': fault_type,
+                'fault_severity': 'Medium',
+                'description': str(row.get('Fault Description', '')).strip(),
+                'repair_cost': repair_cost,
+                'repair_date': str(row.get('Report Date', '')).strip(),
+                'status': str(row.get('Fault Status', 'Open')).strip(),
+                'reported_by': str(row.get('Reported By', driver_name)).strip(),
+                'created_at': timestamp
+            }
+        row_faults.append(fault_record)
+    return maintenance_data, row_faults
+
+
+def timed(function, *args):
+    """Run a function once and return (seconds, result)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def as_json(result):
+    """Serialized form used to check the two conversions produce identical output"""
+    return json.dumps(result, ensure_ascii=False, sort_keys=False)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark the Excel sheet to JSON conversion')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Sheet row counts to benchmark')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    manager = ExcelSyncManager()
+    timestamp = datetime.now().isoformat()
+
+    # Sheets with columns missing entirely must fall back to the same defaults
+    sparse = generate_fleet_sheet(200, seed=1).drop(columns=['Vehicle ID', 'Status', 'Driver ID', 'Year',
+                                                              'Reported By', 'Fault Status', 'Repair Cost'])
+    mismatches = 0
+    if as_json(legacy_build_vehicles(sparse, timestamp)) != as_json(manager.build_vehicles(sparse, timestamp)):
+        mismatches += 1
+    if as_json(legacy_build_maintenance_records(sparse, timestamp)) != \
+            as_json(manager.build_maintenance_records(sparse, timestamp)):
+        mismatches += 1
+
+    print("Excel Sync Conversion Benchmark")
+    print("=" * 72)
+    print(f"{'Rows':>8} {'iterrows':>12} {'Column-wise':>12} {'Speedup':>9} {'Identical':>10}")
+    for rows in args.sizes:
+        sheet = generate_fleet_sheet(rows)
+
+        legacy_vehicles_time, legacy_vehicles = timed(legacy_build_vehicles, sheet, timestamp)
+        legacy_records_time, legacy_records = timed(legacy_build_maintenance_records, sheet, timestamp)
+        vehicles_time, vehicles = timed(manager.build_vehicles, sheet, timestamp)
+        records_time, records = timed(manager.build_maintenance_records, sheet, timestamp)
+
+        identical = as_json(legacy_vehicles) == as_json(vehicles) and as_json(legacy_records) == as_json(records)
+        if not identical:
+            mismatches += 1
+
+        legacy_total = legacy_vehicles_time + legacy_records_time
+        total = vehicles_time + records_time
+        print(f"{rows:>8} {legacy_total:>11.2f}s {total:>11.2f}s {legacy_total / total:>8.1f}x "
+              f"{'yes' if identical else 'NO':>10}")
+
+    if mismatches:
+        print(f"{mismatches} conversions produced different JSON")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Fleet Record Types Benchmark
+Measures the resident memory per vehicle and per maintenance record when the
+data files are loaded as plain dicts versus the slotted record types, and
+checks that the records equal the dicts they were built from
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import generate_fleet_sheet
+from scripts.excel_sync_manager import ExcelSyncManager
+from src.core.atomic_json import write_json_atomic
+from src.core.catalog_snapshot import CatalogSnapshot, write_catalog_snapshot
+from src.core.fleet_models import MaintenanceRecord, Vehicle, load_records
+
+
+# Run in a child process so each load starts from a clean heap
+LOAD_MEMORY_SCRIPT = """
+import gc, json, sys
+sys.path.insert(0, {root!r})
+from src.core.catalog_snapshot import CatalogSnapshot
+from src.core.fleet_models import MaintenanceRecord, Vehicle, load_records
+
+def anonymous_mb():
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Anonymous:'):
+                return int(line.split()[1]) / 1024
+
+mode, path, list_key = sys.argv[1], sys.argv[2], sys.argv[3]
+row_type = Vehicle if list_key == 'vehicles' else MaintenanceRecord
+gc.collect()
+before = anonymous_mb()
+if mode == 'dicts':
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)[list_key]
+elif mode == 'records':
+    with open(path, 'r', encoding='utf-8') as f:
+        rows, _ = load_records(f, list_key, row_type)
+else:
+    rows = list(CatalogSnapshot.load(path, row_type=row_type if mode == 'snapshot-records' else None).rows)
+gc.collect()
+print(anonymous_mb() - before)
+"""
+
+
+def bytes_per_row(mode, path, list_key, count):
+    """Private (anonymous) memory per row a fresh process keeps after loading, or None off Linux"""
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        return None
+    output = subprocess.run(
+        [sys.executable, '-c', LOAD_MEMORY_SCRIPT.format(root=project_root), mode, path, list_key],
+        capture_output=True, text=True, check=True).stdout
+    return float(output) * 1024 * 1024 / count
+
+
+def timed(function, *args):
+    """Run a function once and return (seconds, result)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def load_dicts(path, list_key):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)[list_key]
+
+
+def load_typed(path, list_key, row_type):
+    with open(path, 'r', encoding='utf-8') as f:
+        return load_records(f, list_key, row_type)[0]
+
+
+def format_row_bytes(value):
+    return f"{value:.0f}B" if value is not None else 'n/a'
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark dict rows against the slotted fleet record types')
+    parser.add_argument('--rows', type=int, default=100000, help='Sheet rows to generate')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    manager = ExcelSyncManager()
+    timestamp = datetime.now().isoformat()
+    sheet = generate_fleet_sheet(args.rows)
+    vehicles = manager.build_vehicles(sheet, timestamp)
+    records, _ = manager.build_maintenance_records(sheet, timestamp)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        catalog_path = os.path.join(data_dir, 'large_vehicle_catalog.json')
+        records_path = os.path.join(data_dir, 'maintenance_records.json')
+        catalog = {'vehicles': vehicles, 'total_vehicles': len(vehicles), 'last_updated': timestamp}
+        write_json_atomic(catalog_path, catalog)
+        write_catalog_snapshot(catalog_path, catalog)
+        write_json_atomic(records_path, {'records': records})
+
+        cases = [
+            ('Vehicles (JSON)', catalog_path, 'vehicles', Vehicle, 'dicts', 'records'),
+            ('Vehicles (snapshot)', catalog_path, 'vehicles', Vehicle, 'snapshot-dicts', 'snapshot-records'),
+            ('Maintenance records', records_path, 'records', MaintenanceRecord, 'dicts', 'records'),
+        ]
+        identical = True
+        rows = []
+        for label, path, list_key, row_type, dict_mode, record_mode in cases:
+            count = len(vehicles) if list_key == 'vehicles' else len(records)
+            if dict_mode == 'dicts':
+                dict_time, dict_rows = timed(load_dicts, path, list_key)
+                record_time, record_rows = timed(load_typed, path, list_key, row_type)
+            else:
+                dict_time, dict_rows = timed(lambda: list(CatalogSnapshot.load(path).rows))
+                record_time, record_rows = timed(lambda: list(CatalogSnapshot.load(path, row_type=row_type).rows))
+            identical = identical and record_rows == dict_rows
+            rows.append((label, count, dict_time, record_time,
+                         bytes_per_row(dict_mode, path, list_key, count),
+                         bytes_per_row(record_mode, path, list_key, count)))
+
+    print("Fleet Record Types Benchmark")
+    print("=" * 84)
+    print(f"{'Data':<22} {'Rows':>8} {'Load dicts':>11} {'Load typed':>11} {'Dict/row':>10} {'Typed/row':>10} {'Saved':>7}")
+    for label, count, dict_time, record_time, dict_bytes, record_bytes in rows:
+        saved = f"{1 - record_bytes / dict_bytes:.0%}" if dict_bytes and record_bytes else 'n/a'
+        print(f"{label:<22} {count:>8} {dict_time:>10.2f}s {record_time:>10.2f}s "
+              f"{format_row_bytes(dict_bytes):>10} {format_row_bytes(record_bytes):>10} {saved:>7}")
+    print(f"Records equal their dicts: {'yes' if identical else 'NO'}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
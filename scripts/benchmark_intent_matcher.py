@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher Benchmark
+Measures message classification throughput of the webhook's keyword lists, a
+per-keyword scan over the gazetteer and the compiled IntentMatcher
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.services.intent_matcher import IntentMatcher, COMMAND_PHRASES, GAZETTEER_GROUPS, HEBREW_PREFIXES, \
+    LICENSE_PLATE_PATTERN, DEFAULT_GAZETTEER_PATH
+
+# WhatsApp messages in the shapes drivers and fleet managers actually send
+MESSAGE_CORPUS = [
+    "חיפוש 21-599-58",
+    "דוח תחזוקה 22-727-57",
+    "דוח תקלות 10-600-42",
+    "חיפוש 22 727 57",
+    "דוח טיפולים 2272757",
+    "אפשר בבקשה דוח תחזוקה לרכב 22-727-57? תודה",
+    "היי, תשלח לי את דוח התקלות של 10-600-42",
+    "מצא את הרכב 21-599-58",
+    "חפש 10-600-42 דחוף",
+    "יש תקלה ברכב 22-727-57, המנוע לא עובד",
+    "הרכב 21-599-58 צריך טיפול, מתי הטיפול הבא?",
+    "מה המצב של 10-600-42",
+    "שלום",
+    "עזרה",
+    "איך מבקשים דוח?",
+    "תודה רבה!",
+    "search 21-599-58",
+    "maintenance report 22-727-57",
+    "Fault report 10-600-42 please",
+    "find vehicle 21 599 58",
+    "Hi, can you send me the maintenance report for 22-727-57?",
+    "my truck 10-600-42 is broken, engine not working",
+    "need an oil change on 21-599-58",
+    "show car 22-727-57",
+    "help",
+    "what commands are there?",
+    "ok thanks",
+    "When is the next service for 10-600-42?",
+]
+
+
+def legacy_classify(incoming_msg):
+    """Pre-matcher webhook logic: three keyword scans, fixed precedence, plate regex in the branch"""
+    is_maintenance_report = any(keyword in incoming_msg.lower() for keyword in [
+        'maintenance report', 'דוח תחזוקה', 'דוח טיפולים', 'תחזוקה', 'טיפולים'
+    ])
+    is_fault_report = any(keyword in incoming_msg.lower() for keyword in [
+        'fault report', 'דוח תקלות', 'תקלות', 'דוח תקלה'
+    ])
+    is_vehicle_search = any(keyword in incoming_msg.lower() for keyword in [
+        'search', 'חיפוש', 'מצא', 'find', 'חפש'
+    ])
+
+    if is_vehicle_search:
+        intent = 'vehicle_search'
+    elif is_fault_report:
+        intent = 'fault_report'
+    elif is_maintenance_report:
+        intent = 'maintenance_report'
+    else:
+        return 'help', None
+
+    import re
+    matches = re.findall(r'(\d{2}[- ]?\d{3}[- ]?\d{2})', incoming_msg)
+    return intent, matches[0].replace(' ', '-') if matches else None
+
+
+def make_keyword_scan_classifier(keyword_intents):
+    """
+    Same vocabulary as the matcher, checked one keyword at a time:
+    a precompiled word-boundary regex per gazetteer keyword
+    """
+    keyword_patterns = [
+        (re.compile(rf'(?<![^\W\d_])[{HEBREW_PREFIXES}]?{re.escape(keyword)}(?![^\W\d_])'), intents)
+        for keyword, intents in keyword_intents.items()
+    ]
+    plate_pattern = re.compile(LICENSE_PLATE_PATTERN)
+
+    def classify(message):
+        lowered = message.lower()
+        for intent, phrases in COMMAND_PHRASES.items():
+            if any(phrase in lowered for phrase in phrases):
+                break
+        else:
+            scores = {}
+            for keyword_pattern, intents in keyword_patterns:
+                hits = len(keyword_pattern.findall(lowered))
+                for keyword_intent in intents:
+                    scores[keyword_intent] = scores.get(keyword_intent, 0) + hits
+            intent = max(scores, key=scores.get) if scores else 'help'
+        return intent, plate_pattern.findall(message)
+
+    return classify
+
+
+def write_synthetic_gazetteer(path, multiplier):
+    """
+    Write a gazetteer with the shipped keywords plus suffixed variants of each one
+
+    Returns:
+        keyword -> intents map of the grown vocabulary
+    """
+    with open(DEFAULT_GAZETTEER_PATH, 'r', encoding='utf-8') as f:
+        gazetteer = json.load(f)
+
+    for group in GAZETTEER_GROUPS:
+        for words in gazetteer['keywords'].get(group, {}).values():
+            shipped = list(words)
+            words.extend(f"{word}{copy}x" for copy in range(1, multiplier) for word in shipped)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(gazetteer, f, ensure_ascii=False)
+
+    return IntentMatcher(gazetteer_path=path)._compiled[2]
+
+
+def measure(classify, messages, duration):
+    """Classify messages for up to `duration` seconds and return messages/sec"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            classify(message)
+        count += len(messages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return count / elapsed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark webhook intent classification throughput')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds to run each measurement')
+    parser.add_argument('--vocabulary-multipliers', type=int, nargs='+', default=[1, 5, 20],
+                        help='Gazetteer vocabulary sizes to benchmark, as multiples of the shipped gazetteer')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    matcher = IntentMatcher()
+
+    # Messages with an explicit command phrase must classify exactly as before
+    mismatches = 0
+    print(f"{'Message':<60} {'Legacy':<20} {'Matcher':<20}")
+    for message in MESSAGE_CORPUS:
+        legacy_intent, legacy_plate = legacy_classify(message)
+        result = matcher.match(message)
+        if legacy_intent != 'help' and (legacy_intent, legacy_plate) != (result.intent, result.license_plate):
+            mismatches += 1
+        print(f"{message[:58]:<60} {legacy_intent:<20} {result.intent:<20}")
+
+    print()
+    print("Intent Classification Benchmark")
+    print("=" * 72)
+    legacy_rate = measure(legacy_classify, MESSAGE_CORPUS, args.duration)
+    print(f"{'Legacy keyword lists (14 phrases):':<44} {legacy_rate:>12,.0f} msg/s")
+
+    print()
+    print(f"{'Vocabulary':>10} {'Per-keyword regex scan':>24} {'Compiled IntentMatcher':>24}")
+    for multiplier in args.vocabulary_multipliers:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            gazetteer_path = os.path.join(tmp_dir, 'gazetteer.json')
+            vocabulary = write_synthetic_gazetteer(gazetteer_path, multiplier)
+            scaled_matcher = IntentMatcher(gazetteer_path=gazetteer_path)
+            scan_rate = measure(make_keyword_scan_classifier(vocabulary), MESSAGE_CORPUS, args.duration)
+            matcher_rate = measure(scaled_matcher.match, MESSAGE_CORPUS, args.duration)
+        print(f"{len(vocabulary):>10} {scan_rate:>18,.0f} msg/s {matcher_rate:>18,.0f} msg/s")
+
+    if mismatches:
+        print(f"{mismatches} command messages classified differently")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Maintenance Tracker Benchmark
+Compares the fleet-wide alert sweep using per-vehicle linear scans (O(V*(V+R log R))),
+per-vehicle lookups on the vehicle_id indexes (O(V+R log R)) and the batch array
+computation, and the per-record statistics loop against the columnar NumPy reductions
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import write_dataset, generate_vehicles, generate_maintenance_records
+from src.core.maintenance_columns import MaintenanceColumns
+from src.core.maintenance_tracker import MaintenanceTracker
+
+
+class LinearScanMaintenanceTracker(MaintenanceTracker):
+    """Tracker with the pre-index lookups: scan all vehicles and filter/sort all records per call"""
+
+    def _get_vehicle(self, vehicle_id):
+        return next((v for v in self._load_vehicles() if v.get('id') == vehicle_id), None)
+
+    def _get_history(self, vehicle_id):
+        records = [r for r in self._load_maintenance_records() if r.get('vehicle_id') == vehicle_id]
+        records.sort(key=lambda x: x.get('date', ''), reverse=True)
+        return records
+
+
+def per_vehicle_alerts(tracker, days_ahead=30):
+    """Pre-batch alert sweep: one get_vehicle_maintenance_status() call per vehicle"""
+    alerts = []
+    for vehicle in tracker._load_vehicles():
+        vehicle_id = vehicle.get('id')
+        if not vehicle_id:
+            continue
+        status = tracker.get_vehicle_maintenance_status(vehicle_id)
+        if status.get('status') == 'no_records':
+            alerts.append((vehicle_id, 'due', 0))
+            continue
+        days_until_due = status.get('days_until_next_service')
+        if days_until_due is None:
+            continue
+        if days_until_due < 0:
+            alerts.append((vehicle_id, 'overdue', days_until_due))
+        elif days_until_due <= 7:
+            alerts.append((vehicle_id, 'due', days_until_due))
+        elif days_until_due <= days_ahead:
+            alerts.append((vehicle_id, 'upcoming', days_until_due))
+    return alerts
+
+
+def time_alert_sweep(tracker_class, catalog_path, records_path, batch):
+    """
+    Load data, build the per-load indexes, then time one fleet alert sweep
+
+    The batch sweep is timed without materializing MaintenanceAlert objects,
+    which is how the statistics call consumes it.
+    """
+    tracker = tracker_class(records_path, catalog_path)
+    if batch:
+        tracker.get_maintenance_alerts_batch(days_ahead=30)
+    else:
+        per_vehicle_alerts(tracker, days_ahead=30)
+
+    start = time.perf_counter()
+    if batch:
+        alerts = tracker.get_maintenance_alerts_batch(days_ahead=30)
+    else:
+        alerts = per_vehicle_alerts(tracker, days_ahead=30)
+    return time.perf_counter() - start, len(alerts)
+
+
+def loop_statistics(records):
+    """Pre-columnar cost windows and most common service: strptime per record, list.count mode"""
+    current_date = datetime.now()
+    totals = []
+    for days in (30, 90, 365):
+        threshold = current_date - timedelta(days=days)
+        total = 0.0
+        for record in records:
+            try:
+                if datetime.strptime(record.get('date', ''), '%Y-%m-%d') >= threshold:
+                    total += record.get('cost', 0.0)
+            except ValueError:
+                continue
+        totals.append(total)
+    service_types = [record.get('type', '') for record in records if record.get('type')]
+    most_common = max(set(service_types), key=service_types.count) if service_types else 'Unknown'
+    return totals, most_common
+
+
+def columnar_statistics(columns):
+    """Cost windows and most common service from the columnar store"""
+    current_date = datetime.now()
+    totals = [columns.total_cost_since(current_date - timedelta(days=days)) for days in (30, 90, 365)]
+    return totals, columns.most_common_service() or 'Unknown'
+
+
+def benchmark_statistics(record_counts, max_loop_records):
+    """Time the record-level statistics with the Python loop and with MaintenanceColumns"""
+    print()
+    print("Maintenance Statistics Benchmark (cost windows + most common service)")
+    print("=" * 64)
+    print(f"{'Records':>10} {'Python loop':>14} {'Column build':>14} {'Columnar call':>15}")
+
+    for record_count in record_counts:
+        vehicles = generate_vehicles(max(1, record_count // 50))
+        records = generate_maintenance_records(vehicles, 50)
+
+        if record_count <= max_loop_records:
+            start = time.perf_counter()
+            loop_statistics(records)
+            loop_text = f"{(time.perf_counter() - start) * 1000:>11.1f} ms"
+        else:
+            loop_text = f"{'skipped':>14}"
+
+        start = time.perf_counter()
+        columns = MaintenanceColumns(records)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar_statistics(columns)
+        call_time = time.perf_counter() - start
+
+        print(f"{len(records):>10} {loop_text} {build_time * 1000:>11.1f} ms {call_time * 1000:>12.3f} ms")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark MaintenanceTracker alert sweeps and statistics')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 5000, 50000],
+                        help='Fleet sizes to benchmark')
+    parser.add_argument('--records-per-vehicle', type=int, default=3)
+    parser.add_argument('--max-linear-size', type=int, default=5000,
+                        help='Largest fleet to run the quadratic linear-scan version on')
+    parser.add_argument('--stats-records', type=int, nargs='+', default=[100000, 1000000, 3000000],
+                        help='Maintenance record counts for the statistics benchmark')
+    parser.add_argument('--max-loop-records', type=int, default=1000000,
+                        help='Largest record count to run the per-record statistics loop on')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print("Maintenance Tracker Benchmark (fleet alert sweep)")
+    print("=" * 72)
+    print(f"{'Vehicles':>10} {'Records':>10} {'Linear scan':>14} {'Indexed':>14} {'Batch':>14}")
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog_path, records_path, _ = write_dataset(tmp_dir, size, args.records_per_vehicle)
+            batch_time, batch_alerts = time_alert_sweep(MaintenanceTracker, catalog_path, records_path, True)
+            indexed_time, indexed_alerts = time_alert_sweep(MaintenanceTracker, catalog_path, records_path, False)
+            if indexed_alerts != batch_alerts:
+                raise RuntimeError(f"Alert count mismatch: {indexed_alerts} != {batch_alerts}")
+
+            if size <= args.max_linear_size:
+                linear_time, linear_alerts = time_alert_sweep(LinearScanMaintenanceTracker, catalog_path,
+                                                              records_path, False)
+                if linear_alerts != batch_alerts:
+                    raise RuntimeError(f"Alert count mismatch: {linear_alerts} != {batch_alerts}")
+                linear_text = f"{linear_time * 1000:>11.1f} ms"
+            else:
+                linear_text = f"{'skipped':>14}"
+
+        print(f"{size:>10} {size * args.records_per_vehicle:>10} {linear_text} "
+              f"{indexed_time * 1000:>11.1f} ms {batch_time * 1000:>11.1f} ms")
+
+    benchmark_statistics(args.stats_records, args.max_loop_records)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
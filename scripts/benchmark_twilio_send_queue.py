@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Twilio Send Queue Benchmark
+Runs a bulk notification batch against a simulated Twilio account that allows
+a fixed number of messages per second (429 beyond it) and fails some requests
+with 503. Compares sending in the caller's loop with TwilioSendQueue: time the
+caller is blocked, messages delivered, and the 429s the provider returned.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from twilio.base.exceptions import TwilioRestException
+
+from src.services.twilio_send_queue import TwilioSendQueue
+
+
+class SimulatedTwilioAccount:
+    """Stands in for TwilioDriver: fixed latency, a per-second send limit and random 503s"""
+
+    def __init__(self, messages_per_second, latency, error_rate):
+        self.messages_per_second = messages_per_second
+        self.latency = latency
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._window = []
+        self.counts = {'accepted': 0, 'throttled': 0, 'errors': 0}
+
+    def whatsapp_message_params(self, to_number, message, media_url=None, voice_url=None):
+        return {'to': f"whatsapp:{to_number}", 'body': message}
+
+    def sms_message_params(self, to_number, message):
+        return {'to': to_number, 'body': message}
+
+    def create_message(self, params):
+        time.sleep(self.latency)
+        with self._lock:
+            now = time.monotonic()
+            self._window = [sent for sent in self._window if now - sent < 1.0]
+            if len(self._window) >= self.messages_per_second:
+                self.counts['throttled'] += 1
+                raise TwilioRestException(429, '/Messages', 'Too Many Requests')
+            if random.random() < self.error_rate:
+                self.counts['errors'] += 1
+                raise TwilioRestException(503, '/Messages', 'Service Unavailable')
+            self._window.append(now)
+            self.counts['accepted'] += 1
+            return f"SM{self.counts['accepted']:032d}"
+
+
+def run_inline(args):
+    """Send every message from the caller's loop, as TwilioDriver.send_whatsapp_message does"""
+    account = SimulatedTwilioAccount(args.rate, args.latency, args.error_rate)
+    start = time.perf_counter()
+    for index in range(args.messages):
+        try:
+            account.create_message(account.whatsapp_message_params(f"+9725000{index:05d}", 'Reminder'))
+        except TwilioRestException:
+            pass
+    blocked = time.perf_counter() - start
+    return blocked, blocked, account.counts['accepted'], account.counts
+
+
+def run_queued(args, dead_letter_path):
+    """Submit every message to a TwilioSendQueue and wait for it to drain"""
+    account = SimulatedTwilioAccount(args.rate, args.latency, args.error_rate)
+    queue = TwilioSendQueue(account, workers=args.workers, messages_per_second=args.rate, burst=1,
+                            backoff_base_seconds=0.5, backoff_max_seconds=5, dead_letter_path=dead_letter_path)
+    queue.start()
+    start = time.perf_counter()
+    for index in range(args.messages):
+        queue.send_whatsapp(f"+9725000{index:05d}", 'Reminder', idempotency_key=f"reminder:{index}")
+    blocked = time.perf_counter() - start
+    while True:
+        metrics = queue.get_metrics()
+        if metrics['queue_depth'] == 0 and metrics['in_flight'] == 0:
+            break
+        time.sleep(0.05)
+    queue.stop()
+    return blocked, time.perf_counter() - start, metrics['sent'], account.counts
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark the Twilio send queue against a simulated account')
+    parser.add_argument('--messages', type=int, default=200, help='Messages in the batch')
+    parser.add_argument('--rate', type=float, default=20, help='Messages per second the account allows')
+    parser.add_argument('--latency', type=float, default=0.15, help='Seconds per messages.create call')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='Fraction of calls failing with 503')
+    parser.add_argument('--workers', type=int, default=8, help='Send queue workers')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = [('Inline', run_inline(args)),
+                   ('Send queue', run_queued(args, os.path.join(temp_dir, 'dead_letter.jsonl')))]
+
+    print("Twilio Send Queue Benchmark")
+    print("=" * 78)
+    print(f"{args.messages} messages, account limit {args.rate:g}/s "
+          f"(ideal {args.messages / args.rate:.1f}s), {args.latency * 1000:.0f}ms per call")
+    print(f"{'Mode':<12} {'Caller blocked':>15} {'Total':>8} {'Delivered':>10} {'429s':>6} {'503s':>6}")
+    for label, (blocked, total, delivered, counts) in results:
+        print(f"{label:<12} {blocked:>14.3f}s {total:>7.1f}s {delivered:>10} "
+              f"{counts['throttled']:>6} {counts['errors']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Webhook Throughput Benchmark
+Measures /webhook vehicle-search requests/sec with per-request JSON loading
+versus the in-memory vehicle repository, at several catalog sizes
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_data import write_dataset
+
+
+def run_requests(client, plates, duration):
+    """Send vehicle search requests for up to `duration` seconds and return requests/sec"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        plate = plates[count % len(plates)]
+        response = client.post('/webhook', data={'Body': f"חיפוש {plate}", 'From': 'whatsapp:+972500000000'})
+        if response.status_code != 200:
+            raise RuntimeError(f"Unexpected status {response.status_code}")
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return count / elapsed
+
+
+def benchmark_size(simple_server, vehicle_count, duration):
+    """Benchmark one catalog size with both loading strategies"""
+    from src.core.vehicle_repository import configure_vehicle_repository
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        catalog_path, records_path, vehicles = write_dataset(tmp_dir, vehicle_count)
+        # Look up plates spread over the whole catalog, not only the first rows
+        step = max(1, len(vehicles) // 50)
+        plates = [v['license_plate'] for v in vehicles[::step]]
+
+        def legacy_find_vehicle(license_plate):
+            # Pre-repository behaviour: parse the catalog and scan it on every message
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f).get('vehicles', [])
+            for vehicle in catalog:
+                if vehicle.get('license_plate', '').upper() == license_plate.upper():
+                    return vehicle
+            return None
+
+        client = simple_server.app.test_client()
+        repository_find = simple_server.find_vehicle_by_license_plate
+
+        simple_server.find_vehicle_by_license_plate = legacy_find_vehicle
+        try:
+            legacy_rps = run_requests(client, plates, duration)
+        finally:
+            simple_server.find_vehicle_by_license_plate = repository_find
+
+        configure_vehicle_repository(catalog_path, records_path)
+        simple_server.load_vehicles()  # warm the repository before timing
+        repository_rps = run_requests(client, plates, duration)
+
+    return legacy_rps, repository_rps
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark webhook vehicle search throughput')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[220, 10000, 100000],
+                        help='Catalog sizes to benchmark')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds to run each measurement')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    from src.services import simple_server
+
+    print("Webhook Throughput Benchmark (vehicle search)")
+    print("=" * 60)
+    print(f"{'Vehicles':>10} {'JSON per request':>20} {'Repository':>15} {'Speedup':>10}")
+    for size in args.sizes:
+        legacy_rps, repository_rps = benchmark_size(simple_server, size, args.duration)
+        print(f"{size:>10} {legacy_rps:>16.1f} r/s {repository_rps:>11.1f} r/s {repository_rps / legacy_rps:>9.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
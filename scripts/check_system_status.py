@@ -16,6 +16,8 @@ import logging
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.core.catalog_snapshot import CatalogSnapshot
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -181,10 +183,16 @@ def check_data_files():
     vehicle_path = os.path.join(project_root, 'data', 'large_vehicle_catalog.json')
     if os.path.exists(vehicle_path):
         try:
-            with open(vehicle_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # The snapshot header carries the count, no need to parse the whole catalog
+            snapshot = CatalogSnapshot.load(vehicle_path)
+            if snapshot is not None:
                 status['vehicle_catalog'] = True
-                status['vehicle_count'] = len(data.get('vehicles', []))
+                status['vehicle_count'] = snapshot.count
+            else:
+                with open(vehicle_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    status['vehicle_catalog'] = True
+                    status['vehicle_count'] = len(data.get('vehicles', []))
         except Exception as e:
             status['vehicle_catalog_error'] = str(e)
     
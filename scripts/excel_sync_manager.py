@@ -7,6 +7,8 @@ Handles synchronization between main Excel file and fault report file
 import os
 import sys
 import json
+import uuid
+import argparse
 import pandas as pd
 from datetime import datetime
 import hashlib
@@ -17,7 +19,13 @@ from pathlib import Path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
+from src.core.atomic_json import write_json_atomic
+from src.core.catalog_snapshot import CatalogSnapshot, snapshot_path, write_catalog_snapshot
+from src.core.fleet_datastore import get_fleet_datastore
+from src.core.report_cache import invalidate_report_cache
+
 # Setup logging
+os.makedirs(os.path.join(project_root, 'logs'), exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -28,10 +36,204 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+
+# Data sheet names in order of preference; the first sheet is used if none exists
+SHEET_NAMES = ('Vehicles', 'Vehicle Data', 'Main Data', 'Sheet1')
+
+# Rows per DataFrame when streaming the sheet
+DEFAULT_CHUNK_ROWS = 5000
+
+# Keywords of the maintenance-related columns logged by the sync
+MAINTENANCE_COLUMN_KEYWORDS = ['maintenance', 'repair', 'fault', 'service', 'cost', 'last', 'next']
+
+# Fields stamped at sync time; not part of a row's content hash
+VOLATILE_FIELDS = ('last_updated', 'created_at')
+
+# Reserved key in vehicle_hashes holding the whole-workbook hash
+WORKBOOK_HASH_KEY = 'main_excel'
+
+# How ids are assigned to rows without a Vehicle ID cell, recorded in the sync tracking.
+# Data synced under another scheme (None: row positions, 'V000') is re-keyed by a full sync.
+VEHICLE_ID_SCHEME = 'plate'
+
+def select_sheet_name(sheet_names):
+    """Pick the data sheet from a workbook's sheet names"""
+    for name in SHEET_NAMES:
+        if name in sheet_names:
+            return name
+    return sheet_names[0] if sheet_names else None
+
+def load_sync_config():
+    """Read the excel_sync section of config/config.json (empty if unavailable)"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('excel_sync', {})
+    except Exception as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+        return {}
+
+def _stream_cell(cell):
+    """Convert a read-only openpyxl cell the way pandas' openpyxl reader does"""
+    if cell.value is None:
+        return float('nan')
+    if cell.data_type == 'e':
+        return float('nan')
+    if cell.data_type == 'n' and isinstance(cell.value, float) and cell.value.is_integer():
+        return int(cell.value)
+    return cell.value
+
+def _header_names(header_row):
+    """Column names for a header row, named and de-duplicated like pandas does"""
+    names = []
+    seen = {}
+    for position, value in enumerate(header_row):
+        name = f"Unnamed: {position}" if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def text_column(df, column, default=''):
+    """
+    str(cell).strip() for a whole column, as the row-by-row sync did with row.get(column, default)
+    
+    Args:
+        df: Sheet data
+        column: Column name
+        default: Value for every row when the column is missing (a string, or a list with one value per row)
+    
+    Returns:
+        List of strings aligned with the rows
+    """
+    if column not in df.columns:
+        if isinstance(default, list):
+            return [str(value).strip() for value in default]
+        return [str(default).strip()] * len(df)
+    
+    values = df[column]
+    if pd.api.types.is_datetime64_dtype(values):
+        # str(Timestamp) is 'YYYY-MM-DD HH:MM:SS' unless there is a sub-second part
+        whole_seconds = values.isna() | ((values.dt.microsecond == 0) & (values.dt.nanosecond == 0))
+        if whole_seconds.all():
+            return values.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('NaT').tolist()
+    # str() over the plain values is several times faster than the pandas .str accessor
+    return [str(value).strip() for value in values.tolist()]
+
+def int_column(df, column):
+    """int(cell) for a whole column, 0 for empty cells or a missing column"""
+    if column not in df.columns:
+        return [0] * len(df)
+    values = df[column]
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).astype('int64').tolist()
+    return [int(value) if pd.notna(value) else 0 for value in values.tolist()]
+
+def first_float_column(df, columns):
+    """
+    Per row, float() of the first non-empty, numeric cell among the given columns (0 if none)
+    """
+    results = [None] * len(df)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            floats = values.astype(float).tolist()
+            present = values.notna().tolist()
+            for i in range(len(results)):
+                if results[i] is None and present[i]:
+                    results[i] = floats[i]
+            continue
+        for i, value in enumerate(values.tolist()):
+            if results[i] is None and pd.notna(value):
+                try:
+                    results[i] = float(value)
+                except (ValueError, TypeError):
+                    continue
+    return [0 if value is None else value for value in results]
+
+def row_content_hash(*items):
+    """MD5 of the JSON content of one or more row-derived dicts, ignoring sync timestamps"""
+    content = [
+        {key: value for key, value in item.items() if key not in VOLATILE_FIELDS} if item else None
+        for item in items
+    ]
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+def row_keys(items):
+    """
+    Stable row keys: the license plate, with '#<n>' appended to repeated plates
+    
+    Returns:
+        List of keys aligned with items
+    """
+    seen = {}
+    keys = []
+    for item in items:
+        plate = item.get('license_plate', '')
+        seen[plate] = seen.get(plate, 0) + 1
+        keys.append(plate if seen[plate] == 1 else f"{plate}#{seen[plate]}")
+    return keys
+
+def plate_vehicle_ids(plates):
+    """
+    Vehicle ids for rows without a Vehicle ID cell, derived from the license plate
+    
+    Unlike the row position, the plate does not change when other rows are added,
+    removed or moved, so neither do the ids (and row hashes) of untouched rows.
+    """
+    return [f"V-{plate}" for plate in plates]
+
+def plate_from_row_key(key):
+    """License plate part of a row key"""
+    return key.split('#', 1)[0]
+
+def diff_row_hashes(previous_hashes, keys, hashes):
+    """
+    Compare per-row hashes with the previous sync
+    
+    Args:
+        previous_hashes: Row key -> hash from the previous sync (in previous row order)
+        keys: Current row keys in sheet order
+        hashes: Current row hashes aligned with keys
+    
+    Returns:
+        Dict with inserted/updated/deleted key lists, unchanged count and whether
+        the row order is the same as in the previous sync
+    """
+    current = dict(zip(keys, hashes))
+    inserted = [key for key in keys if key not in previous_hashes]
+    updated = [key for key in keys if key in previous_hashes and previous_hashes[key] != current[key]]
+    deleted = [key for key in previous_hashes if key not in current]
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'deleted': deleted,
+        'unchanged': len(keys) - len(inserted) - len(updated),
+        'same_layout': list(previous_hashes) == keys
+    }
+
 class ExcelSyncManager:
     """Manages synchronization between Excel files and JSON data"""
     
-    def __init__(self):
+    def __init__(self, stream_rows=None, chunk_rows=None):
+        """
+        Initialize the sync manager.
+        
+        Args:
+            stream_rows: Read the sheet in chunks with openpyxl read-only mode instead of
+                parsing it into one DataFrame (default: excel_sync.stream_rows in config.json)
+            chunk_rows: Rows per chunk when streaming (default: excel_sync.chunk_rows)
+        """
+        sync_config = load_sync_config()
+        self.stream_rows = sync_config.get('stream_rows', False) if stream_rows is None else stream_rows
+        self.chunk_rows = chunk_rows or sync_config.get('chunk_rows', DEFAULT_CHUNK_ROWS)
+        
         self.project_root = project_root
         self.data_dir = os.path.join(project_root, 'data')
         self.main_excel_path = os.path.join(project_root, 'Large Enhanced Fleet.xlsx')
@@ -42,6 +244,11 @@ class ExcelSyncManager:
         # Create sync tracking file
         self.sync_tracking_path = os.path.join(self.data_dir, 'sync_tracking.json')
         self.sync_tracking = self.load_sync_tracking()
+        self._detected_file = (None, None)  # (stat signature, MD5) of the change being synced
+        self._rekeying = False  # True while a sync rewrites data keyed by an older id scheme
+        
+        # Optional SQLite copy of the data (datastore.backend = sqlite in config.json)
+        self.datastore = get_fleet_datastore()
     
     def load_sync_tracking(self):
         """Load sync tracking data"""
@@ -52,6 +259,9 @@ class ExcelSyncManager:
             else:
                 return {
                     'last_sync': None,
+                    'last_sync_id': None,
+                    'vehicle_catalog_sync_id': None,
+                    'maintenance_records_sync_id': None,
                     'vehicle_hashes': {},
                     'maintenance_hashes': {},
                     'sync_history': []
@@ -60,6 +270,9 @@ class ExcelSyncManager:
             logger.error(f"Error loading sync tracking: {e}")
             return {
                 'last_sync': None,
+                'last_sync_id': None,
+                'vehicle_catalog_sync_id': None,
+                'maintenance_records_sync_id': None,
                 'vehicle_hashes': {},
                 'maintenance_hashes': {},
                 'sync_history': []
@@ -68,8 +281,7 @@ class ExcelSyncManager:
     def save_sync_tracking(self):
         """Save sync tracking data"""
         try:
-            with open(self.sync_tracking_path, 'w', encoding='utf-8') as f:
-                json.dump(self.sync_tracking, f, ensure_ascii=False, indent=2)
+            write_json_atomic(self.sync_tracking_path, self.sync_tracking)
         except Exception as e:
             logger.error(f"Error saving sync tracking: {e}")
     
@@ -88,9 +300,28 @@ class ExcelSyncManager:
             logger.error(f"Error calculating hash for {file_path}: {e}")
             return None
     
+    @staticmethod
+    def file_stat_signature(file_path):
+        """Return [mtime_ns, size] of a file, or None if it cannot be stat'ed"""
+        try:
+            stat = os.stat(file_path)
+            return [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            return None
+    
     def detect_vehicle_changes(self):
-        """Detect changes in vehicle data"""
+        """
+        Detect changes in vehicle data
+        
+        The file is only hashed when its mtime or size differs from the last sync;
+        a changed mtime with identical content is remembered so it is not hashed again.
+        """
         try:
+            signature = self.file_stat_signature(self.main_excel_path)
+            if signature is not None and signature == self.sync_tracking.get('main_excel_stat'):
+                logger.info("No changes detected in main Excel file")
+                return False
+            
             # Calculate current hash of main Excel file
             current_hash = self.calculate_file_hash(self.main_excel_path)
             if not current_hash:
@@ -101,9 +332,12 @@ class ExcelSyncManager:
             last_hash = self.sync_tracking.get('vehicle_hashes', {}).get('main_excel')
             if current_hash == last_hash:
                 logger.info("No changes detected in main Excel file")
+                self.sync_tracking['main_excel_stat'] = signature
+                self.save_sync_tracking()
                 return False
             
             logger.info(f"Changes detected in main Excel file (hash: {current_hash[:8]}...)")
+            self._detected_file = (signature, current_hash)
             return True
             
         except Exception as e:
@@ -111,24 +345,17 @@ class ExcelSyncManager:
             return False
     
     def load_main_excel_data(self):
-        """Load data from main Excel file"""
+        """
+        Load the data sheet from the main Excel file
+        
+        The workbook is opened once; its sheet names are checked and only the
+        selected sheet is parsed.
+        """
         try:
-            # Try different sheet names
-            sheet_names = ['Vehicles', 'Vehicle Data', 'Main Data', 'Sheet1']
-            df = None
-            
-            for sheet in sheet_names:
-                try:
-                    df = pd.read_excel(self.main_excel_path, sheet_name=sheet)
-                    logger.info(f"Successfully loaded data from sheet: {sheet}")
-                    break
-                except:
-                    continue
-            
-            if df is None:
-                # Try to read the first sheet
-                df = pd.read_excel(self.main_excel_path, sheet_name=0)
-                logger.info("Loaded data from first available sheet")
+            with pd.ExcelFile(self.main_excel_path) as workbook:
+                sheet = select_sheet_name(workbook.sheet_names)
+                df = workbook.parse(sheet)
+            logger.info(f"Successfully loaded data from sheet: {sheet}")
             
             # Since we're using the English Excel file, no column mapping needed
             # The columns are already in English
@@ -139,146 +366,453 @@ class ExcelSyncManager:
             logger.error(f"Error loading main Excel data: {e}")
             return None
     
-    def update_vehicle_catalog(self, df):
-        """Update vehicle catalog from Excel data"""
+    def iter_main_excel_chunks(self, chunk_rows=None):
+        """
+        Stream the data sheet as DataFrames of at most chunk_rows rows
+        
+        Uses openpyxl read-only mode, so only one chunk of cells is held at a time.
+        Cells are converted like pandas' openpyxl reader, blank rows are skipped and
+        the row index continues across chunks. Column dtypes are inferred per chunk
+        (object), so numbers in a column with blank cells are not widened to float.
+        
+        Yields:
+            DataFrame chunks in sheet order
+        """
+        from openpyxl import load_workbook
+        
+        chunk_rows = chunk_rows or self.chunk_rows
+        workbook = load_workbook(self.main_excel_path, read_only=True, data_only=True)
         try:
-            vehicles = []
-            
-            for index, row in df.iterrows():
-                # Extract vehicle data using correct English column names
-                vehicle = {
-                    'id': str(row.get('Vehicle ID', f"V{index:03d}")).strip(),
-                    'license_plate': str(row.get('License Plate', '')).strip(),
-                    'vin': str(row.get('VIN', '')).strip(),
-                    'make': str(row.get('Make', '')).strip(),
-                    'model': str(row.get('Model', '')).strip(),
-                    'year': int(row.get('Year', 0)) if pd.notna(row.get('Year')) else 0,
-                    'type': str(row.get('Vehicle Type', '')).strip(),
-                    'category': str(row.get('Category Name', '')).strip(),
-                    'status': str(row.get('Status', 'active')).strip(),
-                    'location': str(row.get('Location Name', '')).strip(),
-                    'driver': {
-                        'name': str(row.get('Driver Name', '')).strip(),
-                        'id': str(row.get('Driver ID', 'D000')).strip(),
-                        'phone': str(row.get('Driver Phone', '')).strip(),
-                        'email': str(row.get('Driver Email', '')).strip(),
-                        'license_number': str(row.get('Driver License', '')).strip()
-                    },
-                    'specifications': {
-                        'color': str(row.get('Color', '')).strip(),
-                        'engine': str(row.get('Engine Size', '')).strip(),
-                        'transmission': str(row.get('Transmission', '')).strip(),
-                        'fuel_type': str(row.get('Fuel Type', '')).strip()
-                    },
-                    'insurance': {
-                        'provider': str(row.get('Insurance Provider', '')).strip(),
-                        'policy_number': str(row.get('Policy Number', '')).strip(),
-                        'expiry_date': str(row.get('Insurance Expires', '')).strip()
-                    },
-                    'last_updated': datetime.now().isoformat()
-                }
-                
-                # Only add vehicles with valid license plates
-                if vehicle['license_plate'] and vehicle['license_plate'] != 'nan':
-                    vehicles.append(vehicle)
+            sheet = select_sheet_name(workbook.sheetnames)
+            logger.info(f"Streaming data from sheet: {sheet}")
             
-            # Update vehicle catalog
-            catalog_data = {
-                'vehicles': vehicles,
-                'total_vehicles': len(vehicles),
-                'last_updated': datetime.now().isoformat(),
-                'source_file': self.main_excel_path
-            }
+            columns = None
+            rows = []
+            offset = 0
+            for cells in workbook[sheet].iter_rows():
+                if all(cell.value is None or cell.value == '' for cell in cells):
+                    continue
+                if columns is None:
+                    columns = _header_names([cell.value for cell in cells])
+                    continue
+                
+                values = [_stream_cell(cell) for cell in cells[:len(columns)]]
+                rows.append(values + [float('nan')] * (len(columns) - len(values)))
+                if len(rows) >= chunk_rows:
+                    yield pd.DataFrame(rows, columns=columns, index=range(offset, offset + len(rows)), dtype=object)
+                    offset += len(rows)
+                    rows = []
             
-            with open(self.vehicle_catalog_path, 'w', encoding='utf-8') as f:
-                json.dump(catalog_data, f, ensure_ascii=False, indent=2)
+            # A header-only sheet still yields one (empty) chunk
+            if rows or (columns is not None and offset == 0):
+                yield pd.DataFrame(rows, columns=columns, index=range(offset, offset + len(rows)), dtype=object)
+        finally:
+            workbook.close()
+    
+    def read_sheet_rows(self, timestamp):
+        """
+        Convert the data sheet to vehicles, maintenance records and fault records
+        
+        Returns:
+            Tuple of (vehicles, maintenance records, fault record or None per maintenance
+            record, sheet row count), or None if the workbook could not be read
+        """
+        if self.stream_rows:
+            try:
+                vehicles, maintenance_data, row_faults = [], [], []
+                row_count = 0
+                columns = []
+                for chunk in self.iter_main_excel_chunks():
+                    columns = list(chunk.columns)
+                    row_count += len(chunk)
+                    vehicles.extend(self.build_vehicles(chunk, timestamp))
+                    chunk_records, chunk_faults = self.build_maintenance_records(chunk, timestamp)
+                    maintenance_data.extend(chunk_records)
+                    row_faults.extend(chunk_faults)
+            except Exception as e:
+                logger.error(f"Error streaming main Excel data: {e}")
+                return None
+        else:
+            df = self.load_main_excel_data()
+            if df is None:
+                return None
+            columns = list(df.columns)
+            row_count = len(df)
+            vehicles = self.build_vehicles(df, timestamp)
+            maintenance_data, row_faults = self.build_maintenance_records(df, timestamp)
+        
+        # Look for maintenance-related columns
+        maintenance_columns = [col for col in columns if any(keyword in str(col).lower()
+                               for keyword in MAINTENANCE_COLUMN_KEYWORDS)]
+        logger.info(f"Found maintenance columns: {maintenance_columns}")
+        
+        return vehicles, maintenance_data, row_faults, row_count
+    
+    def build_vehicles(self, df, timestamp):
+        """
+        Convert sheet rows to vehicle catalog entries (rows without a license plate are skipped)
+        
+        Works column by column; the per-row loop only assembles the dicts.
+        """
+        # Extract vehicle data using correct English column names
+        plates = text_column(df, 'License Plate')
+        ids = text_column(df, 'Vehicle ID', plate_vehicle_ids(plates))
+        vins = text_column(df, 'VIN')
+        makes = text_column(df, 'Make')
+        models = text_column(df, 'Model')
+        years = int_column(df, 'Year')
+        types = text_column(df, 'Vehicle Type')
+        categories = text_column(df, 'Category Name')
+        statuses = text_column(df, 'Status', 'active')
+        locations = text_column(df, 'Location Name')
+        driver_names = text_column(df, 'Driver Name')
+        driver_ids = text_column(df, 'Driver ID', 'D000')
+        driver_phones = text_column(df, 'Driver Phone')
+        driver_emails = text_column(df, 'Driver Email')
+        driver_licenses = text_column(df, 'Driver License')
+        colors = text_column(df, 'Color')
+        engines = text_column(df, 'Engine Size')
+        transmissions = text_column(df, 'Transmission')
+        fuel_types = text_column(df, 'Fuel Type')
+        insurance_providers = text_column(df, 'Insurance Provider')
+        policy_numbers = text_column(df, 'Policy Number')
+        insurance_expiry = text_column(df, 'Insurance Expires')
+        
+        rows = zip(ids, plates, vins, makes, models, years, types, categories, statuses, locations,
+                   driver_names, driver_ids, driver_phones, driver_emails, driver_licenses,
+                   colors, engines, transmissions, fuel_types,
+                   insurance_providers, policy_numbers, insurance_expiry)
+        
+        vehicles = []
+        for (vehicle_id, license_plate, vin, make, model, year, vehicle_type, category, status, location,
+             driver_name, driver_id, driver_phone, driver_email, driver_license,
+             color, engine, transmission, fuel_type,
+             insurance_provider, policy_number, expiry_date) in rows:
+            # Only add vehicles with valid license plates
+            if not license_plate or license_plate == 'nan':
+                continue
+            vehicles.append({
+                'id': vehicle_id,
+                'license_plate': license_plate,
+                'vin': vin,
+                'make': make,
+                'model': model,
+                'year': year,
+                'type': vehicle_type,
+                'category': category,
+                'status': status,
+                'location': location,
+                'driver': {
+                    'name': driver_name,
+                    'id': driver_id,
+                    'phone': driver_phone,
+                    'email': driver_email,
+                    'license_number': driver_license
+                },
+                'specifications': {
+                    'color': color,
+                    'engine': engine,
+                    'transmission': transmission,
+                    'fuel_type': fuel_type
+                },
+                'insurance': {
+                    'provider': insurance_provider,
+                    'policy_number': policy_number,
+                    'expiry_date': expiry_date
+                },
+                'last_updated': timestamp
+            })
+        
+        return vehicles
+    
+    def build_maintenance_records(self, df, timestamp):
+        """
+        Convert sheet rows to maintenance records and their fault records
+        
+        Returns:
+            Tuple of (maintenance records, fault record or None per maintenance record)
+        """
+        plates = text_column(df, 'License Plate')
+        # Same ids as build_vehicles, so records join their vehicle
+        row_ids = text_column(df, 'Vehicle ID', plate_vehicle_ids(plates))
+        driver_names = text_column(df, 'Driver Name')
+        
+        # Get repair cost from Hebrew columns
+        repair_costs = first_float_column(df, ['עלות תיקון (₪)', 'עלות תיקון (שקל)', 'עלות תיקון', 'Repair Cost'])
+        
+        last_maintenance = text_column(df, 'Last Maintenance')
+        next_maintenance = text_column(df, 'Next Maintenance')
+        mileages = int_column(df, 'Mileage')
+        fault_types = text_column(df, 'Fault Type')
+        fault_descriptions = text_column(df, 'Fault Description')
+        report_dates = text_column(df, 'Report Date')
+        fault_statuses = text_column(df, 'Fault Status', 'Open')
+        reported_by = text_column(df, 'Reported By', driver_names)
+        
+        rows = zip(row_ids, plates, driver_names, repair_costs, last_maintenance, next_maintenance, mileages,
+                   fault_types, fault_descriptions, report_dates, fault_statuses, reported_by)
+        
+        maintenance_data = []
+        row_faults = []
+        for (vehicle_id, license_plate, driver_name, repair_cost, last_date, next_date, mileage,
+             fault_type, fault_description, report_date, fault_status, reporter) in rows:
+            if not license_plate or license_plate == 'nan':
+                continue
             
-            logger.info(f"Updated vehicle catalog with {len(vehicles)} vehicles")
-            return True
+            # Create maintenance record
+            maintenance_data.append({
+                'vehicle_id': vehicle_id,
+                'license_plate': license_plate,
+                'driver_name': driver_name,
+                'date': last_date,
+                'type': 'Routine Maintenance',
+                'description': f"Maintenance for vehicle {license_plate}",
+                'cost': repair_cost,
+                'status': 'Completed',
+                'provider': 'Internal',
+                'mileage': mileage,
+                'next_service': next_date,
+                'created_at': timestamp
+            })
             
+            # Check if it's a fault record - look for fault data
+            if fault_type and fault_type != 'nan' and fault_type != 'None':
+                row_faults.append({
+                    'vehicle_id': vehicle_id,
+                    'license_plate': license_plate,
+                    'driver_name': driver_name,
+                    'fault_type': fault_type,
+                    'fault_severity': 'Medium',
+                    'description': fault_description,
+                    'repair_cost': repair_cost,  # Use the same repair cost as the maintenance record
+                    'repair_date': report_date,
+                    'status': fault_status,
+                    'reported_by': reporter,
+                    'created_at': timestamp
+                })
+            else:
+                row_faults.append(None)
+        
+        return maintenance_data, row_faults
+    
+    def _load_synced_items(self, path, list_key, sync_id_key):
+        """
+        Load the items written by a previous sync, keyed by row key
+        
+        Returns:
+            Row key -> item, or None if the file is missing or does not match the tracked row hashes
+        """
+        try:
+            if not os.path.exists(path):
+                return None
+            snapshot = CatalogSnapshot.load(path) if path == self.vehicle_catalog_path else None
+            if snapshot is not None:
+                data = {**snapshot.meta, list_key: snapshot.rows}
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
         except Exception as e:
-            logger.error(f"Error updating vehicle catalog: {e}")
+            logger.warning(f"Could not read {path}, rewriting it in full: {e}")
+            return None
+        
+        file_sync_id = self.sync_tracking.get(sync_id_key)
+        if not file_sync_id or data.get('changes', {}).get('sync_id') != file_sync_id:
+            return None
+        items = data.get(list_key, [])
+        return dict(zip(row_keys(items), items))
+    
+    def _datastore_behind(self):
+        """True if the SQLite datastore does not hold the data the JSON files hold"""
+        if self.datastore is None:
+            return False
+        try:
+            return (self.datastore.get_sync_id('vehicles') != self.sync_tracking.get('vehicle_catalog_sync_id')
+                    or self.datastore.get_sync_id('maintenance_records')
+                    != self.sync_tracking.get('maintenance_records_sync_id'))
+        except Exception as e:
+            logger.error(f"Error reading datastore state: {e}")
             return False
     
-    def update_fault_reports(self, df):
-        """Update fault reports based on vehicle data"""
+    def _update_datastore(self, table, sync_id_key, write):
+        """
+        Bring one datastore table in step with its JSON file
+        
+        Args:
+            table: 'vehicles' or 'maintenance_records'
+            sync_id_key: Tracking key of the JSON file's sync id
+            write: Called with that sync id if the table holds anything else
+        """
+        if self.datastore is None:
+            return
+        file_sync_id = self.sync_tracking.get(sync_id_key)
         try:
-            # Extract maintenance/fault data from Excel
-            maintenance_data = []
-            fault_data = []
-            
-            # Look for maintenance-related columns
-            maintenance_columns = [col for col in df.columns if any(keyword in col.lower() 
-                                for keyword in ['maintenance', 'repair', 'fault', 'service', 'cost', 'last', 'next'])]
-            
-            logger.info(f"Found maintenance columns: {maintenance_columns}")
+            if self.datastore.get_sync_id(table) != file_sync_id:
+                write(file_sync_id)
+        except Exception as e:
+            # The JSON files stay authoritative; the next sync retries
+            logger.error(f"Error updating datastore {table}: {e}")
+    
+    def _ensure_catalog_snapshot(self):
+        """Write the catalog snapshot if it is missing or older than the catalog JSON"""
+        if not os.path.exists(self.vehicle_catalog_path) or CatalogSnapshot.load(self.vehicle_catalog_path):
+            return
+        try:
+            with open(self.vehicle_catalog_path, 'r', encoding='utf-8') as f:
+                catalog_data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read {self.vehicle_catalog_path} to build its snapshot: {e}")
+            return
+        if write_catalog_snapshot(self.vehicle_catalog_path, catalog_data):
+            logger.info(f"Rebuilt catalog snapshot {snapshot_path(self.vehicle_catalog_path)}")
+    
+    def _merge_rows(self, path, list_key, hash_map_name, sync_id_key, items, hashes, sync_id):
+        """
+        Diff rows against the previous sync and merge unchanged rows from the current file
+        
+        Unchanged rows keep the exact dict (and timestamp) written by the previous sync.
+        Row-level changes are only listed for incremental syncs; a full sync rewrites
+        everything, so its changes block carries just the sync ids.
+        
+        Returns:
+            Tuple of (merged items, changes block, new row hash map)
+        """
+        keys = row_keys(items)
+        previous_hashes = {key: value for key, value in self.sync_tracking.get(hash_map_name, {}).items()
+                           if key != WORKBOOK_HASH_KEY}
+        previous_items = None if self._rekeying else self._load_synced_items(path, list_key, sync_id_key)
+        
+        full = previous_items is None
+        if full:
+            previous_hashes = {}
+        diff = diff_row_hashes(previous_hashes, keys, hashes)
+        
+        changed_keys = set(diff['inserted']) | set(diff['updated'])
+        merged = [
+            item if key in changed_keys or key not in previous_items else previous_items[key]
+            for key, item in zip(keys, items)
+        ] if not full else items
+        
+        if full:
+            changes = {
+                'sync_id': sync_id,
+                'base_sync_id': None,
+                'full': True,
+                'same_layout': False,
+                'inserted': [],
+                'updated': [],
+                'deleted': [],
+                'changed_positions': []
+            }
+        else:
+            changes = {
+                'sync_id': sync_id,
+                'base_sync_id': self.sync_tracking.get(sync_id_key),
+                'full': False,
+                'same_layout': diff['same_layout'],
+                'inserted': diff['inserted'],
+                'updated': diff['updated'],
+                'deleted': diff['deleted'],
+                'changed_positions': [position for position, key in enumerate(keys) if key in changed_keys]
+            }
+        return merged, changes, dict(zip(keys, hashes))
+    
+    @staticmethod
+    def _has_changes(changes):
+        """True if a changes block contains any row-level change"""
+        return changes['full'] or bool(changes['inserted'] or changes['updated'] or changes['deleted'])
+    
+    def update_vehicle_catalog(self, vehicles, timestamp, sync_id):
+        """
+        Update vehicle catalog from Excel data, applying only the changed rows
+        
+        Args:
+            vehicles: Vehicles built from the sheet (see build_vehicles)
+            timestamp: Sync timestamp
+            sync_id: Id of this sync
+        
+        Returns:
+            The changes block written to the catalog, or None on error
+        """
+        try:
+            hashes = [row_content_hash(vehicle) for vehicle in vehicles]
+            vehicles, changes, row_hashes = self._merge_rows(
+                self.vehicle_catalog_path, 'vehicles', 'vehicle_hashes', 'vehicle_catalog_sync_id', vehicles, hashes, sync_id)
             
-            for index, row in df.iterrows():
-                license_plate = str(row.get('License Plate', '')).strip()
-                if not license_plate or license_plate == 'nan':
-                    continue
-                
-                # Get driver name for the record
-                driver_name = str(row.get('Driver Name', '')).strip()
-                
-                # Get repair cost from Hebrew columns
-                repair_cost = 0
-                cost_columns = ['עלות תיקון (₪)', 'עלות תיקון (שקל)', 'עלות תיקון', 'Repair Cost']
-                for col in cost_columns:
-                    if col in row and pd.notna(row[col]):
-                        try:
-                            repair_cost = float(row[col])
-                            break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Create maintenance record
-                maintenance_record = {
-                    'vehicle_id': f"V{index:03d}",
-                    'license_plate': license_plate,
-                    'driver_name': driver_name,
-                    'date': str(row.get('Last Maintenance', '')).strip(),
-                    'type': 'Routine Maintenance',
-                    'description': f"Maintenance for vehicle {license_plate}",
-                    'cost': repair_cost,
-                    'status': 'Completed',
-                    'provider': 'Internal',
-                    'mileage': int(row.get('Mileage', 0)) if pd.notna(row.get('Mileage')) else 0,
-                    'next_service': str(row.get('Next Maintenance', '')).strip(),
-                    'created_at': datetime.now().isoformat()
+            if self._has_changes(changes):
+                # Update vehicle catalog
+                catalog_data = {
+                    'vehicles': vehicles,
+                    'total_vehicles': len(vehicles),
+                    'last_updated': timestamp,
+                    'source_file': self.main_excel_path,
+                    'changes': changes
                 }
                 
-                # Check if it's a fault record - look for fault data
-                fault_type = str(row.get('Fault Type', '')).strip()
-                if fault_type and fault_type != 'nan' and fault_type != 'None':
-                    fault_record = {
-                        'vehicle_id': f"V{index:03d}",
-                        'license_plate': license_plate,
-                        'driver_name': driver_name,
-                        'fault_type': fault_type,
-                        'fault_severity': 'Medium',
-                        'description': str(row.get('Fault Description', '')).strip(),
-                        'repair_cost': repair_cost,  # Use the same repair cost we found above
-                        'repair_date': str(row.get('Report Date', '')).strip(),
-                        'status': str(row.get('Fault Status', 'Open')).strip(),
-                        'reported_by': str(row.get('Reported By', driver_name)).strip(),
-                        'created_at': datetime.now().isoformat()
-                    }
-                    fault_data.append(fault_record)
-                    logger.info(f"Added fault record for {license_plate}: {fault_type}")
+                write_json_atomic(self.vehicle_catalog_path, catalog_data)
+                write_catalog_snapshot(self.vehicle_catalog_path, catalog_data)
+                self.sync_tracking['vehicle_catalog_sync_id'] = sync_id
                 
-                maintenance_data.append(maintenance_record)
+                logger.info(f"Updated vehicle catalog with {len(vehicles)} vehicles "
+                            f"({len(changes['inserted'])} inserted, {len(changes['updated'])} updated, "
+                            f"{len(changes['deleted'])} deleted)")
+            else:
+                logger.info("No vehicle rows changed, vehicle catalog left as is")
+                self._ensure_catalog_snapshot()
+            
+            self.sync_tracking['vehicle_hashes'] = {
+                WORKBOOK_HASH_KEY: self.sync_tracking.get('vehicle_hashes', {}).get(WORKBOOK_HASH_KEY),
+                **row_hashes
+            }
+            self._update_datastore('vehicles', 'vehicle_catalog_sync_id',
+                                   lambda file_sync_id: self.datastore.write_vehicles(vehicles, changes, file_sync_id))
+            return changes
+            
+        except Exception as e:
+            logger.error(f"Error updating vehicle catalog: {e}")
+            return None
+    
+    def update_fault_reports(self, maintenance_data, row_faults, timestamp, sync_id):
+        """
+        Update maintenance records and the fault summary, applying only the changed rows
+        
+        Args:
+            maintenance_data: Maintenance records built from the sheet (see build_maintenance_records)
+            row_faults: Fault record or None per maintenance record
+            timestamp: Sync timestamp
+            sync_id: Id of this sync
+        
+        Returns:
+            The changes block written to the maintenance records, or None on error
+        """
+        try:
+            fault_data = [fault for fault in row_faults if fault]
+            
+            # A row's hash covers its maintenance record and its fault record
+            hashes = [row_content_hash(record, fault) for record, fault in zip(maintenance_data, row_faults)]
+            maintenance_data, changes, row_hashes = self._merge_rows(
+                self.maintenance_records_path, 'records', 'maintenance_hashes', 'maintenance_records_sync_id',
+                maintenance_data, hashes, sync_id)
+            
+            if not self._has_changes(changes) and os.path.exists(self.fault_reports_path):
+                logger.info("No maintenance rows changed, maintenance records and fault reports left as is")
+                self.sync_tracking['maintenance_hashes'] = row_hashes
+                self._update_datastore('maintenance_records', 'maintenance_records_sync_id',
+                                       lambda file_sync_id: self.datastore.write_maintenance(
+                                           maintenance_data, row_faults, changes, file_sync_id))
+                return changes
             
             # Update maintenance records
             maintenance_records = {
                 'records': maintenance_data,
                 'total_records': len(maintenance_data),
-                'last_updated': datetime.now().isoformat(),
-                'source_file': self.main_excel_path
+                'last_updated': timestamp,
+                'source_file': self.main_excel_path,
+                'changes': changes
             }
             
-            with open(self.maintenance_records_path, 'w', encoding='utf-8') as f:
-                json.dump(maintenance_records, f, ensure_ascii=False, indent=2)
+            write_json_atomic(self.maintenance_records_path, maintenance_records)
+            self.sync_tracking['maintenance_hashes'] = row_hashes
+            self.sync_tracking['maintenance_records_sync_id'] = sync_id
             
             # Update fault reports summary
             fault_summary = {
@@ -286,7 +820,7 @@ class ExcelSyncManager:
                 'faults_by_type': {},
                 'faults_by_severity': {},
                 'total_repair_cost': sum(f.get('repair_cost', 0) for f in fault_data),
-                'last_updated': datetime.now().isoformat(),
+                'last_updated': timestamp,
                 'source_file': self.main_excel_path
             }
             
@@ -298,16 +832,20 @@ class ExcelSyncManager:
                 fault_summary['faults_by_type'][fault_type] = fault_summary['faults_by_type'].get(fault_type, 0) + 1
                 fault_summary['faults_by_severity'][fault_severity] = fault_summary['faults_by_severity'].get(fault_severity, 0) + 1
             
-            with open(self.fault_reports_path, 'w', encoding='utf-8') as f:
-                json.dump(fault_summary, f, ensure_ascii=False, indent=2)
+            write_json_atomic(self.fault_reports_path, fault_summary)
+            self._update_datastore('maintenance_records', 'maintenance_records_sync_id',
+                                   lambda file_sync_id: self.datastore.write_maintenance(
+                                       maintenance_data, row_faults, changes, file_sync_id))
             
-            logger.info(f"Updated maintenance records: {len(maintenance_data)} records")
+            logger.info(f"Updated maintenance records: {len(maintenance_data)} records "
+                        f"({len(changes['inserted'])} inserted, {len(changes['updated'])} updated, "
+                        f"{len(changes['deleted'])} deleted)")
             logger.info(f"Updated fault reports: {len(fault_data)} faults")
-            return True
+            return changes
             
         except Exception as e:
             logger.error(f"Error updating fault reports: {e}")
-            return False
+            return None
     
     def sync_excel_data(self):
         """Main synchronization method"""
@@ -319,40 +857,85 @@ class ExcelSyncManager:
                 logger.error(f"Main Excel file not found: {self.main_excel_path}")
                 return False
             
+            # Data written with another vehicle id scheme is rewritten in full (catalog,
+            # records and datastore) so every vehicle and record carries the new ids
+            self._rekeying = self.sync_tracking.get('vehicle_id_scheme') != VEHICLE_ID_SCHEME
+            
             # Detect changes
             if not self.detect_vehicle_changes():
-                logger.info("No changes detected, skipping sync")
-                return True
+                if self._rekeying:
+                    logger.info(f"Data was synced with an older vehicle id scheme, re-keying it "
+                                f"('{VEHICLE_ID_SCHEME}' ids)")
+                elif not self._datastore_behind():
+                    logger.info("No changes detected, skipping sync")
+                    self._ensure_catalog_snapshot()
+                    return True
+                else:
+                    # Workbook unchanged, but the datastore was never filled or a write failed
+                    logger.info("Datastore is behind the JSON files, re-reading the workbook to fill it")
+                self._detected_file = (self.sync_tracking.get('main_excel_stat'),
+                                       self.sync_tracking.get('vehicle_hashes', {}).get(WORKBOOK_HASH_KEY))
+            
+            # One timestamp and sync id for every row written by this sync
+            timestamp = datetime.now().isoformat()
+            sync_id = uuid.uuid4().hex
             
             # Load Excel data
-            df = self.load_main_excel_data()
-            if df is None:
+            sheet_rows = self.read_sheet_rows(timestamp)
+            if sheet_rows is None:
                 logger.error("Failed to load Excel data")
                 return False
+            vehicles, maintenance_data, row_faults, row_count = sheet_rows
             
-            logger.info(f"Loaded Excel data with {len(df)} rows")
+            logger.info(f"Loaded Excel data with {row_count} rows")
             
             # Update vehicle catalog
-            if not self.update_vehicle_catalog(df):
+            vehicle_changes = self.update_vehicle_catalog(vehicles, timestamp, sync_id)
+            if vehicle_changes is None:
                 logger.error("Failed to update vehicle catalog")
                 return False
             
             # Update fault reports
-            if not self.update_fault_reports(df):
+            maintenance_changes = self.update_fault_reports(maintenance_data, row_faults, timestamp, sync_id)
+            if maintenance_changes is None:
                 logger.error("Failed to update fault reports")
                 return False
             
-            # Update sync tracking
-            current_hash = self.calculate_file_hash(self.main_excel_path)
-            self.sync_tracking['last_sync'] = datetime.now().isoformat()
-            self.sync_tracking['vehicle_hashes']['main_excel'] = current_hash
+            # Cached PDF reports of changed vehicles were rendered from the old data
+            if vehicle_changes['full'] or maintenance_changes['full']:
+                invalidate_report_cache()
+            else:
+                changed_plates = {
+                    plate_from_row_key(key)
+                    for changes in (vehicle_changes, maintenance_changes)
+                    for key in changes['inserted'] + changes['updated'] + changes['deleted']
+                }
+                if changed_plates:
+                    invalidate_report_cache(license_plates=sorted(changed_plates))
+            
+            # Update sync tracking with the stat and hash the change was detected at;
+            # if the file was saved again meanwhile, the next sync sees a new stat
+            signature, current_hash = self._detected_file
+            self.sync_tracking['main_excel_stat'] = signature
+            self.sync_tracking['last_sync'] = timestamp
+            self.sync_tracking['last_sync_id'] = sync_id
+            self.sync_tracking['vehicle_hashes'][WORKBOOK_HASH_KEY] = current_hash
+            self.sync_tracking['vehicle_id_scheme'] = VEHICLE_ID_SCHEME
+            self._rekeying = False
             
             # Add to sync history
+            full_sync = vehicle_changes['full'] or maintenance_changes['full']
             sync_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'action': 'full_sync',
-                'vehicles_updated': len(df),
-                'file_hash': current_hash[:8] if current_hash else 'unknown'
+                'timestamp': timestamp,
+                'action': 'full_sync' if full_sync else 'incremental_sync',
+                'vehicles_updated': row_count,
+                'file_hash': current_hash[:8] if current_hash else 'unknown',
+                'vehicles_inserted': len(vehicle_changes['inserted']),
+                'vehicles_changed': len(vehicle_changes['updated']),
+                'vehicles_deleted': len(vehicle_changes['deleted']),
+                'records_inserted': len(maintenance_changes['inserted']),
+                'records_changed': len(maintenance_changes['updated']),
+                'records_deleted': len(maintenance_changes['deleted'])
             }
             self.sync_tracking['sync_history'].append(sync_entry)
             
@@ -404,10 +987,32 @@ class ExcelSyncManager:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Synchronize the fleet Excel workbook into the JSON data files')
+    parser.add_argument('--stream', action='store_true', default=None,
+                        help='Stream the sheet with openpyxl read-only mode instead of loading it at once')
+    parser.add_argument('--chunk-rows', type=int, help='Rows per chunk when streaming')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and sync whenever the workbook changes')
+    parser.add_argument('--reload-url', help='Server endpoint notified after each sync in watch mode')
+    args = parser.parse_args()
+    
     print("Excel Synchronization Manager")
     print("=" * 40)
     
-    sync_manager = ExcelSyncManager()
+    sync_manager = ExcelSyncManager(stream_rows=args.stream, chunk_rows=args.chunk_rows)
+    
+    if args.watch:
+        from scripts.excel_sync_watcher import create_watcher_from_config
+        
+        watcher = create_watcher_from_config(sync_manager)
+        if args.reload_url:
+            watcher.reload_url = args.reload_url
+        print(f"Watching {sync_manager.main_excel_path} ({watcher.get_status()['mode']}), Ctrl+C to stop")
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        return 0
     
     # Get current status
     status = sync_manager.get_sync_status()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Excel Sync Watcher
+Keeps the JSON data files in step with the fleet workbook: waits for the file to
+change (filesystem events via watchdog when installed, stat polling otherwise),
+lets bursts of saves settle, runs the Excel sync and tells the server to reload.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+
+import requests
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.excel_sync_manager import ExcelSyncManager, load_sync_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELOAD_URL = 'http://localhost:5000/reload'
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+if WATCHDOG_AVAILABLE:
+    class _WorkbookEventHandler(FileSystemEventHandler):
+        """Sets an event whenever the workbook is written, replaced or moved into place"""
+
+        def __init__(self, workbook_path, changed_event):
+            super().__init__()
+            self.workbook_path = os.path.abspath(workbook_path)
+            self.changed_event = changed_event
+
+        def on_any_event(self, event):
+            # Excel saves through a temp file that is renamed over the workbook
+            paths = (getattr(event, 'src_path', None), getattr(event, 'dest_path', None))
+            if any(path and os.path.abspath(path) == self.workbook_path for path in paths):
+                self.changed_event.set()
+
+
+def publish_reload(reload_url, timeout=2.0):
+    """
+    Ask the running server to reload its data
+
+    Returns:
+        True if the server acknowledged the reload
+    """
+    try:
+        response = requests.post(reload_url, timeout=timeout)
+        if response.status_code == 200:
+            logger.info(f"Server reloaded: {response.json()}")
+            return True
+        logger.warning(f"Server reload returned HTTP {response.status_code}")
+        return False
+    except Exception as e:
+        logger.warning(f"Could not reach server at {reload_url}: {e}")
+        return False
+
+
+class ExcelSyncWatcher:
+    """Runs the Excel sync whenever the workbook changes"""
+
+    def __init__(self,
+                 sync_manager=None,
+                 debounce_seconds=2.0,
+                 poll_interval=5.0,
+                 max_settle_seconds=30.0,
+                 reload_url=DEFAULT_RELOAD_URL,
+                 use_events=True):
+        """
+        Initialize the watcher.
+
+        Args:
+            sync_manager: ExcelSyncManager to run (default: a new one)
+            debounce_seconds: The workbook must be unchanged for this long before syncing
+            poll_interval: Seconds between stat checks (with events, a safety net for missed events)
+            max_settle_seconds: Sync anyway if the workbook keeps changing for this long
+            reload_url: Server endpoint to POST to after a sync wrote new data (None to disable)
+            use_events: Use filesystem events when watchdog is installed
+        """
+        self.sync_manager = sync_manager or ExcelSyncManager()
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.max_settle_seconds = max_settle_seconds
+        self.reload_url = reload_url
+        self.use_events = use_events and WATCHDOG_AVAILABLE
+
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = None
+        self._counters = {'syncs': 0, 'failed_syncs': 0, 'reloads': 0, 'skipped_unchanged': 0}
+
+    @property
+    def workbook_path(self):
+        return self.sync_manager.main_excel_path
+
+    def _start_observer(self):
+        """Watch the workbook's directory for events (no-op without watchdog)"""
+        if not self.use_events:
+            logger.info(f"Polling {self.workbook_path} every {self.poll_interval}s")
+            return
+        directory = os.path.dirname(os.path.abspath(self.workbook_path))
+        self._observer = Observer()
+        self._observer.schedule(_WorkbookEventHandler(self.workbook_path, self._changed), directory, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        logger.info(f"Watching {self.workbook_path} for filesystem events")
+
+    def _wait_for_change(self):
+        """Block until an event arrives or the poll interval passes; False when stopping"""
+        self._changed.wait(self.poll_interval)
+        self._changed.clear()
+        return not self._stop.is_set()
+
+    def _wait_until_settled(self, signature):
+        """
+        Wait until the workbook stat is unchanged for debounce_seconds
+
+        Returns:
+            The settled stat signature (None if the file is gone)
+        """
+        started = time.monotonic()
+        while not self._stop.is_set():
+            self._changed.clear()
+            if self._stop.wait(self.debounce_seconds):
+                break
+            current = ExcelSyncManager.file_stat_signature(self.workbook_path)
+            if current == signature and not self._changed.is_set():
+                return current
+            signature = current
+            if time.monotonic() - started >= self.max_settle_seconds:
+                logger.warning(f"Workbook still changing after {self.max_settle_seconds}s, syncing anyway")
+                return current
+        return signature
+
+    def check_once(self):
+        """
+        Sync if the workbook changed since the last sync
+
+        Returns:
+            True if a sync wrote new data
+        """
+        signature = ExcelSyncManager.file_stat_signature(self.workbook_path)
+        if signature is None or signature == self.sync_manager.sync_tracking.get('main_excel_stat'):
+            return False
+
+        signature = self._wait_until_settled(signature)
+        if signature is None or self._stop.is_set():
+            return False
+
+        last_sync_id = self.sync_manager.sync_tracking.get('last_sync_id')
+        if not self.sync_manager.sync_excel_data():
+            self._counters['failed_syncs'] += 1
+            return False
+
+        if self.sync_manager.sync_tracking.get('last_sync_id') == last_sync_id:
+            # Saved again without content changes; only the stat was recorded
+            self._counters['skipped_unchanged'] += 1
+            return False
+
+        self._counters['syncs'] += 1
+        if self.reload_url and publish_reload(self.reload_url):
+            self._counters['reloads'] += 1
+        return True
+
+    def run(self):
+        """Watch until stop() is called"""
+        self._start_observer()
+        try:
+            # Catch up on edits made while the watcher was not running
+            self.check_once()
+            while self._wait_for_change():
+                try:
+                    self.check_once()
+                except Exception as e:
+                    logger.error(f"Error in Excel watch loop: {e}")
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join(timeout=5)
+
+    def start(self):
+        """Run the watcher in a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='excel-sync-watcher', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def get_status(self):
+        """Watcher mode and counters"""
+        return {
+            'workbook': self.workbook_path,
+            'mode': 'events' if self.use_events else 'polling',
+            'running': self._thread is not None and self._thread.is_alive(),
+            **self._counters
+        }
+
+
+def create_watcher_from_config(sync_manager=None):
+    """Build a watcher from the excel_sync section of config/config.json"""
+    sync_config = load_sync_config()
+    return ExcelSyncWatcher(
+        sync_manager=sync_manager,
+        debounce_seconds=sync_config.get('debounce_seconds', 2.0),
+        poll_interval=sync_config.get('poll_interval_seconds', 5.0),
+        reload_url=sync_config.get('reload_url', DEFAULT_RELOAD_URL)
+    )
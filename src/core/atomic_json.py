@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Atomic JSON Writes
+Data files are written to a temp file in the same directory, fsynced and moved
+over the target with os.replace, so readers see either the old or the new file,
+never a partial one. Each write also bumps a per-file generation counter that
+readers can compare instead of re-parsing the file; writers hold a per-file
+lock, so concurrent writers never lose a bump.
+
+file_lock() serializes read-modify-write cycles on a shared file between the
+processes of a multi-worker server.
+"""
+
+import os
+import json
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Any, Optional
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+
+def generation_path(path: str) -> str:
+    """Sidecar file holding the generation counter of a data file"""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f".{filename}.generation")
+
+
+def write_lock_path(path: str) -> str:
+    """Sidecar lock file serializing the writers of a data file"""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f".{filename}.lock")
+
+
+def read_generation(path: str) -> Optional[int]:
+    """
+    Current generation of a data file
+
+    Returns:
+        The counter, or None if the file was never written by write_json_atomic()
+    """
+    try:
+        with open(generation_path(path), 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return None
+
+
+def _fsync_directory(directory: str):
+    """Persist a rename in a directory (not supported on Windows, where this is a no-op)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace_with(path: str, write, binary: bool = False) -> None:
+    """Write through a same-directory temp file, fsync it and move it over path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with (open(temp_path, 'wb') if binary else open(temp_path, 'w', encoding='utf-8')) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def write_json_atomic(path: str, data: Any, indent: Optional[int] = 2, ensure_ascii: bool = False) -> int:
+    """
+    Atomically replace a JSON file and bump its generation
+
+    Args:
+        path: Target file
+        data: JSON-serializable data
+        indent: json.dump indent
+        ensure_ascii: json.dump ensure_ascii (False keeps Hebrew readable)
+
+    Returns:
+        The file's new generation
+    """
+    # Held across both replaces: the generation read-increment-write cannot
+    # interleave with another writer, and the last generation goes with the last data
+    with file_lock(write_lock_path(path)):
+        _replace_with(path, lambda f: json.dump(data, f, ensure_ascii=ensure_ascii, indent=indent))
+
+        # Bumped after the data is in place: a reader that sees the new generation
+        # is guaranteed to read the new file
+        generation = (read_generation(path) or 0) + 1
+        _replace_with(generation_path(path), lambda f: f.write(f"{generation}\n"))
+    return generation
+
+
+def write_bytes_atomic(path: str, chunks) -> None:
+    """Atomically replace a binary file with the given byte chunks (no generation counter)"""
+    def write(f):
+        for chunk in chunks:
+            f.write(chunk)
+    _replace_with(path, write, binary=True)
+
+
+@contextmanager
+def file_lock(lock_path: str, blocking: bool = True):
+    """
+    Exclusive lock shared by every process that opens the same lock file
+
+    Args:
+        lock_path: Lock file (created if missing, never removed)
+        blocking: Wait for the lock; otherwise give up at once if another process holds it
+
+    Yields:
+        True if the lock is held, False if blocking is False and it was taken
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        try:
+            if os.name == 'nt':
+                f.seek(0)
+                # LK_LOCK retries for about 10 seconds before raising
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
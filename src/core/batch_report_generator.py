@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Batch PDF Report Generator
+Renders maintenance reports for the whole fleet (or a filtered set of vehicles)
+across a process pool, into a dated directory under reports/batch
+"""
+
+import os
+import re
+import sys
+import time
+import zipfile
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.core.vehicle_repository import VehicleRepository, get_vehicle_repository, normalize_license_plate, \
+    DEFAULT_VEHICLE_CATALOG_PATH, DEFAULT_MAINTENANCE_RECORDS_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_DIR = os.path.join(project_root, 'reports', 'batch')
+
+# One generator per worker process, created by _init_worker
+_worker_generator = None
+
+
+def _init_worker():
+    """Pool initializer: register fonts and build styles once per worker"""
+    global _worker_generator
+    import io
+    import contextlib
+    from src.core.template_hebrew_pdf import TemplateHebrewPDFGenerator
+
+    # The font registry reports on stdout; keep worker output quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_generator = TemplateHebrewPDFGenerator()
+
+
+def _render_report(task: Tuple[Dict, List[Dict], str]) -> Tuple[str, Optional[str]]:
+    """
+    Render one report inside a worker
+
+    Returns:
+        Tuple of (output path, error message or None)
+    """
+    import io
+    import contextlib
+
+    vehicle, maintenance_records, output_path = task
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _worker_generator.generate_maintenance_report(vehicle, maintenance_records, output_path)
+        return output_path, None
+    except Exception as e:
+        return output_path, str(e)
+
+
+def safe_filename_part(text: str) -> str:
+    """Make a value (e.g. a license plate) safe to embed in a file name"""
+    cleaned = re.sub(r'[^0-9A-Za-z_-]+', '_', str(text)).strip('_')
+    return cleaned or 'unknown'
+
+
+def select_vehicles(vehicles: List[Dict],
+                    license_plates: List[str] = None,
+                    status: str = None,
+                    location: str = None,
+                    make: str = None,
+                    limit: int = None) -> List[Dict]:
+    """
+    Filter the catalog
+
+    Args:
+        vehicles: Vehicle catalog
+        license_plates: Only these plates (any dash/space formatting)
+        status: Only vehicles with this status
+        location: Only vehicles at this location
+        make: Only vehicles of this make (case-insensitive)
+        limit: Maximum number of vehicles
+
+    Returns:
+        Selected vehicles in catalog order
+    """
+    plates = {normalize_license_plate(plate) for plate in license_plates} if license_plates else None
+    make = make.lower() if make else None
+
+    selected = []
+    for vehicle in vehicles:
+        if plates is not None and normalize_license_plate(vehicle.get('license_plate', '')) not in plates:
+            continue
+        if status and vehicle.get('status') != status:
+            continue
+        if location and vehicle.get('location') != location:
+            continue
+        if make and str(vehicle.get('make', '')).lower() != make:
+            continue
+        selected.append(vehicle)
+        if limit and len(selected) >= limit:
+            break
+    return selected
+
+
+class BatchReportGenerator:
+    """Renders maintenance reports for many vehicles in parallel"""
+
+    def __init__(self,
+                 output_root: str = DEFAULT_BATCH_DIR,
+                 workers: int = None,
+                 vehicle_catalog_path: str = DEFAULT_VEHICLE_CATALOG_PATH,
+                 maintenance_records_path: str = DEFAULT_MAINTENANCE_RECORDS_PATH,
+                 repository=None):
+        """
+        Initialize the batch generator.
+
+        Args:
+            output_root: Directory the dated run directories are created in
+            workers: Number of rendering processes (default: CPU count)
+            vehicle_catalog_path: Path to the vehicle catalog JSON
+            maintenance_records_path: Path to the maintenance records JSON
+            repository: Data source with the VehicleRepository read methods (e.g. the
+                SQLite FleetDatastore); default: a VehicleRepository over the two paths
+        """
+        self.output_root = output_root
+        self.workers = workers or os.cpu_count() or 1
+        self.repository = repository or VehicleRepository(vehicle_catalog_path, maintenance_records_path)
+
+    def _build_tasks(self, vehicles: List[Dict], output_dir: str) -> List[Tuple[Dict, List[Dict], str]]:
+        """Pair each vehicle with its records and a unique output path"""
+        tasks = []
+        used_names = set()
+        for vehicle in vehicles:
+            license_plate = vehicle.get('license_plate', 'unknown')
+            plate_part = safe_filename_part(license_plate)
+            name = f"maintenance_report_{plate_part}"
+            suffix = 1
+            while name in used_names:
+                suffix += 1
+                name = f"maintenance_report_{plate_part}_{suffix}"
+            used_names.add(name)
+
+            records = self.repository.get_maintenance_records_for_plate(license_plate)
+            tasks.append((vehicle, records, os.path.join(output_dir, f"{name}.pdf")))
+        return tasks
+
+    def run(self, vehicles: List[Dict] = None, create_zip: bool = False, merge: bool = False,
+            run_date: datetime = None) -> Dict:
+        """
+        Render reports for a set of vehicles
+
+        Args:
+            vehicles: Vehicles to report on (default: the whole catalog)
+            create_zip: Bundle the rendered PDFs into one ZIP file
+            merge: Also write one multi-vehicle PDF with a report per vehicle
+            run_date: Date of the run directory (default: today)
+
+        Returns:
+            Run summary with output paths and failures
+        """
+        start = time.perf_counter()
+        if vehicles is None:
+            vehicles = self.repository.get_vehicles()
+
+        date_text = (run_date or datetime.now()).strftime('%Y-%m-%d')
+        output_dir = os.path.join(self.output_root, date_text)
+        os.makedirs(output_dir, exist_ok=True)
+
+        tasks = self._build_tasks(vehicles, output_dir)
+        logger.info(f"Rendering {len(tasks)} reports with {self.workers} workers into {output_dir}")
+
+        rendered = []
+        rendered_tasks = []
+        failures = []
+        if tasks:
+            # Batch several reports per IPC round trip; keep all workers busy
+            chunksize = max(1, min(50, len(tasks) // (self.workers * 4)))
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+                for task, (output_path, error) in zip(tasks, executor.map(_render_report, tasks, chunksize=chunksize)):
+                    if error is None:
+                        rendered.append(output_path)
+                        rendered_tasks.append(task)
+                    else:
+                        failures.append({'file': os.path.basename(output_path), 'error': error})
+                        logger.error(f"Failed to render {os.path.basename(output_path)}: {error}")
+
+        summary = {
+            'output_dir': output_dir,
+            'vehicles': len(tasks),
+            'rendered': len(rendered),
+            'failed': failures,
+            'zip_path': None,
+            'merged_path': None
+        }
+
+        if create_zip and rendered:
+            summary['zip_path'] = self._create_zip(rendered, output_dir, date_text)
+
+        if merge and rendered_tasks:
+            try:
+                summary['merged_path'] = self._create_merged_pdf(rendered_tasks, output_dir, date_text)
+            except Exception as e:
+                logger.error(f"Failed to write the merged PDF: {e}")
+                failures.append({'file': f"fleet_maintenance_reports_{date_text}.pdf", 'error': str(e)})
+
+        summary['seconds'] = round(time.perf_counter() - start, 2)
+        return summary
+
+    def _create_zip(self, rendered: List[str], output_dir: str, date_text: str) -> str:
+        """Bundle rendered PDFs into one ZIP"""
+        zip_path = os.path.join(output_dir, f"maintenance_reports_{date_text}.zip")
+        # PDFs are already compressed; storing them keeps the bundle step I/O bound
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as bundle:
+            for path in rendered:
+                bundle.write(path, arcname=os.path.basename(path))
+        logger.info(f"Wrote {len(rendered)} reports to {zip_path}")
+        return zip_path
+
+    def _create_merged_pdf(self, tasks: List[Tuple[Dict, List[Dict], str]], output_dir: str,
+                           date_text: str) -> str:
+        """
+        Write one PDF with every rendered report, one vehicle per section
+
+        The per-vehicle PDFs the workers rendered are concatenated with pypdf. Without
+        pypdf the reports are rendered again into one document in this process.
+
+        Args:
+            tasks: Tasks whose report rendered successfully
+        """
+        merged_path = os.path.join(output_dir, f"fleet_maintenance_reports_{date_text}.pdf")
+        if PYPDF_AVAILABLE:
+            writer = PdfWriter()
+            for _, _, output_path in tasks:
+                writer.append(output_path)
+            with open(merged_path, 'wb') as f:
+                writer.write(f)
+            writer.close()
+        else:
+            from src.core.template_hebrew_pdf import TemplateHebrewPDFGenerator
+
+            logger.warning("pypdf is not installed, rendering the merged PDF again (pip install pypdf)")
+            generator = TemplateHebrewPDFGenerator()
+            generator.generate_combined_report(((vehicle, records) for vehicle, records, _ in tasks), merged_path)
+        logger.info(f"Wrote merged PDF with {len(tasks)} reports to {merged_path}")
+        return merged_path
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Render maintenance PDF reports for many vehicles')
+    parser.add_argument('--plates', nargs='+', help='License plates to report on (default: all vehicles)')
+    parser.add_argument('--status', help='Only vehicles with this status')
+    parser.add_argument('--location', help='Only vehicles at this location')
+    parser.add_argument('--make', help='Only vehicles of this make')
+    parser.add_argument('--limit', type=int, help='Maximum number of vehicles')
+    parser.add_argument('--workers', type=int, help='Rendering processes (default: CPU count)')
+    parser.add_argument('--output-dir', default=DEFAULT_BATCH_DIR,
+                        help='Root directory for dated run directories')
+    parser.add_argument('--zip', action='store_true', help='Bundle the reports into one ZIP file')
+    parser.add_argument('--merge', action='store_true', help='Also write one merged multi-vehicle PDF')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # The configured data source: the SQLite datastore when enabled, the JSON files otherwise
+    batch = BatchReportGenerator(output_root=args.output_dir, workers=args.workers,
+                                 repository=get_vehicle_repository())
+    vehicles = select_vehicles(batch.repository.get_vehicles(), args.plates, args.status,
+                               args.location, args.make, args.limit)
+    if not vehicles:
+        print("No vehicles match the given filters")
+        return 1
+
+    summary = batch.run(vehicles, create_zip=args.zip, merge=args.merge)
+
+    print(f"Rendered {summary['rendered']}/{summary['vehicles']} reports in {summary['seconds']}s")
+    print(f"Output directory: {summary['output_dir']}")
+    if summary['zip_path']:
+        print(f"ZIP bundle: {summary['zip_path']}")
+    if summary['merged_path']:
+        print(f"Merged PDF: {summary['merged_path']}")
+    for failure in summary['failed']:
+        print(f"Failed: {failure['file']}: {failure['error']}")
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
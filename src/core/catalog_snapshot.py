@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Compact Vehicle Catalog Snapshot
+Column-oriented binary copy of large_vehicle_catalog.json written next to it by the
+Excel sync. Repeated values (makes, models, colors, fuel types, ...) are stored once
+in a string table and referenced by id, numbers are stored as fixed-width arrays and
+vehicles are only turned back into dicts when they are accessed, so loading a 100k
+vehicle catalog takes milliseconds instead of the seconds json.load needs.
+
+File layout:
+    MAGIC, uint32 header length, JSON header, then the data blocks listed in the
+    header (each 8-byte aligned): the UTF-8 string table, its byte offsets,
+    one array per leaf field and a sorted normalized-plate index. Every value is
+    found by offset, so a read-only memory map of the file serves one vehicle by
+    touching only the pages that hold its values.
+"""
+
+import gc
+import os
+import json
+import mmap
+import struct
+import logging
+from collections.abc import Sequence
+from operator import index as as_index
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.atomic_json import read_generation, write_bytes_atomic
+from src.core.vehicle_repository import normalize_license_plate
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'FLEETSNAP1\n'
+_LENGTH = struct.Struct('<I')
+_ALIGNMENT = 8
+
+# Leaf column kinds: 'str' -> uint32 string ids, 'int' -> int64, 'float' -> float64,
+# 'json' -> uint32 string ids of the JSON text (None, bools, lists, mixed types)
+_NUMPY_TYPES = {'str': np.uint32, 'json': np.uint32, 'int': np.int64, 'float': np.float64}
+_INT64_RANGE = (-2**63, 2**63 - 1)
+
+
+def snapshot_path(catalog_path: str) -> str:
+    """Snapshot file for a catalog JSON file"""
+    return f"{os.path.splitext(catalog_path)[0]}.snapshot"
+
+
+def source_signature(catalog_path: str) -> Optional[List]:
+    """
+    [generation, mtime_ns, size] of the catalog JSON, or None if it cannot be stat'ed
+
+    A snapshot is fresh only while the JSON still has the signature it was built from.
+    """
+    try:
+        stat = os.stat(catalog_path)
+    except OSError:
+        return None
+    return [read_generation(catalog_path), stat.st_mtime_ns, stat.st_size]
+
+
+def _row_shape(row: Dict) -> List:
+    """Nested [key, None | sub-shape] list describing a row's keys"""
+    return [[key, _row_shape(value) if isinstance(value, dict) else None] for key, value in row.items()]
+
+
+def _leaf_paths(shape: List, prefix: Tuple = ()) -> List[Tuple]:
+    """Key paths of the leaf fields in a shape, depth first"""
+    paths = []
+    for key, sub_shape in shape:
+        if sub_shape is None:
+            paths.append(prefix + (key,))
+        else:
+            paths.extend(_leaf_paths(sub_shape, prefix + (key,)))
+    return paths
+
+
+def _column_kind(values: List) -> str:
+    """Storage kind that round-trips every value in a column exactly"""
+    types = {type(value) for value in values}
+    if types == {str}:
+        return 'str'
+    if types == {int} and all(_INT64_RANGE[0] <= value <= _INT64_RANGE[1] for value in values):
+        return 'int'
+    if types == {float}:
+        return 'float'
+    return 'json'
+
+
+def _column_template(shape: List, positions) -> List:
+    """Shape with each leaf replaced by its column position (leaves are numbered depth first)"""
+    return [[key, next(positions) if sub_shape is None else _column_template(sub_shape, positions)]
+            for key, sub_shape in shape]
+
+
+def _assemble(template: List, values) -> Dict:
+    """Build a row dict from a column template and the row's column values"""
+    return {key: values[column] if isinstance(column, int) else _assemble(column, values)
+            for key, column in template}
+
+
+def _assemble_columns(template: List, columns: List[List], count: int, row_type=None) -> List:
+    """
+    Build every row at once, one nesting level at a time, from whole decoded columns
+
+    Rows are dicts, or row_type records (see fleet_models) built straight from the
+    columns when a row type is given.
+    """
+    keys = [key for key, _ in template]
+    fields = [columns[column] if isinstance(column, int) else
+              _assemble_columns(column, columns, count, row_type.nested_type(key) if row_type else None)
+              for key, column in template]
+    if row_type is not None:
+        return row_type.from_columns(keys, fields, count)
+    if not fields:
+        return [{} for _ in range(count)]
+    return [dict(zip(keys, values)) for values in zip(*fields)]
+
+
+class _StringTable:
+    """Builds the deduplicated string table while columns are encoded"""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def id_of(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def _encode_catalog(catalog: Dict, list_key: str, signature: List) -> Optional[List[bytes]]:
+    """
+    Encode a catalog as snapshot chunks
+
+    Returns:
+        List of byte chunks, or None if the rows do not all share one key layout
+    """
+    rows = catalog.get(list_key, [])
+    shape = _row_shape(rows[0]) if rows else []
+    if any(_row_shape(row) != shape for row in rows):
+        return None
+
+    table = _StringTable()
+    columns = []
+    blocks = []
+    for position, path in enumerate(_leaf_paths(shape)):
+        values = []
+        for row in rows:
+            value = row
+            for key in path:
+                value = value[key]
+            values.append(value)
+
+        kind = _column_kind(values)
+        if kind == 'str':
+            data = np.fromiter((table.id_of(value) for value in values), dtype=np.uint32, count=len(values))
+        elif kind == 'json':
+            data = np.fromiter((table.id_of(json.dumps(value, ensure_ascii=False)) for value in values),
+                               dtype=np.uint32, count=len(values))
+        else:
+            data = np.array(values, dtype=_NUMPY_TYPES[kind])
+        columns.append({'path': list(path), 'kind': kind})
+        blocks.append((f"column_{position}", data.tobytes()))
+
+    # Sorted (normalized plate, position) pairs answer plate lookups with a binary search
+    plates = [normalize_license_plate(row.get('license_plate', '')).encode('utf-8') for row in rows]
+    plate_width = max((len(plate) for plate in plates), default=0) or 1
+    plate_keys = np.array(plates, dtype=f'S{plate_width}') if plates else np.zeros(0, dtype=f'S{plate_width}')
+    plate_order = np.argsort(plate_keys, kind='stable').astype(np.int64)
+    blocks.append(('plate_keys', plate_keys[plate_order].tobytes()))
+    blocks.append(('plate_positions', plate_order.tobytes()))
+
+    encoded = [string.encode('utf-8') for string in table.strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    blocks.append(('string_offsets', offsets.tobytes()))
+    blocks.append(('strings', b''.join(encoded)))
+
+    layout = {}
+    offset = 0
+    for name, data in blocks:
+        layout[name] = [offset, len(data)]
+        offset += len(data) + (-len(data) % _ALIGNMENT)
+
+    header = json.dumps({
+        'list_key': list_key,
+        'count': len(rows),
+        'source': signature,
+        'meta': {key: value for key, value in catalog.items() if key != list_key},
+        'shape': shape,
+        'columns': columns,
+        'plate_key_width': plate_width,
+        'indexed_plates': len({plate for plate in plates if plate}),
+        'blocks': layout
+    }, ensure_ascii=False).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + _LENGTH.size + len(header)) % _ALIGNMENT)
+
+    chunks = [MAGIC, _LENGTH.pack(len(header)), header]
+    for name, data in blocks:
+        chunks.append(data)
+        chunks.append(b'\0' * (-len(data) % _ALIGNMENT))
+    return chunks
+
+
+def write_catalog_snapshot(catalog_path: str, catalog: Dict, list_key: str = 'vehicles') -> bool:
+    """
+    Write the snapshot for a catalog that was just written to catalog_path
+
+    Args:
+        catalog_path: The catalog JSON file (already written; its signature is recorded)
+        catalog: The catalog data as written
+        list_key: Key of the row list in the catalog
+
+    Returns:
+        True if a snapshot was written; False if the rows cannot be stored
+        column-wise (any stale snapshot is removed so loaders use the JSON)
+    """
+    path = snapshot_path(catalog_path)
+    try:
+        chunks = _encode_catalog(catalog, list_key, source_signature(catalog_path))
+        if chunks is None:
+            logger.info(f"Catalog rows have differing layouts, not writing {path}")
+            remove_catalog_snapshot(catalog_path)
+            return False
+        write_bytes_atomic(path, chunks)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing catalog snapshot {path}: {e}")
+        remove_catalog_snapshot(catalog_path)
+        return False
+
+
+def remove_catalog_snapshot(catalog_path: str):
+    """Delete the snapshot for a catalog, if any"""
+    try:
+        os.remove(snapshot_path(catalog_path))
+    except OSError:
+        pass
+
+
+class SnapshotRows(Sequence):
+    """
+    Read-only list of catalog rows backed by snapshot columns
+
+    With cache_rows, rows are built on first access and then cached, so repeated
+    access returns the same row. Without it nothing is kept: every access decodes
+    a fresh row and iteration decodes chunk by chunk, so memory stays flat however
+    large the catalog is. column() returns a whole field at once without building
+    any rows.
+    """
+
+    def __init__(self, snapshot: 'CatalogSnapshot', cache_rows: bool = True):
+        self._snapshot = snapshot
+        self._rows = [None] * snapshot.count if cache_rows else None
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._snapshot.count))]
+        position = as_index(position)
+        if self._rows is None:
+            if position < 0:
+                position += self._snapshot.count
+            if not 0 <= position < self._snapshot.count:
+                raise IndexError('snapshot row index out of range')
+            return self._snapshot.build_row(position)
+        row = self._rows[position]
+        if row is None:
+            row = self._rows[position] = self._snapshot.build_row(position)
+        return row
+
+    def __iter__(self):
+        if self._rows is None:
+            return self._snapshot.iter_rows()
+        if any(row is None for row in self._rows):
+            self._rows = self._snapshot.build_rows(self._rows)
+        return iter(self._rows)
+
+    def column(self, *path: str) -> List:
+        """All values of one field in row order, e.g. column('driver', 'phone')"""
+        return self._snapshot.column(path)
+
+
+class CatalogSnapshot:
+    """A loaded snapshot file; see load()"""
+
+    def __init__(self, buffer, header: Dict, data_start: int, cache_rows: bool = True, row_type=None):
+        self.header = header
+        self.row_type = row_type
+        self.count = header['count']
+        self.source = header['source']
+        self.meta = header['meta']
+        self._buffer = buffer
+        self._data_start = data_start
+        self._columns = [(tuple(column['path']), column['kind']) for column in header['columns']]
+        self._template = _column_template(header['shape'], iter(range(len(self._columns))))
+        self._column_arrays = {}
+        self._column_values = {}
+        self._strings_start = data_start + header['blocks']['strings'][0]
+        self._offsets = self._block('string_offsets', np.int64)
+        self.rows = SnapshotRows(self, cache_rows)
+
+    @classmethod
+    def load(cls, catalog_path: str, signature: Optional[List] = None,
+             memory_map: bool = False, cache_rows: bool = True,
+             row_type=None) -> Optional['CatalogSnapshot']:
+        """
+        Load the snapshot for a catalog if it is fresh
+
+        Args:
+            catalog_path: The catalog JSON file
+            signature: The catalog's [generation, mtime_ns, size] if already known
+            memory_map: Map the file read-only instead of reading it. Pages come from
+                the page cache and are shared by every process mapping the same file;
+                the mapping stays valid when a sync replaces the file.
+            cache_rows: Keep rows once built (see SnapshotRows)
+            row_type: Record type (e.g. fleet_models.Vehicle) to build rows as instead of dicts
+
+        Returns:
+            The snapshot, or None if it is missing, unreadable or older than the JSON
+        """
+        path = snapshot_path(catalog_path)
+        if not os.path.exists(path):
+            return None
+        if signature is None:
+            signature = source_signature(catalog_path)
+        if signature is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if memory_map else f.read()
+            if buffer[:len(MAGIC)] != MAGIC:
+                logger.warning(f"Ignoring {path}: not a catalog snapshot")
+                return None
+            header_start = len(MAGIC) + _LENGTH.size
+            (header_length,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+            header = json.loads(buffer[header_start:header_start + header_length])
+            if header.get('source') != list(signature):
+                return None
+            return cls(buffer, header, header_start + header_length, cache_rows, row_type)
+        except Exception as e:
+            logger.error(f"Error loading catalog snapshot {path}: {e}")
+            return None
+
+    def _block(self, name: str, dtype) -> np.ndarray:
+        offset, length = self.header['blocks'][name]
+        return np.frombuffer(self._buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize,
+                             offset=self._data_start + offset)
+
+    def _string(self, string_id: int) -> str:
+        """Decode one string of the string table"""
+        start = self._strings_start + int(self._offsets[string_id])
+        end = self._strings_start + int(self._offsets[string_id + 1])
+        return self._buffer[start:end].decode('utf-8')
+
+    def _column_array(self, position: int) -> np.ndarray:
+        array = self._column_arrays.get(position)
+        if array is None:
+            array = self._column_arrays[position] = self._block(f"column_{position}",
+                                                                _NUMPY_TYPES[self._columns[position][1]])
+        return array
+
+    def _decode(self, position: int, raw) -> Any:
+        kind = self._columns[position][1]
+        if kind == 'int':
+            return int(raw)
+        if kind == 'float':
+            return float(raw)
+        value = self._string(raw)
+        return json.loads(value) if kind == 'json' else value
+
+    def _decode_column(self, position: int, start: int = 0, end: Optional[int] = None) -> List:
+        """Decoded Python values of rows start:end of one column"""
+        array = self._column_array(position)[start:end]
+        kind = self._columns[position][1]
+        if kind in ('int', 'float'):
+            return array.tolist()
+        if kind == 'json':
+            # Decoded per row: mutable values (lists) must not be shared between rows
+            return [self._decode(position, string_id) for string_id in array.tolist()]
+        # Each distinct string is decoded once and shared by every row using it
+        string_ids, inverse = np.unique(array, return_inverse=True)
+        starts = (self._offsets[string_ids] + self._strings_start).tolist()
+        ends = (self._offsets[string_ids + 1] + self._strings_start).tolist()
+        buffer = self._buffer
+        decoded = [buffer[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+        return list(map(decoded.__getitem__, inverse.tolist()))
+
+    def _column_list(self, position: int) -> List:
+        """Decoded Python values of one column (cached)"""
+        values = self._column_values.get(position)
+        if values is None:
+            values = self._column_values[position] = self._decode_column(position)
+        return values
+
+    def column(self, path: Tuple) -> List:
+        """All values of the leaf field at path, in row order"""
+        for position, (column_path, kind) in enumerate(self._columns):
+            if column_path == tuple(path):
+                return self._column_list(position)
+        raise KeyError(path)
+
+    def build_row(self, position: int) -> Dict:
+        """Build one row (a dict, or a row_type record) from the columns"""
+        values = [self._decode(column, self._column_array(column)[position].item())
+                  for column in range(len(self._columns))]
+        row = _assemble(self._template, values)
+        return self.row_type.from_dict(row) if self.row_type is not None else row
+
+    def build_rows(self, existing: List) -> List[Dict]:
+        """Build every row from whole decoded columns, keeping rows that were already built"""
+        # Only new containers are allocated here, none of them cyclic: pausing the
+        # collector avoids repeated full-heap passes while the rows are built
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Built a chunk at a time (see iter_rows): whole decoded columns were cached on
+            # the snapshot, and freeing such large temporaries leaves heap holes behind
+            return [row if row is not None else new_row for row, new_row in zip(existing, self.iter_rows())]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def iter_rows(self, chunk_rows: int = 4096):
+        """Yield freshly built rows in file order, decoding chunk_rows rows at a time"""
+        for start in range(0, self.count, chunk_rows):
+            end = min(start + chunk_rows, self.count)
+            columns = [self._decode_column(position, start, end) for position in range(len(self._columns))]
+            yield from _assemble_columns(self._template, columns, end - start, self.row_type)
+
+    def find_plate_positions(self, normalized_plate: str) -> List[int]:
+        """Row positions (in file order) whose normalized plate equals normalized_plate"""
+        if not normalized_plate:
+            return []
+        key = normalized_plate.encode('utf-8')
+        if len(key) > self.header['plate_key_width']:
+            return []
+        keys = self._block('plate_keys', f"S{self.header['plate_key_width']}")
+        start = np.searchsorted(keys, key, side='left')
+        end = np.searchsorted(keys, key, side='right')
+        return self._block('plate_positions', np.int64)[start:end].tolist()
+
+    @property
+    def indexed_plates(self) -> int:
+        return self.header['indexed_plates']
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+SQLite Fleet Datastore
+Optional SQLite copy of the fleet data (vehicles, drivers, maintenance records and
+faults) populated by the Excel sync. Lookups by license plate, vehicle id and date
+ranges are indexed queries instead of full JSON parses, and the database runs in
+WAL mode so readers keep working while a sync writes.
+
+Enabled with "datastore": {"backend": "sqlite"} in config/config.json. Each row
+keeps the exact dict the sync wrote (as JSON) next to the indexed columns, so
+callers get the same dicts they would get from the JSON files.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from src.core.fleet_models import Driver, FaultRecord, MaintenanceRecord, Vehicle
+from src.core.vehicle_repository import normalize_license_plate
+
+# Project root (two levels above src/core)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+DEFAULT_DATASTORE_PATH = os.path.join(project_root, 'data', 'fleet.db')
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS vehicles (
+    position INTEGER PRIMARY KEY,
+    vehicle_id TEXT,
+    license_plate TEXT,
+    plate_key TEXT,
+    make TEXT,
+    model TEXT,
+    status TEXT,
+    location TEXT,
+    driver_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_vehicles_plate_key ON vehicles (plate_key);
+CREATE INDEX IF NOT EXISTS idx_vehicles_vehicle_id ON vehicles (vehicle_id);
+
+CREATE TABLE IF NOT EXISTS drivers (
+    driver_id TEXT PRIMARY KEY,
+    name TEXT,
+    phone TEXT,
+    email TEXT,
+    license_number TEXT
+);
+
+CREATE TABLE IF NOT EXISTS maintenance_records (
+    position INTEGER PRIMARY KEY,
+    vehicle_id TEXT,
+    license_plate TEXT,
+    plate_key TEXT,
+    date TEXT,
+    type TEXT,
+    cost REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_plate_key ON maintenance_records (plate_key);
+CREATE INDEX IF NOT EXISTS idx_records_vehicle_id_date ON maintenance_records (vehicle_id, date);
+CREATE INDEX IF NOT EXISTS idx_records_date ON maintenance_records (date);
+
+CREATE TABLE IF NOT EXISTS faults (
+    position INTEGER PRIMARY KEY,
+    vehicle_id TEXT,
+    license_plate TEXT,
+    plate_key TEXT,
+    fault_type TEXT,
+    status TEXT,
+    repair_date TEXT,
+    repair_cost REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_faults_plate_key ON faults (plate_key);
+CREATE INDEX IF NOT EXISTS idx_faults_vehicle_id ON faults (vehicle_id);
+CREATE INDEX IF NOT EXISTS idx_faults_repair_date ON faults (repair_date);
+"""
+
+
+def load_datastore_config() -> Dict:
+    """Read the datastore section of config/config.json (empty if unavailable)"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('datastore', {})
+    except Exception as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+        return {}
+
+
+def _encode(item: Dict) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+
+
+def _vehicle_row(position: int, vehicle: Dict) -> tuple:
+    driver = vehicle.get('driver') or {}
+    return (position, vehicle.get('id'), vehicle.get('license_plate'),
+            normalize_license_plate(vehicle.get('license_plate', '')), vehicle.get('make'), vehicle.get('model'),
+            vehicle.get('status'), vehicle.get('location'), driver.get('id'), _encode(vehicle))
+
+
+def _record_row(position: int, record: Dict) -> tuple:
+    return (position, record.get('vehicle_id'), record.get('license_plate'),
+            normalize_license_plate(record.get('license_plate', '')), record.get('date'), record.get('type'),
+            record.get('cost'), _encode(record))
+
+
+def _fault_row(position: int, fault: Dict) -> tuple:
+    return (position, fault.get('vehicle_id'), fault.get('license_plate'),
+            normalize_license_plate(fault.get('license_plate', '')), fault.get('fault_type'), fault.get('status'),
+            fault.get('repair_date'), fault.get('repair_cost'), _encode(fault))
+
+
+def _incremental_positions(changes: Optional[Dict], stored_sync_id: Optional[str]) -> Optional[List[int]]:
+    """
+    Positions to rewrite when a sync's changes apply on top of what the table holds
+
+    Returns None when the table must be rewritten in full (no change set, a full
+    sync, moved rows, or the table was written by a different sync than the base).
+    """
+    if (not changes or changes.get('full') or not changes.get('same_layout')
+            or stored_sync_id is None or changes.get('base_sync_id') != stored_sync_id):
+        return None
+    return changes.get('changed_positions')
+
+
+class FleetDatastore:
+    """
+    SQLite store for the fleet data
+
+    Offers the same read methods as VehicleRepository (get_vehicles,
+    find_vehicle_by_license_plate, get_maintenance_records_for_plate, refresh,
+    get_status) plus indexed queries by vehicle id, driver and date range.
+    Connections are per thread (and per process after a fork).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DATASTORE_PATH):
+        """
+        Initialize the datastore, creating the database and schema if needed.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._cache = {}
+        self._cache_generation = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # Autocommit mode: writes open explicit transactions (see _transaction)
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction; readers keep seeing the previous commit until it ends"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        return self._connection().execute(sql, parameters).fetchall()
+
+    def _items(self, row_type, sql: str, parameters: tuple = ()) -> List:
+        """Run a query selecting the data column and load its rows as row_type records"""
+        return [row_type.from_dict(json.loads(data)) for (data,) in self._query(sql, parameters)]
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        rows = self._query('SELECT value FROM meta WHERE key = ?', (key,))
+        return rows[0][0] if rows else None
+
+    @staticmethod
+    def _set_meta(connection: sqlite3.Connection, key: str, value: Any):
+        connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                           (key, None if value is None else str(value)))
+
+    @staticmethod
+    def _bump_generation(connection: sqlite3.Connection):
+        connection.execute("INSERT INTO meta (key, value) VALUES ('generation', '1') "
+                           "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    def get_generation(self) -> int:
+        """Counter bumped by every write; changes whenever the data changes"""
+        return int(self._get_meta('generation') or 0)
+
+    def get_sync_id(self, table: str) -> Optional[str]:
+        """Id of the Excel sync whose data a table ('vehicles' or 'maintenance_records') holds"""
+        return self._get_meta(f"{table}_sync_id")
+
+    def is_populated(self) -> bool:
+        """True once a sync has written the vehicles"""
+        return self.get_sync_id('vehicles') is not None
+
+    def write_vehicles(self, vehicles: List[Dict], changes: Optional[Dict], sync_id: Optional[str]):
+        """
+        Store the vehicle catalog and rebuild the drivers table
+
+        Args:
+            vehicles: The full catalog, in file order
+            changes: The sync's changes block; only the changed rows are rewritten
+                when it applies on top of what the table holds
+            sync_id: Sync id recorded for the table
+        """
+        positions = _incremental_positions(changes, self.get_sync_id('vehicles'))
+        with self._transaction() as connection:
+            if positions is None:
+                connection.execute('DELETE FROM vehicles')
+                positions = range(len(vehicles))
+            connection.executemany('INSERT OR REPLACE INTO vehicles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (_vehicle_row(position, vehicles[position]) for position in positions))
+
+            # First vehicle listing a driver id wins, in catalog order
+            drivers = {}
+            for vehicle in vehicles:
+                driver = vehicle.get('driver') or {}
+                if driver.get('id') and driver['id'] not in drivers:
+                    drivers[driver['id']] = (driver['id'], driver.get('name'), driver.get('phone'),
+                                             driver.get('email'), driver.get('license_number'))
+            connection.execute('DELETE FROM drivers')
+            connection.executemany('INSERT INTO drivers VALUES (?, ?, ?, ?, ?)', drivers.values())
+
+            self._set_meta(connection, 'vehicles_sync_id', sync_id)
+            self._bump_generation(connection)
+        logger.info(f"Datastore: stored {len(vehicles)} vehicles ({len(positions)} rows written)")
+
+    def write_maintenance(self, records: List[Dict], row_faults: List[Optional[Dict]],
+                          changes: Optional[Dict], sync_id: Optional[str]):
+        """
+        Store the maintenance records and their faults
+
+        Args:
+            records: All maintenance records, in file order
+            row_faults: Fault record or None per maintenance record
+            changes: The sync's changes block (see write_vehicles)
+            sync_id: Sync id recorded for the tables
+        """
+        positions = _incremental_positions(changes, self.get_sync_id('maintenance_records'))
+        with self._transaction() as connection:
+            if positions is None:
+                connection.execute('DELETE FROM maintenance_records')
+                connection.execute('DELETE FROM faults')
+                positions = range(len(records))
+            else:
+                connection.executemany('DELETE FROM faults WHERE position = ?',
+                                       ((position,) for position in positions))
+            connection.executemany('INSERT OR REPLACE INTO maintenance_records VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (_record_row(position, records[position]) for position in positions))
+            connection.executemany('INSERT INTO faults VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   (_fault_row(position, row_faults[position]) for position in positions
+                                    if position < len(row_faults) and row_faults[position]))
+
+            self._set_meta(connection, 'maintenance_records_sync_id', sync_id)
+            self._bump_generation(connection)
+        logger.info(f"Datastore: stored {len(records)} maintenance records ({len(positions)} rows written)")
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Drop cached full-table reads if a sync wrote since they were made
+
+        Returns:
+            True if the data changed since the last refresh
+        """
+        generation = self.get_generation()
+        with self._cache_lock:
+            changed = generation != self._cache_generation
+            if changed:
+                self._cache = {}
+                self._cache_generation = generation
+        return changed
+
+    def _cached(self, name: str, loader) -> List:
+        """Full-table reads are cached until the next write"""
+        self.refresh()
+        with self._cache_lock:
+            items = self._cache.get(name)
+        if items is None:
+            items = loader()
+            with self._cache_lock:
+                self._cache[name] = items
+        return items
+
+    def get_vehicles(self) -> List[Vehicle]:
+        """Get all vehicles in catalog order"""
+        return self._cached('vehicles', lambda: self._items(Vehicle, 'SELECT data FROM vehicles ORDER BY position'))
+
+    def get_maintenance_records(self) -> List[MaintenanceRecord]:
+        """Get all maintenance records in file order"""
+        return self._cached('records', lambda: self._items(MaintenanceRecord,
+                                                           'SELECT data FROM maintenance_records ORDER BY position'))
+
+    def find_vehicle_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
+        """First catalog vehicle with the plate, ignoring dashes, spaces and case"""
+        items = self._items(Vehicle, 'SELECT data FROM vehicles WHERE plate_key = ? ORDER BY position LIMIT 1',
+                            (normalize_license_plate(license_plate),))
+        return items[0] if items else None
+
+    def get_maintenance_records_for_plate(self, license_plate: str) -> List[MaintenanceRecord]:
+        """Get all maintenance records for a license plate, in file order"""
+        return self._items(MaintenanceRecord,
+                           'SELECT data FROM maintenance_records WHERE plate_key = ? ORDER BY position',
+                           (normalize_license_plate(license_plate),))
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get datastore status for health output"""
+        counts = {table: self._query(f'SELECT COUNT(*) FROM {table}')[0][0]
+                  for table in ('vehicles', 'drivers', 'maintenance_records', 'faults')}
+        return {
+            'backend': 'sqlite',
+            'path': self.db_path,
+            'loaded': self.is_populated(),
+            'generation': self.get_generation(),
+            'vehicle_count': counts['vehicles'],
+            'driver_count': counts['drivers'],
+            'maintenance_record_count': counts['maintenance_records'],
+            'fault_count': counts['faults'],
+            'vehicles_sync_id': self.get_sync_id('vehicles'),
+            'maintenance_records_sync_id': self.get_sync_id('maintenance_records')
+        }
+
+    def get_vehicle(self, vehicle_id: str) -> Optional[Vehicle]:
+        """First catalog vehicle with the given id"""
+        items = self._items(Vehicle, 'SELECT data FROM vehicles WHERE vehicle_id = ? ORDER BY position LIMIT 1',
+                            (vehicle_id,))
+        return items[0] if items else None
+
+    def get_driver(self, driver_id: str) -> Optional[Driver]:
+        """Driver details by driver id"""
+        rows = self._query('SELECT driver_id, name, phone, email, license_number FROM drivers WHERE driver_id = ?',
+                           (driver_id,))
+        if not rows:
+            return None
+        return Driver.from_dict(dict(zip(('id', 'name', 'phone', 'email', 'license_number'), rows[0])))
+
+    def get_vehicles_for_driver(self, driver_id: str) -> List[Vehicle]:
+        """Vehicles assigned to a driver, in catalog order"""
+        return self._items(Vehicle, 'SELECT data FROM vehicles WHERE driver_id = ? ORDER BY position', (driver_id,))
+
+    def get_maintenance_history(self, vehicle_id: str) -> List[MaintenanceRecord]:
+        """A vehicle's maintenance records, newest first (file order on equal dates)"""
+        return self._items(MaintenanceRecord, 'SELECT data FROM maintenance_records WHERE vehicle_id = ? '
+                           'ORDER BY date DESC, position', (vehicle_id,))
+
+    def get_maintenance_records_between(self, start_date: str, end_date: str,
+                                        license_plate: Optional[str] = None) -> List[MaintenanceRecord]:
+        """
+        Maintenance records dated within [start_date, end_date], oldest first
+
+        Args:
+            start_date: First date (YYYY-MM-DD; compared as text like the stored dates)
+            end_date: Last date, inclusive (a bare date includes that whole day)
+            license_plate: Only records for this plate
+        """
+        sql = 'SELECT data FROM maintenance_records WHERE date >= ? AND date <= ?'
+        parameters = (start_date, f"{end_date}\uffff")
+        if license_plate:
+            sql += ' AND plate_key = ?'
+            parameters += (normalize_license_plate(license_plate),)
+        return self._items(MaintenanceRecord, sql + ' ORDER BY date, position', parameters)
+
+    def get_faults(self, license_plate: Optional[str] = None,
+                   status: Optional[str] = None) -> List[FaultRecord]:
+        """Fault records, optionally for one plate and/or with one status, in file order"""
+        clauses = []
+        parameters = ()
+        if license_plate:
+            clauses.append('plate_key = ?')
+            parameters += (normalize_license_plate(license_plate),)
+        if status:
+            clauses.append('status = ?')
+            parameters += (status,)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self._items(FaultRecord, f'SELECT data FROM faults{where} ORDER BY position', parameters)
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+_datastore = None
+_datastore_lock = threading.Lock()
+
+
+def get_fleet_datastore() -> Optional[FleetDatastore]:
+    """
+    Get the process-wide datastore when config selects the sqlite backend
+
+    Returns:
+        The datastore, or None if the backend is not sqlite or the database cannot be opened
+    """
+    global _datastore
+    if _datastore is None:
+        datastore_config = load_datastore_config()
+        if datastore_config.get('backend', 'json') != 'sqlite':
+            return None
+        with _datastore_lock:
+            if _datastore is None:
+                path = datastore_config.get('path') or DEFAULT_DATASTORE_PATH
+                if not os.path.isabs(path):
+                    path = os.path.join(project_root, path)
+                try:
+                    _datastore = FleetDatastore(path)
+                except sqlite3.Error as e:
+                    logger.error(f"Could not open datastore {path}: {e}")
+                    return None
+    return _datastore
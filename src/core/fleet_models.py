@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Fleet Record Types
+Compact record types for vehicles, drivers and maintenance/fault records, built
+once when the data is loaded. Each type is a slotted dataclass, so an instance
+stores only its field values instead of a dict repeating every key. Categorical
+strings (status, fuel type, service type, make, dates, ...) are interned, so all
+records with the same value share one string object.
+
+The types keep the read-only mapping interface the code used with plain dicts
+(get(), [], in, keys()) and compare equal to the dict they were built from;
+to_dict() returns that dict, including keys outside the known fields. Records
+are shared by every reader of a loaded file: treat them as read-only.
+"""
+
+import gc
+import sys
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Missing:
+    """Marks a known field that was absent from the source dict"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<missing>'
+
+    def __reduce__(self):
+        # Unpickles to the module's single instance
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic collector while many new, acyclic objects are allocated"""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+class _Record:
+    """Mapping-style read access and bulk construction shared by the record types"""
+
+    __slots__ = ()
+
+    # Set per type: field names in dict order (by _record_type), interned and nested fields
+    _keys: Tuple[str, ...] = ()
+    _key_set: frozenset = frozenset()
+    _interned: frozenset = frozenset()
+    _nested: Dict[str, type] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> '_Record':
+        """Build one record from a loaded dict (keys outside the known fields go to extra)"""
+        values = []
+        for key in cls._keys:
+            value = data.get(key, MISSING)
+            nested = cls._nested.get(key)
+            if nested is not None and type(value) is dict:
+                value = nested.from_dict(value)
+            elif key in cls._interned and type(value) is str:
+                value = sys.intern(value)
+            values.append(value)
+        key_set = cls._key_set
+        extra = None if data.keys() <= key_set else {key: value for key, value in data.items() if key not in key_set}
+        return cls(*values, extra)
+
+    @classmethod
+    def from_columns(cls, names: List[str], columns: List[List], count: int) -> List['_Record']:
+        """
+        Build records from whole columns (e.g. decoded catalog snapshot columns)
+
+        Args:
+            names: Field name of each column
+            columns: Column values in row order; nested fields already hold records
+            count: Number of rows
+
+        Returns:
+            One record per row, in order
+        """
+        by_name = dict(zip(names, columns))
+        extra_names = [name for name in names if name not in cls._key_set]
+        if extra_names:
+            extras = [dict(zip(extra_names, values)) for values in zip(*(by_name[name] for name in extra_names))]
+        else:
+            extras = [None] * count
+        missing = [MISSING] * count
+        with _gc_paused():
+            return list(map(cls, *(by_name.get(key, missing) for key in cls._keys), extras))
+
+    @classmethod
+    def nested_type(cls, key: str) -> Optional[type]:
+        """Record type of a nested field (e.g. Vehicle.nested_type('driver') is Driver), or None"""
+        return cls._nested.get(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._key_set:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        present = [key for key in self._keys if getattr(self, key) is not MISSING]
+        return present + list(self.extra or ())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The plain dict this record was built from (nested records included)"""
+        data = {}
+        for key in self._keys:
+            value = getattr(self, key)
+            if value is MISSING:
+                continue
+            data[key] = value.to_dict() if isinstance(value, _Record) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other) -> bool:
+        if type(other) is type(self):
+            return (self.extra == other.extra and
+                    [getattr(self, key) for key in self._keys] == [getattr(other, key) for key in self._keys])
+        if isinstance(other, (_Record, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, _Record) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def _record_type(cls):
+    """Make a slotted dataclass of cls and record its field names"""
+    cls = dataclass(slots=True, eq=False)(cls)
+    cls._keys = tuple(field.name for field in fields(cls) if field.name != 'extra')
+    cls._key_set = frozenset(cls._keys)
+    return cls
+
+
+@_record_type
+class Driver(_Record):
+    """Driver assigned to a vehicle"""
+
+    name: Any = MISSING
+    id: Any = MISSING
+    phone: Any = MISSING
+    email: Any = MISSING
+    license_number: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_record_type
+class Specifications(_Record):
+    """Vehicle specifications"""
+
+    _interned = frozenset({'color', 'engine', 'transmission', 'fuel_type'})
+
+    color: Any = MISSING
+    engine: Any = MISSING
+    transmission: Any = MISSING
+    fuel_type: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_record_type
+class Insurance(_Record):
+    """Vehicle insurance policy"""
+
+    _interned = frozenset({'provider', 'expiry_date'})
+
+    provider: Any = MISSING
+    policy_number: Any = MISSING
+    expiry_date: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_record_type
+class Vehicle(_Record):
+    """Catalog vehicle (large_vehicle_catalog.json)"""
+
+    _interned = frozenset({'make', 'model', 'type', 'category', 'status', 'location', 'last_updated'})
+    _nested = {'driver': Driver, 'specifications': Specifications, 'insurance': Insurance}
+
+    id: Any = MISSING
+    license_plate: Any = MISSING
+    vin: Any = MISSING
+    make: Any = MISSING
+    model: Any = MISSING
+    year: Any = MISSING
+    type: Any = MISSING
+    category: Any = MISSING
+    status: Any = MISSING
+    location: Any = MISSING
+    driver: Any = MISSING
+    specifications: Any = MISSING
+    insurance: Any = MISSING
+    last_updated: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_record_type
+class MaintenanceRecord(_Record):
+    """Maintenance record (maintenance_records.json)"""
+
+    _interned = frozenset({'driver_name', 'date', 'type', 'status', 'provider', 'next_service', 'created_at'})
+
+    vehicle_id: Any = MISSING
+    license_plate: Any = MISSING
+    driver_name: Any = MISSING
+    date: Any = MISSING
+    type: Any = MISSING
+    description: Any = MISSING
+    cost: Any = MISSING
+    status: Any = MISSING
+    provider: Any = MISSING
+    mileage: Any = MISSING
+    next_service: Any = MISSING
+    created_at: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_record_type
+class FaultRecord(_Record):
+    """Fault record (fault_reports.json)"""
+
+    _interned = frozenset({'driver_name', 'fault_type', 'fault_severity', 'repair_date', 'status',
+                           'reported_by', 'created_at'})
+
+    vehicle_id: Any = MISSING
+    license_plate: Any = MISSING
+    driver_name: Any = MISSING
+    fault_type: Any = MISSING
+    fault_severity: Any = MISSING
+    description: Any = MISSING
+    repair_cost: Any = MISSING
+    repair_date: Any = MISSING
+    status: Any = MISSING
+    reported_by: Any = MISSING
+    created_at: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+def _plain(value: Any) -> Any:
+    """A copy of a parsed JSON value with every record turned back into a dict"""
+    if isinstance(value, _Record):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def load_records(f, list_key: str, row_type: type) -> Tuple[List, Dict]:
+    """
+    Parse a JSON data file, building its rows as records while it is parsed
+
+    Each row is converted as soon as the parser finishes it, so the full set of
+    row dicts never exists at once and the records are packed together in memory.
+    The parser recognizes rows by their license_plate key. Only the items of the
+    row list become records: if any other object carried the key, the document
+    is turned back into plain dicts and the rows are converted afterwards.
+
+    Args:
+        f: Open data file
+        list_key: Key of the row list ('vehicles', 'records', 'faults')
+        row_type: Record type of the rows
+
+    Returns:
+        Tuple of (the rows as records, the parsed document)
+    """
+    converted = 0
+
+    def convert(item: Dict) -> Any:
+        nonlocal converted
+        if 'license_plate' not in item:
+            return item
+        converted += 1
+        return row_type.from_dict(item)
+
+    with _gc_paused():
+        data = json.load(f, object_hook=convert)
+        items = data.get(list_key, [])
+        if converted != sum(1 for row in items if type(row) is row_type):
+            data = _plain(data)
+            items = data.get(list_key, [])
+        rows = [row if type(row) is row_type else row_type.from_dict(row) for row in items]
+        if list_key in data:
+            data[list_key] = rows
+    return rows, data
+
+
+def json_default(value: Any) -> Any:
+    """
+    json.dumps default= hook: records serialize as the dicts they were built from
+
+    Dates and datetimes serialize in ISO format. Anything else raises TypeError,
+    as json.dumps does without a hook.
+    """
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Columnar Maintenance Record Store
+NumPy-backed columns (dates, costs, service type codes) built once per data load,
+so fleet statistics are array reductions instead of per-record Python loops.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+NAT_DAY = np.datetime64('NaT', 'D')
+
+
+def parse_record_dates(date_strings: List[Any]) -> np.ndarray:
+    """
+    Parse 'YYYY-MM-DD' strings into a datetime64[D] array
+
+    Values that datetime.strptime rejects (empty, other formats) become NaT.
+    Each distinct string is parsed once; fleets repeat dates heavily.
+    """
+    parsed = {}
+    for value in set(date_strings):
+        try:
+            parsed[value] = np.datetime64(datetime.strptime(value, '%Y-%m-%d').date(), 'D')
+        except (TypeError, ValueError):
+            parsed[value] = NAT_DAY
+    return np.array([parsed[value] for value in date_strings], dtype='datetime64[D]')
+
+
+def encode_categories(values: List[Any]) -> tuple:
+    """
+    Encode values as categorical codes
+
+    Returns:
+        Tuple of (categories list in first-seen order, int32 code array)
+    """
+    lookup = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values),
+                        dtype=np.int32, count=len(values))
+    categories = [None] * len(lookup)
+    for value, code in lookup.items():
+        categories[code] = value
+    return categories, codes
+
+
+def _to_cost(value: Any) -> float:
+    """Convert a record cost to float, treating missing or malformed values as 0"""
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def first_day_on_or_after(moment: datetime) -> np.datetime64:
+    """Return the first calendar day whose midnight is >= moment"""
+    instant = np.datetime64(moment, 'us')
+    day = instant.astype('datetime64[D]')
+    return day if day >= instant else day + np.timedelta64(1, 'D')
+
+
+class MaintenanceColumns:
+    """
+    Column-oriented view of maintenance records
+
+    Attributes:
+        dates: datetime64[D] service dates (NaT where unparseable)
+        costs: float64 service costs
+        service_types: Category values (record 'type', None when missing)
+        service_codes: int32 index into service_types per record
+    """
+
+    def __init__(self, records: List[Dict]):
+        count = len(records)
+        self.record_count = count
+        self.dates = parse_record_dates([record.get('date', '') for record in records])
+        self.costs = np.fromiter((_to_cost(record.get('cost', 0.0)) for record in records),
+                                 dtype=np.float64, count=count)
+        self.service_types, self.service_codes = encode_categories([record.get('type') for record in records])
+
+        # Date-sorted prefix sums turn "cost since day X" into a binary search
+        valid = ~np.isnat(self.dates)
+        order = np.argsort(self.dates[valid], kind='stable')
+        self._sorted_dates = self.dates[valid][order]
+        self._cost_prefix = np.concatenate(([0.0], np.cumsum(self.costs[valid][order])))
+
+        # Service frequencies never change between loads
+        self.service_counts = np.bincount(self.service_codes, minlength=len(self.service_types))
+
+    def total_cost_since(self, moment: datetime) -> float:
+        """Sum the cost of records dated on or after moment (records are at midnight)"""
+        start = np.searchsorted(self._sorted_dates, first_day_on_or_after(moment), side='left')
+        return float(self._cost_prefix[-1] - self._cost_prefix[start])
+
+    def most_common_service(self) -> Optional[str]:
+        """Most frequent non-empty service type, or None if no record has one"""
+        counts = self.service_counts.copy()
+        for code, service_type in enumerate(self.service_types):
+            if not service_type:
+                counts[code] = 0
+        if counts.size == 0 or counts.max() == 0:
+            return None
+        return self.service_types[int(np.argmax(counts))]
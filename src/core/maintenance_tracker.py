@@ -5,14 +5,24 @@ Handles maintenance scheduling, tracking, cost analysis, and reporting.
 Integrates with vehicle data and maintenance records.
 """
 
-import json
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import os
+import sys
 
-@dataclass
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.core.maintenance_columns import MaintenanceColumns
+from src.core.catalog_snapshot import CatalogSnapshot, SnapshotRows
+from src.core.fleet_models import MaintenanceRecord, Vehicle, load_records
+
+@dataclass(slots=True)
 class MaintenanceAlert:
     """Maintenance alert data structure"""
     vehicle_id: str
@@ -27,7 +37,7 @@ class MaintenanceAlert:
     estimated_cost: float
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class MaintenanceStats:
     """Maintenance statistics data structure"""
     total_vehicles: int
@@ -40,21 +50,115 @@ class MaintenanceStats:
     most_common_service: str
     maintenance_frequency: float
 
+# Alert type / priority codes used by the batch alert computation
+ALERT_TYPES = ('overdue', 'due', 'upcoming')
+ALERT_PRIORITIES = ('critical', 'high', 'medium')
+NO_RECORDS_DESCRIPTION = 'No maintenance records found - general inspection recommended'
+
+class MaintenanceAlertBatch:
+    """
+    Fleet-wide maintenance alerts held as arrays
+    MaintenanceAlert objects are only built when an alert is accessed
+    """
+    
+    def __init__(self, vehicles: List[Vehicle], positions: np.ndarray, alert_codes: np.ndarray,
+                 priority_codes: np.ndarray, days_until_due: np.ndarray, last_dates: np.ndarray,
+                 next_dates: np.ndarray, service_types: List[str], service_costs: Dict[str, float],
+                 current_date: datetime):
+        self._vehicles = vehicles
+        self.positions = positions
+        self.alert_codes = alert_codes
+        self.priority_codes = priority_codes
+        self.days_until_due = days_until_due
+        self.last_dates = last_dates
+        self.next_dates = next_dates
+        self._service_types = service_types
+        self._service_costs = service_costs
+        self._current_date = current_date
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def __getitem__(self, index: int) -> MaintenanceAlert:
+        vehicle = self._vehicles[self.positions[index]]
+        service_type = self._service_types[index]
+        
+        if np.isnat(self.last_dates[index]):
+            # No maintenance records - recommend general inspection
+            return MaintenanceAlert(
+                vehicle_id=vehicle.get('id'),
+                vehicle_name=vehicle.get('name', 'Unknown'),
+                license_plate=vehicle.get('license_plate', 'N/A'),
+                alert_type='due',
+                days_until_due=0,
+                last_service_date='Never',
+                next_service_date=self._current_date.strftime('%Y-%m-%d'),
+                service_type=service_type,
+                priority='high',
+                estimated_cost=self._service_costs.get(service_type, 150.0),
+                description=NO_RECORDS_DESCRIPTION
+            )
+        
+        days_until_due = int(self.days_until_due[index])
+        return MaintenanceAlert(
+            vehicle_id=vehicle.get('id'),
+            vehicle_name=vehicle.get('name', 'Unknown'),
+            license_plate=vehicle.get('license_plate', 'N/A'),
+            alert_type=ALERT_TYPES[self.alert_codes[index]],
+            days_until_due=days_until_due,
+            last_service_date=str(self.last_dates[index]),
+            next_service_date=str(self.next_dates[index]),
+            service_type=service_type,
+            priority=ALERT_PRIORITIES[self.priority_codes[index]],
+            estimated_cost=self._service_costs.get(service_type, 150.0),
+            description=f"{service_type.replace('_', ' ').title()} due in {abs(days_until_due)} days"
+        )
+    
+    def __iter__(self):
+        for index in range(len(self.positions)):
+            yield self[index]
+    
+    def count(self, alert_type: str) -> int:
+        """Count alerts of one type without materializing them"""
+        return int(np.count_nonzero(self.alert_codes == ALERT_TYPES.index(alert_type)))
+    
+    def iter_alerts(self, alert_types: List[str]):
+        """Materialize only the alerts whose type is in alert_types"""
+        codes = [ALERT_TYPES.index(alert_type) for alert_type in alert_types]
+        for index in np.flatnonzero(np.isin(self.alert_codes, codes)):
+            yield self[index]
+
 class MaintenanceTracker:
     """
     Maintenance Tracker for fleet maintenance management
     Handles scheduling, tracking, cost analysis, and reporting
     """
     
-    def __init__(self, maintenance_records_path: str, vehicle_catalog_path: str):
+    def __init__(self, maintenance_records_path: str, vehicle_catalog_path: str, datastore=None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            maintenance_records_path: Path to the maintenance records JSON
+            vehicle_catalog_path: Path to the vehicle catalog JSON
+            datastore: FleetDatastore to query instead of the JSON files; per-vehicle
+                lookups then use its indexes instead of loading the whole fleet
+        """
         self.logger = logging.getLogger(__name__)
         self.maintenance_records_path = maintenance_records_path
         self.vehicle_catalog_path = vehicle_catalog_path
+        self.datastore = datastore
         
         # Data caches
         self._maintenance_records_cache = None
         self._vehicles_cache = None
         
+        # Indexes built once per data load (see _build_indexes)
+        self._vehicles_by_id = None
+        self._history_by_vehicle_id = None
+        self._record_columns = None
+        self._fleet_latest_rows = None
+        
         # Maintenance intervals (in days)
         self.maintenance_intervals = {
             'oil_change': 90,
@@ -79,35 +183,146 @@ class MaintenanceTracker:
         
         self.logger.info("Maintenance Tracker initialized")
     
-    def _load_maintenance_records(self) -> List[Dict]:
-        """Load maintenance records from JSON file"""
+    def _load_maintenance_records(self) -> List[MaintenanceRecord]:
+        """Load maintenance records from the datastore or the JSON file"""
         if self._maintenance_records_cache is not None:
             return self._maintenance_records_cache
+        
+        if self.datastore is not None:
+            self._cache_maintenance_records(self.datastore.get_maintenance_records())
+            return self._maintenance_records_cache
             
         try:
             with open(self.maintenance_records_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._maintenance_records_cache = data.get('records', [])
-                return self._maintenance_records_cache
+                records, _ = load_records(f, 'records', MaintenanceRecord)
+            self._cache_maintenance_records(records)
+            return self._maintenance_records_cache
         except Exception as e:
             self.logger.error(f"Error loading maintenance records: {e}")
             return []
     
-    def _load_vehicles(self) -> List[Dict]:
-        """Load vehicle catalog from JSON file"""
+    def _cache_maintenance_records(self, records: List[MaintenanceRecord]):
+        """
+        Cache freshly loaded records and build their columnar view with them
+        
+        The columns are part of the data load, so the first statistics or
+        alerts query after a reload does not pay for building them.
+        """
+        self._record_columns = MaintenanceColumns(records)
+        self._maintenance_records_cache = records
+    
+    def _load_vehicles(self) -> List[Vehicle]:
+        """Load vehicle catalog from the datastore, its compact snapshot or the JSON file"""
         if self._vehicles_cache is not None:
             return self._vehicles_cache
+        
+        if self.datastore is not None:
+            self._vehicles_cache = self.datastore.get_vehicles()
+            return self._vehicles_cache
+        
+        snapshot = CatalogSnapshot.load(self.vehicle_catalog_path, row_type=Vehicle)
+        if snapshot is not None:
+            self._vehicles_cache = snapshot.rows
+            return self._vehicles_cache
             
         try:
             with open(self.vehicle_catalog_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._vehicles_cache = data.get('vehicles', [])
+                self._vehicles_cache, _ = load_records(f, 'vehicles', Vehicle)
                 return self._vehicles_cache
         except Exception as e:
             self.logger.error(f"Error loading vehicle catalog: {e}")
             return []
     
-    def get_vehicle_maintenance_history(self, vehicle_id: str) -> List[Dict]:
+    def _vehicle_ids(self) -> List:
+        """Vehicle IDs in catalog order, read from the snapshot column without building vehicles"""
+        vehicles = self._load_vehicles()
+        if isinstance(vehicles, SnapshotRows):
+            try:
+                return vehicles.column('id')
+            except KeyError:
+                return [None] * len(vehicles)
+        return [vehicle.get('id') for vehicle in vehicles]
+    
+    def _build_indexes(self):
+        """
+        Build vehicle_id lookups for the loaded data
+        
+        Maps vehicle_id -> catalog position of the first vehicle with that id, and
+        vehicle_id -> records sorted by date (newest first). Built once per
+        data load so per-vehicle queries no longer scan the whole dataset.
+        """
+        vehicles_by_id = {}
+        for position, vehicle_id in enumerate(self._vehicle_ids()):
+            if vehicle_id and vehicle_id not in vehicles_by_id:
+                vehicles_by_id[vehicle_id] = position
+        
+        history_by_vehicle_id = {}
+        for record in self._load_maintenance_records():
+            history_by_vehicle_id.setdefault(record.get('vehicle_id'), []).append(record)
+        
+        # Stable sort keeps file order for records on the same date
+        for records in history_by_vehicle_id.values():
+            records.sort(key=lambda x: x.get('date', ''), reverse=True)
+        
+        self._vehicles_by_id = vehicles_by_id
+        self._history_by_vehicle_id = history_by_vehicle_id
+    
+    def _get_record_columns(self) -> MaintenanceColumns:
+        """Get the columnar view of the maintenance records (built by the data load)"""
+        if self._record_columns is None:
+            self._load_maintenance_records()
+        return self._record_columns if self._record_columns is not None else MaintenanceColumns([])
+    
+    def _get_fleet_latest_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-vehicle latest record, built once per data load
+        
+        Returns:
+            Tuple of (catalog positions of vehicles with an ID, row of each
+            vehicle's latest record in the record columns or -1 if it has none)
+        """
+        if self._fleet_latest_rows is None:
+            records = self._load_maintenance_records()
+            latest_row_by_id = {}
+            latest_date_by_id = {}
+            # Newest date wins; on equal dates the first record in file order wins,
+            # matching the head of get_vehicle_maintenance_history
+            for row, record in enumerate(records):
+                vehicle_id = record.get('vehicle_id')
+                date = record.get('date', '')
+                if vehicle_id not in latest_row_by_id or date > latest_date_by_id[vehicle_id]:
+                    latest_row_by_id[vehicle_id] = row
+                    latest_date_by_id[vehicle_id] = date
+            
+            positions = []
+            rows = []
+            for position, vehicle_id in enumerate(self._vehicle_ids()):
+                if not vehicle_id:
+                    continue
+                positions.append(position)
+                rows.append(latest_row_by_id.get(vehicle_id, -1))
+            
+            self._fleet_latest_rows = (np.array(positions, dtype=np.int64), np.array(rows, dtype=np.int64))
+        return self._fleet_latest_rows
+    
+    def _get_vehicle(self, vehicle_id: str) -> Optional[Vehicle]:
+        """Get the first vehicle with the given ID"""
+        if self.datastore is not None:
+            return self.datastore.get_vehicle(vehicle_id)
+        if self._vehicles_by_id is None:
+            self._build_indexes()
+        position = self._vehicles_by_id.get(vehicle_id)
+        return self._load_vehicles()[position] if position is not None else None
+    
+    def _get_history(self, vehicle_id: str) -> List[MaintenanceRecord]:
+        """Get the shared, date-sorted record list for a vehicle (do not modify)"""
+        if self.datastore is not None:
+            return self.datastore.get_maintenance_history(vehicle_id)
+        if self._history_by_vehicle_id is None:
+            self._build_indexes()
+        return self._history_by_vehicle_id.get(vehicle_id, [])
+    
+    def get_vehicle_maintenance_history(self, vehicle_id: str) -> List[MaintenanceRecord]:
         """
         Get maintenance history for a specific vehicle
         
@@ -120,13 +335,7 @@ class MaintenanceTracker:
         if not vehicle_id:
             return []
         
-        maintenance_records = self._load_maintenance_records()
-        vehicle_records = [record for record in maintenance_records 
-                          if record.get('vehicle_id') == vehicle_id]
-        
-        # Sort by date (newest first)
-        vehicle_records.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return vehicle_records
+        return list(self._get_history(vehicle_id))
     
     def get_vehicle_maintenance_status(self, vehicle_id: str) -> Dict[str, Any]:
         """
@@ -141,13 +350,12 @@ class MaintenanceTracker:
         if not vehicle_id:
             return {}
         
-        vehicles = self._load_vehicles()
-        vehicle = next((v for v in vehicles if v.get('id') == vehicle_id), None)
+        vehicle = self._get_vehicle(vehicle_id)
         
         if not vehicle:
             return {}
         
-        maintenance_records = self.get_vehicle_maintenance_history(vehicle_id)
+        maintenance_records = self._get_history(vehicle_id)
         
         if not maintenance_records:
             return {
@@ -218,85 +426,88 @@ class MaintenanceTracker:
             'last_service_cost': latest_record.get('cost', 0.0)
         }
     
-    def get_maintenance_alerts(self, days_ahead: int = 30) -> List[MaintenanceAlert]:
+    def get_maintenance_alerts_batch(self, days_ahead: int = 30) -> MaintenanceAlertBatch:
         """
-        Get maintenance alerts for vehicles due or overdue
+        Compute maintenance alerts for the whole fleet in one array pass
+        
+        Next-due dates, days until due, alert type and priority are computed
+        for every vehicle at once from the latest record per vehicle, using
+        maintenance_intervals and service_costs as lookup arrays.
         
         Args:
             days_ahead: Number of days to look ahead for alerts
             
         Returns:
-            List of maintenance alerts
+            MaintenanceAlertBatch sorted by priority and days until due
         """
         vehicles = self._load_vehicles()
-        alerts = []
+        columns = self._get_record_columns()
+        positions, latest_rows = self._get_fleet_latest_rows()
         current_date = datetime.now()
         
-        for vehicle in vehicles:
-            vehicle_id = vehicle.get('id')
-            if not vehicle_id:
-                continue
-            
-            maintenance_status = self.get_vehicle_maintenance_status(vehicle_id)
-            
-            if maintenance_status.get('status') == 'no_records':
-                # No maintenance records - recommend general inspection
-                alert = MaintenanceAlert(
-                    vehicle_id=vehicle_id,
-                    vehicle_name=vehicle.get('name', 'Unknown'),
-                    license_plate=vehicle.get('license_plate', 'N/A'),
-                    alert_type='due',
-                    days_until_due=0,
-                    last_service_date='Never',
-                    next_service_date=current_date.strftime('%Y-%m-%d'),
-                    service_type='general_inspection',
-                    priority='high',
-                    estimated_cost=self.service_costs.get('general_inspection', 150.0),
-                    description='No maintenance records found - general inspection recommended'
-                )
-                alerts.append(alert)
-                continue
-            
-            days_until_due = maintenance_status.get('days_until_next_service')
-            if days_until_due is None:
-                continue
-            
-            # Determine alert type and priority
-            if days_until_due < 0:
-                alert_type = 'overdue'
-                priority = 'critical'
-            elif days_until_due <= 7:
-                alert_type = 'due'
-                priority = 'high'
-            elif days_until_due <= days_ahead:
-                alert_type = 'upcoming'
-                priority = 'medium'
-            else:
-                continue  # Not within alert window
-            
-            service_type = maintenance_status.get('recommended_service', 'general_inspection')
-            estimated_cost = self.service_costs.get(service_type, 150.0)
-            
-            alert = MaintenanceAlert(
-                vehicle_id=vehicle_id,
-                vehicle_name=vehicle.get('name', 'Unknown'),
-                license_plate=vehicle.get('license_plate', 'N/A'),
-                alert_type=alert_type,
-                days_until_due=days_until_due,
-                last_service_date=maintenance_status.get('last_service_date', 'Unknown'),
-                next_service_date=maintenance_status.get('next_service_date', 'Unknown'),
-                service_type=service_type,
-                priority=priority,
-                estimated_cost=estimated_cost,
-                description=f"{service_type.replace('_', ' ').title()} due in {abs(days_until_due)} days"
-            )
-            alerts.append(alert)
-        
-        # Sort by priority and days until due
-        priority_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
-        alerts.sort(key=lambda x: (priority_order.get(x.priority, 4), x.days_until_due))
+        # Lookup arrays indexed by service type code; records without a type
+        # fall back to a general inspection
+        service_types = [service_type if service_type is not None else 'general_inspection'
+                         for service_type in columns.service_types]
+        intervals = np.array([self.maintenance_intervals.get(service_type, 180) for service_type in service_types] or [0],
+                             dtype='timedelta64[D]')
+        
+        has_records = latest_rows >= 0
+        safe_rows = np.where(has_records, latest_rows, 0)
+        if columns.record_count:
+            last_dates = np.where(has_records, columns.dates[safe_rows], np.datetime64('NaT', 'D'))
+            service_codes = columns.service_codes[safe_rows]
+        else:
+            last_dates = np.full(len(latest_rows), np.datetime64('NaT', 'D'))
+            service_codes = np.zeros(len(latest_rows), dtype=np.int32)
+        next_dates = last_dates + intervals[service_codes]
+        
+        # Whole days from now until the next service (floor, like timedelta.days)
+        now_us = np.datetime64(current_date, 'us')
+        days_until_due = np.floor_divide((next_dates.astype('datetime64[us]') - now_us).astype(np.int64),
+                                         86400 * 10**6)
+        
+        dated = ~np.isnat(next_dates)
+        overdue = dated & (days_until_due < 0)
+        due = dated & ~overdue & (days_until_due <= 7)
+        upcoming = dated & ~overdue & ~due & (days_until_due <= days_ahead)
+        
+        # Vehicles without any records are always due for a general inspection
+        no_records = ~has_records
+        alert_codes = np.select([overdue, due | no_records, upcoming], [0, 1, 2], default=-1)
+        days_until_due = np.where(no_records, 0, days_until_due)
+        
+        selected = np.flatnonzero(alert_codes >= 0)
+        # Priority codes line up with alert codes: overdue/critical, due/high, upcoming/medium
+        order = selected[np.lexsort((days_until_due[selected], alert_codes[selected]))]
+        
+        selected_service_types = [service_types[code] if has_record else 'general_inspection'
+                                  for code, has_record in zip(service_codes[order], has_records[order])]
+        
+        return MaintenanceAlertBatch(
+            vehicles=vehicles,
+            positions=positions[order],
+            alert_codes=alert_codes[order],
+            priority_codes=alert_codes[order],
+            days_until_due=days_until_due[order],
+            last_dates=last_dates[order],
+            next_dates=next_dates[order],
+            service_types=selected_service_types,
+            service_costs=self.service_costs,
+            current_date=current_date
+        )
+    
+    def get_maintenance_alerts(self, days_ahead: int = 30) -> List[MaintenanceAlert]:
+        """
+        Get maintenance alerts for vehicles due or overdue
         
-        return alerts
+        Args:
+            days_ahead: Number of days to look ahead for alerts
+            
+        Returns:
+            List of maintenance alerts
+        """
+        return list(self.get_maintenance_alerts_batch(days_ahead))
     
     def get_maintenance_statistics(self) -> MaintenanceStats:
         """
@@ -310,45 +521,23 @@ class MaintenanceTracker:
         
         total_vehicles = len(vehicles)
         
-        # Get alerts to count due/overdue vehicles
-        alerts = self.get_maintenance_alerts(days_ahead=30)
-        vehicles_due = len([a for a in alerts if a.alert_type == 'due'])
-        vehicles_overdue = len([a for a in alerts if a.alert_type == 'overdue'])
+        # Count due/overdue vehicles without materializing alerts
+        alerts = self.get_maintenance_alerts_batch(days_ahead=30)
+        vehicles_due = alerts.count('due')
+        vehicles_overdue = alerts.count('overdue')
         
-        # Calculate costs for different periods
+        # Calculate costs for different periods from the date-sorted cost columns
+        columns = self._get_record_columns()
         current_date = datetime.now()
-        thirty_days_ago = current_date - timedelta(days=30)
-        ninety_days_ago = current_date - timedelta(days=90)
-        one_year_ago = current_date - timedelta(days=365)
-        
-        total_cost_30_days = 0.0
-        total_cost_90_days = 0.0
-        total_cost_year = 0.0
-        
-        for record in maintenance_records:
-            record_date_str = record.get('date', '')
-            if not record_date_str:
-                continue
-            
-            try:
-                record_date = datetime.strptime(record_date_str, '%Y-%m-%d')
-                cost = record.get('cost', 0.0)
-                
-                if record_date >= thirty_days_ago:
-                    total_cost_30_days += cost
-                if record_date >= ninety_days_ago:
-                    total_cost_90_days += cost
-                if record_date >= one_year_ago:
-                    total_cost_year += cost
-            except ValueError:
-                continue
+        total_cost_30_days = columns.total_cost_since(current_date - timedelta(days=30))
+        total_cost_90_days = columns.total_cost_since(current_date - timedelta(days=90))
+        total_cost_year = columns.total_cost_since(current_date - timedelta(days=365))
         
         # Calculate average cost per vehicle
         average_cost_per_vehicle = total_cost_year / total_vehicles if total_vehicles > 0 else 0.0
         
         # Find most common service type
-        service_types = [record.get('type', '') for record in maintenance_records if record.get('type')]
-        most_common_service = max(set(service_types), key=service_types.count) if service_types else 'Unknown'
+        most_common_service = columns.most_common_service() or 'Unknown'
         
         # Calculate maintenance frequency (services per vehicle per year)
         maintenance_frequency = len(maintenance_records) / total_vehicles if total_vehicles > 0 else 0.0
@@ -379,8 +568,7 @@ class MaintenanceTracker:
         if not vehicle_id:
             return {"error": "Vehicle ID is required"}
         
-        vehicles = self._load_vehicles()
-        vehicle = next((v for v in vehicles if v.get('id') == vehicle_id), None)
+        vehicle = self._get_vehicle(vehicle_id)
         
         if not vehicle:
             return {"error": "Vehicle not found"}
@@ -516,22 +704,21 @@ class MaintenanceTracker:
         Returns:
             List of vehicles with maintenance status
         """
-        alerts = self.get_maintenance_alerts(days_ahead)
+        alerts = self.get_maintenance_alerts_batch(days_ahead)
         vehicles = []
         
-        for alert in alerts:
-            if alert.alert_type in ['due', 'overdue']:
-                vehicles.append({
-                    'vehicle_id': alert.vehicle_id,
-                    'vehicle_name': alert.vehicle_name,
-                    'license_plate': alert.license_plate,
-                    'alert_type': alert.alert_type,
-                    'days_until_due': alert.days_until_due,
-                    'service_type': alert.service_type,
-                    'priority': alert.priority,
-                    'estimated_cost': alert.estimated_cost,
-                    'description': alert.description
-                })
+        for alert in alerts.iter_alerts(['due', 'overdue']):
+            vehicles.append({
+                'vehicle_id': alert.vehicle_id,
+                'vehicle_name': alert.vehicle_name,
+                'license_plate': alert.license_plate,
+                'alert_type': alert.alert_type,
+                'days_until_due': alert.days_until_due,
+                'service_type': alert.service_type,
+                'priority': alert.priority,
+                'estimated_cost': alert.estimated_cost,
+                'description': alert.description
+            })
         
         return vehicles
     
@@ -539,6 +726,10 @@ class MaintenanceTracker:
         """Refresh all cached data"""
         self._maintenance_records_cache = None
         self._vehicles_cache = None
+        self._vehicles_by_id = None
+        self._history_by_vehicle_id = None
+        self._record_columns = None
+        self._fleet_latest_rows = None
         self.logger.info("Maintenance Tracker data refreshed")
 
 
@@ -546,10 +737,13 @@ if __name__ == "__main__":
     # Example usage
     logging.basicConfig(level=logging.INFO)
     
-    # Initialize tracker
+    # Initialize tracker (queries the SQLite datastore when it is enabled in config.json)
+    from src.core.fleet_datastore import get_fleet_datastore
+    datastore = get_fleet_datastore()
     tracker = MaintenanceTracker(
         maintenance_records_path="data/vehicles/maintenance_records.json",
-        vehicle_catalog_path="data/vehicle_catalog.json"
+        vehicle_catalog_path="data/vehicle_catalog.json",
+        datastore=datastore if datastore is not None and datastore.is_populated() else None
     )
     
     # Test maintenance alerts
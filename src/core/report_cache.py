@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Report Cache
+Reuses rendered PDF reports when the vehicle, its records, the report type and the
+template version are unchanged. Entries are evicted least-recently-used by total
+bytes on disk; when the Excel sync writes new data it drops the reports of the
+vehicles that changed (or the whole cache after a full rewrite).
+
+Every server process keeps its own copy of the index; saves re-read the index
+file under a file lock and merge in the entries other processes added, so
+workers of a multi-process server do not overwrite each other's entries.
+"""
+
+import os
+import sys
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.core.atomic_json import file_lock
+from src.core.fleet_models import json_default
+from src.core.template_hebrew_pdf import TEMPLATE_VERSION
+from src.core.vehicle_repository import normalize_license_plate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(project_root, 'reports', 'maintenance_reports')
+DEFAULT_INVALIDATION_MARKER = os.path.join(project_root, 'data', '.report_cache_epoch')
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+INDEX_FILENAME = '.report_cache_index.json'
+INDEX_LOCK_FILENAME = '.report_cache_index.lock'
+# The invalidation log is restarted (as one full invalidation) once it grows past this
+MAX_MARKER_BYTES = 64 * 1024
+
+
+def invalidate_report_cache(marker_path: str = DEFAULT_INVALIDATION_MARKER,
+                            license_plates: Optional[List[str]] = None):
+    """
+    Mark cached reports as stale
+
+    Called by writers of the vehicle catalog / maintenance records. Each call appends
+    one JSON line to the marker; caches read the lines added since their last lookup
+    and drop the reports of those plates.
+
+    Args:
+        marker_path: Invalidation log shared with the caches
+        license_plates: Vehicles whose data changed (default: every cached report)
+    """
+    plates = sorted({normalize_license_plate(plate) for plate in license_plates}) if license_plates else None
+    line = json.dumps({
+        'time': datetime.now().isoformat(),
+        'id': uuid.uuid4().hex,
+        'license_plates': plates
+    }, ensure_ascii=False) + '\n'
+
+    try:
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        size = os.path.getsize(marker_path) if os.path.exists(marker_path) else 0
+        if size + len(line) <= MAX_MARKER_BYTES:
+            with open(marker_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            return
+
+        # Restart the log as a new file; caches see a new inode and drop everything
+        full_line = json.dumps({'time': datetime.now().isoformat(), 'id': uuid.uuid4().hex,
+                                'license_plates': None}) + '\n'
+        temp_path = f"{marker_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(full_line)
+        os.replace(temp_path, marker_path)
+    except Exception as e:
+        logger.error(f"Error invalidating report cache: {e}")
+
+
+def _marker_position(path: str) -> Optional[List[int]]:
+    """Return [inode, size] of the invalidation log, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+        return [stat.st_ino, stat.st_size]
+    except OSError:
+        return None
+
+
+def _read_invalidated_plates(path: str, previous: Optional[List[int]], current: Optional[List[int]]):
+    """
+    Plates invalidated between two log positions
+
+    Returns:
+        Set of normalized plates, or None if every cached report is stale
+    """
+    if previous is None and current is not None:
+        # The log was created since: every line in it is new
+        previous = [current[0], 0]
+    if current is None or previous[0] != current[0] or current[1] < previous[1]:
+        # New, replaced or truncated log: nothing tells us what changed
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            f.seek(previous[1])
+            lines = f.read(current[1] - previous[1]).decode('utf-8').splitlines()
+    except Exception as e:
+        logger.warning(f"Could not read report cache invalidation log: {e}")
+        return None
+
+    plates = set()
+    for line in lines:
+        try:
+            line_plates = json.loads(line).get('license_plates')
+        except (ValueError, AttributeError):
+            line_plates = None
+        if line_plates is None:
+            return None
+        plates.update(line_plates)
+    return plates
+
+
+class ReportCache:
+    """
+    LRU cache of rendered report PDFs keyed by a hash of their inputs
+
+    Cached files live in cache_dir next to regular reports so the download route
+    can serve them by filename. The index (key -> filename, size) is persisted in
+    cache_dir so hits survive server restarts.
+    """
+
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 invalidation_marker: str = DEFAULT_INVALIDATION_MARKER):
+        """
+        Initialize the report cache.
+
+        Args:
+            cache_dir: Directory holding cached PDFs and the cache index
+            max_bytes: Total size of cached PDFs kept on disk
+            invalidation_marker: Invalidation log written by invalidate_report_cache()
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.invalidation_marker = invalidation_marker
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        self.index_lock_path = os.path.join(cache_dir, INDEX_LOCK_FILENAME)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {'filename', 'size', 'license_plate'}, least recently used first
+        self._total_bytes = 0
+        self._removed_keys = set()  # dropped since the last save; not merged back from the index file
+        self._epoch = None
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(vehicle: Dict, maintenance_records: List[Dict], report_type: str) -> str:
+        """
+        Hash the report inputs
+
+        The report header carries the generation date, so the date is part of the key.
+        """
+        payload = json.dumps({
+            'vehicle': vehicle,
+            'records': maintenance_records,
+            'report_type': report_type,
+            'template_version': TEMPLATE_VERSION,
+            'report_date': datetime.now().strftime('%Y-%m-%d')
+        }, ensure_ascii=False, sort_keys=True, default=json_default)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load_index(self):
+        """Load the persisted index, dropping entries whose files are gone"""
+        current = _marker_position(self.invalidation_marker)
+        self._epoch = current
+        try:
+            if not os.path.exists(self.index_path):
+                return
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load report cache index: {e}")
+            return
+
+        entries = index.get('entries', {})
+        if index.get('epoch') != current:
+            # Data changed while we were not running
+            plates = _read_invalidated_plates(self.invalidation_marker, index.get('epoch'), current)
+            stale = [key for key, entry in entries.items() if self._is_stale(entry, plates)]
+            self._remove_files([entries.pop(key)['filename'] for key in stale])
+            self._removed_keys.update(stale)
+
+        for key, entry in entries.items():
+            if os.path.exists(os.path.join(self.cache_dir, entry['filename'])):
+                self._entries[key] = entry
+                self._total_bytes += entry['size']
+
+        if index.get('epoch') != current:
+            self._save_index()
+
+    def _merge_saved_entries(self):
+        """Adopt entries other processes added to the index file (caller holds both locks)"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Could not read report cache index: {e}")
+            return
+        if index.get('epoch') != self._epoch:
+            # Saved across an invalidation we have not applied (or the writer has not);
+            # its entries may be stale
+            return
+
+        added = [(key, entry) for key, entry in index.get('entries', {}).items()
+                 if key not in self._entries and key not in self._removed_keys
+                 and os.path.exists(os.path.join(self.cache_dir, entry['filename']))]
+        if not added:
+            return
+        # Their recency in the other process is unknown; treat them as least recently used
+        merged = OrderedDict(added)
+        merged.update(self._entries)
+        self._entries = merged
+        self._total_bytes += sum(entry['size'] for _, entry in added)
+
+    def _evict_over_budget(self):
+        """Drop least recently used entries until the cache fits max_bytes (caller holds the lock)"""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry['size']
+            self._removed_keys.add(key)
+            evicted.append(entry['filename'])
+        self._remove_files(evicted)
+        self._counters['evictions'] += len(evicted)
+
+    def _save_index(self):
+        """Merge with the index file and persist the index (caller holds the lock or is initializing)"""
+        try:
+            with file_lock(self.index_lock_path):
+                self._merge_saved_entries()
+                self._evict_over_budget()
+                temp_path = f"{self.index_path}.{uuid.uuid4().hex}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'epoch': self._epoch, 'entries': self._entries}, f)
+                os.replace(temp_path, self.index_path)
+            self._removed_keys.clear()
+        except Exception as e:
+            logger.error(f"Error saving report cache index: {e}")
+
+    def _remove_files(self, filenames: List[str]):
+        """Delete cached PDFs, ignoring files that are already gone"""
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_stale(entry: Dict, plates: Optional[set]) -> bool:
+        """True if an entry is covered by an invalidation (plates None means all)"""
+        return plates is None or entry.get('license_plate') is None or entry['license_plate'] in plates
+
+    def _check_invalidation(self):
+        """Drop the entries of plates invalidated since the last check (caller holds the lock)"""
+        epoch = _marker_position(self.invalidation_marker)
+        if epoch == self._epoch:
+            return
+        plates = _read_invalidated_plates(self.invalidation_marker, self._epoch, epoch)
+        stale = [key for key, entry in self._entries.items() if self._is_stale(entry, plates)]
+
+        scope = 'all vehicles' if plates is None else f"{len(plates)} vehicles"
+        logger.info(f"Report cache invalidated for {scope}, dropping {len(stale)} reports")
+        removed = [self._entries.pop(key) for key in stale]
+        self._removed_keys.update(stale)
+        self._total_bytes -= sum(entry['size'] for entry in removed)
+        self._remove_files([entry['filename'] for entry in removed])
+        self._epoch = epoch
+        self._counters['invalidations'] += 1
+        self._save_index()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached report
+
+        Returns:
+            Path of the cached PDF, or None on a miss
+        """
+        with self._lock:
+            self._check_invalidation()
+            entry = self._entries.get(key)
+            if entry is not None:
+                file_path = os.path.join(self.cache_dir, entry['filename'])
+                if os.path.exists(file_path):
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return file_path
+                # Removed from disk behind our back
+                del self._entries[key]
+                self._total_bytes -= entry['size']
+                self._removed_keys.add(key)
+            self._counters['misses'] += 1
+            return None
+
+    def reserve_path(self, key: str) -> str:
+        """Return a unique temporary path to render a report into before add()"""
+        return os.path.join(self.cache_dir, f".{key[:16]}_{uuid.uuid4().hex[:8]}.pdf.tmp")
+
+    def add(self, key: str, rendered_path: str, license_plate: str = 'unknown') -> str:
+        """
+        Move a freshly rendered PDF into the cache
+
+        Args:
+            key: Cache key from make_key()
+            rendered_path: Path the report was rendered to (usually from reserve_path())
+            license_plate: Used in the cached filename
+
+        Returns:
+            Path of the cached PDF
+        """
+        filename = f"maintenance_report_{license_plate}_{key[:16]}.pdf"
+        file_path = os.path.join(self.cache_dir, filename)
+
+        with self._lock:
+            os.replace(rendered_path, file_path)
+            size = os.path.getsize(file_path)
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous['size']
+            self._entries[key] = {
+                'filename': filename,
+                'size': size,
+                'license_plate': normalize_license_plate(license_plate)
+            }
+            self._total_bytes += size
+            # Evicts over the byte budget once other processes' entries are merged in
+            self._save_index()
+
+        return file_path
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters for health output"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                **self._counters
+            }
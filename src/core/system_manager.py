@@ -16,6 +16,8 @@ import logging
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from src.core.atomic_json import write_json_atomic
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ class SystemManager:
         self.project_root = project_root
         self.server_process = None
         self.ngrok_process = None
+        self.excel_watcher = None
         
     def initialize_system(self):
         """Initialize the entire system"""
@@ -53,6 +56,9 @@ class SystemManager:
             # Step 5: Start main server
             self.start_main_server()
             
+            # Keep the data in step with later workbook edits
+            self.start_excel_watcher()
+            
             # Step 6: Display webhook URL and optionally update Twilio
             if ngrok_url:
                 webhook_url = f"{ngrok_url}/webhook"
@@ -174,8 +180,7 @@ class SystemManager:
             
             # Save to JSON
             catalog_path = os.path.join(self.project_root, 'data', 'large_vehicle_catalog.json')
-            with open(catalog_path, 'w', encoding='utf-8') as f:
-                json.dump({'vehicles': vehicles}, f, ensure_ascii=False, indent=2)
+            write_json_atomic(catalog_path, {'vehicles': vehicles})
             
             logger.info(f"✅ Updated vehicle catalog with {len(vehicles)} vehicles")
             
@@ -205,10 +210,7 @@ class SystemManager:
             
             # Save to JSON
             records_path = os.path.join(self.project_root, 'data', 'vehicles', 'maintenance_records.json')
-            os.makedirs(os.path.dirname(records_path), exist_ok=True)
-            
-            with open(records_path, 'w', encoding='utf-8') as f:
-                json.dump({'records': records}, f, ensure_ascii=False, indent=2)
+            write_json_atomic(records_path, {'records': records})
             
             logger.info(f"✅ Updated maintenance records with {len(records)} records")
             
@@ -253,8 +255,7 @@ class SystemManager:
             
             # Save fault summary
             fault_path = os.path.join(self.project_root, 'data', 'fault_reports.json')
-            with open(fault_path, 'w', encoding='utf-8') as f:
-                json.dump(fault_summary, f, ensure_ascii=False, indent=2)
+            write_json_atomic(fault_path, fault_summary)
             
             logger.info(f"✅ Updated fault reports: {len(fault_records)} faults found")
             
@@ -314,13 +315,23 @@ class SystemManager:
             return None
     
     def start_main_server(self):
-        """Start the main Flask server"""
+        """Start the main server (the Flask development server, the multi-worker production
+        server with server.production, or the async server with server.async)"""
         logger.info("🚀 Starting main server...")
         
         try:
+            from src.services.production_server import load_server_config
+            
+            server_config = load_server_config()
+            script = 'src/services/production_server.py'
+            if server_config.get('async', False):
+                script = 'src/services/async_server.py'
+            elif not server_config.get('production', False):
+                script = 'src/services/simple_server.py'
+            
             # Start server in background
             self.server_process = subprocess.Popen(
-                [sys.executable, 'src/services/simple_server.py'],
+                [sys.executable, script],
                 cwd=self.project_root
             )
             
@@ -333,12 +344,31 @@ class SystemManager:
             logger.error(f"❌ Error starting main server: {e}")
             return False
     
+    def start_excel_watcher(self):
+        """Sync the workbook in the background whenever it changes (excel_sync.watch in config.json)"""
+        try:
+            from scripts.excel_sync_manager import load_sync_config
+            from scripts.excel_sync_watcher import create_watcher_from_config
+            
+            if not load_sync_config().get('watch', False):
+                return False
+            
+            self.excel_watcher = create_watcher_from_config()
+            self.excel_watcher.start()
+            logger.info(f"✅ Excel watcher started ({self.excel_watcher.get_status()['mode']})")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start Excel watcher: {e}")
+            return False
+    
     def get_system_status(self):
         """Get current system status"""
         status = {
             'server_running': self.server_process and self.server_process.poll() is None,
             'ngrok_running': self.ngrok_process and self.ngrok_process.poll() is None,
             'ngrok_url': self.get_ngrok_url(),
+            'excel_watcher': self.excel_watcher.get_status() if self.excel_watcher else None,
             'timestamp': datetime.now().isoformat()
         }
         return status
@@ -348,6 +378,9 @@ class SystemManager:
         logger.info("🛑 Stopping Fleet Management System...")
         
         try:
+            if self.excel_watcher:
+                self.excel_watcher.stop()
+            
             if self.server_process:
                 self.server_process.terminate()
                 self.server_process.wait()
@@ -6,6 +6,7 @@ Follows the professional design template specification
 
 import os
 import json
+import threading
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -18,42 +19,102 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.lib.colors import HexColor
 
-class TemplateHebrewPDFGenerator:
-    """Template-based Hebrew PDF Generator following professional design specs"""
+# Bump whenever the report layout changes so cached reports are re-rendered
+TEMPLATE_VERSION = '1.0'
+
+# Project fonts directory (checked in addition to the system font directories)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Extra font directories, separated by os.pathsep; searched before the defaults
+FONT_DIRS_ENV = 'FLEET_FONT_DIRS'
+
+DEFAULT_FONT_DIRS = [
+    'C:/Windows/Fonts',
+    'fonts',
+    os.path.join(project_root, 'fonts'),
+    '/System/Library/Fonts',
+    '/usr/share/fonts/truetype',
+    '/usr/share/fonts'
+]
+
+# Preferred Hebrew fonts, best first (None = built-in CID/standard font)
+FONT_OPTIONS = [
+    ('Noto Sans Hebrew', 'NotoSansHebrew-Regular.ttf'),
+    ('Assistant', 'Assistant-Regular.ttf'),
+    ('Rubik', 'Rubik-Regular.ttf'),
+    ('Arial Unicode MS', 'arial.ttf'),
+    ('Tahoma', 'tahoma.ttf'),
+    ('Times New Roman', 'times.ttf'),
+    ('HeiseiKakuGo-W5', None),
+    ('Helvetica', None)
+]
+
+# Template colors from the design spec
+TEMPLATE_COLORS = {
+    'primary': HexColor('#003366'),
+    'accent': HexColor('#E6B400'),
+    'text': HexColor('#111111'),
+    'muted': HexColor('#555555'),
+    'surface': HexColor('#F7F8FA'),
+    'tableHeaderBg': HexColor('#003366'),
+    'tableHeaderFg': HexColor('#FFFFFF'),
+    'tableStripeA': HexColor('#FFFFFF'),
+    'tableStripeB': HexColor('#F0F2F5'),
+    'border': HexColor('#D8DCE1')
+}
+
+class FontStyleRegistry:
+    """
+    Process-wide Hebrew font, paragraph styles and table styles
     
-    def __init__(self):
-        """Initialize the template-based Hebrew PDF generator"""
+    The font is resolved and registered with pdfmetrics once per process and the
+    styles are built once; every TemplateHebrewPDFGenerator shares them.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    _font_dirs = None
+    
+    @classmethod
+    def get_instance(cls):
+        """Get the shared registry, building it on first use"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(cls._font_dirs)
+        return cls._instance
+    
+    @classmethod
+    def configure(cls, font_dirs=None):
+        """
+        Set the font search path and rebuild the registry on next use
+        
+        Args:
+            font_dirs: Directories searched before the defaults (and FLEET_FONT_DIRS)
+        """
+        with cls._instance_lock:
+            cls._font_dirs = list(font_dirs) if font_dirs else None
+            cls._instance = None
+    
+    def __init__(self, font_dirs=None):
+        """
+        Resolve the font and build the styles.
+        
+        Args:
+            font_dirs: Directories searched before FLEET_FONT_DIRS and the defaults
+        """
+        env_dirs = [d for d in os.environ.get(FONT_DIRS_ENV, '').split(os.pathsep) if d]
+        self.font_dirs = list(font_dirs or []) + env_dirs + DEFAULT_FONT_DIRS
+        self.colors = TEMPLATE_COLORS
         self.hebrew_font = self._find_best_hebrew_font()
         print(f"Using font: {self.hebrew_font}")
         
-        # Template colors from the design spec
-        self.colors = {
-            'primary': HexColor('#003366'),
-            'accent': HexColor('#E6B400'),
-            'text': HexColor('#111111'),
-            'muted': HexColor('#555555'),
-            'surface': HexColor('#F7F8FA'),
-            'tableHeaderBg': HexColor('#003366'),
-            'tableHeaderFg': HexColor('#FFFFFF'),
-            'tableStripeA': HexColor('#FFFFFF'),
-            'tableStripeB': HexColor('#F0F2F5'),
-            'border': HexColor('#D8DCE1')
-        }
+        self.styles = self._build_styles()
+        self.table_styles = self._build_table_styles()
     
     def _find_best_hebrew_font(self):
         """Find the best available Hebrew font"""
-        font_options = [
-            ('Noto Sans Hebrew', 'NotoSansHebrew-Regular.ttf'),
-            ('Assistant', 'Assistant-Regular.ttf'),
-            ('Rubik', 'Rubik-Regular.ttf'),
-            ('Arial Unicode MS', 'arial.ttf'),
-            ('Tahoma', 'tahoma.ttf'),
-            ('Times New Roman', 'times.ttf'),
-            ('HeiseiKakuGo-W5', None),
-            ('Helvetica', None)
-        ]
-        
-        for font_name, font_file in font_options:
+        for font_name, font_file in FONT_OPTIONS:
             try:
                 if font_file:
                     font_path = self._find_font_file(font_file)
@@ -73,80 +134,15 @@ class TemplateHebrewPDFGenerator:
         return 'Helvetica'
     
     def _find_font_file(self, filename):
-        """Find font file in common locations"""
-        common_paths = [
-            f'C:/Windows/Fonts/{filename}',
-            f'C:/Windows/Fonts/{filename.upper()}',
-            f'C:/Windows/Fonts/{filename.lower()}',
-            f'fonts/{filename}',
-            f'/System/Library/Fonts/{filename}',
-            f'/usr/share/fonts/truetype/{filename}',
-            f'/usr/share/fonts/{filename}'
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                return path
+        """Find font file in the font search path"""
+        for directory in self.font_dirs:
+            for name in (filename, filename.upper(), filename.lower()):
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    return path
         return None
     
-    def _reverse_hebrew_text(self, text):
-        """Reverse Hebrew text to fix RTL display issues"""
-        if not text or not isinstance(text, str):
-            return text
-        
-        words = text.split()
-        reversed_words = []
-        
-        for word in words:
-            if any('\u0590' <= char <= '\u05FF' for char in word):
-                reversed_words.append(word[::-1])
-            else:
-                reversed_words.append(word)
-        
-        return ' '.join(reversed_words)
-    
-    def _get_vehicle_color(self, vehicle_data):
-        """Get vehicle color from specifications"""
-        try:
-            specs = vehicle_data.get('specifications', {})
-            color = specs.get('color', 'לא זמין')
-            if color and color != 'לא זמין':
-                return color
-        except:
-            pass
-        return vehicle_data.get('color', 'לא זמין')
-    
-    def _get_driver_name(self, vehicle_data):
-        """Get driver name from driver object"""
-        try:
-            driver = vehicle_data.get('driver', {})
-            if isinstance(driver, dict):
-                return driver.get('name', 'לא זמין')
-            return str(driver) if driver else 'לא זמין'
-        except:
-            return 'לא זמין'
-    
-    def _get_driver_phone(self, vehicle_data):
-        """Get driver phone from driver object"""
-        try:
-            driver = vehicle_data.get('driver', {})
-            if isinstance(driver, dict):
-                return driver.get('phone', 'לא זמין')
-            return 'לא זמין'
-        except:
-            return 'לא זמין'
-    
-    def _get_driver_email(self, vehicle_data):
-        """Get driver email from driver object"""
-        try:
-            driver = vehicle_data.get('driver', {})
-            if isinstance(driver, dict):
-                return driver.get('email', 'לא זמין')
-            return 'לא זמין'
-        except:
-            return 'לא זמין'
-    
-    def create_template_styles(self):
+    def _build_styles(self):
         """Create styles following the template specification"""
         styles = getSampleStyleSheet()
         font_name = self.hebrew_font
@@ -227,14 +223,178 @@ class TemplateHebrewPDFGenerator:
             'medium': medium_style,
             'small': small_style,
             'regular': regular_style,
-            'xs': xs_style
+            'xs': xs_style,
+            # Centered variants used for titles
+            'centered_display': ParagraphStyle('CenteredDisplay', parent=display_style, alignment=TA_CENTER),
+            'centered_large': ParagraphStyle('CenteredLarge', parent=large_style, alignment=TA_CENTER),
+            'centered_small': ParagraphStyle('CenteredSmall', parent=small_style, alignment=TA_CENTER)
         }
     
-    def generate_maintenance_report(self, vehicle_data, maintenance_records, output_path):
-        """Generate a maintenance report PDF following the template design"""
+    def _build_table_styles(self):
+        """Create the table styles shared by all reports"""
+        return {
+            # Vehicle details card: data column on the left, labels on the right
+            'vehicle': TableStyle([
+                # Data column styling (left column)
+                ('BACKGROUND', (0, 0), (0, -1), self.colors['tableStripeA']),
+                ('TEXTCOLOR', (0, 0), (0, -1), self.colors['text']),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+                # Label column styling (right column)
+                ('BACKGROUND', (1, 0), (1, -1), self.colors['surface']),
+                ('TEXTCOLOR', (1, 0), (1, -1), self.colors['text']),
+                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+                # Common styling
+                ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
+                ('FONTSIZE', (0, 0), (-1, -1), 12),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('LEFTPADDING', (0, 0), (-1, -1), 12),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+                # Borders
+                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
+                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border']),
+                # Alternating row colors
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.colors['tableStripeA'], self.colors['tableStripeB']])
+                
+            ]),
+            # Maintenance records and fault reports tables
+            'records': TableStyle([
+                # Header styling
+                ('BACKGROUND', (0, 0), (-1, 0), self.colors['tableHeaderBg']),
+                ('TEXTCOLOR', (0, 0), (-1, 0), self.colors['tableHeaderFg']),
+                ('FONTNAME', (0, 0), (-1, 0), self.hebrew_font),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('FONTWEIGHT', (0, 0), (-1, 0), 'bold'),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('TOPPADDING', (0, 0), (-1, 0), 12),
+                # Data styling
+                ('FONTNAME', (0, 1), (-1, -1), self.hebrew_font),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+                ('TOPPADDING', (0, 1), (-1, -1), 8),
+                # Alternating row colors
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.colors['tableStripeA'], self.colors['tableStripeB']]),
+                # Borders
+                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
+                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
+                
+            ]),
+            'summary': TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), self.colors['surface']),
+                ('TEXTCOLOR', (0, 0), (0, -1), self.colors['text']),
+                ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
+                ('FONTSIZE', (0, 0), (-1, -1), 12),
+                ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 10),
+                ('LEFTPADDING', (0, 0), (-1, -1), 12),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+                # Data styling
+                ('BACKGROUND', (1, 0), (1, -1), self.colors['tableStripeA']),
+                ('TEXTCOLOR', (1, 0), (1, -1), self.colors['text']),
+                # Special styling for total cost
+                ('BACKGROUND', (0, 4), (1, 4), self.colors['accent']),
+                ('TEXTCOLOR', (0, 4), (1, 4), self.colors['text']),
+                ('FONTWEIGHT', (0, 4), (1, 4), 'bold'),
+                # Borders
+                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
+                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
+                
+            ]),
+            'signature': TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
+                ('FONTSIZE', (0, 0), (-1, -1), 12),
+                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
+                ('TOPPADDING', (0, 0), (-1, -1), 15),
+                ('LEFTPADDING', (0, 0), (-1, -1), 12),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+                # Borders
+                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
+                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
+                
+            ])
+        }
+
+class TemplateHebrewPDFGenerator:
+    """Template-based Hebrew PDF Generator following professional design specs"""
+    
+    def __init__(self):
+        """Initialize the template-based Hebrew PDF generator"""
+        self.registry = FontStyleRegistry.get_instance()
+        self.hebrew_font = self.registry.hebrew_font
+        self.colors = self.registry.colors
+    
+    def _reverse_hebrew_text(self, text):
+        """Reverse Hebrew text to fix RTL display issues"""
+        if not text or not isinstance(text, str):
+            return text
         
-        # Create document with template margins (15mm = 42.5 points)
-        doc = SimpleDocTemplate(
+        words = text.split()
+        reversed_words = []
+        
+        for word in words:
+            if any('\u0590' <= char <= '\u05FF' for char in word):
+                reversed_words.append(word[::-1])
+            else:
+                reversed_words.append(word)
+        
+        return ' '.join(reversed_words)
+    
+    def _get_vehicle_color(self, vehicle_data):
+        """Get vehicle color from specifications"""
+        try:
+            specs = vehicle_data.get('specifications', {})
+            color = specs.get('color', 'לא זמין')
+            if color and color != 'לא זמין':
+                return color
+        except:
+            pass
+        return vehicle_data.get('color', 'לא זמין')
+    
+    def _get_driver_name(self, vehicle_data):
+        """Get driver name from driver object"""
+        try:
+            driver = vehicle_data.get('driver', {})
+            if hasattr(driver, 'get'):  # dict or fleet_models.Driver
+                return driver.get('name', 'לא זמין')
+            return str(driver) if driver else 'לא זמין'
+        except:
+            return 'לא זמין'
+    
+    def _get_driver_phone(self, vehicle_data):
+        """Get driver phone from driver object"""
+        try:
+            driver = vehicle_data.get('driver', {})
+            if hasattr(driver, 'get'):  # dict or fleet_models.Driver
+                return driver.get('phone', 'לא זמין')
+            return 'לא זמין'
+        except:
+            return 'לא זמין'
+    
+    def _get_driver_email(self, vehicle_data):
+        """Get driver email from driver object"""
+        try:
+            driver = vehicle_data.get('driver', {})
+            if hasattr(driver, 'get'):  # dict or fleet_models.Driver
+                return driver.get('email', 'לא זמין')
+            return 'לא זמין'
+        except:
+            return 'לא זמין'
+    
+    def create_template_styles(self):
+        """Get the shared styles following the template specification"""
+        return self.registry.styles
+    
+    def _create_document(self, output_path):
+        """Create a document with template margins (15mm = 42.5 points)"""
+        return SimpleDocTemplate(
             output_path, 
             pagesize=A4,
             rightMargin=42.5,  # 15mm
@@ -242,7 +402,9 @@ class TemplateHebrewPDFGenerator:
             topMargin=42.5,    # 15mm
             bottomMargin=42.5  # 15mm
         )
-        
+    
+    def build_report_story(self, vehicle_data, maintenance_records):
+        """Build the flowables of one vehicle's maintenance report"""
         styles = self.create_template_styles()
         story = []
         
@@ -267,22 +429,42 @@ class TemplateHebrewPDFGenerator:
         # Footer
         story.extend(self._create_footer(styles))
         
+        return story
+    
+    def generate_maintenance_report(self, vehicle_data, maintenance_records, output_path):
+        """Generate a maintenance report PDF following the template design"""
+        doc = self._create_document(output_path)
+        story = self.build_report_story(vehicle_data, maintenance_records)
+        
         # Build PDF
         doc.build(story)
         print(f"Generated template-based Hebrew PDF report: {output_path}")
     
+    def generate_combined_report(self, reports, output_path):
+        """
+        Generate one PDF with a maintenance report per vehicle, each starting on a new page
+        
+        Args:
+            reports: Iterable of (vehicle_data, maintenance_records) pairs
+            output_path: Path of the merged PDF
+        """
+        doc = self._create_document(output_path)
+        story = []
+        for vehicle_data, maintenance_records in reports:
+            if story:
+                story.append(PageBreak())
+            story.extend(self.build_report_story(vehicle_data, maintenance_records))
+        
+        doc.build(story)
+        print(f"Generated combined Hebrew PDF report: {output_path}")
+    
     def _create_header(self, vehicle_data, styles):
         """Create header section following template"""
         story = []
         
         # Main title - centered
         title_text = self._reverse_hebrew_text("דוח תחזוקת רכב")
-        centered_display_style = ParagraphStyle(
-            'CenteredDisplay',
-            parent=styles['display'],
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph(title_text, centered_display_style))
+        story.append(Paragraph(title_text, styles['centered_display']))
         
         # Subline with document info
         doc_number = f"OPS-MAINT-{datetime.now().strftime('%Y-%m-%d')}"
@@ -297,12 +479,7 @@ class TemplateHebrewPDFGenerator:
         ]
         
         for line in subline_data:
-            centered_small_style = ParagraphStyle(
-                'CenteredSmall',
-                parent=styles['small'],
-                alignment=TA_CENTER
-            )
-            story.append(Paragraph(self._reverse_hebrew_text(line), centered_small_style))
+            story.append(Paragraph(self._reverse_hebrew_text(line), styles['centered_small']))
         
         # Divider line
         story.append(Spacer(1, 10))
@@ -317,12 +494,7 @@ class TemplateHebrewPDFGenerator:
         
         # Section title - centered
         section_title = self._reverse_hebrew_text("פרטי רכב")
-        centered_style = ParagraphStyle(
-            'CenteredLarge',
-            parent=styles['large'],
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph(section_title, centered_style))
+        story.append(Paragraph(section_title, styles['centered_large']))
         story.append(Spacer(1, 10))
         
         # Vehicle data
@@ -346,29 +518,7 @@ class TemplateHebrewPDFGenerator:
         
         # Create table with card styling - data on left, labels on right
         vehicle_table = Table(vehicle_data, colWidths=[3*inch, 2.5*inch])
-        vehicle_table.setStyle(TableStyle([
-            # Data column styling (left column)
-            ('BACKGROUND', (0, 0), (0, -1), self.colors['tableStripeA']),
-            ('TEXTCOLOR', (0, 0), (0, -1), self.colors['text']),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            # Label column styling (right column)
-            ('BACKGROUND', (1, 0), (1, -1), self.colors['surface']),
-            ('TEXTCOLOR', (1, 0), (1, -1), self.colors['text']),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            # Common styling
-            ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            # Borders
-            ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border']),
-            # Alternating row colors
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.colors['tableStripeA'], self.colors['tableStripeB']])
-        ]))
+        vehicle_table.setStyle(self.registry.table_styles['vehicle'])
         
         story.append(vehicle_table)
         story.append(Spacer(1, 25))
@@ -381,12 +531,7 @@ class TemplateHebrewPDFGenerator:
         
         # Section title - centered
         section_title = self._reverse_hebrew_text("רשומות תחזוקה")
-        centered_style = ParagraphStyle(
-            'CenteredLarge',
-            parent=styles['large'],
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph(section_title, centered_style))
+        story.append(Paragraph(section_title, styles['centered_large']))
         story.append(Spacer(1, 10))
         
         if maintenance_records:
@@ -432,28 +577,7 @@ class TemplateHebrewPDFGenerator:
             
             # Create table
             maintenance_table = Table(table_data, colWidths=[1.2*inch, 1.2*inch, 2.4*inch, 0.8*inch, 0.8*inch])
-            maintenance_table.setStyle(TableStyle([
-                # Header styling
-                ('BACKGROUND', (0, 0), (-1, 0), self.colors['tableHeaderBg']),
-                ('TEXTCOLOR', (0, 0), (-1, 0), self.colors['tableHeaderFg']),
-                ('FONTNAME', (0, 0), (-1, 0), self.hebrew_font),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('FONTWEIGHT', (0, 0), (-1, 0), 'bold'),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('TOPPADDING', (0, 0), (-1, 0), 12),
-                # Data styling
-                ('FONTNAME', (0, 1), (-1, -1), self.hebrew_font),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 8),
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.colors['tableStripeA'], self.colors['tableStripeB']]),
-                # Borders
-                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
-            ]))
+            maintenance_table.setStyle(self.registry.table_styles['records'])
             
             story.append(maintenance_table)
         else:
@@ -473,12 +597,7 @@ class TemplateHebrewPDFGenerator:
         if fault_records:
             # Section title - centered
             section_title = self._reverse_hebrew_text("דוחות תקלות")
-            centered_style = ParagraphStyle(
-                'CenteredLarge',
-                parent=styles['large'],
-                alignment=TA_CENTER
-            )
-            story.append(Paragraph(section_title, centered_style))
+            story.append(Paragraph(section_title, styles['centered_large']))
             story.append(Spacer(1, 10))
             
             # Table headers
@@ -505,28 +624,7 @@ class TemplateHebrewPDFGenerator:
             
             # Create table
             fault_table = Table(table_data, colWidths=[1.2*inch, 1.4*inch, 1*inch, 1.2*inch, 1.2*inch])
-            fault_table.setStyle(TableStyle([
-                # Header styling
-                ('BACKGROUND', (0, 0), (-1, 0), self.colors['tableHeaderBg']),
-                ('TEXTCOLOR', (0, 0), (-1, 0), self.colors['tableHeaderFg']),
-                ('FONTNAME', (0, 0), (-1, 0), self.hebrew_font),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('FONTWEIGHT', (0, 0), (-1, 0), 'bold'),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('TOPPADDING', (0, 0), (-1, 0), 12),
-                # Data styling
-                ('FONTNAME', (0, 1), (-1, -1), self.hebrew_font),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 8),
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.colors['tableStripeA'], self.colors['tableStripeB']]),
-                # Borders
-                ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
-            ]))
+            fault_table.setStyle(self.registry.table_styles['records'])
             
             story.append(fault_table)
             story.append(Spacer(1, 25))
@@ -560,28 +658,7 @@ class TemplateHebrewPDFGenerator:
         
         # Create summary table
         summary_table = Table(summary_data, colWidths=[2.5*inch, 1.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.colors['surface']),
-            ('TEXTCOLOR', (0, 0), (0, -1), self.colors['text']),
-            ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            # Data styling
-            ('BACKGROUND', (1, 0), (1, -1), self.colors['tableStripeA']),
-            ('TEXTCOLOR', (1, 0), (1, -1), self.colors['text']),
-            # Special styling for total cost
-            ('BACKGROUND', (0, 4), (1, 4), self.colors['accent']),
-            ('TEXTCOLOR', (0, 4), (1, 4), self.colors['text']),
-            ('FONTWEIGHT', (0, 4), (1, 4), 'bold'),
-            # Borders
-            ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
-        ]))
+        summary_table.setStyle(self.registry.table_styles['summary'])
         
         story.append(summary_table)
         story.append(Spacer(1, 25))
@@ -604,20 +681,7 @@ class TemplateHebrewPDFGenerator:
         ]
         
         signature_table = Table(signature_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-        signature_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), self.hebrew_font),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            # Borders
-            ('BOX', (0, 0), (-1, -1), 1, self.colors['border']),
-            ('INNERGRID', (0, 0), (-1, -1), 0.5, self.colors['border'])
-        ]))
+        signature_table.setStyle(self.registry.table_styles['signature'])
         
         story.append(signature_table)
         story.append(Spacer(1, 25))
@@ -629,7 +693,7 @@ class TemplateHebrewPDFGenerator:
         story = []
         
         # Footer content
-        footer_text = f"Confidential — Operations | עמוד 1 מתוך 1 | גרסה 1.0"
+        footer_text = f"Confidential — Operations | עמוד 1 מתוך 1 | גרסה {TEMPLATE_VERSION}"
         story.append(Paragraph(self._reverse_hebrew_text(footer_text), styles['xs']))
         
         return story
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Vehicle Repository for Fleet Management System
+Process-wide in-memory view of the vehicle catalog and maintenance records.
+Files are loaded once and reloaded only when their generation, mtime or size changes.
+"""
+
+import os
+import time
+import logging
+import threading
+from bisect import insort
+from typing import Dict, List, Optional, Tuple, Any
+
+from src.core.atomic_json import read_generation
+from src.core.fleet_models import MaintenanceRecord, Vehicle, load_records
+
+# Project root (two levels above src/core)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_VEHICLE_CATALOG_PATH = os.path.join(project_root, 'data', 'large_vehicle_catalog.json')
+DEFAULT_MAINTENANCE_RECORDS_PATH = os.path.join(project_root, 'data', 'vehicles', 'maintenance_records.json')
+
+logger = logging.getLogger(__name__)
+
+# Record type each data file's items are loaded as, by list key
+ROW_TYPES = {'vehicles': Vehicle, 'records': MaintenanceRecord}
+
+
+def normalize_license_plate(license_plate: Any) -> str:
+    """Normalize a license plate for lookups: no dashes, no spaces, upper case"""
+    if not license_plate:
+        return ''
+    return str(license_plate).replace('-', '').replace(' ', '').upper()
+
+
+class _PlateIndex:
+    """
+    Normalized plate -> positions of the items carrying that plate
+    Positions are kept in file order, so the first position is the first match
+    """
+
+    __slots__ = ('positions',)
+
+    def __init__(self, positions: Dict[str, List[int]]):
+        self.positions = positions
+
+    @classmethod
+    def build(cls, items: List[Dict]) -> '_PlateIndex':
+        """Build the index from scratch"""
+        positions = {}
+        for position, item in enumerate(items):
+            plate = normalize_license_plate(item.get('license_plate', ''))
+            if plate:
+                positions.setdefault(plate, []).append(position)
+        return cls(positions)
+
+    def rebuilt_for(self, old_items: List[Dict], new_items: List[Dict],
+                    changed: Optional[List[int]] = None) -> '_PlateIndex':
+        """
+        Return an index for new_items, reusing this index where possible
+
+        When the item count is unchanged only the rows that differ are re-indexed;
+        the untouched position lists are shared with the previous index.
+
+        Args:
+            old_items: Items this index was built for
+            new_items: Items to index
+            changed: Positions known to differ (from the sync change set); skips comparing every row
+        """
+        if len(old_items) != len(new_items):
+            return _PlateIndex.build(new_items)
+
+        if changed is None:
+            changed = [position for position, (old, new) in enumerate(zip(old_items, new_items)) if old != new]
+        if not changed:
+            return self
+        if len(changed) > len(new_items) // 4:
+            return _PlateIndex.build(new_items)
+
+        positions = dict(self.positions)
+        copied = set()
+
+        def _own(plate):
+            # Copy a position list before the first write so readers of the old index are unaffected
+            if plate not in copied:
+                positions[plate] = list(positions.get(plate, []))
+                copied.add(plate)
+            return positions[plate]
+
+        for position in changed:
+            old_plate = normalize_license_plate(old_items[position].get('license_plate', ''))
+            new_plate = normalize_license_plate(new_items[position].get('license_plate', ''))
+            if old_plate:
+                _own(old_plate).remove(position)
+                if not positions[old_plate]:
+                    del positions[old_plate]
+                    copied.discard(old_plate)
+            if new_plate:
+                insort(_own(new_plate), position)
+
+        return _PlateIndex(positions)
+
+    def get(self, license_plate: Any) -> List[int]:
+        """Get positions for a (not yet normalized) plate"""
+        return self.positions.get(normalize_license_plate(license_plate), [])
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+class _SnapshotPlateIndex:
+    """Plate index answered by binary search over the catalog snapshot's sorted plate block"""
+
+    __slots__ = ('snapshot',)
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def rebuilt_for(self, old_items, new_items, changed=None) -> _PlateIndex:
+        # Nothing to reuse: the next load came from JSON, index it from scratch
+        return _PlateIndex.build(new_items)
+
+    def get(self, license_plate: Any) -> List[int]:
+        """Get positions for a (not yet normalized) plate"""
+        return self.snapshot.find_plate_positions(normalize_license_plate(license_plate))
+
+    def __len__(self) -> int:
+        return self.snapshot.indexed_plates
+
+
+class _FileSnapshot:
+    """Parsed contents of a JSON data file with its plate index and the stat signature it was read at"""
+
+    __slots__ = ('signature', 'items', 'plate_index', 'sync_id')
+
+    def __init__(self, signature: Optional[Tuple], items: List[Dict], plate_index: _PlateIndex = None,
+                 sync_id: Optional[str] = None):
+        self.signature = signature
+        self.items = items
+        self.plate_index = plate_index if plate_index is not None else _PlateIndex.build(items)
+        self.sync_id = sync_id  # Excel sync that wrote the file, if any
+
+
+def _changed_positions(changes: Dict, previous: _FileSnapshot) -> Optional[List[int]]:
+    """
+    Positions to re-index according to the Excel sync change set
+
+    Only usable when the file was written as a delta on top of exactly the snapshot
+    we hold and no rows moved; otherwise returns None (compare every row).
+    """
+    if (not changes or changes.get('full') or not changes.get('same_layout')
+            or previous.sync_id is None or changes.get('base_sync_id') != previous.sync_id):
+        return None
+    return changes.get('changed_positions')
+
+
+class _RepositoryState:
+    """Immutable state published by a (re)load; swapped in as a single reference"""
+
+    __slots__ = ('vehicles', 'records')
+
+    def __init__(self, vehicles: _FileSnapshot, records: _FileSnapshot):
+        self.vehicles = vehicles
+        self.records = records
+
+
+def _file_signature(path: str) -> Optional[Tuple[Optional[int], int, int]]:
+    """
+    Return (generation, mtime_ns, size) for a file, or None if it cannot be stat'ed
+
+    The generation (bumped by write_json_atomic) catches rewrites that keep the same
+    size within the filesystem's mtime resolution; mtime and size catch other writers.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (read_generation(path), stat.st_mtime_ns, stat.st_size)
+
+
+class VehicleRepository:
+    """
+    In-memory vehicle and maintenance record store
+    Serves lookups from memory and reloads each file atomically when it changes on disk
+    """
+
+    def __init__(self,
+                 vehicle_catalog_path: str = DEFAULT_VEHICLE_CATALOG_PATH,
+                 maintenance_records_path: str = DEFAULT_MAINTENANCE_RECORDS_PATH,
+                 check_interval: float = 1.0,
+                 memory_map: bool = False):
+        """
+        Initialize the repository.
+
+        Args:
+            vehicle_catalog_path: Path to the vehicle catalog JSON
+            maintenance_records_path: Path to the maintenance records JSON
+            check_interval: Minimum seconds between stat checks for file changes
+            memory_map: Serve vehicles from a read-only memory map of the catalog snapshot,
+                decoding each vehicle when it is accessed instead of keeping decoded
+                vehicles resident (the map is shared by all processes through the page cache)
+        """
+        self.vehicle_catalog_path = vehicle_catalog_path
+        self.maintenance_records_path = maintenance_records_path
+        self.check_interval = check_interval
+        self.memory_map = memory_map
+
+        self._reload_lock = threading.Lock()
+        self._last_check = 0.0
+        self._state = _RepositoryState(_FileSnapshot(None, []), _FileSnapshot(None, []))
+        self._loaded = False
+
+    def _load_catalog_snapshot(self, signature: Optional[Tuple]) -> Optional[_FileSnapshot]:
+        """Load the vehicle catalog from its compact snapshot if it is fresh"""
+        if signature is None:
+            return None
+        # Imported here: catalog_snapshot imports normalize_license_plate from this module
+        from src.core.catalog_snapshot import CatalogSnapshot
+
+        snapshot = CatalogSnapshot.load(self.vehicle_catalog_path, list(signature),
+                                        memory_map=self.memory_map, cache_rows=not self.memory_map,
+                                        row_type=Vehicle)
+        if snapshot is None:
+            return None
+        changes = snapshot.meta.get('changes')
+        return _FileSnapshot(signature, snapshot.rows, _SnapshotPlateIndex(snapshot),
+                             changes.get('sync_id') if changes else None)
+
+    def _load_file(self, path: str, key: str, signature: Optional[Tuple],
+                   previous: _FileSnapshot) -> _FileSnapshot:
+        """Read one JSON data file into records, updating the previous plate index incrementally"""
+        if path == self.vehicle_catalog_path:
+            loaded = self._load_catalog_snapshot(signature)
+            if loaded is not None:
+                return loaded
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items, data = load_records(f, key, ROW_TYPES[key])
+            changes = data.get('changes')
+        except Exception as e:
+            logger.error(f"Error loading {path}: {e}")
+            items = []
+            changes = None
+
+        plate_index = previous.plate_index.rebuilt_for(previous.items, items, _changed_positions(changes, previous))
+        return _FileSnapshot(signature, items, plate_index, changes.get('sync_id') if changes else None)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload any data file whose generation, mtime or size changed since the last load
+
+        Args:
+            force: Skip the check interval and re-stat both files now
+
+        Returns:
+            True if anything was reloaded
+        """
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_check < self.check_interval:
+            return False
+
+        with self._reload_lock:
+            self._last_check = time.monotonic()
+            state = self._state
+
+            vehicle_signature = _file_signature(self.vehicle_catalog_path)
+            records_signature = _file_signature(self.maintenance_records_path)
+
+            vehicles = state.vehicles
+            records = state.records
+            changed = False
+
+            if not self._loaded or vehicle_signature != vehicles.signature:
+                vehicles = self._load_file(self.vehicle_catalog_path, 'vehicles', vehicle_signature, vehicles)
+                changed = True
+                logger.info(f"Loaded {len(vehicles.items)} vehicles from {self.vehicle_catalog_path}")
+
+            if not self._loaded or records_signature != records.signature:
+                records = self._load_file(self.maintenance_records_path, 'records', records_signature, records)
+                changed = True
+                logger.info(f"Loaded {len(records.items)} maintenance records from {self.maintenance_records_path}")
+
+            if changed:
+                # Publish the new state with a single reference swap so readers
+                # never observe a half-reloaded repository
+                self._state = _RepositoryState(vehicles, records)
+            self._loaded = True
+            return changed
+
+    def _current_state(self) -> _RepositoryState:
+        """Return the current state, reloading first if the files changed"""
+        self.refresh()
+        return self._state
+
+    def get_vehicles(self) -> List[Vehicle]:
+        """Get all vehicles in the catalog"""
+        return self._current_state().vehicles.items
+
+    def get_maintenance_records(self) -> List[MaintenanceRecord]:
+        """Get all maintenance records"""
+        return self._current_state().records.items
+
+    def find_vehicle_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
+        """
+        Find a vehicle by license plate, ignoring dashes, spaces and case
+
+        Args:
+            license_plate: License plate as typed by the user
+
+        Returns:
+            The first catalog vehicle with that plate, or None
+        """
+        vehicles = self._current_state().vehicles
+        positions = vehicles.plate_index.get(license_plate)
+        return vehicles.items[positions[0]] if positions else None
+
+    def get_maintenance_records_for_plate(self, license_plate: str) -> List[MaintenanceRecord]:
+        """Get all maintenance records for a license plate, in file order"""
+        records = self._current_state().records
+        return [records.items[position] for position in records.plate_index.get(license_plate)]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get repository load status for health output"""
+        state = self._state
+        return {
+            'loaded': self._loaded,
+            'vehicle_count': len(state.vehicles.items),
+            'maintenance_record_count': len(state.records.items),
+            'indexed_plates': len(state.vehicles.plate_index),
+            'vehicles_from_snapshot': isinstance(state.vehicles.plate_index, _SnapshotPlateIndex),
+            'memory_map': self.memory_map,
+            'vehicle_catalog_signature': state.vehicles.signature,
+            'maintenance_records_signature': state.records.signature
+        }
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def _default_repository():
+    """The SQLite datastore when it is configured and populated, the JSON files otherwise"""
+    # Imported here: fleet_datastore imports normalize_license_plate from this module
+    from src.core.fleet_datastore import get_fleet_datastore
+
+    datastore = get_fleet_datastore()
+    if datastore is not None:
+        if datastore.is_populated():
+            return datastore
+        logger.warning(f"Datastore {datastore.db_path} has not been synced yet, reading the JSON files")
+    return VehicleRepository()
+
+
+def get_vehicle_repository() -> VehicleRepository:
+    """
+    Get the process-wide vehicle repository, creating it on first use
+
+    With "datastore": {"backend": "sqlite"} in config.json this is the FleetDatastore,
+    which offers the same read methods.
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = _default_repository()
+    return _repository
+
+
+def configure_vehicle_repository(vehicle_catalog_path: str = DEFAULT_VEHICLE_CATALOG_PATH,
+                                 maintenance_records_path: str = DEFAULT_MAINTENANCE_RECORDS_PATH,
+                                 check_interval: float = 1.0,
+                                 memory_map: bool = False) -> VehicleRepository:
+    """Replace the process-wide vehicle repository (e.g. to point it at other data files)"""
+    global _repository
+    with _repository_lock:
+        _repository = VehicleRepository(vehicle_catalog_path, maintenance_records_path, check_interval, memory_map)
+    return _repository
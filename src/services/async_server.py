@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Async Server for Fleet Management System
+Serves /webhook, /download/<filename>, /jobs, /health and /reload from an ASGI app
+(Starlette on uvicorn), so one process keeps thousands of webhook requests in
+flight on its event loop instead of parking a thread on each one.
+
+The reply logic is shared with the Flask app (simple_server.handle_webhook_message).
+Plate searches are answered on the event loop straight from the in-memory
+repository. Work that blocks runs in a bounded thread pool: PDF rendering for
+report requests, repository reloads, datastore queries and health collection.
+The repository is reloaded by a background task, so a lookup on the loop never
+waits for a JSON file to be read. Recently fetched small reports are served from
+memory, others are streamed from disk in chunks; both answer conditional and
+range requests.
+
+Host and port come from the "server" section of config/config.json, the pool
+size and reload interval from the "async_server" section.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+import functools
+from datetime import datetime
+from email.utils import formatdate
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from urllib.parse import parse_qsl
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.routing import Route
+
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+from src.core.vehicle_repository import VehicleRepository
+from src.services import simple_server
+from src.services.production_server import load_server_config, preload_app
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+
+DEFAULT_ASYNC_CONFIG = {
+    'executor_threads': 8,  # threads for blocking work (PDF rendering, reloads, datastore queries)
+    'refresh_interval_seconds': 1.0,
+    'backlog': 2048
+}
+
+
+def load_async_config() -> Dict:
+    """Read the async_server section of config/config.json over the defaults"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return {**DEFAULT_ASYNC_CONFIG, **json.load(f).get('async_server', {})}
+    except Exception as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+        return dict(DEFAULT_ASYNC_CONFIG)
+
+
+async def run_blocking(app, function, *args):
+    """Run a blocking call in the app's thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.executor, functools.partial(function, *args))
+
+
+async def refresh_repository_periodically(app, interval: float):
+    """Reload changed data files in the thread pool every interval seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_blocking(app, app.state.repository.refresh, True)
+        except Exception as e:
+            logger.error(f"Error refreshing repository: {e}")
+
+
+async def request_values(request) -> Dict[str, str]:
+    """Query and urlencoded form values of a request (like Flask's request.values)"""
+    values = {}
+    if request.headers.get('content-type', '').startswith('application/x-www-form-urlencoded'):
+        body = await request.body()
+        values.update(parse_qsl(body.decode('utf-8', errors='replace'), keep_blank_values=True))
+    values.update(request.query_params)
+    return values
+
+
+def to_asgi_response(reply) -> Response:
+    """Convert a Flask/werkzeug Response built by the shared handlers"""
+    return Response(reply.get_data(), status_code=reply.status_code, media_type=reply.mimetype)
+
+
+async def webhook(request):
+    """Main webhook endpoint for WhatsApp messages"""
+    values = await request_values(request)
+    incoming_msg = values.get('Body', '').strip()
+    sender = values.get('From', '')
+
+    intent_match = None
+    if incoming_msg:
+        try:
+            intent_match = simple_server.get_intent_matcher().match(incoming_msg)
+        except Exception as e:
+            logger.error(f"Error matching intent: {e}")
+
+    # Searches and help replies only read memory; reports render PDFs and the
+    # datastore runs queries, so those go to the thread pool
+    if not incoming_msg or (intent_match is not None and request.app.state.lookups_in_memory
+                            and intent_match.intent not in simple_server.REPORT_INTENTS):
+        reply = simple_server.handle_webhook_message(incoming_msg, sender, intent_match)
+    else:
+        reply = await run_blocking(request.app, simple_server.handle_webhook_message,
+                                   incoming_msg, sender, intent_match)
+    return to_asgi_response(reply)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True if an If-None-Match header names the ETag (or is *)"""
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == f'"{etag}"' for tag in if_none_match.split(','))
+
+
+def parse_byte_range(range_header: str, size: int):
+    """
+    The single byte range of a Range header
+
+    Returns:
+        (start, end) with end exclusive, None to send the whole file (no header,
+        several ranges or a malformed one), or () if the range is unsatisfiable
+    """
+    units, _, spec = range_header.partition('=')
+    if units.strip() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            start, end = max(size - int(last), 0), size
+        else:
+            start, end = int(first), min(int(last) + 1, size) if last else size
+    except ValueError:
+        return None
+    return (start, end) if start < end else ()
+
+
+def download_response(request, report_file) -> Response:
+    """Serve a resolved report: 304 for a matching ETag, 206 for a byte range, 200 otherwise"""
+    headers = {
+        'etag': f'"{report_file.etag}"',
+        'cache-control': f"public, max-age={simple_server.download_max_age()}",
+        'last-modified': formatdate(report_file.mtime, usegmt=True),
+        'accept-ranges': 'bytes'
+    }
+    if etag_matches(request.headers.get('if-none-match', ''), report_file.etag):
+        return Response(status_code=304, headers=headers)
+
+    if report_file.content is None:
+        # Streamed from disk in chunks; FileResponse answers Range requests itself (starlette 0.39+)
+        return FileResponse(report_file.path, filename=report_file.filename, headers=headers)
+
+    headers['content-disposition'] = f'attachment; filename="{report_file.filename}"'
+    byte_range = None
+    if_range = request.headers.get('if-range')
+    if 'range' in request.headers and (if_range is None or if_range in (headers['etag'], headers['last-modified'])):
+        byte_range = parse_byte_range(request.headers['range'], report_file.size)
+    if byte_range == ():
+        return Response(status_code=416, headers={'content-range': f"bytes */{report_file.size}"})
+    if byte_range:
+        start, end = byte_range
+        headers['content-range'] = f"bytes {start}-{end - 1}/{report_file.size}"
+        return Response(report_file.content[start:end], status_code=206, headers=headers,
+                        media_type='application/pdf')
+    return Response(report_file.content, headers=headers, media_type='application/pdf')
+
+
+async def download_file(request):
+    """Serve a generated PDF report, from memory when it was fetched recently"""
+    filename = request.path_params['filename']
+    try:
+        download_cache = simple_server.get_report_download_cache()
+        report_file = download_cache.cached(filename)
+        if report_file is None:
+            report_file = await run_blocking(request.app, download_cache.lookup, filename)
+        if report_file is None:
+            return JSONResponse({"error": "File not found"}, status_code=404)
+        return download_response(request, report_file)
+    except Exception as e:
+        logger.error(f"Error serving file {filename}: {e}")
+        return JSONResponse({"error": "File serving error"}, status_code=500)
+
+
+async def reload_data(request):
+    """Reload data files now (called by the Excel sync watcher after it writes new data)"""
+    # Tunnelled requests also arrive from localhost but carry X-Forwarded-For
+    client_host = request.client.host if request.client else None
+    if client_host not in ('127.0.0.1', '::1') or request.headers.get('x-forwarded-for'):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+
+    repository = request.app.state.repository
+    reloaded = await run_blocking(request.app, repository.refresh, True)
+    logger.info(f"Reload requested, data {'reloaded' if reloaded else 'already current'}")
+    status = await run_blocking(request.app, repository.get_status)
+    return JSONResponse({"reloaded": reloaded, "repository": status,
+                         "timestamp": datetime.now().isoformat()})
+
+
+async def report_jobs_metrics(request):
+    """Report job queue depth and counters"""
+    return JSONResponse(simple_server.report_jobs_status())
+
+
+async def report_job_status(request):
+    """Status of a queued report job (full id or the reference sent to the requester)"""
+    job_queue = simple_server.get_report_job_queue()
+    job = job_queue.get_job(request.path_params['job_id']) if job_queue is not None else None
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse(job)
+
+
+async def health_check(request):
+    """Health check endpoint"""
+    status = await run_blocking(request.app, simple_server.health_status, "async_fleet_server")
+    status["executor_threads"] = request.app.state.executor_threads
+    return JSONResponse(status)
+
+
+def create_app(async_config: Dict = None) -> Starlette:
+    """
+    Build the ASGI app
+
+    Args:
+        async_config: async_server settings (read from config.json when omitted)
+
+    Returns:
+        The Starlette app; data is loaded when the server starts it
+    """
+    async_config = async_config or load_async_config()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.executor_threads = async_config['executor_threads']
+        app.state.executor = ThreadPoolExecutor(max_workers=async_config['executor_threads'],
+                                                thread_name_prefix='fleet-blocking')
+        await run_blocking(app, preload_app)
+        repository = simple_server.get_vehicle_repository()
+        app.state.repository = repository
+        app.state.lookups_in_memory = isinstance(repository, VehicleRepository)
+        simple_server.get_public_url_provider()
+        simple_server.get_report_janitor()
+
+        refresh_task = None
+        if app.state.lookups_in_memory:
+            # Lookups never stat or reload inline; the background task does it
+            repository.check_interval = float('inf')
+            refresh_task = asyncio.create_task(
+                refresh_repository_periodically(app, async_config['refresh_interval_seconds']))
+        logger.info(f"Async server ready ({async_config['executor_threads']} threads for blocking work)")
+        try:
+            yield
+        finally:
+            if refresh_task is not None:
+                refresh_task.cancel()
+            app.state.executor.shutdown(wait=False)
+
+    routes = [
+        Route('/webhook', webhook, methods=['POST']),
+        Route('/download/{filename}', download_file),
+        Route('/jobs', report_jobs_metrics),
+        Route('/jobs/{job_id}', report_job_status),
+        Route('/reload', reload_data, methods=['POST']),
+        Route('/health', health_check)
+    ]
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run the fleet webhook server as an async (ASGI) app')
+    parser.add_argument('--host', help='Bind address (server.host in config.json)')
+    parser.add_argument('--port', type=int, help='Port (server.port in config.json)')
+    args = parser.parse_args()
+
+    if not UVICORN_AVAILABLE:
+        logger.error("uvicorn is not installed: pip install uvicorn")
+        return 1
+
+    server_config = load_server_config()
+    async_config = load_async_config()
+    host = args.host or server_config['host']
+    port = args.port or server_config['port']
+
+    try:
+        logger.info(f"Starting async server on {host}:{port}")
+        uvicorn.run(create_app(async_config), host=host, port=port, backlog=async_config['backlog'],
+                    timeout_keep_alive=server_config['keepalive_seconds'], log_level='info')
+        return 0
+    except Exception as e:
+        logger.error(f"Failed to start server: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher
+Classifies incoming WhatsApp messages with one compiled regex built from the
+webhook command phrases and data/gazetteer.json, extracting license plates in
+the same pass over the message.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_PATH = os.path.join(project_root, 'data', 'gazetteer.json')
+
+# Webhook intents in precedence order (earlier wins ties)
+INTENTS = ('vehicle_search', 'fault_report', 'maintenance_report')
+HELP_INTENT = 'help'
+
+# Tie order when only gazetteer keywords match: vehicle words ("car", "רכב") appear
+# in most messages, so a fault or maintenance word decides a tie against them
+KEYWORD_INTENTS = ('fault_report', 'maintenance_report', 'vehicle_search')
+
+# Explicit command phrases, matched anywhere in the message
+COMMAND_PHRASES = {
+    'vehicle_search': ['search', 'חיפוש', 'מצא', 'find', 'חפש'],
+    'fault_report': ['fault report', 'דוח תקלות', 'תקלות', 'דוח תקלה'],
+    'maintenance_report': ['maintenance report', 'דוח תחזוקה', 'דוח טיפולים', 'תחזוקה', 'טיפולים']
+}
+
+# Gazetteer keyword groups feeding each intent
+GAZETTEER_GROUPS = {
+    'vehicle_search': 'vehicle_search',
+    'maintenance': 'maintenance_report',
+    'repair_request': 'fault_report',
+    'help_commands': HELP_INTENT
+}
+
+COMMAND_WEIGHT = 10
+KEYWORD_WEIGHT = 1
+
+# Hebrew single-letter prefixes (ב, ה, ו, כ, ל, מ, ש) allowed before a gazetteer keyword
+HEBREW_PREFIXES = 'בהוכלמש'
+
+LICENSE_PLATE_PATTERN = r'\d{2}[- ]?\d{3}[- ]?\d{2}'
+
+
+@dataclass
+class IntentMatch:
+    """Classification of one message"""
+    intent: str  # one of INTENTS, or 'help'
+    scores: Dict[str, int] = field(default_factory=dict)
+    license_plates: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+
+    @property
+    def license_plate(self) -> Optional[str]:
+        """First license plate in the message, with spaces turned into dashes"""
+        return self.license_plates[0].replace(' ', '-') if self.license_plates else None
+
+
+def _alternation(phrases) -> str:
+    """
+    Regex matching any of the phrases, factored into a prefix trie
+
+    Python's re tries alternatives one by one; sharing prefixes keeps each position
+    cheap. Optional suffixes are greedy, so the longest phrase wins at a position.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class IntentMatcher:
+    """
+    Compiled intent classifier
+
+    Command phrases match anywhere (as substrings) and keep their fixed precedence,
+    so messages with a command classify as they did before the gazetteer was used.
+    Gazetteer keywords must be whole words (optionally with a Hebrew prefix letter)
+    and only decide the intent when no command phrase is present and the message
+    carries a license plate: "תקלה ברכב 12-345-67" is a fault report, while
+    "איך מבקשים דוח?" still gets help.
+    """
+
+    def __init__(self, gazetteer_path: str = DEFAULT_GAZETTEER_PATH, check_interval: float = 1.0):
+        """
+        Initialize the matcher.
+
+        Args:
+            gazetteer_path: Path to the gazetteer JSON
+            check_interval: Minimum seconds between gazetteer modification checks
+        """
+        self.gazetteer_path = gazetteer_path
+        self.check_interval = check_interval
+
+        self._reload_lock = threading.Lock()
+        self._signature = None
+        self._last_check = 0.0
+        self._compiled = self._compile({})
+        self.refresh(force=True)
+
+    def _load_gazetteer_keywords(self) -> Dict[str, List[str]]:
+        """Read gazetteer keywords per intent (all languages)"""
+        with open(self.gazetteer_path, 'r', encoding='utf-8') as f:
+            groups = json.load(f).get('keywords', {})
+
+        keywords = {}
+        for group, intent in GAZETTEER_GROUPS.items():
+            for words in groups.get(group, {}).values():
+                keywords.setdefault(intent, []).extend(word.lower() for word in words if word)
+        return keywords
+
+    @staticmethod
+    def _compile(gazetteer_keywords: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Build the single-pass pattern
+
+        Returns:
+            Tuple of (pattern, command phrase -> intents, keyword -> intents)
+        """
+        command_intents = {}
+        for intent, phrases in COMMAND_PHRASES.items():
+            for phrase in phrases:
+                command_intents.setdefault(phrase, []).append(intent)
+
+        keyword_intents = {}
+        for intent, words in gazetteer_keywords.items():
+            for word in words:
+                if intent not in keyword_intents.setdefault(word, []):
+                    keyword_intents[word].append(intent)
+
+        # Group order matters: match() unpacks findall() tuples as (command, plate, keyword)
+        word_start = rf'(?:(?<![^\W\d_])|(?<=(?<![^\W\d_])[{HEBREW_PREFIXES}]))'
+        keywords = _alternation(keyword_intents) if keyword_intents else '(?!)'
+        pattern = '|'.join([
+            rf'(?P<command>{_alternation(command_intents)})',
+            rf'(?P<plate>{LICENSE_PLATE_PATTERN})',
+            rf'{word_start}(?P<keyword>{keywords})(?![^\W\d_])'
+        ])
+
+        return re.compile(pattern), command_intents, keyword_intents
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Recompile if the gazetteer changed
+
+        Returns:
+            True if the pattern was rebuilt
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._reload_lock:
+            self._last_check = now
+            try:
+                stat = os.stat(self.gazetteer_path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature = None
+
+            if signature == self._signature and not force:
+                return False
+
+            try:
+                keywords = self._load_gazetteer_keywords() if signature else {}
+            except Exception as e:
+                logger.error(f"Error loading gazetteer: {e}")
+                return False
+
+            self._compiled = self._compile(keywords)
+            self._signature = signature
+            logger.info(f"Compiled intent matcher with {sum(len(w) for w in keywords.values())} gazetteer keywords")
+            return True
+
+    def match(self, message: str) -> IntentMatch:
+        """Classify a message and extract its license plates"""
+        self.refresh()
+        pattern, command_intents, keyword_intents = self._compiled
+
+        scores = {}
+        command_hits = set()
+        plates = []
+        keywords = []
+        for command, plate, keyword in pattern.findall(message.lower()):
+            if plate:
+                plates.append(plate)
+                continue
+            if command:
+                intents, weight = command_intents[command], COMMAND_WEIGHT
+                command_hits.update(intents)
+                keywords.append(command)
+            else:
+                intents, weight = keyword_intents[keyword], KEYWORD_WEIGHT
+                keywords.append(keyword)
+            for intent in intents:
+                scores[intent] = scores.get(intent, 0) + weight
+
+        if command_hits:
+            intent = next(intent for intent in INTENTS if intent in command_hits)
+        elif plates:
+            best = max(KEYWORD_INTENTS, key=lambda i: (scores.get(i, 0), -KEYWORD_INTENTS.index(i)))
+            intent = best if scores.get(best, 0) > 0 else HELP_INTENT
+        else:
+            intent = HELP_INTENT
+
+        return IntentMatch(intent=intent, scores=scores, license_plates=plates, keywords=keywords)
+
+
+_intent_matcher = None
+_intent_matcher_lock = threading.Lock()
+
+
+def get_intent_matcher() -> IntentMatcher:
+    """Get the process-wide intent matcher"""
+    global _intent_matcher
+    if _intent_matcher is None:
+        with _intent_matcher_lock:
+            if _intent_matcher is None:
+                _intent_matcher = IntentMatcher()
+    return _intent_matcher
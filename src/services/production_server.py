@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Production Server for Fleet Management System
+Serves the webhook app with a multi-worker WSGI server instead of Flask's
+single-process development server.
+
+The app is preloaded in the master process: the vehicle catalog and its plate
+index, the maintenance records, the PDF fonts and the compiled intent matcher are
+loaded once before the workers are forked, so every worker shares those pages
+copy-on-write instead of loading its own copy. Services that own threads (the
+public URL refresher, the report job queue, the report janitor, the Twilio send
+queue) start inside each worker.
+
+Each worker holds its own copy of the data: POST /reload reloads only the worker
+that receives it, the others pick the new files up through their own
+modification-time checks (at most repository check_interval seconds later).
+
+gunicorn is used when installed (Linux/macOS); otherwise waitress (also runs on
+Windows), which serves from one process with a thread pool. Settings come from
+the "server" section of config/config.json.
+"""
+
+import os
+import gc
+import sys
+import json
+import logging
+import argparse
+from typing import Dict
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+# Set in the master before forking so each worker knows how many processes share account limits
+SERVER_PROCESSES_ENV = 'FLEET_SERVER_PROCESSES'
+
+DEFAULT_SERVER_CONFIG = {
+    'production': False,  # SystemManager starts this server instead of simple_server.py (opt-in)
+    'host': '0.0.0.0',
+    'port': 5000,
+    'workers': 0,  # 0 = one per CPU core
+    'threads': 4,
+    'keepalive_seconds': 5,
+    'timeout_seconds': 120,
+    'async': False  # SystemManager starts the async (ASGI) server instead
+}
+
+
+def load_server_config() -> Dict:
+    """Read the server section of config/config.json over the defaults"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return {**DEFAULT_SERVER_CONFIG, **json.load(f).get('server', {})}
+    except Exception as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+        return dict(DEFAULT_SERVER_CONFIG)
+
+
+def worker_count(server_config: Dict) -> int:
+    """Configured worker processes, or one per CPU core when set to 0"""
+    workers = int(server_config.get('workers') or 0)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def server_process_count() -> int:
+    """Processes serving the app (the gunicorn workers), 1 outside the production server"""
+    try:
+        return max(1, int(os.environ.get(SERVER_PROCESSES_ENV, 1)))
+    except ValueError:
+        return 1
+
+
+def preload_app():
+    """
+    Import the app and load everything the workers should share
+
+    Returns:
+        The Flask app
+    """
+    from src.core.template_hebrew_pdf import FontStyleRegistry
+    from src.services import simple_server
+
+    repository = simple_server.get_vehicle_repository()
+    repository.refresh(force=True)
+    simple_server.get_intent_matcher()
+    FontStyleRegistry.get_instance()
+    simple_server.get_report_cache()
+    logger.info(f"Preloaded app data: {repository.get_status()}")
+
+    # Everything loaded so far lives as long as the process. Moving it out of the
+    # collector's generations keeps collections in the workers from writing to
+    # (and so un-sharing) the inherited pages.
+    gc.collect()
+    gc.freeze()
+    return simple_server.app
+
+
+def start_worker_services():
+    """Start the per-process services that own threads (run in each worker after the fork)"""
+    from src.services import simple_server
+
+    simple_server.get_public_url_provider()
+    simple_server.get_report_janitor()
+
+
+def run_gunicorn(app, server_config: Dict):
+    """Serve with gunicorn: forked workers sharing the preloaded app, each with a thread pool"""
+
+    class FleetApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        'bind': f"{server_config['host']}:{server_config['port']}",
+        'workers': worker_count(server_config),
+        'worker_class': 'gthread',
+        'threads': server_config['threads'],
+        'keepalive': server_config['keepalive_seconds'],
+        'timeout': server_config['timeout_seconds'],
+        'preload_app': True,
+        'post_fork': lambda server, worker: start_worker_services()
+    }
+    os.environ[SERVER_PROCESSES_ENV] = str(options['workers'])
+    logger.info(f"Starting gunicorn with {options['workers']} workers x {options['threads']} threads "
+                f"on {options['bind']}")
+    FleetApplication(app, options).run()
+
+
+def run_waitress(app, server_config: Dict):
+    """Serve with waitress: one process, one thread per configured worker thread"""
+    threads = worker_count(server_config) * server_config['threads']
+    logger.info(f"gunicorn not available, starting waitress with {threads} threads "
+                f"on {server_config['host']}:{server_config['port']}")
+    start_worker_services()
+    waitress.serve(app, host=server_config['host'], port=server_config['port'], threads=threads,
+                   channel_timeout=server_config['keepalive_seconds'])
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run the fleet webhook server with a production WSGI server')
+    parser.add_argument('--host', help='Bind address (server.host in config.json)')
+    parser.add_argument('--port', type=int, help='Port (server.port in config.json)')
+    parser.add_argument('--workers', type=int, help='Worker processes, 0 for one per core (server.workers)')
+    args = parser.parse_args()
+
+    server_config = load_server_config()
+    for key in ('host', 'port', 'workers'):
+        if getattr(args, key) is not None:
+            server_config[key] = getattr(args, key)
+
+    try:
+        app = preload_app()
+        if GUNICORN_AVAILABLE:
+            run_gunicorn(app, server_config)
+        elif WAITRESS_AVAILABLE:
+            run_waitress(app, server_config)
+        else:
+            logger.warning("Neither gunicorn nor waitress is installed, falling back to the Flask development server")
+            start_worker_services()
+            app.run(host=server_config['host'], port=server_config['port'], debug=False, threaded=True)
+        return 0
+    except Exception as e:
+        logger.error(f"Failed to start server: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
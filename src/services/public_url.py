@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Public URL Provider
+Keeps the server's public base URL (ngrok tunnel or a configured static URL) cached
+and refreshed in the background, so request handlers never call the tunnel API.
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+NGROK_TUNNELS_API = 'http://localhost:4040/api/tunnels'
+
+
+def fetch_ngrok_url(api_url: str = NGROK_TUNNELS_API, timeout: float = 2.0) -> Optional[str]:
+    """Query the local ngrok agent for the https tunnel URL"""
+    try:
+        response = requests.get(api_url, timeout=timeout)
+        data = response.json()
+
+        for tunnel in data.get('tunnels', []):
+            if tunnel.get('proto') == 'https':
+                return tunnel.get('public_url')
+
+        return None
+    except Exception as e:
+        logger.debug(f"Error getting ngrok URL: {e}")
+        return None
+
+
+class PublicUrlProvider:
+    """
+    Cached public base URL
+
+    get_base_url() only reads cached state. A daemon thread refreshes the ngrok
+    URL every refresh_interval seconds; a tunnel URL that has not been confirmed
+    for ttl seconds is dropped and the static base URL is used instead.
+    """
+
+    def __init__(self,
+                 static_base_url: str = None,
+                 ttl: float = 60.0,
+                 refresh_interval: float = 15.0,
+                 tunnel_api_url: str = NGROK_TUNNELS_API,
+                 request_timeout: float = 2.0,
+                 default_base_url: str = 'http://localhost:5000'):
+        """
+        Initialize the provider.
+
+        Args:
+            static_base_url: Base URL used when no tunnel is known (e.g. a fixed domain)
+            ttl: Seconds a fetched tunnel URL stays valid without being re-confirmed
+            refresh_interval: Seconds between background tunnel API queries
+            tunnel_api_url: ngrok agent tunnels API
+            request_timeout: Timeout of each tunnel API call
+            default_base_url: Last resort when neither a tunnel nor a static URL is available
+        """
+        self.static_base_url = static_base_url.rstrip('/') if static_base_url else None
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.tunnel_api_url = tunnel_api_url
+        self.request_timeout = request_timeout
+        self.default_base_url = default_base_url
+
+        self._tunnel_url = None
+        self._fetched_at = 0.0  # time.monotonic() of the last successful fetch
+        self._last_checked = None
+        self._refresh_failures = 0
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def refresh(self) -> Optional[str]:
+        """Query the tunnel API now and update the cached URL"""
+        tunnel_url = fetch_ngrok_url(self.tunnel_api_url, self.request_timeout)
+        with self._lock:
+            self._last_checked = datetime.now().isoformat()
+            if tunnel_url:
+                if tunnel_url != self._tunnel_url:
+                    logger.info(f"Public URL is now {tunnel_url}")
+                self._tunnel_url = tunnel_url.rstrip('/')
+                self._fetched_at = time.monotonic()
+                self._refresh_failures = 0
+            else:
+                self._refresh_failures += 1
+        return tunnel_url
+
+    def _refresh_loop(self):
+        """Background refresh thread"""
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._stop_event.wait(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name='public-url-refresh', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop_event.set()
+
+    def _tunnel_url_if_fresh(self) -> Optional[str]:
+        """Cached tunnel URL, or None if it expired (caller holds the lock)"""
+        if self._tunnel_url and time.monotonic() - self._fetched_at <= self.ttl:
+            return self._tunnel_url
+        return None
+
+    def get_base_url(self) -> str:
+        """Current public base URL without a trailing slash (never blocks on I/O)"""
+        with self._lock:
+            return self._tunnel_url_if_fresh() or self.static_base_url or self.default_base_url
+
+    def build_url(self, path: str) -> str:
+        """Join a path onto the public base URL"""
+        return f"{self.get_base_url()}/{path.lstrip('/')}"
+
+    def get_status(self) -> Dict[str, Any]:
+        """Provider state for health output"""
+        with self._lock:
+            tunnel_url = self._tunnel_url_if_fresh()
+            return {
+                'base_url': tunnel_url or self.static_base_url or self.default_base_url,
+                'source': 'ngrok' if tunnel_url else ('static' if self.static_base_url else 'default'),
+                'last_checked': self._last_checked,
+                'refresh_failures': self._refresh_failures,
+                'background_refresh': self._thread is not None and self._thread.is_alive()
+            }
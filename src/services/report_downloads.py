@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Report Download Cache
+Resolves /download/<filename> requests to report files with a strong ETag (a hash
+of the PDF's content), and keeps the bytes of small recently served reports in
+memory. WhatsApp and Twilio fetch the same media URL several times, so repeat
+fetches are answered from memory without opening or even stat-ing the file;
+an entry is re-checked against the disk at most every revalidate_seconds.
+
+Larger reports are not kept in memory, but their ETag is remembered per file
+signature (inode, mtime, size) so the file is only hashed once. The servers
+send them straight from disk (sendfile under gunicorn).
+
+Downloads set the file's access time to now, which the report janitor reads as
+the report's last download time. Memory hits stamp it at most once every
+access_stamp_seconds per file, so often-fetched reports are not mistaken for
+unused ones.
+"""
+
+import os
+import stat
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+DEFAULT_MAX_ENTRIES = 4096
+HASH_CHUNK_BYTES = 1024 * 1024
+DEFAULT_ACCESS_STAMP_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class ReportFile:
+    """A report resolved for download"""
+    filename: str
+    path: str
+    size: int
+    mtime: float
+    etag: str  # hex content hash, unquoted
+    content: Optional[bytes]  # the PDF bytes when small enough to keep in memory
+    signature: Tuple[int, int, int]
+    checked_at: float
+    stamped_at: float  # when the file's access time was last set (time.monotonic())
+
+
+class ReportDownloadCache:
+    """
+    LRU of resolved report files, holding the bytes of small ones
+
+    Only plain files directly in reports_dir are served; hidden files (the report
+    cache index, reports still being rendered) are not.
+    """
+
+    def __init__(self,
+                 reports_dir: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                 revalidate_seconds: float = 5.0,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 access_stamp_seconds: float = DEFAULT_ACCESS_STAMP_SECONDS):
+        """
+        Initialize the download cache.
+
+        Args:
+            reports_dir: Directory the download route serves
+            max_bytes: Total report bytes kept in memory
+            max_file_bytes: Largest report kept in memory
+            revalidate_seconds: How long an entry is trusted before the file is stat-ed again
+            max_entries: Reports remembered (with or without their bytes)
+            access_stamp_seconds: Least time between access time updates for memory hits
+        """
+        self.reports_dir = reports_dir
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.max_entries = max_entries
+        self.access_stamp_seconds = access_stamp_seconds
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # filename -> ReportFile, least recently used first
+        self._memory_bytes = 0
+        self._counters = {'memory_hits': 0, 'revalidations': 0, 'file_reads': 0, 'not_found': 0}
+
+    @staticmethod
+    def _valid_filename(filename: str) -> bool:
+        return bool(filename) and os.path.basename(filename) == filename and not filename.startswith('.')
+
+    def _drop(self, filename: str):
+        """Forget an entry (caller holds the lock)"""
+        entry = self._entries.pop(filename, None)
+        if entry is not None and entry.content is not None:
+            self._memory_bytes -= entry.size
+
+    def _store(self, entry: ReportFile):
+        """Insert an entry and evict least recently used ones over the limits (caller holds the lock)"""
+        self._drop(entry.filename)
+        self._entries[entry.filename] = entry
+        if entry.content is not None:
+            self._memory_bytes += entry.size
+        while self._entries and (self._memory_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            self._drop(next(iter(self._entries)))
+
+    def cached(self, filename: str) -> Optional[ReportFile]:
+        """
+        A report whose bytes are in memory and recently checked, without reading the file
+
+        The only file I/O is the access time update, at most once every
+        access_stamp_seconds per file.
+
+        Returns:
+            The report, or None if lookup() has to go to the disk
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None or entry.content is None or now - entry.checked_at >= self.revalidate_seconds:
+                return None
+            self._entries.move_to_end(filename)
+            self._counters['memory_hits'] += 1
+            stamp = now - entry.stamped_at >= self.access_stamp_seconds
+            if stamp:
+                entry.stamped_at = now
+        if stamp:
+            self._stamp_access(entry.path, entry.signature[1])
+        return entry
+
+    def lookup(self, filename: str) -> Optional[ReportFile]:
+        """
+        Resolve a download filename
+
+        Args:
+            filename: Requested file name (no directories)
+
+        Returns:
+            The report, or None if there is no such file
+        """
+        if not self._valid_filename(filename):
+            return None
+        entry = self.cached(filename)
+        if entry is not None:
+            return entry
+
+        path = os.path.join(self.reports_dir, filename)
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            file_stat = None
+        if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+            with self._lock:
+                self._drop(filename)
+                self._counters['not_found'] += 1
+            return None
+
+        signature = (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and entry.signature == signature:
+                entry.checked_at = now
+                entry.stamped_at = now
+                self._entries.move_to_end(filename)
+                self._counters['revalidations'] += 1
+        if entry is not None and entry.signature == signature:
+            self._stamp_access(path, file_stat.st_mtime_ns)
+            return entry
+
+        try:
+            entry = self._read(filename, path, now)
+        except OSError as e:
+            logger.warning(f"Could not read report {path}: {e}")
+            return None
+        with self._lock:
+            self._store(entry)
+            self._counters['file_reads'] += 1
+        self._stamp_access(path, entry.signature[1])
+        return entry
+
+    @staticmethod
+    def _stamp_access(path: str, mtime_ns: int):
+        """Record a download in the file's access time (kept explicitly, noatime mounts ignore reads)"""
+        try:
+            os.utime(path, ns=(time.time_ns(), mtime_ns))
+        except OSError:
+            pass
+
+    def _read(self, filename: str, path: str, now: float) -> ReportFile:
+        """Hash a report file, keeping its bytes if it is small"""
+        digest = hashlib.sha256()
+        content = None
+        with open(path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            if file_stat.st_size <= self.max_file_bytes:
+                content = f.read()
+                digest.update(content)
+            else:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+                    digest.update(chunk)
+        return ReportFile(
+            filename=filename,
+            path=path,
+            size=len(content) if content is not None else file_stat.st_size,
+            mtime=file_stat.st_mtime,
+            etag=digest.hexdigest()[:32],
+            content=content,
+            signature=(file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size),
+            checked_at=now,
+            stamped_at=now
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, bytes in memory and counters for health output"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_bytes,
+                'max_bytes': self.max_bytes,
+                **self._counters
+            }
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Report Janitor
+Keeps the reports directory bounded on long-running servers. A daemon thread
+sweeps it periodically:
+
+- reports not downloaded for max_age seconds are deleted,
+- while the directory is over its byte budget, the least recently downloaded
+  reports are deleted,
+- the newest report of each license plate is always kept,
+- renders abandoned by a crashed process (hidden .tmp files) are deleted.
+
+The last download time of a report is its access time: the download route
+stamps it (see ReportDownloadCache) and it falls back to the modification time
+for reports never downloaded. Because it lives on the file, every server
+process sees the same value and no state has to be shared or persisted. Each
+process of a multi-worker server runs its own janitor; a lock file in the
+reports directory lets only one of them sweep at a time.
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.core.atomic_json import file_lock
+from src.core.vehicle_repository import normalize_license_plate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_INTERVAL_SECONDS = 300
+# Renders in progress are much younger than this
+TEMP_FILE_MAX_AGE_SECONDS = 3600
+SWEEP_LOCK_FILENAME = '.report_janitor.lock'
+
+# maintenance_report_<YYYYmmdd_HHMMSS>_<plate>.pdf (inline and queued renders)
+TIMESTAMPED_REPORT = re.compile(r'^maintenance_report_\d{8}_\d{6}_(?P<plate>.+)\.pdf$')
+# maintenance_report_<plate>_<cache key>.pdf (report cache)
+CACHED_REPORT = re.compile(r'^maintenance_report_(?P<plate>.+)_[0-9a-f]{16}\.pdf$')
+
+
+def report_plate(filename: str) -> Optional[str]:
+    """Normalized license plate of a report filename, or None if it is not a report"""
+    match = TIMESTAMPED_REPORT.match(filename) or CACHED_REPORT.match(filename)
+    return normalize_license_plate(match.group('plate')) if match else None
+
+
+class ReportJanitor:
+    """
+    Age and disk-budget garbage collector for a reports directory
+
+    sweep() can also be called directly (e.g. from a maintenance script).
+    """
+
+    def __init__(self,
+                 reports_dir: str,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 interval: float = DEFAULT_INTERVAL_SECONDS):
+        """
+        Initialize the janitor.
+
+        Args:
+            reports_dir: Directory holding the generated reports
+            max_age_seconds: Delete reports not downloaded for this long
+            max_bytes: Total size the reports may take on disk
+            interval: Seconds between sweeps of the background thread
+        """
+        self.reports_dir = reports_dir
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.interval = interval
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {'sweeps': 0, 'sweeps_skipped': 0, 'expired': 0, 'evicted': 0, 'temp_files_removed': 0,
+                          'bytes_freed': 0, 'errors': 0}
+        self._last_sweep = None
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Reports and stale temp files in the directory (name, size, last use, plate)"""
+        files = []
+        try:
+            with os.scandir(self.reports_dir) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files.append({
+                        'name': entry.name,
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime,
+                        'last_used': max(stat.st_atime, stat.st_mtime),
+                        'plate': report_plate(entry.name)
+                    })
+        except FileNotFoundError:
+            pass
+        return files
+
+    def _remove(self, name: str) -> bool:
+        try:
+            os.remove(os.path.join(self.reports_dir, name))
+            return True
+        except FileNotFoundError:
+            # Removed by the report cache or another server process
+            return False
+        except OSError as e:
+            logger.warning(f"Could not remove report {name}: {e}")
+            with self._lock:
+                self._counters['errors'] += 1
+            return False
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Apply the retention rules once
+
+        Returns:
+            Counts of this sweep: expired, evicted, temp_files_removed, bytes_freed
+            (all zero if another process is sweeping the directory)
+        """
+        with file_lock(os.path.join(self.reports_dir, SWEEP_LOCK_FILENAME), blocking=False) as locked:
+            if locked:
+                return self._sweep()
+        with self._lock:
+            self._counters['sweeps_skipped'] += 1
+        return {'expired': 0, 'evicted': 0, 'temp_files_removed': 0, 'bytes_freed': 0}
+
+    def _sweep(self) -> Dict[str, int]:
+        """Apply the retention rules (caller holds the sweep lock)"""
+        start = time.monotonic()
+        now = time.time()
+        files = self._scan()
+        result = {'expired': 0, 'evicted': 0, 'temp_files_removed': 0, 'bytes_freed': 0}
+
+        reports = []
+        for item in files:
+            if item['name'].startswith('.') and item['name'].endswith('.tmp'):
+                if now - item['mtime'] > TEMP_FILE_MAX_AGE_SECONDS and self._remove(item['name']):
+                    result['temp_files_removed'] += 1
+                    result['bytes_freed'] += item['size']
+            elif item['plate'] is not None:
+                reports.append(item)
+
+        # The newest report of each plate is what a repeat request gets; never delete it
+        newest = {}
+        for item in reports:
+            kept = newest.get(item['plate'])
+            if kept is None or item['mtime'] > kept['mtime']:
+                newest[item['plate']] = item
+        protected = {item['name'] for item in newest.values()}
+
+        total_bytes = sum(item['size'] for item in reports)
+        survivors = []
+        # Least recently downloaded first
+        for item in sorted(reports, key=lambda item: item['last_used']):
+            if item['name'] in protected:
+                continue
+            if now - item['last_used'] > self.max_age_seconds:
+                reason = 'expired'
+            elif total_bytes > self.max_bytes:
+                reason = 'evicted'
+            else:
+                survivors.append(item)
+                continue
+            if self._remove(item['name']):
+                result[reason] += 1
+                result['bytes_freed'] += item['size']
+            total_bytes -= item['size']
+
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._counters['sweeps'] += 1
+            for key, value in result.items():
+                self._counters[key] += value
+            self._last_sweep = {
+                'time': datetime.now().isoformat(),
+                'seconds': round(elapsed, 3),
+                'reports': len(protected) + len(survivors),
+                'total_bytes': total_bytes
+            }
+
+        if result['expired'] or result['evicted'] or result['temp_files_removed']:
+            logger.info(f"Report janitor: {result['expired']} expired, {result['evicted']} evicted, "
+                        f"{result['temp_files_removed']} temp files removed, {result['bytes_freed']} bytes freed")
+        return result
+
+    def _sweep_loop(self):
+        """Background sweep thread"""
+        while not self._stop_event.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Report janitor sweep failed: {e}")
+                with self._lock:
+                    self._counters['errors'] += 1
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Start the background sweep thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sweep_loop, name='report-janitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background sweep thread"""
+        self._stop_event.set()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retention settings, counters and the last sweep for health output"""
+        with self._lock:
+            return {
+                'enabled': True,
+                'running': self._thread is not None and self._thread.is_alive(),
+                'max_age_seconds': self.max_age_seconds,
+                'max_bytes': self.max_bytes,
+                'last_sweep': self._last_sweep,
+                **self._counters
+            }
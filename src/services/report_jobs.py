@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Report Job Queue
+Renders PDF reports in a bounded process pool so webhook requests return immediately.
+Finished reports are handed to a delivery callback (e.g. a WhatsApp push via Twilio);
+failed renders are cleaned up and handed to a failure callback, so the requester who
+was promised a report hears that it could not be made.
+"""
+
+import os
+import sys
+import uuid
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+logger = logging.getLogger(__name__)
+
+# Length of the job reference sent to the requester; get_job() accepts it as a prefix
+JOB_REFERENCE_LENGTH = 8
+
+
+def render_report_pdf(vehicle: Dict, maintenance_records: List[Dict], file_path: str) -> str:
+    """Render one maintenance report PDF (runs inside a pool worker process)"""
+    from src.core.template_hebrew_pdf import TemplateHebrewPDFGenerator
+
+    generator = TemplateHebrewPDFGenerator()
+    generator.generate_maintenance_report(vehicle, maintenance_records, file_path)
+    return file_path
+
+
+@dataclass
+class ReportJob:
+    """State of one queued report"""
+    job_id: str
+    report_type: str  # 'maintenance', 'fault'
+    license_plate: str
+    recipient: str
+    file_path: str
+    status: str = 'queued'  # 'queued', 'running', 'completed', 'failed'
+    created_at: str = ''
+    finished_at: Optional[str] = None
+    delivery_status: Optional[str] = None  # 'sent', 'failed'
+    error: Optional[str] = None
+    cache_key: Optional[str] = None  # ReportCache key the rendered file belongs to
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public job view (no local file paths or requester phone number)"""
+        data = asdict(self)
+        data.pop('cache_key')
+        data.pop('recipient')
+        data['filename'] = os.path.basename(data.pop('file_path'))
+        return data
+
+
+class ReportJobQueue:
+    """
+    Bounded queue of PDF report jobs backed by a process pool
+
+    At most max_pending_jobs jobs may be queued or rendering at once; submit()
+    returns None beyond that so callers can fall back to rendering inline.
+    """
+
+    def __init__(self,
+                 max_workers: int = 2,
+                 max_pending_jobs: int = 32,
+                 on_complete: Callable[[ReportJob], bool] = None,
+                 history_size: int = 500,
+                 on_failure: Callable[[ReportJob], bool] = None):
+        """
+        Initialize the job queue.
+
+        Args:
+            max_workers: Number of PDF rendering processes
+            max_pending_jobs: Maximum jobs queued or rendering at the same time
+            on_complete: Called with each successfully rendered job; returns True if delivered
+            history_size: Number of finished jobs kept for status lookups
+            on_failure: Called with each job whose render failed; returns True if the
+                requester was notified
+        """
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.on_complete = on_complete
+        self.on_failure = on_failure
+        self.history_size = history_size
+
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._futures = {}
+        self._pending = 0
+        self._counters = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0,
+                          'delivered': 0, 'delivery_failed': 0}
+        self._executor = None
+        self._delivery_executor = None
+
+    def _get_executors(self):
+        """Create the worker pools on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            # Deliveries make blocking HTTP calls; keep them off the pool's result thread
+            self._delivery_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='report-delivery')
+            atexit.register(self.shutdown)
+        return self._executor, self._delivery_executor
+
+    def submit(self, vehicle: Dict, maintenance_records: List[Dict], file_path: str,
+               recipient: str, report_type: str = 'maintenance',
+               cache_key: Optional[str] = None) -> Optional[ReportJob]:
+        """
+        Queue a report for rendering
+
+        Returns:
+            The queued job, or None if the queue is full or the pool is unavailable
+        """
+        with self._lock:
+            if self._pending >= self.max_pending_jobs:
+                self._counters['rejected'] += 1
+                logger.warning(f"Report queue full ({self._pending} pending), rejecting job")
+                return None
+            self._pending += 1
+
+            job = ReportJob(
+                job_id=uuid.uuid4().hex,
+                report_type=report_type,
+                license_plate=vehicle.get('license_plate', 'unknown'),
+                recipient=recipient,
+                file_path=file_path,
+                created_at=datetime.now().isoformat(),
+                cache_key=cache_key
+            )
+            self._jobs[job.job_id] = job
+            self._counters['submitted'] += 1
+
+        try:
+            executor, _ = self._get_executors()
+            future = executor.submit(render_report_pdf, vehicle, maintenance_records, file_path)
+        except Exception as e:
+            logger.error(f"Error submitting report job: {e}")
+            # A broken pool cannot accept more work; start a fresh one next time
+            self.shutdown(wait=False)
+            with self._lock:
+                self._pending -= 1
+                del self._jobs[job.job_id]
+                self._counters['submitted'] -= 1
+            return None
+
+        with self._lock:
+            # The job may already have finished and been recorded by _on_rendered
+            if job.finished_at is None:
+                self._futures[job.job_id] = future
+        future.add_done_callback(lambda f, job_id=job.job_id: self._on_rendered(job_id, f))
+        logger.info(f"Queued {report_type} report job {job.job_id} for {job.license_plate}")
+        return job
+
+    def _on_rendered(self, job_id: str, future):
+        """Record the render result and hand the job to the delivery or failure callback"""
+        with self._lock:
+            self._pending -= 1
+            self._futures.pop(job_id, None)
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.finished_at = datetime.now().isoformat()
+            error = future.exception()
+            if error is None:
+                job.status = 'completed'
+                self._counters['completed'] += 1
+            else:
+                job.status = 'failed'
+                job.error = str(error)
+                self._counters['failed'] += 1
+            self._trim_history()
+
+        callback = self.on_complete
+        if error is not None:
+            logger.error(f"Report job {job_id} failed: {error}")
+            # Whatever the renderer wrote is incomplete
+            try:
+                os.remove(job.file_path)
+            except OSError:
+                pass
+            callback = self.on_failure
+
+        if callback is None:
+            return
+        with self._lock:
+            delivery_executor = self._delivery_executor
+            if delivery_executor is not None:
+                try:
+                    delivery_executor.submit(self._deliver, job, callback)
+                    return
+                except RuntimeError:
+                    # Shut down between the check and the submit
+                    pass
+            job.delivery_status = 'failed'
+            self._counters['delivery_failed'] += 1
+        logger.warning(f"Report job {job_id} finished after the queue shut down, not delivered")
+
+    def _deliver(self, job: ReportJob, callback: Callable[[ReportJob], bool]):
+        """Run the delivery (or failure) callback for a finished job"""
+        try:
+            delivered = bool(callback(job))
+        except Exception as e:
+            logger.error(f"Error delivering report job {job.job_id}: {e}")
+            delivered = False
+
+        with self._lock:
+            job.delivery_status = 'sent' if delivered else 'failed'
+            self._counters['delivered' if delivered else 'delivery_failed'] += 1
+
+    def _trim_history(self):
+        """Drop the oldest finished jobs beyond history_size (caller holds the lock)"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in ('completed', 'failed'):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the public status of a job
+
+        Args:
+            job_id: Full job id, or a unique prefix of at least JOB_REFERENCE_LENGTH
+                characters (the reference sent to the requester)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None and len(job_id) >= JOB_REFERENCE_LENGTH:
+                matches = [candidate for key, candidate in self._jobs.items() if key.startswith(job_id)]
+                job = matches[0] if len(matches) == 1 else None
+            if job is None:
+                return None
+            future = self._futures.get(job.job_id)
+            if job.status == 'queued' and future is not None and future.running():
+                job.status = 'running'
+            return job.to_dict()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and job counters for health output"""
+        with self._lock:
+            return {
+                'queue_depth': self._pending,
+                'max_pending_jobs': self.max_pending_jobs,
+                'workers': self.max_workers,
+                **self._counters
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pools (renders finishing after a non-waiting shutdown are not delivered)"""
+        executor = self._executor
+        if executor is None:
+            return
+        # Renders that finish while waiting here are still handed to the delivery pool
+        executor.shutdown(wait=wait)
+        with self._lock:
+            delivery_executor = self._delivery_executor
+            self._executor = None
+            self._delivery_executor = None
+        if delivery_executor is not None:
+            delivery_executor.shutdown(wait=wait)
@@ -4,13 +4,14 @@ Simple Fleet Management Server
 One server, one port, handles everything
 """
 
+import io
 import os
 import sys
 import json
 import logging
-import requests
 from datetime import datetime
 from flask import Flask, request, Response, send_file, jsonify
+from werkzeug.exceptions import HTTPException
 from twilio.twiml.messaging_response import MessagingResponse
 
 # Add the project root to the Python path
@@ -21,31 +22,47 @@ sys.path.insert(0, project_root)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_ngrok_url():
-    """Get the current ngrok public URL"""
+app = Flask(__name__)
+
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+REPORTS_DIR = os.path.join(project_root, 'reports', 'maintenance_reports')
+
+def load_config():
+    """Load general configuration from config/config.json"""
     try:
-        response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
-        data = response.json()
-        
-        for tunnel in data.get('tunnels', []):
-            if tunnel.get('proto') == 'https':
-                return tunnel.get('public_url')
-        
-        return None
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except Exception as e:
-        logger.error(f"Error getting ngrok URL: {e}")
-        return None
+        logger.warning(f"Could not load configuration: {e}")
+        return {}
 
-app = Flask(__name__)
+config = load_config()
+
+# Extra Hebrew font directories for PDF reports
+if config.get('reports', {}).get('font_dirs'):
+    from src.core.template_hebrew_pdf import FontStyleRegistry
+    FontStyleRegistry.configure(config['reports']['font_dirs'])
+
+# Data is served from the process-wide repository, which reloads files only when they change
+from src.core.vehicle_repository import get_vehicle_repository, configure_vehicle_repository
+from src.core.fleet_models import Driver
+
+# Serve vehicles from a shared memory map of the catalog snapshot instead of a
+# per-process copy of every decoded vehicle (not needed with the SQLite datastore).
+# Windows cannot replace a file while it is mapped, so the Excel sync could not
+# rewrite the snapshot under a running server; there the snapshot is read instead.
+if (config.get('datastore', {}).get('backend', 'json') != 'sqlite'
+        and config.get('repository', {}).get('memory_map_catalog', True)):
+    if os.name == 'nt':
+        logger.info("repository.memory_map_catalog is not supported on Windows, reading the catalog snapshot instead")
+    else:
+        configure_vehicle_repository(memory_map=True)
+from src.services.intent_matcher import get_intent_matcher
 
-# Simple data loading
 def load_vehicles():
     """Load vehicle data"""
     try:
-        vehicle_path = os.path.join(project_root, 'data', 'large_vehicle_catalog.json')
-        with open(vehicle_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('vehicles', [])
+        return get_vehicle_repository().get_vehicles()
     except Exception as e:
         logger.error(f"Error loading vehicles: {e}")
         return []
@@ -53,33 +70,33 @@ def load_vehicles():
 def load_maintenance_records():
     """Load maintenance records"""
     try:
-        maintenance_path = os.path.join(project_root, 'data', 'vehicles', 'maintenance_records.json')
-        with open(maintenance_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('records', [])
+        return get_vehicle_repository().get_maintenance_records()
     except Exception as e:
         logger.error(f"Error loading maintenance records: {e}")
         return []
 
 def find_vehicle_by_license_plate(license_plate):
     """Find vehicle by license plate"""
-    vehicles = load_vehicles()
-    for vehicle in vehicles:
-        if vehicle.get('license_plate', '').upper() == license_plate.upper():
-            return vehicle
-    return None
+    try:
+        return get_vehicle_repository().find_vehicle_by_license_plate(license_plate)
+    except Exception as e:
+        logger.error(f"Error finding vehicle {license_plate}: {e}")
+        return None
 
 def get_maintenance_records_for_vehicle(license_plate):
     """Get maintenance records for a vehicle by license plate"""
-    records = load_maintenance_records()
-    return [record for record in records if record.get('license_plate', '').upper() == license_plate.upper()]
+    try:
+        return get_vehicle_repository().get_maintenance_records_for_plate(license_plate)
+    except Exception as e:
+        logger.error(f"Error loading maintenance records for {license_plate}: {e}")
+        return []
 
 def format_vehicle_search_response(vehicle):
     """Format vehicle information as a structured table response"""
     try:
         # Get driver information
         driver = vehicle.get('driver', {})
-        if isinstance(driver, dict):
+        if isinstance(driver, (dict, Driver)):
             driver_name = driver.get('name', 'לא זמין')
             driver_phone = driver.get('phone', 'לא זמין')
             driver_email = driver.get('email', 'לא זמין')
@@ -113,66 +130,322 @@ def format_vehicle_search_response(vehicle):
         logger.error(f"Error formatting vehicle search response: {e}")
         return f"שגיאה בעיבוד פרטי הרכב: {str(e)}"
 
-def generate_simple_pdf_report(vehicle, maintenance_records):
-    """Generate a Hebrew PDF report"""
+def build_report_path(vehicle):
+    """Build a new timestamped PDF path for a vehicle report"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"maintenance_report_{timestamp}_{vehicle.get('license_plate', 'unknown')}.pdf"
+    return os.path.join(REPORTS_DIR, filename)
+
+# Rendered report cache, created on first use
+_report_cache = None
+
+def get_report_cache():
+    """Get the report cache, or None if report caching is disabled"""
+    global _report_cache
+    reports_config = config.get('reports', {})
+    if not reports_config.get('cache_enabled', True):
+        return None
+    
+    if _report_cache is None:
+        from src.core.report_cache import ReportCache
+        _report_cache = ReportCache(
+            cache_dir=REPORTS_DIR,
+            max_bytes=int(reports_config.get('cache_max_mb', 200) * 1024 * 1024)
+        )
+    return _report_cache
+
+# Download lookups (content ETags, small reports kept in memory), created on first use
+_report_download_cache = None
+
+def get_report_download_cache():
+    """Get the download cache that resolves /download/<filename> requests"""
+    global _report_download_cache
+    if _report_download_cache is None:
+        from src.services.report_downloads import ReportDownloadCache
+        reports_config = config.get('reports', {})
+        _report_download_cache = ReportDownloadCache(
+            reports_dir=REPORTS_DIR,
+            max_bytes=int(reports_config.get('download_cache_mb', 32) * 1024 * 1024),
+            max_file_bytes=int(reports_config.get('download_cache_max_file_kb', 1024) * 1024)
+        )
+    return _report_download_cache
+
+# Report retention (age and disk budget), created on first use
+_report_janitor = None
+
+def get_report_janitor():
+    """Get the report janitor, starting its background sweeps on first use, or None if disabled"""
+    global _report_janitor
+    reports_config = config.get('reports', {})
+    if not reports_config.get('janitor_enabled', True):
+        return None
+    
+    if _report_janitor is None:
+        from src.services.report_janitor import ReportJanitor
+        _report_janitor = ReportJanitor(
+            reports_dir=REPORTS_DIR,
+            max_age_seconds=reports_config.get('retention_days', 7) * 24 * 3600,
+            max_bytes=int(reports_config.get('retention_max_mb', 500) * 1024 * 1024),
+            interval=reports_config.get('janitor_interval_seconds', 300)
+        )
+        _report_janitor.start()
+    return _report_janitor
+
+def download_max_age():
+    """Seconds clients may reuse a downloaded report (report filenames are never reused for other content)"""
+    return config.get('reports', {}).get('download_max_age_seconds', 3600)
+
+def generate_simple_pdf_report(vehicle, maintenance_records, report_type='maintenance'):
+    """Generate a Hebrew PDF report, reusing a cached one when the inputs are unchanged"""
     try:
         from src.core.template_hebrew_pdf import TemplateHebrewPDFGenerator
         
-        # Create PDF
-        reports_dir = os.path.join(project_root, 'reports', 'maintenance_reports')
-        os.makedirs(reports_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"maintenance_report_{timestamp}_{vehicle.get('license_plate', 'unknown')}.pdf"
-        file_path = os.path.join(reports_dir, filename)
+        report_cache = get_report_cache()
+        if report_cache is not None:
+            cache_key = report_cache.make_key(vehicle, maintenance_records, report_type)
+            cached_path = report_cache.get(cache_key)
+            if cached_path:
+                return cached_path
+            file_path = report_cache.reserve_path(cache_key)
+        else:
+            file_path = build_report_path(vehicle)
         
         # Use template-based Hebrew PDF generator
         generator = TemplateHebrewPDFGenerator()
         generator.generate_maintenance_report(vehicle, maintenance_records, file_path)
         
+        if report_cache is not None:
+            file_path = report_cache.add(cache_key, file_path, vehicle.get('license_plate', 'unknown'))
         return file_path
         
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
         return None
 
-@app.route('/webhook', methods=['POST'])
-def webhook():
-    """Main webhook endpoint for WhatsApp messages"""
+# Public base URL for download links, refreshed in the background
+_public_url_provider = None
+
+def get_public_url_provider():
+    """Get the public URL provider, starting its background refresh on first use"""
+    global _public_url_provider
+    if _public_url_provider is None:
+        from src.services.public_url import PublicUrlProvider
+        public_url_config = config.get('public_url', {})
+        _public_url_provider = PublicUrlProvider(
+            static_base_url=os.getenv('PUBLIC_BASE_URL') or public_url_config.get('base_url'),
+            ttl=public_url_config.get('ttl_seconds', 60),
+            refresh_interval=public_url_config.get('refresh_interval_seconds', 15)
+        )
+        _public_url_provider.start()
+    return _public_url_provider
+
+def build_download_url(filename):
+    """Build the public download URL for a generated report"""
+    return get_public_url_provider().build_url(f"download/{filename}")
+
+# Outbound Twilio driver, created on first use
+_twilio_driver = None
+_twilio_driver_checked = False
+
+def get_twilio_driver():
+    """Get a Twilio driver for outbound messages, or None if credentials are not configured"""
+    global _twilio_driver, _twilio_driver_checked
+    if _twilio_driver_checked:
+        return _twilio_driver
+    _twilio_driver_checked = True
+    
     try:
-        # Get message data
-        incoming_msg = request.values.get('Body', '').strip()
-        sender = request.values.get('From', '')
+        from src.services.twilio_driver import TwilioDriver
         
+        # Credentials come from TWILIO_ACCOUNT_SID / TWILIO_AUTH_TOKEN / TWILIO_WHATSAPP_NUMBER
+        _twilio_driver = TwilioDriver()
+    except Exception as e:
+        logger.warning(f"Outbound Twilio messaging unavailable: {e}")
+        _twilio_driver = None
+    return _twilio_driver
+
+# Outbound message queue (rate limit, retries, dead letters), created on first use
+_twilio_send_queue = None
+
+def get_twilio_send_queue():
+    """Get the outbound message queue, or None if outbound messaging is unavailable"""
+    global _twilio_send_queue
+    if _twilio_send_queue is None:
+        driver = get_twilio_driver()
+        if driver is None:
+            return None
+        from src.services.production_server import server_process_count
+        from src.services.twilio_send_queue import TwilioSendQueue, load_send_queue_config
+        queue_config = load_send_queue_config()
+        # The configured rate is the account's; every server process gets its share
+        processes = server_process_count()
+        dead_letter_path = queue_config['dead_letter_path']
+        if not os.path.isabs(dead_letter_path):
+            dead_letter_path = os.path.join(project_root, dead_letter_path)
+        # Idempotency keys are shared with the other server processes through this file
+        keys_path = queue_config['keys_path']
+        if keys_path and not os.path.isabs(keys_path):
+            keys_path = os.path.join(project_root, keys_path)
+        _twilio_send_queue = TwilioSendQueue(
+            driver,
+            workers=queue_config['workers'],
+            messages_per_second=queue_config['messages_per_second'] / processes,
+            burst=queue_config['burst'],
+            max_attempts=queue_config['max_attempts'],
+            backoff_base_seconds=queue_config['backoff_base_seconds'],
+            backoff_max_seconds=queue_config['backoff_max_seconds'],
+            max_pending=queue_config['max_pending'],
+            dead_letter_path=dead_letter_path,
+            keys_path=keys_path
+        )
+        _twilio_send_queue.start()
+    return _twilio_send_queue
+
+REPORT_LABELS = {
+    'maintenance': 'דוח התחזוקה',
+    'fault': 'דוח התקלות'
+}
+
+def deliver_report(job):
+    """Queue a rendered report for the requester over WhatsApp (True once it is queued)"""
+    send_queue = get_twilio_send_queue()
+    if send_queue is None:
+        return False
+    
+    report_cache = get_report_cache()
+    if job.cache_key and report_cache is not None:
+        job.file_path = report_cache.add(job.cache_key, job.file_path, job.license_plate)
+    
+    download_url = build_download_url(os.path.basename(job.file_path))
+    label = REPORT_LABELS.get(job.report_type, REPORT_LABELS['maintenance'])
+    logger.info(f"Sending {job.report_type} report to {job.recipient}: {download_url}")
+    message = send_queue.send_whatsapp(
+        job.recipient,
+        f"{label} עבור {job.license_plate} מוכן. הקובץ מצורף להודעה.",
+        media_url=download_url,
+        idempotency_key=f"report:{job.job_id}"
+    )
+    return message is not None
+
+def notify_report_failure(job):
+    """Tell the requester that a queued report could not be rendered (True once it is queued)"""
+    send_queue = get_twilio_send_queue()
+    if send_queue is None:
+        return False
+    
+    label = REPORT_LABELS.get(job.report_type, REPORT_LABELS['maintenance'])
+    logger.info(f"Notifying {job.recipient} that {job.report_type} report job {job.job_id} failed")
+    message = send_queue.send_whatsapp(
+        job.recipient,
+        f"שגיאה ביצירת {label} עבור {job.license_plate} (מספר בקשה: {job.job_id[:8]}). נסה שוב מאוחר יותר.",
+        idempotency_key=f"report-failed:{job.job_id}"
+    )
+    return message is not None
+
+# Background PDF rendering, created on first use
+_report_job_queue = None
+
+def get_report_job_queue():
+    """Get the report job queue, or None if asynchronous report generation is disabled"""
+    global _report_job_queue
+    reports_config = config.get('reports', {})
+    if not reports_config.get('async_generation', False):
+        return None
+    
+    if _report_job_queue is None:
+        from src.services.report_jobs import ReportJobQueue
+        _report_job_queue = ReportJobQueue(
+            max_workers=reports_config.get('max_workers', 2),
+            max_pending_jobs=reports_config.get('max_pending_jobs', 32),
+            on_complete=deliver_report,
+            on_failure=notify_report_failure
+        )
+    return _report_job_queue
+
+def twiml_message(text, media_url=None):
+    """Build a TwiML Response with a single message"""
+    twiml_response = MessagingResponse()
+    message = twiml_response.message(text)
+    if media_url:
+        message.media(media_url)
+    return Response(str(twiml_response), mimetype='text/xml')
+
+def create_report_response(vehicle, license_plate, sender, report_type):
+    """
+    Generate a maintenance or fault report for a vehicle and build the webhook reply
+    
+    When asynchronous generation is enabled and outbound messaging works, the PDF is
+    queued and pushed to the sender when ready; otherwise it is rendered inline and
+    attached to the reply.
+    """
+    label = REPORT_LABELS[report_type]
+    
+    # Get maintenance records (fault reports are part of maintenance records)
+    maintenance_records = get_maintenance_records_for_vehicle(license_plate)
+    
+    # A cached report is attached right away, no rendering needed
+    report_cache = get_report_cache()
+    cache_key = None
+    if report_cache is not None:
+        cache_key = report_cache.make_key(vehicle, maintenance_records, report_type)
+        cached_path = report_cache.get(cache_key)
+        if cached_path:
+            download_url = build_download_url(os.path.basename(cached_path))
+            logger.info(f"Sending cached {report_type} report to {sender}: {download_url}")
+            return twiml_message(f"{label} עבור {license_plate} מוכן. הקובץ מצורף להודעה.", download_url)
+    
+    job_queue = get_report_job_queue()
+    if job_queue is not None and sender and get_twilio_driver() is not None:
+        file_path = report_cache.reserve_path(cache_key) if cache_key else build_report_path(vehicle)
+        job = job_queue.submit(vehicle, maintenance_records, file_path, sender, report_type, cache_key=cache_key)
+        if job:
+            return twiml_message(f"{label} עבור {license_plate} בהכנה ויישלח אליך בהודעה נפרדת. מספר בקשה: {job.job_id[:8]}")
+    
+    # Generate PDF inline (same report for maintenance and fault requests for now)
+    pdf_path = generate_simple_pdf_report(vehicle, maintenance_records, report_type)
+    if not pdf_path:
+        return twiml_message(f"שגיאה ביצירת {label}.")
+    
+    download_url = build_download_url(os.path.basename(pdf_path))
+    logger.info(f"Sending {report_type} report to {sender}: {download_url}")
+    return twiml_message(f"{label} עבור {license_plate} מוכן. הקובץ מצורף להודעה.", download_url)
+
+REPORT_INTENTS = {
+    'fault_report': 'fault',
+    'maintenance_report': 'maintenance'
+}
+
+def handle_webhook_message(incoming_msg, sender, intent_match=None):
+    """
+    Build the webhook reply for one incoming WhatsApp message
+    
+    Shared by the Flask view and the async server (src/services/async_server.py).
+    
+    Args:
+        incoming_msg: Message body, stripped
+        sender: Sender address (e.g. whatsapp:+972...)
+        intent_match: Intent already matched for the message, if the caller has one
+    
+    Returns:
+        Response with the TwiML reply
+    """
+    try:
         if not incoming_msg:
             logger.warning("Empty message received")
             return Response("Empty message", status=400)
         
         logger.info(f"Raw message from {sender}: '{incoming_msg}'")
         
-        # Check if it's a maintenance report request
-        is_maintenance_report = any(keyword in incoming_msg.lower() for keyword in [
-            'maintenance report', 'דוח תחזוקה', 'דוח טיפולים', 'תחזוקה', 'טיפולים'
-        ])
+        # Classify the message and extract license plates in one pass
+        if intent_match is None:
+            intent_match = get_intent_matcher().match(incoming_msg)
+        logger.info(f"Intent: {intent_match.intent} (scores: {intent_match.scores})")
         
-        # Check if it's a fault report request
-        is_fault_report = any(keyword in incoming_msg.lower() for keyword in [
-            'fault report', 'דוח תקלות', 'תקלות', 'דוח תקלה'
-        ])
-        
-        # Check if it's a vehicle search request
-        is_vehicle_search = any(keyword in incoming_msg.lower() for keyword in [
-            'search', 'חיפוש', 'מצא', 'find', 'חפש'
-        ])
-        
-        if is_vehicle_search:
-            # Extract license plate from search request
-            import re
-            license_pattern = r'(\d{2}[- ]?\d{3}[- ]?\d{2})'
-            matches = re.findall(license_pattern, incoming_msg)
-            
-            if matches:
-                license_plate = matches[0].replace(' ', '-')
+        if intent_match.intent == 'vehicle_search':
+            license_plate = intent_match.license_plate
+            if license_plate:
                 logger.info(f"Vehicle search for license plate: {license_plate}")
                 
                 # Find vehicle
@@ -195,45 +468,15 @@ def webhook():
                 twiml_response.message(error_msg)
                 return Response(str(twiml_response), mimetype='text/xml')
         
-        elif is_fault_report:
-            # Extract license plate from fault report request
-            import re
-            license_pattern = r'(\d{2}[- ]?\d{3}[- ]?\d{2})'
-            matches = re.findall(license_pattern, incoming_msg)
-            
-            if matches:
-                license_plate = matches[0].replace(' ', '-')
+        elif intent_match.intent == 'fault_report':
+            license_plate = intent_match.license_plate
+            if license_plate:
                 logger.info(f"Fault report request for license plate: {license_plate}")
                 
                 # Find vehicle
                 vehicle = find_vehicle_by_license_plate(license_plate)
                 if vehicle:
-                    # Get maintenance records (fault reports are part of maintenance records)
-                    maintenance_records = get_maintenance_records_for_vehicle(license_plate)
-                    
-                    # Generate PDF (same as maintenance report for now)
-                    pdf_path = generate_simple_pdf_report(vehicle, maintenance_records)
-                    if pdf_path:
-                        filename = os.path.basename(pdf_path)
-                        # Get current ngrok URL dynamically
-                        ngrok_url = get_ngrok_url()
-                        if ngrok_url:
-                            download_url = f"{ngrok_url}/download/{filename}"
-                        else:
-                            download_url = f"http://localhost:5000/download/{filename}"
-                        
-                        # Generate TwiML response with media
-                        twiml_response = MessagingResponse()
-                        message = twiml_response.message(f"דוח התקלות עבור {license_plate} מוכן. הקובץ מצורף להודעה.")
-                        message.media(download_url)
-                        
-                        logger.info(f"Sending fault report to {sender}: {download_url}")
-                        return Response(str(twiml_response), mimetype='text/xml')
-                    else:
-                        error_msg = "שגיאה ביצירת דוח התקלות."
-                        twiml_response = MessagingResponse()
-                        twiml_response.message(error_msg)
-                        return Response(str(twiml_response), mimetype='text/xml')
+                    return create_report_response(vehicle, license_plate, sender, 'fault')
                 else:
                     error_msg = f"רכב עם לוחית רישוי {license_plate} לא נמצא."
                     twiml_response = MessagingResponse()
@@ -245,45 +488,15 @@ def webhook():
                 twiml_response.message(error_msg)
                 return Response(str(twiml_response), mimetype='text/xml')
         
-        elif is_maintenance_report:
-            # Extract license plate
-            import re
-            license_pattern = r'(\d{2}[- ]?\d{3}[- ]?\d{2})'
-            matches = re.findall(license_pattern, incoming_msg)
-            
-            if matches:
-                license_plate = matches[0].replace(' ', '-')
+        elif intent_match.intent == 'maintenance_report':
+            license_plate = intent_match.license_plate
+            if license_plate:
                 logger.info(f"Found license plate: {license_plate}")
                 
                 # Find vehicle
                 vehicle = find_vehicle_by_license_plate(license_plate)
                 if vehicle:
-                    # Get maintenance records
-                    maintenance_records = get_maintenance_records_for_vehicle(license_plate)
-                    
-                    # Generate PDF
-                    pdf_path = generate_simple_pdf_report(vehicle, maintenance_records)
-                    if pdf_path:
-                        filename = os.path.basename(pdf_path)
-                        # Get current ngrok URL dynamically
-                        ngrok_url = get_ngrok_url()
-                        if ngrok_url:
-                            download_url = f"{ngrok_url}/download/{filename}"
-                        else:
-                            download_url = f"http://localhost:5000/download/{filename}"
-                        
-                        # Generate TwiML response with media
-                        twiml_response = MessagingResponse()
-                        message = twiml_response.message(f"דוח התחזוקה עבור {license_plate} מוכן. הקובץ מצורף להודעה.")
-                        message.media(download_url)
-                        
-                        logger.info(f"Sending media response to {sender}: {download_url}")
-                        return Response(str(twiml_response), mimetype='text/xml')
-                    else:
-                        error_msg = "שגיאה ביצירת דוח התחזוקה."
-                        twiml_response = MessagingResponse()
-                        twiml_response.message(error_msg)
-                        return Response(str(twiml_response), mimetype='text/xml')
+                    return create_report_response(vehicle, license_plate, sender, 'maintenance')
                 else:
                     error_msg = f"רכב עם לוחית רישוי {license_plate} לא נמצא."
                     twiml_response = MessagingResponse()
@@ -317,38 +530,105 @@ def webhook():
         twiml_response.message("מצטער, אירעה שגיאה בעיבוד הבקשה שלך.")
         return Response(str(twiml_response), mimetype='text/xml')
 
+@app.route('/webhook', methods=['POST'])
+def webhook():
+    """Main webhook endpoint for WhatsApp messages"""
+    incoming_msg = request.values.get('Body', '').strip()
+    sender = request.values.get('From', '')
+    return handle_webhook_message(incoming_msg, sender)
+
 @app.route('/download/<filename>')
 def download_file(filename):
-    """Download PDF files"""
+    """Download PDF files (conditional GETs get 304, Range requests 206)"""
     try:
-        reports_dir = os.path.join(project_root, 'reports', 'maintenance_reports')
-        file_path = os.path.join(reports_dir, filename)
-        
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True, download_name=filename)
-        else:
+        report_file = get_report_download_cache().lookup(filename)
+        if report_file is None:
             return jsonify({"error": "File not found"}), 404
+        
+        # Small recent reports come from memory; others from disk through the
+        # server's file wrapper (sendfile under gunicorn)
+        source = io.BytesIO(report_file.content) if report_file.content is not None else report_file.path
+        return send_file(source, as_attachment=True, download_name=filename,
+                         etag=report_file.etag, last_modified=report_file.mtime,
+                         conditional=True, max_age=download_max_age())
+    except HTTPException:
+        # e.g. 416 for an unsatisfiable range
+        raise
     except Exception as e:
         logger.error(f"Error serving file {filename}: {e}")
         return jsonify({"error": "File serving error"}), 500
 
-@app.route('/health')
-def health_check():
-    """Health check endpoint"""
+def report_jobs_status():
+    """Report job queue depth and counters"""
+    job_queue = get_report_job_queue()
+    if job_queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **job_queue.get_metrics()}
+
+@app.route('/jobs')
+def report_jobs_metrics():
+    """Report job queue depth and counters"""
+    return jsonify(report_jobs_status())
+
+@app.route('/jobs/<job_id>')
+def report_job_status(job_id):
+    """Status of a queued report job"""
+    job_queue = get_report_job_queue()
+    job = job_queue.get_job(job_id) if job_queue is not None else None
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@app.route('/reload', methods=['POST'])
+def reload_data():
+    """Reload data files now (called by the Excel sync watcher after it writes new data)"""
+    # Tunnelled requests also arrive from localhost but carry X-Forwarded-For
+    if request.remote_addr not in ('127.0.0.1', '::1') or request.headers.get('X-Forwarded-For'):
+        return jsonify({"error": "Forbidden"}), 403
+    
+    repository = get_vehicle_repository()
+    reloaded = repository.refresh(force=True)
+    logger.info(f"Reload requested, data {'reloaded' if reloaded else 'already current'}")
     return jsonify({
-        "service": "simple_fleet_server",
-        "status": "healthy",
+        "reloaded": reloaded,
+        "repository": repository.get_status(),
         "timestamp": datetime.now().isoformat()
     })
 
+def health_status(service="simple_fleet_server"):
+    """Health check payload"""
+    return {
+        "service": service,
+        "status": "healthy",
+        "repository": get_vehicle_repository().get_status(),
+        "public_url": get_public_url_provider().get_status(),
+        "report_jobs": report_jobs_status(),
+        "report_cache": get_report_cache().get_stats() if get_report_cache() else {"enabled": False},
+        "report_downloads": get_report_download_cache().get_stats(),
+        "report_janitor": get_report_janitor().get_status() if get_report_janitor() else {"enabled": False},
+        "twilio_send_queue": _twilio_send_queue.get_metrics() if _twilio_send_queue else {"enabled": False},
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.route('/health')
+def health_check():
+    """Health check endpoint"""
+    return jsonify(health_status())
+
 if __name__ == '__main__':
     try:
         logger.info("Starting Simple Fleet Management Server on port 5000")
         logger.info("Available endpoints:")
         logger.info("  POST /webhook - Main webhook for WhatsApp messages")
         logger.info("  GET  /download/<filename> - Download PDF files")
+        logger.info("  GET  /jobs, /jobs/<id> - Report job queue metrics and status")
+        logger.info("  POST /reload - Reload data files (local requests only)")
         logger.info("  GET  /health - Health check")
         
+        # Resolve the public URL before the first report request
+        get_public_url_provider()
+        get_report_janitor()
+        
         app.run(host='0.0.0.0', port=5000, debug=False)
         
     except Exception as e:
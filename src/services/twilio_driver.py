@@ -68,6 +68,69 @@ class TwilioDriver:
             self.logger.error(f"❌ Twilio connection failed: {e}")
             return False
     
+    def whatsapp_message_params(self, to_number: str, message: str, media_url: str = None, voice_url: str = None) -> Dict[str, Any]:
+        """
+        Build the messages.create parameters of a WhatsApp message.
+        
+        Args:
+            to_number: Recipient's phone number (with country code, e.g., '+1234567890')
+            message: Message text to send
+            media_url: Optional URL to media file (image, video, etc.)
+            voice_url: Optional URL to voice message file
+            
+        Returns:
+            Keyword arguments for create_message()
+        """
+        # Format numbers for WhatsApp
+        from_whatsapp = f"whatsapp:{self.whatsapp_number}"
+        # Check if to_number already has whatsapp: prefix
+        if to_number.startswith('whatsapp:'):
+            to_whatsapp = to_number
+        else:
+            to_whatsapp = f"whatsapp:{to_number}"
+        
+        # Prepare message parameters
+        message_params = {
+            'body': message,
+            'from_': from_whatsapp,
+            'to': to_whatsapp
+        }
+        
+        # Add media if provided
+        if media_url:
+            message_params['media_url'] = [media_url]
+        
+        # Add voice message if provided
+        if voice_url:
+            message_params['media_url'] = message_params.get('media_url', []) + [voice_url]
+        
+        return message_params
+    
+    def sms_message_params(self, to_number: str, message: str) -> Dict[str, Any]:
+        """Build the messages.create parameters of an SMS message."""
+        return {
+            'body': message,
+            'from_': self.whatsapp_number,  # Can use same number for SMS
+            'to': to_number
+        }
+    
+    def create_message(self, message_params: Dict[str, Any]) -> str:
+        """
+        Send a prepared message (one messages.create call).
+        
+        Args:
+            message_params: Parameters from whatsapp_message_params() or sms_message_params()
+            
+        Returns:
+            The message SID
+            
+        Raises:
+            TwilioRestException if Twilio rejects the request, requests exceptions on network errors
+        """
+        message_obj = self.client.messages.create(**message_params)
+        self.logger.debug(f"Message SID: {message_obj.sid}")
+        return message_obj.sid
+    
     def send_whatsapp_message(self, to_number: str, message: str, media_url: str = None, voice_url: str = None) -> bool:
         """
         Send WhatsApp message via Twilio.
@@ -82,34 +145,9 @@ class TwilioDriver:
             True if message sent successfully, False otherwise
         """
         try:
-            # Format numbers for WhatsApp
-            from_whatsapp = f"whatsapp:{self.whatsapp_number}"
-            # Check if to_number already has whatsapp: prefix
-            if to_number.startswith('whatsapp:'):
-                to_whatsapp = to_number
-            else:
-                to_whatsapp = f"whatsapp:{to_number}"
-            
-            # Prepare message parameters
-            message_params = {
-                'body': message,
-                'from_': from_whatsapp,
-                'to': to_whatsapp
-            }
-            
-            # Add media if provided
-            if media_url:
-                message_params['media_url'] = [media_url]
-            
-            # Add voice message if provided
-            if voice_url:
-                message_params['media_url'] = message_params.get('media_url', []) + [voice_url]
-            
-            # Send message
-            message_obj = self.client.messages.create(**message_params)
+            self.create_message(self.whatsapp_message_params(to_number, message, media_url, voice_url))
             
             self.logger.info(f"✅ WhatsApp message sent to {to_number}: {message[:50]}...")
-            self.logger.debug(f"Message SID: {message_obj.sid}")
             
             return True
             
@@ -155,14 +193,9 @@ class TwilioDriver:
             True if message sent successfully, False otherwise
         """
         try:
-            message_obj = self.client.messages.create(
-                body=message,
-                from_=self.whatsapp_number,  # Can use same number for SMS
-                to=to_number
-            )
+            self.create_message(self.sms_message_params(to_number, message))
             
             self.logger.info(f"✅ SMS sent to {to_number}: {message[:50]}...")
-            self.logger.debug(f"Message SID: {message_obj.sid}")
             
             return True
             
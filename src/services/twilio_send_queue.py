@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Twilio Send Queue
+Outbound WhatsApp/SMS messages go through a queue in front of TwilioDriver, so
+callers return at once instead of waiting on messages.create. A pool of worker
+threads sends the messages, paced by a token bucket set to the account's
+messages-per-second, so bulk notification runs go out at the provider limit
+instead of being throttled by it.
+
+Requests Twilio answers with 429 or 5xx, and connections that could not be
+made, are retried with exponential backoff and jitter. Other errors, and
+messages that used up their attempts, are appended to a dead-letter file (one
+JSON object per line) for inspection or resending. A message submitted with an
+idempotency key that is already queued or sent is not queued again; with a
+keys journal, this holds across every server process sharing the file.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import heapq
+import random
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import requests
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.core.atomic_json import file_lock, write_bytes_atomic
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.json')
+DEFAULT_DEAD_LETTER_PATH = os.path.join(project_root, 'logs', 'twilio_dead_letter.jsonl')
+
+DEFAULT_SEND_QUEUE_CONFIG = {
+    'workers': 4,
+    'messages_per_second': 1.0,  # the account's limit, split between the server processes
+    'burst': 1,
+    'max_attempts': 5,
+    'backoff_base_seconds': 1.0,
+    'backoff_max_seconds': 60.0,
+    'max_pending': 10000,
+    'dead_letter_path': 'logs/twilio_dead_letter.jsonl',
+    'keys_path': 'logs/twilio_idempotency_keys.jsonl'
+}
+
+
+def load_send_queue_config() -> Dict:
+    """Read the twilio_send_queue section of config/config.json over the defaults"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return {**DEFAULT_SEND_QUEUE_CONFIG, **json.load(f).get('twilio_send_queue', {})}
+    except Exception as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+        return dict(DEFAULT_SEND_QUEUE_CONFIG)
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for errors worth retrying: 429 and 5xx responses, connections that were never made"""
+    status = getattr(error, 'status', None)  # TwilioRestException
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    # A read timeout means the request was sent and Twilio may have accepted the
+    # message: never retried, as that could send it twice
+    if isinstance(error, requests.ReadTimeout):
+        return False
+    # Failed connections (ConnectTimeout included) never reached Twilio
+    return isinstance(error, requests.ConnectionError)
+
+
+class IdempotencyJournal:
+    """
+    Idempotency keys claimed by every send queue sharing one file
+
+    The file holds one JSON object per line, {"key": ..., "state": "claimed"} or
+    "released" (a dead-lettered message frees its key for a resend). Claims and
+    releases append a line under file_lock; each process reads only the lines
+    appended since it last looked. Once the file holds twice max_keys lines it is
+    rewritten with the max_keys most recently claimed keys.
+    """
+
+    def __init__(self, path: str, max_keys: int = 10000):
+        """
+        Initialize the journal.
+
+        Args:
+            path: JSON-lines file shared by the server processes
+            max_keys: Claimed keys remembered; older ones may be claimed again
+        """
+        self.path = path
+        directory, filename = os.path.split(path)
+        self.lock_path = os.path.join(directory, f".{filename}.lock")
+        self.max_keys = max_keys
+
+        self._lock = threading.Lock()
+        self._claimed = OrderedDict()  # key -> None, oldest claim first
+        self._inode = None
+        self._offset = 0
+        self._lines = 0
+
+    def _catch_up(self):
+        """Apply the lines other processes appended (caller holds both locks)"""
+        try:
+            file_stat = os.stat(self.path)
+        except FileNotFoundError:
+            file_stat = None
+        if file_stat is None or file_stat.st_ino != self._inode or file_stat.st_size < self._offset:
+            # New or rewritten file: read it from the start
+            self._claimed.clear()
+            self._inode = file_stat.st_ino if file_stat is not None else None
+            self._offset = 0
+            self._lines = 0
+        if file_stat is None or file_stat.st_size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        complete = data[:data.rfind(b'\n') + 1]  # a torn last line is read again next time
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            self._lines += 1
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(entry.get('key'), entry.get('state'))
+
+    def _apply(self, key: str, state: str):
+        if state == 'claimed':
+            self._claimed.pop(key, None)
+            self._claimed[key] = None
+            while len(self._claimed) > self.max_keys:
+                self._claimed.popitem(last=False)
+        elif state == 'released':
+            self._claimed.pop(key, None)
+
+    def _append(self, key: str, state: str):
+        """Append one line and apply it (caller holds both locks and has caught up)"""
+        line = json.dumps({'key': key, 'state': state, 'time': datetime.now().isoformat()},
+                          ensure_ascii=False) + '\n'
+        with open(self.path, 'ab') as f:
+            f.write(line.encode('utf-8'))
+            self._inode = os.fstat(f.fileno()).st_ino
+            self._offset = f.tell()
+        self._lines += 1
+        self._apply(key, state)
+        if self._lines >= 2 * self.max_keys:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file with the claimed keys only (caller holds both locks)"""
+        write_bytes_atomic(self.path, [
+            (json.dumps({'key': key, 'state': 'claimed'}, ensure_ascii=False) + '\n').encode('utf-8')
+            for key in self._claimed
+        ])
+        file_stat = os.stat(self.path)
+        self._inode = file_stat.st_ino
+        self._offset = file_stat.st_size
+        self._lines = len(self._claimed)
+
+    def claim(self, key: str) -> bool:
+        """
+        Claim a key before its message is queued
+
+        Returns:
+            True if the key was free, False if some process already claimed it
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._catch_up()
+            if key in self._claimed:
+                return False
+            self._append(key, 'claimed')
+            return True
+
+    def release(self, key: str):
+        """Free a key whose message was not sent"""
+        with self._lock, file_lock(self.lock_path):
+            self._catch_up()
+            self._append(key, 'released')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to capacity banked"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+@dataclass
+class OutboundMessage:
+    """State of one queued message"""
+    message_id: str
+    channel: str  # 'whatsapp', 'sms'
+    to: str
+    params: Dict[str, Any] = field(repr=False)
+    idempotency_key: Optional[str] = None
+    status: str = 'queued'  # 'queued', 'sending', 'retrying', 'sent', 'dead', 'duplicate' (key claimed by another process)
+    attempts: int = 0
+    sid: Optional[str] = None
+    error: Optional[str] = None
+    created_at: str = ''
+    finished_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public message view (without the message body)"""
+        data = asdict(self)
+        data.pop('params')
+        return data
+
+
+class TwilioSendQueue:
+    """
+    Rate-limited, retrying outbound message queue
+
+    At most max_pending messages may be waiting at once; beyond that a message is
+    written to the dead-letter file and submit() returns None.
+    """
+
+    def __init__(self,
+                 driver,
+                 workers: int = 4,
+                 messages_per_second: float = 1.0,
+                 burst: int = 1,
+                 max_attempts: int = 5,
+                 backoff_base_seconds: float = 1.0,
+                 backoff_max_seconds: float = 60.0,
+                 max_pending: int = 10000,
+                 dead_letter_path: str = DEFAULT_DEAD_LETTER_PATH,
+                 history_size: int = 10000,
+                 keys_path: Optional[str] = None):
+        """
+        Initialize the send queue.
+
+        Args:
+            driver: TwilioDriver (anything with the *_message_params() and create_message() methods)
+            workers: Threads sending messages concurrently
+            messages_per_second: Sustained send rate of this queue (its process's share of the account's limit)
+            burst: Messages that may go out back to back after an idle period
+            max_attempts: Sends tried per message before it is dead-lettered
+            backoff_base_seconds: Delay before the first retry; doubles on every further retry
+            backoff_max_seconds: Longest delay between retries
+            max_pending: Messages waiting to be sent or retried
+            dead_letter_path: JSON-lines file for messages that could not be sent
+            history_size: Finished messages (and their idempotency keys) remembered
+            keys_path: IdempotencyJournal file shared with the other server processes;
+                None checks idempotency keys within this process only
+        """
+        self.driver = driver
+        self.workers = workers
+        self.messages_per_second = messages_per_second
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_pending = max_pending
+        self.dead_letter_path = dead_letter_path
+        self.history_size = history_size
+
+        self._bucket = TokenBucket(messages_per_second, burst)
+        self._condition = threading.Condition()
+        self._schedule = []  # heap of (ready time, sequence, message_id)
+        self._sequence = 0
+        self._messages = OrderedDict()  # message_id -> OutboundMessage, oldest first
+        self._keys = {}  # idempotency key -> message_id
+        self._in_flight = 0
+        self._counters = {'submitted': 0, 'sent': 0, 'retried': 0, 'dead_lettered': 0,
+                          'duplicates': 0, 'rejected': 0}
+        self._journal = IdempotencyJournal(keys_path, history_size) if keys_path else None
+        self._dead_letter_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._condition:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stop_event.clear()
+            self._threads = [threading.Thread(target=self._worker_loop, name=f'twilio-send-{index}', daemon=True)
+                             for index in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the worker threads; queued messages stay queued"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def send_whatsapp(self, to_number: str, message: str, media_url: str = None,
+                      idempotency_key: Optional[str] = None) -> Optional[OutboundMessage]:
+        """Queue a WhatsApp message (see submit())"""
+        params = self.driver.whatsapp_message_params(to_number, message, media_url)
+        return self.submit('whatsapp', to_number, params, idempotency_key)
+
+    def send_sms(self, to_number: str, message: str,
+                 idempotency_key: Optional[str] = None) -> Optional[OutboundMessage]:
+        """Queue an SMS message (see submit())"""
+        return self.submit('sms', to_number, self.driver.sms_message_params(to_number, message), idempotency_key)
+
+    def submit(self, channel: str, to: str, params: Dict[str, Any],
+               idempotency_key: Optional[str] = None) -> Optional[OutboundMessage]:
+        """
+        Queue a prepared message
+
+        Args:
+            channel: 'whatsapp' or 'sms'
+            to: Recipient (for logs and status)
+            params: messages.create parameters from the driver
+            idempotency_key: Caller's key for this message (e.g. a report job id);
+                a message with the same key that is queued or sent is returned instead,
+                and one claimed by another process gives a 'duplicate' message
+
+        Returns:
+            The queued message, or None if the queue is full
+        """
+        message = OutboundMessage(
+            message_id=uuid.uuid4().hex,
+            channel=channel,
+            to=to,
+            params=params,
+            idempotency_key=idempotency_key,
+            created_at=datetime.now().isoformat()
+        )
+        with self._condition:
+            existing = self._messages.get(self._keys.get(idempotency_key)) if idempotency_key else None
+            if existing is not None and existing.status != 'dead':
+                self._counters['duplicates'] += 1
+                logger.info(f"Message with key {idempotency_key} already {existing.status}, not queued again")
+                return existing
+
+        claimed = False
+        if idempotency_key and self._journal is not None:
+            try:
+                claimed = self._journal.claim(idempotency_key)
+                if not claimed:
+                    message.status = 'duplicate'
+                    message.finished_at = datetime.now().isoformat()
+            except Exception as e:
+                # Sending without the shared check beats not sending at all
+                logger.error(f"Error claiming idempotency key {idempotency_key} in {self._journal.path}: {e}")
+
+        with self._condition:
+            if message.status == 'duplicate':
+                self._messages[message.message_id] = message
+                self._keys[idempotency_key] = message.message_id
+                self._counters['duplicates'] += 1
+                self._trim_history()
+            elif len(self._schedule) >= self.max_pending:
+                self._counters['rejected'] += 1
+                message.status = 'dead'
+                message.error = 'send queue full'
+            else:
+                self._messages[message.message_id] = message
+                if idempotency_key:
+                    self._keys[idempotency_key] = message.message_id
+                self._push(message, time.monotonic())
+                self._counters['submitted'] += 1
+                self._trim_history()
+
+        if message.status == 'duplicate':
+            logger.info(f"Message with key {idempotency_key} already claimed by another process, not queued")
+        elif message.status == 'dead':
+            logger.warning(f"Send queue full ({self.max_pending} pending), dead-lettering message to {to}")
+            if claimed:
+                self._release_key(message)
+            self._dead_letter(message)
+            return None
+        return message
+
+    def _push(self, message: OutboundMessage, ready_at: float):
+        """Schedule a message (caller holds the condition)"""
+        self._sequence += 1
+        heapq.heappush(self._schedule, (ready_at, self._sequence, message.message_id))
+        self._condition.notify()
+
+    def _next_message(self) -> Optional[OutboundMessage]:
+        """Wait for the next message that is due, or None when stopping"""
+        with self._condition:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                if self._schedule and self._schedule[0][0] <= now:
+                    _, _, message_id = heapq.heappop(self._schedule)
+                    message = self._messages[message_id]
+                    message.status = 'sending'
+                    self._in_flight += 1
+                    return message
+                self._condition.wait(self._schedule[0][0] - now if self._schedule else None)
+            return None
+
+    def _worker_loop(self):
+        """Send due messages, one at a time per worker"""
+        while True:
+            message = self._next_message()
+            if message is None:
+                return
+            delay = self._bucket.reserve()
+            if delay > 0 and self._stop_event.wait(delay):
+                # Stopped while waiting for a token: sending now would break the rate limit
+                self._requeue(message)
+                return
+            self._send(message)
+
+    def _requeue(self, message: OutboundMessage):
+        """Put a message taken by a worker back on the schedule, unsent"""
+        with self._condition:
+            self._in_flight -= 1
+            message.status = 'queued' if message.attempts == 0 else 'retrying'
+            self._push(message, time.monotonic())
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter before retry number attempts"""
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _send(self, message: OutboundMessage):
+        """Make one send attempt and record its outcome"""
+        error = None
+        sid = None
+        try:
+            sid = self.driver.create_message(message.params)
+        except Exception as e:
+            error = e
+
+        dead = False
+        with self._condition:
+            self._in_flight -= 1
+            message.attempts += 1
+            if error is None:
+                message.status = 'sent'
+                message.sid = sid
+                message.error = None
+                message.finished_at = datetime.now().isoformat()
+                self._counters['sent'] += 1
+            elif is_retryable(error) and message.attempts < self.max_attempts:
+                message.status = 'retrying'
+                message.error = str(error)
+                delay = self._backoff(message.attempts)
+                self._push(message, time.monotonic() + delay)
+                self._counters['retried'] += 1
+            else:
+                message.status = 'dead'
+                message.error = str(error)
+                message.finished_at = datetime.now().isoformat()
+                self._counters['dead_lettered'] += 1
+                dead = True
+
+        if error is None:
+            logger.info(f"{message.channel} message {message.message_id} sent to {message.to} ({sid})")
+        elif dead:
+            logger.error(f"Giving up on {message.channel} message {message.message_id} to {message.to} "
+                         f"after {message.attempts} attempts: {error}")
+            self._release_key(message)
+            self._dead_letter(message)
+        else:
+            logger.warning(f"{message.channel} message {message.message_id} to {message.to} failed "
+                           f"(attempt {message.attempts}), retrying in {delay:.1f}s: {error}")
+
+    def _release_key(self, message: OutboundMessage):
+        """Free the shared idempotency key of a message that was not sent"""
+        if not message.idempotency_key or self._journal is None:
+            return
+        try:
+            self._journal.release(message.idempotency_key)
+        except Exception as e:
+            logger.error(f"Error releasing idempotency key {message.idempotency_key}: {e}")
+
+    def _dead_letter(self, message: OutboundMessage):
+        """Append an unsendable message to the dead-letter file"""
+        line = json.dumps({
+            'time': datetime.now().isoformat(),
+            **message.to_dict(),
+            'params': message.params
+        }, ensure_ascii=False, default=str) + '\n'
+        try:
+            with self._dead_letter_lock:
+                os.makedirs(os.path.dirname(self.dead_letter_path), exist_ok=True)
+                with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+        except Exception as e:
+            logger.error(f"Error writing dead-letter file {self.dead_letter_path}: {e}")
+
+    def _trim_history(self):
+        """Drop the oldest finished messages beyond history_size (caller holds the condition)"""
+        excess = len(self._messages) - self.history_size
+        if excess <= 0:
+            return
+        for message_id in list(self._messages):
+            if excess <= 0:
+                break
+            message = self._messages[message_id]
+            if message.status in ('sent', 'dead', 'duplicate'):
+                del self._messages[message_id]
+                if message.idempotency_key and self._keys.get(message.idempotency_key) == message_id:
+                    del self._keys[message.idempotency_key]
+                excess -= 1
+
+    def get_message(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """Get the public status of a message"""
+        with self._condition:
+            message = self._messages.get(message_id)
+            return message.to_dict() if message is not None else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, rate and counters for health output"""
+        with self._condition:
+            return {
+                'queue_depth': len(self._schedule),
+                'in_flight': self._in_flight,
+                'max_pending': self.max_pending,
+                'workers': self.workers,
+                'messages_per_second': self.messages_per_second,
+                **self._counters
+            }
@@ -0,0 +1,79 @@
+"""Atomic data file writes, generations and the shared file lock"""
+
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from src.core.atomic_json import file_lock, read_generation, write_bytes_atomic, write_json_atomic
+
+
+def write_many(path, count):
+    for index in range(count):
+        write_json_atomic(path, {'index': index})
+
+
+def test_writes_bump_the_generation(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    assert read_generation(path) is None
+
+    assert write_json_atomic(path, {'vehicles': []}) == 1
+    assert write_json_atomic(path, {'vehicles': [{'id': 'V-1'}]}) == 2
+    assert read_generation(path) == 2
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'vehicles': [{'id': 'V-1'}]}
+
+
+def test_no_temp_files_are_left(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    write_json_atomic(path, {'vehicles': []})
+    write_bytes_atomic(str(tmp_path / 'catalog.snapshot'), [b'ab', b'cd'])
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    assert (tmp_path / 'catalog.snapshot').read_bytes() == b'abcd'
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    write_json_atomic(path, {'vehicles': []})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {'vehicles': {1, 2}})
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'vehicles': []}
+    assert read_generation(path) == 1
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='uses fork')
+def test_concurrent_writers_never_lose_a_generation(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    context = multiprocessing.get_context('fork')
+    writers = [context.Process(target=write_many, args=(path, 25)) for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert all(writer.exitcode == 0 for writer in writers)
+    assert read_generation(path) == 100
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='uses fork')
+def test_file_lock_is_exclusive(tmp_path):
+    lock_path = str(tmp_path / '.lock')
+    context = multiprocessing.get_context('fork')
+    result = context.Queue()
+    with file_lock(lock_path) as held:
+        assert held
+        probe = context.Process(target=try_lock, args=(lock_path, result))
+        probe.start()
+        probe.join()
+        assert result.get(timeout=5) is False
+    with file_lock(lock_path, blocking=False) as held:
+        assert held
+
+
+def try_lock(lock_path, result):
+    with file_lock(lock_path, blocking=False) as held:
+        result.put(held)
@@ -0,0 +1,79 @@
+"""Batch fleet report rendering: vehicle selection, output names, ZIP and merged PDF"""
+
+import zipfile
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('reportlab')
+
+from src.core.atomic_json import write_json_atomic
+from src.core.batch_report_generator import BatchReportGenerator, safe_filename_part, select_vehicles
+from src.core.vehicle_repository import VehicleRepository
+
+VEHICLES = [
+    {'id': 'V-1', 'license_plate': '12-345-67', 'make': 'Toyota', 'status': 'active', 'location': 'Haifa'},
+    {'id': 'V-2', 'license_plate': '98-765-43', 'make': 'Ford', 'status': 'active', 'location': 'Eilat'},
+    {'id': 'V-3', 'license_plate': '55-555-55', 'make': 'toyota', 'status': 'in_service', 'location': 'Haifa'},
+    {'id': 'V-4', 'license_plate': '12 345 67', 'make': 'Mazda', 'status': 'active', 'location': 'Haifa'},
+]
+
+RECORDS = [
+    {'vehicle_id': 'V-1', 'license_plate': '12-345-67', 'date': '2024-01-10', 'type': 'oil_change', 'cost': 85.0},
+    {'vehicle_id': 'V-2', 'license_plate': '98-765-43', 'date': '2024-02-10', 'type': 'tire_rotation', 'cost': 25.0},
+]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    catalog_path = str(tmp_path / 'large_vehicle_catalog.json')
+    records_path = str(tmp_path / 'maintenance_records.json')
+    write_json_atomic(catalog_path, {'vehicles': VEHICLES})
+    write_json_atomic(records_path, {'records': RECORDS})
+    return VehicleRepository(catalog_path, records_path)
+
+
+def ids(vehicles):
+    return [vehicle['id'] for vehicle in vehicles]
+
+
+def test_select_vehicles_filters():
+    assert ids(select_vehicles(VEHICLES, license_plates=['1234567'])) == ['V-1', 'V-4']
+    assert ids(select_vehicles(VEHICLES, make='TOYOTA')) == ['V-1', 'V-3']
+    assert ids(select_vehicles(VEHICLES, status='active', location='Haifa')) == ['V-1', 'V-4']
+    assert ids(select_vehicles(VEHICLES, limit=2)) == ['V-1', 'V-2']
+    assert select_vehicles(VEHICLES, license_plates=['00-000-00']) == []
+
+
+def test_safe_filename_part():
+    assert safe_filename_part('12-345-67') == '12-345-67'
+    assert safe_filename_part('../12 345/67') == '12_345_67'
+    assert safe_filename_part('///') == 'unknown'
+
+
+def test_output_names_are_unique(repository, tmp_path):
+    batch = BatchReportGenerator(output_root=str(tmp_path / 'batch'), workers=1, repository=repository)
+    tasks = batch._build_tasks(VEHICLES, str(tmp_path))
+
+    names = [path.rsplit('/', 1)[-1] for _, _, path in tasks]
+    assert len(set(names)) == len(names)
+    assert names[0] == 'maintenance_report_12-345-67.pdf'
+    # Records are looked up by normalized plate, so both spellings get V-1's record
+    assert [len(records) for _, records, _ in tasks] == [1, 1, 0, 1]
+
+
+def test_run_renders_zips_and_merges(repository, tmp_path):
+    pypdf = pytest.importorskip('pypdf')
+    batch = BatchReportGenerator(output_root=str(tmp_path / 'batch'), workers=2, repository=repository)
+
+    summary = batch.run(VEHICLES[:3], create_zip=True, merge=True, run_date=datetime(2024, 6, 1))
+
+    assert summary['output_dir'].endswith('2024-06-01')
+    assert summary['rendered'] == 3 and summary['failed'] == []
+    with zipfile.ZipFile(summary['zip_path']) as bundle:
+        assert sorted(bundle.namelist()) == ['maintenance_report_12-345-67.pdf', 'maintenance_report_55-555-55.pdf',
+                                             'maintenance_report_98-765-43.pdf']
+    page_counts = [len(pypdf.PdfReader(f"{summary['output_dir']}/{name}").pages)
+                   for name in ('maintenance_report_12-345-67.pdf', 'maintenance_report_98-765-43.pdf',
+                                'maintenance_report_55-555-55.pdf')]
+    assert len(pypdf.PdfReader(summary['merged_path']).pages) == sum(page_counts)
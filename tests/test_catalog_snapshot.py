@@ -0,0 +1,99 @@
+"""Catalog snapshot writes and loads"""
+
+import os
+
+import pytest
+
+from src.core.atomic_json import write_json_atomic
+from src.core.catalog_snapshot import CatalogSnapshot, write_catalog_snapshot
+from src.core.fleet_models import Vehicle
+from src.core.vehicle_repository import normalize_license_plate
+
+
+def vehicle(index, **overrides):
+    return {
+        'id': f"V-{index}",
+        'license_plate': f"{index:02d}-345-67",
+        'year': 2000 + index,
+        'mileage': 1000.5 * index,
+        'tags': ['leased'] if index % 2 else None,
+        'driver': {'name': f"נהג {index}", 'phone': '050-0000000'},
+        **overrides
+    }
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = str(tmp_path / 'large_vehicle_catalog.json')
+    catalog = {'vehicles': [vehicle(index) for index in range(5)], 'total_vehicles': 5, 'last_updated': 'now'}
+    write_json_atomic(path, catalog)
+    assert write_catalog_snapshot(path, catalog)
+    return path, catalog
+
+
+def test_round_trip(catalog_path):
+    path, catalog = catalog_path
+    snapshot = CatalogSnapshot.load(path)
+
+    assert snapshot is not None
+    assert len(snapshot.rows) == 5
+    assert list(snapshot.rows) == catalog['vehicles']
+    assert snapshot.rows[3] == catalog['vehicles'][3]
+    assert snapshot.meta['total_vehicles'] == 5
+    assert snapshot.rows.column('driver', 'name') == [item['driver']['name'] for item in catalog['vehicles']]
+
+
+def test_rows_as_records(catalog_path):
+    path, catalog = catalog_path
+    snapshot = CatalogSnapshot.load(path, row_type=Vehicle)
+
+    rows = list(snapshot.rows)
+    assert all(type(row) is Vehicle for row in rows)
+    assert [row.to_dict() for row in rows] == catalog['vehicles']
+
+
+def test_plate_index(catalog_path):
+    path, _ = catalog_path
+    snapshot = CatalogSnapshot.load(path)
+
+    assert snapshot.find_plate_positions(normalize_license_plate('02-345-67')) == [2]
+    assert snapshot.find_plate_positions(normalize_license_plate('99-999-99')) == []
+
+
+def test_stale_snapshot_is_ignored(catalog_path):
+    path, catalog = catalog_path
+    write_json_atomic(path, {**catalog, 'vehicles': catalog['vehicles'][:2]})
+
+    assert CatalogSnapshot.load(path) is None
+
+
+def test_differing_row_layouts_are_not_written(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    catalog = {'vehicles': [vehicle(1), {'license_plate': '12-345-67'}]}
+    write_json_atomic(path, catalog)
+
+    assert not write_catalog_snapshot(path, catalog)
+    assert CatalogSnapshot.load(path) is None
+
+
+def test_memory_mapped_round_trip(catalog_path):
+    path, catalog = catalog_path
+    snapshot = CatalogSnapshot.load(path, memory_map=True, cache_rows=False)
+
+    assert list(snapshot.rows) == catalog['vehicles']
+    # Nothing is cached: every access decodes a new row
+    assert snapshot.rows[1] == catalog['vehicles'][1]
+    assert snapshot.rows[1] is not snapshot.rows[1]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Windows cannot replace a mapped file")
+def test_mapping_survives_rewrite(catalog_path):
+    path, catalog = catalog_path
+    mapped = CatalogSnapshot.load(path, memory_map=True, cache_rows=False)
+
+    updated = {**catalog, 'vehicles': [vehicle(index, year=1990) for index in range(3)]}
+    write_json_atomic(path, updated)
+    assert write_catalog_snapshot(path, updated)
+
+    assert list(mapped.rows) == catalog['vehicles']
+    assert list(CatalogSnapshot.load(path, memory_map=True).rows) == updated['vehicles']
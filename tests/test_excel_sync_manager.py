@@ -0,0 +1,229 @@
+"""Row diffs, merges and vehicle ids of the incremental Excel sync"""
+
+import json
+
+import pandas as pd
+import pytest
+
+import excel_sync_manager
+from excel_sync_manager import ExcelSyncManager, diff_row_hashes, row_content_hash, row_keys
+from src.core import fleet_datastore
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A project root with its own config and data directory"""
+    config_path = tmp_path / 'config' / 'config.json'
+    config_path.parent.mkdir()
+    config_path.write_text(json.dumps({'excel_sync': {'stream_rows': False}, 'datastore': {'backend': 'json'}}),
+                           encoding='utf-8')
+    (tmp_path / 'data').mkdir()
+    monkeypatch.setattr(excel_sync_manager, 'project_root', str(tmp_path))
+    monkeypatch.setattr(excel_sync_manager, 'CONFIG_PATH', str(config_path))
+    monkeypatch.setattr(fleet_datastore, 'CONFIG_PATH', str(config_path))
+    return tmp_path
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    """Report cache invalidations of the syncs (plates, or None for every report)"""
+    calls = []
+    monkeypatch.setattr(excel_sync_manager, 'invalidate_report_cache',
+                        lambda license_plates=None: calls.append(license_plates))
+    return calls
+
+
+def write_workbook(project, rows):
+    sheet = pd.DataFrame(rows, columns=['License Plate', 'Make', 'Mileage', 'Fault Type'])
+    sheet.to_excel(project / 'Large Enhanced Fleet.xlsx', sheet_name='Vehicles', index=False)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+ROWS = [
+    ['11-111-11', 'Toyota', 1000, 'Brakes'],
+    ['22-222-22', 'Mazda', 2000, None],
+    ['33-333-33', 'Kia', 3000, None],
+]
+
+
+def test_constructor_reads_config_and_paths(project):
+    manager = ExcelSyncManager()
+
+    assert manager.stream_rows is False
+    assert manager.data_dir == str(project / 'data')
+    assert manager.vehicle_catalog_path == str(project / 'data' / 'large_vehicle_catalog.json')
+    assert manager.datastore is None
+    assert manager.sync_tracking['vehicle_hashes'] == {}
+
+
+def test_row_keys_number_repeated_plates():
+    items = [{'license_plate': 'A'}, {'license_plate': 'B'}, {'license_plate': 'A'}]
+    assert row_keys(items) == ['A', 'B', 'A#2']
+
+
+def test_row_content_hash_ignores_sync_timestamps():
+    assert row_content_hash({'cost': 1, 'created_at': 'monday'}) == row_content_hash({'cost': 1, 'created_at': 'tuesday'})
+    assert row_content_hash({'cost': 1}) != row_content_hash({'cost': 2})
+
+
+def test_diff_row_hashes():
+    diff = diff_row_hashes({'A': 'a', 'B': 'b', 'C': 'c'}, ['A', 'C', 'D'], ['a', 'c2', 'd'])
+    assert diff['inserted'] == ['D']
+    assert diff['updated'] == ['C']
+    assert diff['deleted'] == ['B']
+    assert diff['unchanged'] == 1
+    assert not diff['same_layout']
+
+
+def test_diff_row_hashes_same_layout():
+    diff = diff_row_hashes({'A': 'a', 'B': 'b'}, ['A', 'B'], ['a', 'b2'])
+    assert diff['same_layout']
+    assert diff['updated'] == ['B']
+
+
+def test_full_sync_lists_no_rows(project, invalidations):
+    write_workbook(project, ROWS)
+    assert ExcelSyncManager().sync_excel_data()
+
+    catalog = read_json(project / 'data' / 'large_vehicle_catalog.json')
+    changes = catalog['changes']
+    assert changes['full'] and changes['base_sync_id'] is None
+    assert changes['inserted'] == changes['updated'] == changes['deleted'] == changes['changed_positions'] == []
+    assert [vehicle['id'] for vehicle in catalog['vehicles']] == ['V-11-111-11', 'V-22-222-22', 'V-33-333-33']
+    assert invalidations == [None]
+
+
+def test_incremental_sync_keeps_unchanged_rows(project, invalidations):
+    write_workbook(project, ROWS)
+    assert ExcelSyncManager().sync_excel_data()
+    before = read_json(project / 'data' / 'large_vehicle_catalog.json')
+
+    # First row deleted, third changed, fourth added
+    write_workbook(project, [ROWS[1], ['33-333-33', 'Kia', 3500, None], ['44-444-44', 'Ford', 4000, None]])
+    assert ExcelSyncManager().sync_excel_data()
+
+    catalog = read_json(project / 'data' / 'large_vehicle_catalog.json')
+    changes = catalog['changes']
+    assert not changes['full']
+    assert changes['base_sync_id'] == before['changes']['sync_id']
+    assert changes['deleted'] == ['11-111-11']
+    assert changes['inserted'] == ['44-444-44']
+    assert changes['updated'] == []  # mileage lives in the maintenance records
+    assert changes['changed_positions'] == [2]
+    # The untouched vehicle kept its dict, timestamp and id although its row moved up
+    assert catalog['vehicles'][0] == before['vehicles'][1]
+
+    records = read_json(project / 'data' / 'vehicles' / 'maintenance_records.json')
+    assert records['changes']['updated'] == ['33-333-33']
+    assert invalidations[-1] == ['11-111-11', '33-333-33', '44-444-44']
+
+
+def test_records_join_their_vehicle(project, invalidations):
+    write_workbook(project, ROWS)
+    assert ExcelSyncManager().sync_excel_data()
+
+    vehicles = read_json(project / 'data' / 'large_vehicle_catalog.json')['vehicles']
+    records = read_json(project / 'data' / 'vehicles' / 'maintenance_records.json')['records']
+    assert [record['vehicle_id'] for record in records] == [vehicle['id'] for vehicle in vehicles]
+    assert read_json(project / 'data' / 'fault_reports.json')['total_faults'] == 1
+
+
+def test_data_keyed_by_row_position_is_rekeyed(project, invalidations):
+    write_workbook(project, ROWS)
+    assert ExcelSyncManager().sync_excel_data()
+
+    # Data written by a sync that assigned row-position ids
+    tracking_path = project / 'data' / 'sync_tracking.json'
+    tracking = read_json(tracking_path)
+    del tracking['vehicle_id_scheme']
+    tracking_path.write_text(json.dumps(tracking), encoding='utf-8')
+    catalog_path = project / 'data' / 'large_vehicle_catalog.json'
+    catalog = read_json(catalog_path)
+    for index, vehicle in enumerate(catalog['vehicles']):
+        vehicle['id'] = f"V{index:03d}"
+    catalog_path.write_text(json.dumps(catalog), encoding='utf-8')
+
+    # The workbook is unchanged, but the sync rewrites everything once
+    manager = ExcelSyncManager()
+    assert manager.sync_excel_data()
+    catalog = read_json(catalog_path)
+    assert catalog['changes']['full']
+    assert [vehicle['id'] for vehicle in catalog['vehicles']] == ['V-11-111-11', 'V-22-222-22', 'V-33-333-33']
+    assert manager.sync_tracking['sync_history'][-1]['action'] == 'full_sync'
+    assert invalidations[-1] is None
+
+    # ...and only once
+    assert ExcelSyncManager().sync_excel_data()
+    assert read_json(catalog_path)['changes']['sync_id'] == catalog['changes']['sync_id']
+
+
+def test_vehicle_ids_do_not_depend_on_row_position(project):
+    manager = ExcelSyncManager()
+    sheet = pd.DataFrame({'License Plate': ['11-111-11', '22-222-22', '33-333-33'], 'Make': ['a', 'b', 'c']})
+
+    before = manager.build_vehicles(sheet, 'now')
+    after = manager.build_vehicles(sheet.drop(index=0).reset_index(drop=True), 'now')
+
+    assert [vehicle['id'] for vehicle in after] == [vehicle['id'] for vehicle in before[1:]]
+    assert [row_content_hash(vehicle) for vehicle in after] == [row_content_hash(vehicle) for vehicle in before[1:]]
+
+
+def test_vehicle_id_cells_are_kept(project):
+    manager = ExcelSyncManager()
+    sheet = pd.DataFrame({'Vehicle ID': ['FLEET-7'], 'License Plate': ['11-111-11']})
+
+    sheet['Fault Type'] = ['Brakes']
+
+    [vehicle] = manager.build_vehicles(sheet, 'now')
+    records, faults = manager.build_maintenance_records(sheet, 'now')
+    assert vehicle['id'] == records[0]['vehicle_id'] == faults[0]['vehicle_id'] == 'FLEET-7'
+
+
+@pytest.mark.parametrize('missing_columns', [[], ['Vehicle ID', 'Status', 'Driver ID', 'Year', 'Reported By',
+                                                  'Fault Status', 'Repair Cost']])
+def test_column_wise_conversion_matches_the_row_loop(project, missing_columns):
+    from benchmark_data import generate_fleet_sheet
+    from benchmark_excel_sync import as_json, legacy_build_maintenance_records, legacy_build_vehicles
+
+    manager = ExcelSyncManager()
+    sheet = generate_fleet_sheet(300, seed=7).drop(columns=missing_columns)
+
+    assert as_json(manager.build_vehicles(sheet, 'now')) == as_json(legacy_build_vehicles(sheet, 'now'))
+    assert as_json(manager.build_maintenance_records(sheet, 'now')) == \
+        as_json(legacy_build_maintenance_records(sheet, 'now'))
+
+
+def test_streamed_sheet_converts_like_the_whole_sheet(project):
+    from benchmark_data import generate_fleet_sheet
+
+    sheet = generate_fleet_sheet(120, seed=3)
+    sheet.to_excel(project / 'Large Enhanced Fleet.xlsx', sheet_name='Vehicles', index=False)
+
+    whole = ExcelSyncManager(stream_rows=False).read_sheet_rows('now')
+    streamed = ExcelSyncManager(stream_rows=True, chunk_rows=25).read_sheet_rows('now')
+
+    assert streamed[3] == whole[3] == 120
+    assert json.dumps(streamed, ensure_ascii=False) == json.dumps(whole, ensure_ascii=False)
+
+
+def test_stream_chunks_skip_blank_rows_and_continue_the_index(project):
+    write_workbook(project, ROWS[:1] + [[None, None, None, None]] + ROWS[1:])
+    manager = ExcelSyncManager(stream_rows=True, chunk_rows=2)
+
+    chunks = list(manager.iter_main_excel_chunks())
+
+    assert [list(chunk.index) for chunk in chunks] == [[0, 1], [2]]
+    assert list(chunks[0].columns) == ['License Plate', 'Make', 'Mileage', 'Fault Type']
+    assert [chunk['License Plate'].tolist() for chunk in chunks] == [['11-111-11', '22-222-22'], ['33-333-33']]
+    assert chunks[0]['Mileage'].tolist() == [1000, 2000]
+
+
+def test_header_only_sheet_streams_one_empty_chunk(project):
+    write_workbook(project, [])
+
+    [chunk] = ExcelSyncManager(stream_rows=True).iter_main_excel_chunks()
+    assert chunk.empty and list(chunk.columns) == ['License Plate', 'Make', 'Mileage', 'Fault Type']
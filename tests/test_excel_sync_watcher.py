@@ -0,0 +1,146 @@
+"""Excel sync watcher: change detection, debouncing and the reload call"""
+
+import os
+import time
+
+import pytest
+
+import excel_sync_watcher
+from excel_sync_watcher import ExcelSyncWatcher
+
+
+class FakeSyncManager:
+    """Records syncs; a sync stores the workbook stat and, if the content changed, a new sync id"""
+
+    def __init__(self, workbook_path):
+        self.main_excel_path = str(workbook_path)
+        self.sync_tracking = {}
+        self.syncs = 0
+        self.result = True
+        self.content_changed = True
+
+    def sync_excel_data(self):
+        self.syncs += 1
+        if not self.result:
+            return False
+        stat = os.stat(self.main_excel_path)
+        self.sync_tracking['main_excel_stat'] = [stat.st_mtime_ns, stat.st_size]
+        if self.content_changed:
+            self.sync_tracking['last_sync_id'] = f"sync-{self.syncs}"
+        return True
+
+
+@pytest.fixture
+def manager(tmp_path):
+    workbook_path = tmp_path / 'Large Enhanced Fleet.xlsx'
+    workbook_path.write_bytes(b'v1')
+    return FakeSyncManager(workbook_path)
+
+
+@pytest.fixture
+def reloads(monkeypatch):
+    calls = []
+    monkeypatch.setattr(excel_sync_watcher, 'publish_reload', lambda url: calls.append(url) or True)
+    return calls
+
+
+def script_signatures(monkeypatch, next_signature):
+    """Replace the workbook stat with next_signature(); returns the list of reads"""
+    reads = []
+
+    def file_stat_signature(path):
+        reads.append(path)
+        return next_signature()
+
+    monkeypatch.setattr(excel_sync_watcher.ExcelSyncManager, 'file_stat_signature',
+                        staticmethod(file_stat_signature))
+    return reads
+
+
+def make_watcher(manager, **kwargs):
+    options = {'debounce_seconds': 0.01, 'poll_interval': 0.02, 'max_settle_seconds': 5,
+               'reload_url': 'http://server/reload', 'use_events': False}
+    options.update(kwargs)
+    return ExcelSyncWatcher(sync_manager=manager, **options)
+
+
+def test_changed_workbook_is_synced_and_reloaded(manager, reloads):
+    watcher = make_watcher(manager)
+
+    assert watcher.check_once() is True
+    assert manager.syncs == 1 and reloads == ['http://server/reload']
+    # The recorded stat matches, so nothing happens until the next save
+    assert watcher.check_once() is False
+    assert manager.syncs == 1
+    assert watcher.get_status()['syncs'] == 1 and watcher.get_status()['reloads'] == 1
+
+
+def test_save_without_content_changes_is_not_reloaded(manager, reloads):
+    manager.content_changed = False
+    watcher = make_watcher(manager)
+
+    assert watcher.check_once() is False
+    assert manager.syncs == 1 and reloads == []
+    assert watcher.get_status()['skipped_unchanged'] == 1
+
+
+def test_failed_sync_is_counted(manager, reloads):
+    manager.result = False
+    watcher = make_watcher(manager)
+
+    assert watcher.check_once() is False
+    assert watcher.get_status()['failed_syncs'] == 1 and reloads == []
+
+
+def test_missing_workbook_is_ignored(tmp_path, reloads):
+    manager = FakeSyncManager(tmp_path / 'missing.xlsx')
+
+    assert make_watcher(manager).check_once() is False
+    assert manager.syncs == 0
+
+
+def test_sync_waits_for_the_workbook_to_settle(manager, reloads, monkeypatch):
+    sequence = iter([[1, 10], [2, 20], [3, 30], [3, 30]])
+    reads = script_signatures(monkeypatch, lambda: next(sequence))
+
+    assert make_watcher(manager).check_once() is True
+    # One read to notice the change, then one per debounce period until two agree
+    assert len(reads) == 4 and manager.syncs == 1
+
+
+def test_sync_runs_anyway_after_max_settle(manager, reloads, monkeypatch):
+    sizes = iter(range(10 ** 6))
+    script_signatures(monkeypatch, lambda: [1, next(sizes)])
+
+    assert make_watcher(manager, max_settle_seconds=0.05).check_once() is True
+    assert manager.syncs == 1
+
+
+def test_stop_interrupts_the_settle_wait(manager, reloads):
+    watcher = make_watcher(manager, debounce_seconds=60)
+    watcher._stop.set()
+
+    assert watcher.check_once() is False
+    assert manager.syncs == 0
+
+
+def test_polling_thread_picks_up_a_save(manager, reloads):
+    watcher = make_watcher(manager)
+    watcher.start()
+    try:
+        wait_for(lambda: manager.syncs == 1)
+        with open(manager.main_excel_path, 'wb') as f:
+            f.write(b'v2 with more bytes')
+        wait_for(lambda: manager.syncs == 2)
+        assert watcher.get_status()['running'] and watcher.get_status()['mode'] == 'polling'
+    finally:
+        watcher.stop()
+    assert not watcher.get_status()['running']
+    assert len(reloads) == 2
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
@@ -0,0 +1,147 @@
+"""SQLite fleet datastore: writes from the sync, indexed lookups and cached reads"""
+
+import json
+
+import pytest
+
+from src.core import fleet_datastore
+from src.core.fleet_datastore import FleetDatastore, get_fleet_datastore
+
+
+def vehicle(vehicle_id, plate, driver_id, driver_name):
+    return {'id': vehicle_id, 'license_plate': plate, 'make': 'Toyota', 'status': 'active',
+            'driver': {'id': driver_id, 'name': driver_name, 'phone': '050-1234567'}}
+
+
+VEHICLES = [
+    vehicle('V-1', '11-111-11', 'D001', 'Dana'),
+    vehicle('V-2', '22-222-22', 'D002', 'Avi'),
+    vehicle('V-3', '33-333-33', 'D001', 'Dana Levi'),
+]
+
+RECORDS = [
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'date': '2024-03-01', 'type': 'oil_change', 'cost': 85.0},
+    {'vehicle_id': 'V-2', 'license_plate': '22-222-22', 'date': '2024-01-15', 'type': 'tire_rotation', 'cost': 25.0},
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'date': '2024-01-15', 'type': 'brakes', 'cost': 300.0},
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'date': '2024-03-01T10:00', 'type': 'wash', 'cost': 10.0},
+]
+
+FAULTS = [
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'fault_type': 'Brakes', 'status': 'Open'},
+    None,
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'fault_type': 'Lights', 'status': 'Closed'},
+    None,
+]
+
+
+@pytest.fixture
+def datastore(tmp_path):
+    store = FleetDatastore(str(tmp_path / 'fleet.db'))
+    store.write_vehicles(VEHICLES, None, 'sync-1')
+    store.write_maintenance(RECORDS, FAULTS, None, 'sync-1')
+    yield store
+    store.close()
+
+
+def changes(base_sync_id, positions):
+    return {'full': False, 'same_layout': True, 'base_sync_id': base_sync_id, 'changed_positions': positions}
+
+
+def test_reads_return_the_written_dicts(datastore):
+    assert datastore.get_vehicles() == VEHICLES
+    assert datastore.get_maintenance_records() == RECORDS
+    status = datastore.get_status()
+    assert status['loaded'] and status['vehicles_sync_id'] == 'sync-1'
+    assert (status['vehicle_count'], status['driver_count'], status['maintenance_record_count'],
+            status['fault_count']) == (3, 2, 4, 2)
+
+
+def test_plate_and_id_lookups(datastore):
+    assert datastore.find_vehicle_by_license_plate('2222222')['id'] == 'V-2'
+    assert datastore.find_vehicle_by_license_plate('99-999-99') is None
+    assert [record['type'] for record in datastore.get_maintenance_records_for_plate('11 111 11')] == \
+        ['oil_change', 'brakes', 'wash']
+    assert datastore.get_vehicle('V-3')['license_plate'] == '33-333-33'
+    assert datastore.get_vehicle('V-404') is None
+
+
+def test_drivers_come_from_their_first_vehicle(datastore):
+    assert datastore.get_driver('D001') == {'id': 'D001', 'name': 'Dana', 'phone': '050-1234567',
+                                            'email': None, 'license_number': None}
+    assert datastore.get_driver('D404') is None
+    assert [item['id'] for item in datastore.get_vehicles_for_driver('D001')] == ['V-1', 'V-3']
+
+
+def test_history_and_date_ranges(datastore):
+    assert [record['type'] for record in datastore.get_maintenance_history('V-1')] == ['wash', 'oil_change', 'brakes']
+    # The end date includes the whole day, timestamps too
+    assert [record['type'] for record in datastore.get_maintenance_records_between('2024-01-15', '2024-03-01')] == \
+        ['tire_rotation', 'brakes', 'oil_change', 'wash']
+    assert [record['type'] for record in
+            datastore.get_maintenance_records_between('2024-01-01', '2024-01-31', license_plate='1111111')] == ['brakes']
+
+
+def test_fault_filters(datastore):
+    assert [fault['fault_type'] for fault in datastore.get_faults()] == ['Brakes', 'Lights']
+    assert [fault['fault_type'] for fault in datastore.get_faults('11-111-11', status='Open')] == ['Brakes']
+    assert datastore.get_faults('22-222-22') == []
+
+
+def test_incremental_write_rewrites_only_the_changed_rows(datastore):
+    vehicles = [VEHICLES[0], {**VEHICLES[1], 'status': 'maintenance'}, VEHICLES[2]]
+    records = [RECORDS[0], {**RECORDS[1], 'cost': 40.0}, RECORDS[2], RECORDS[3]]
+    faults = [FAULTS[0], {'vehicle_id': 'V-2', 'license_plate': '22-222-22', 'fault_type': 'Tires',
+                          'status': 'Open'}, FAULTS[2], None]
+
+    datastore.write_vehicles(vehicles, changes('sync-1', [1]), 'sync-2')
+    datastore.write_maintenance(records, faults, changes('sync-1', [1]), 'sync-2')
+
+    assert datastore.get_vehicles() == vehicles
+    assert datastore.get_maintenance_records() == records
+    assert [fault['fault_type'] for fault in datastore.get_faults()] == ['Brakes', 'Tires', 'Lights']
+    assert datastore.get_sync_id('maintenance_records') == 'sync-2'
+
+
+def test_changes_on_another_base_rewrite_the_table(datastore):
+    # The table holds sync-1, so changes made on top of sync-0 cannot be applied row by row
+    datastore.write_vehicles(VEHICLES[:1], changes('sync-0', [0]), 'sync-2')
+
+    assert datastore.get_vehicles() == VEHICLES[:1]
+    assert datastore.get_status()['driver_count'] == 1
+
+
+def test_cached_reads_follow_writes_from_another_connection(datastore):
+    vehicles = datastore.get_vehicles()
+    assert datastore.get_vehicles() is vehicles
+    assert datastore.refresh() is False
+
+    writer = FleetDatastore(datastore.db_path)
+    writer.write_vehicles(VEHICLES[1:], None, 'sync-2')
+    writer.close()
+
+    assert datastore.get_vehicles() == VEHICLES[1:]
+    assert datastore.get_generation() == 3
+
+
+def write_config(tmp_path, monkeypatch, datastore_config):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'datastore': datastore_config}), encoding='utf-8')
+    monkeypatch.setattr(fleet_datastore, 'CONFIG_PATH', str(config_path))
+    monkeypatch.setattr(fleet_datastore, '_datastore', None)
+
+
+def test_json_backend_has_no_datastore(tmp_path, monkeypatch):
+    write_config(tmp_path, monkeypatch, {'backend': 'json'})
+
+    assert get_fleet_datastore() is None
+
+
+def test_sqlite_backend_opens_one_datastore(tmp_path, monkeypatch):
+    write_config(tmp_path, monkeypatch, {'backend': 'sqlite', 'path': 'db/fleet.db'})
+    monkeypatch.setattr(fleet_datastore, 'project_root', str(tmp_path))
+
+    datastore = get_fleet_datastore()
+    assert datastore is get_fleet_datastore()
+    assert datastore.db_path == str(tmp_path / 'db' / 'fleet.db')
+    assert not datastore.is_populated()
+    datastore.close()
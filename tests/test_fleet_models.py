@@ -0,0 +1,98 @@
+"""Record types behave like the dicts they were loaded from"""
+
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from src.core.fleet_models import MISSING, Driver, MaintenanceRecord, Vehicle, json_default, load_records
+
+VEHICLE = {
+    'id': 'V-12-345-67',
+    'license_plate': '12-345-67',
+    'make': 'Toyota',
+    'year': 2020,
+    'driver': {'name': 'דני', 'phone': '050-1234567'},
+    'notes': 'spare key at the depot'
+}
+
+
+def test_mapping_access():
+    vehicle = Vehicle.from_dict(VEHICLE)
+
+    assert vehicle['make'] == 'Toyota'
+    assert vehicle.get('model') is None
+    assert vehicle.get('model', '') == ''
+    assert vehicle['notes'] == 'spare key at the depot'
+    assert 'year' in vehicle and 'model' not in vehicle
+    assert list(vehicle) == list(VEHICLE)
+    assert dict(vehicle.items())['year'] == 2020
+    with pytest.raises(KeyError):
+        vehicle['model']
+
+
+def test_nested_records():
+    vehicle = Vehicle.from_dict(VEHICLE)
+
+    assert type(vehicle['driver']) is Driver
+    assert vehicle['driver']['name'] == 'דני'
+    assert vehicle.get('driver').get('email', 'none') == 'none'
+
+
+def test_to_dict_and_equality():
+    vehicle = Vehicle.from_dict(VEHICLE)
+
+    assert vehicle.to_dict() == VEHICLE
+    assert vehicle == VEHICLE
+    assert vehicle == Vehicle.from_dict(dict(VEHICLE))
+    assert vehicle != {**VEHICLE, 'year': 2021}
+    assert vehicle.model is MISSING
+
+
+def test_records_are_slotted():
+    vehicle = Vehicle.from_dict(VEHICLE)
+    with pytest.raises(AttributeError):
+        vehicle.color = 'red'
+
+
+def test_json_serialization():
+    vehicle = Vehicle.from_dict(VEHICLE)
+    assert json.loads(json.dumps(vehicle, default=json_default, ensure_ascii=False)) == VEHICLE
+
+
+def test_from_columns_matches_from_dict():
+    rows = [{'license_plate': 'A', 'cost': 1.5, 'source': 'sheet'}, {'license_plate': 'B', 'cost': 2.0, 'source': 'api'}]
+    records = MaintenanceRecord.from_columns(['license_plate', 'cost', 'source'],
+                                             [['A', 'B'], [1.5, 2.0], ['sheet', 'api']], 2)
+    assert records == [MaintenanceRecord.from_dict(row) for row in rows]
+    assert records[1]['source'] == 'api' and 'provider' not in records[1]
+
+
+def test_load_records():
+    document = {'records': [{'license_plate': 'A', 'cost': 1}, {'license_plate': 'B', 'cost': 2}], 'total': 2}
+    rows, data = load_records(io.StringIO(json.dumps(document)), 'records', MaintenanceRecord)
+
+    assert all(type(row) is MaintenanceRecord for row in rows)
+    assert rows == document['records']
+    assert data['total'] == 2
+
+
+def test_load_records_converts_only_the_row_list():
+    document = {
+        'records': [{'license_plate': 'A', 'cost': 1, 'previous': {'license_plate': 'Z'}}],
+        'replaced': {'license_plate': 'B'},
+        'history': [{'license_plate': 'C'}]
+    }
+    rows, data = load_records(io.StringIO(json.dumps(document)), 'records', MaintenanceRecord)
+
+    assert type(rows[0]) is MaintenanceRecord
+    assert type(rows[0]['previous']) is dict
+    assert type(data['replaced']) is dict
+    assert type(data['history'][0]) is dict
+
+
+def test_json_default_rejects_unknown_types():
+    assert json.dumps({'at': datetime(2024, 5, 1, 8, 30)}, default=json_default) == '{"at": "2024-05-01T08:30:00"}'
+    with pytest.raises(TypeError):
+        json.dumps({'plates': {'12-345-67'}}, default=json_default)
@@ -0,0 +1,84 @@
+"""Webhook message classification"""
+
+import json
+import os
+
+import pytest
+
+from src.services.intent_matcher import IntentMatcher
+
+# Messages the webhook classified before the gazetteer was used: (message, intent, plate).
+# Their classification must not change; help replies never looked at the plate.
+BASELINE_MESSAGES = [
+    ("חיפוש 21-599-58", 'vehicle_search', '21-599-58'),
+    ("חיפוש 22 727 57", 'vehicle_search', '22-727-57'),
+    ("מצא את הרכב 21-599-58", 'vehicle_search', '21-599-58'),
+    ("חפש 10-600-42 דחוף", 'vehicle_search', '10-600-42'),
+    ("search 21-599-58", 'vehicle_search', '21-599-58'),
+    ("find vehicle 21 599 58", 'vehicle_search', '21-599-58'),
+    ("חיפוש דוח תקלות 10-600-42", 'vehicle_search', '10-600-42'),
+    ("דוח תקלות 10-600-42", 'fault_report', '10-600-42'),
+    ("היי, תשלח לי את דוח התקלות של 10-600-42", 'fault_report', '10-600-42'),
+    ("Fault report 10-600-42 please", 'fault_report', '10-600-42'),
+    ("דוח תקלות ודוח תחזוקה 10-600-42", 'fault_report', '10-600-42'),
+    ("דוח תחזוקה 22-727-57", 'maintenance_report', '22-727-57'),
+    ("דוח טיפולים 2272757", 'maintenance_report', '2272757'),
+    ("אפשר בבקשה דוח תחזוקה לרכב 22-727-57? תודה", 'maintenance_report', '22-727-57'),
+    ("Hi, can you send me the maintenance report for 22-727-57?", 'maintenance_report', '22-727-57'),
+    ("דוח תחזוקה", 'maintenance_report', None),
+    ("search", 'vehicle_search', None),
+    ("שלום", 'help', None),
+    ("עזרה", 'help', None),
+    ("תודה רבה!", 'help', None),
+    ("help", 'help', None),
+    ("ok thanks", 'help', None),
+    ("what commands are there?", 'help', None),
+    ("איך מבקשים דוח?", 'help', None),
+    ("מצב הרכב?", 'help', None),
+    ("מה המצב של 10-600-42", 'help', None),
+]
+
+# Messages that used to get help and are now classified by their gazetteer keywords
+KEYWORD_MESSAGES = [
+    ("תקלה ברכב 12-345-67", 'fault_report'),
+    ("יש תקלה ברכב 22-727-57, המנוע לא עובד", 'fault_report'),
+    ("my truck 10-600-42 is broken, engine not working", 'fault_report'),
+    ("הרכב 21-599-58 צריך טיפול, מתי הטיפול הבא?", 'maintenance_report'),
+    ("need an oil change on 21-599-58", 'maintenance_report'),
+    ("show car 22-727-57", 'vehicle_search'),
+]
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return IntentMatcher()
+
+
+@pytest.mark.parametrize('message,intent,plate', BASELINE_MESSAGES)
+def test_baseline_classification_is_unchanged(matcher, message, intent, plate):
+    result = matcher.match(message)
+    assert result.intent == intent
+    if intent != 'help':
+        assert result.license_plate == plate
+
+
+@pytest.mark.parametrize('message,intent', KEYWORD_MESSAGES)
+def test_keywords_classify_messages_with_a_plate(matcher, message, intent):
+    assert matcher.match(message).intent == intent
+
+
+def test_keywords_must_be_whole_words(matcher):
+    # "ברכב" is the keyword "רכב" with a prefix letter; "רכבת" (train) is another word
+    assert matcher.match("ברכב 12-345-67").keywords == ['רכב']
+    assert matcher.match("רכבת 12-345-67").intent == 'help'
+
+
+def test_gazetteer_changes_are_picked_up(tmp_path):
+    path = tmp_path / 'gazetteer.json'
+    path.write_text(json.dumps({'keywords': {'repair_request': {'english': ['flat']}}}), encoding='utf-8')
+    matcher = IntentMatcher(gazetteer_path=str(path), check_interval=0)
+    assert matcher.match("flat tire 12-345-67").intent == 'fault_report'
+
+    path.write_text(json.dumps({'keywords': {'maintenance': {'english': ['flat', 'tire']}}}), encoding='utf-8')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert matcher.match("flat tire 12-345-67").intent == 'maintenance_report'
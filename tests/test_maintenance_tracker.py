@@ -0,0 +1,216 @@
+"""Maintenance tracker indexes, columnar statistics and batch alerts"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.maintenance_tracker import MaintenanceTracker
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+VEHICLES = [
+    {'id': 'V-1', 'license_plate': '11-111-11', 'name': 'Truck 1'},
+    {'id': 'V-2', 'license_plate': '22-222-22', 'name': 'Truck 2'},
+    {'id': 'V-3', 'license_plate': '33-333-33', 'name': 'Van 3'},
+]
+
+RECORDS = [
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'date': days_ago(10), 'type': 'oil_change', 'cost': 100},
+    {'vehicle_id': 'V-1', 'license_plate': '11-111-11', 'date': days_ago(200), 'type': 'engine_service', 'cost': 300.5},
+    {'vehicle_id': 'V-2', 'license_plate': '22-222-22', 'date': days_ago(60), 'type': 'oil_change', 'cost': '80'},
+    {'vehicle_id': 'V-2', 'license_plate': '22-222-22', 'date': days_ago(400), 'type': 'brake_inspection', 'cost': 120},
+    {'vehicle_id': 'V-2', 'license_plate': '22-222-22', 'date': 'not a date', 'type': 'oil_change', 'cost': 50},
+]
+
+
+def write_data(tmp_path, vehicles, records):
+    catalog_path = tmp_path / 'vehicle_catalog.json'
+    records_path = tmp_path / 'maintenance_records.json'
+    catalog_path.write_text(json.dumps({'vehicles': vehicles}), encoding='utf-8')
+    records_path.write_text(json.dumps({'records': records}), encoding='utf-8')
+    return str(records_path), str(catalog_path)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return MaintenanceTracker(*write_data(tmp_path, VEHICLES, RECORDS))
+
+
+def reference_cost_since(records, days):
+    """Per-record loop the columnar totals replaced"""
+    cutoff = datetime.now() - timedelta(days=days)
+    total = 0.0
+    for record in records:
+        try:
+            if datetime.strptime(record['date'], '%Y-%m-%d') >= cutoff:
+                total += float(record['cost'])
+        except ValueError:
+            continue
+    return total
+
+
+def test_statistics_match_a_per_record_loop(tracker):
+    stats = tracker.get_maintenance_statistics()
+
+    assert stats.total_vehicles == 3
+    assert stats.total_cost_30_days == pytest.approx(reference_cost_since(RECORDS, 30))
+    assert stats.total_cost_90_days == pytest.approx(reference_cost_since(RECORDS, 90))
+    assert stats.total_cost_year == pytest.approx(reference_cost_since(RECORDS, 365))
+    assert stats.average_cost_per_vehicle == pytest.approx(reference_cost_since(RECORDS, 365) / 3)
+    assert stats.most_common_service == 'oil_change'
+    assert stats.maintenance_frequency == pytest.approx(5 / 3)
+
+
+def test_record_columns_are_built_by_the_data_load(tracker):
+    tracker._load_maintenance_records()
+    assert tracker._record_columns is not None
+    assert tracker._record_columns.record_count == len(RECORDS)
+
+    tracker.refresh_data()
+    assert tracker._record_columns is None
+    tracker._load_maintenance_records()
+    assert tracker._record_columns is not None
+
+
+def test_statistics_follow_a_reload(tmp_path, tracker):
+    tracker.get_maintenance_statistics()
+    write_data(tmp_path, VEHICLES, RECORDS[:1])
+    tracker.refresh_data()
+
+    stats = tracker.get_maintenance_statistics()
+    assert stats.total_cost_year == pytest.approx(100)
+    assert stats.maintenance_frequency == pytest.approx(1 / 3)
+
+
+def test_statistics_without_records(tmp_path):
+    stats = MaintenanceTracker(*write_data(tmp_path, VEHICLES, [])).get_maintenance_statistics()
+
+    assert stats.total_cost_year == 0.0
+    assert stats.most_common_service == 'Unknown'
+    assert stats.maintenance_frequency == 0.0
+
+
+def test_history_is_newest_first(tracker):
+    history = tracker.get_vehicle_maintenance_history('V-2')
+
+    # Sorted as strings, like the per-call sort it replaced
+    assert [record['date'] for record in history] == ['not a date', days_ago(60), days_ago(400)]
+    assert tracker.get_vehicle_maintenance_history('V-1')[0]['type'] == 'oil_change'
+
+
+def test_history_keeps_file_order_on_equal_dates(tmp_path):
+    records = [
+        {'vehicle_id': 'V-1', 'date': '2024-05-01', 'type': 'oil_change'},
+        {'vehicle_id': 'V-1', 'date': '2024-05-01', 'type': 'tire_rotation'},
+    ]
+    tracker = MaintenanceTracker(*write_data(tmp_path, VEHICLES, records))
+
+    assert [record['type'] for record in tracker.get_vehicle_maintenance_history('V-1')] == \
+        ['oil_change', 'tire_rotation']
+
+
+def test_history_is_a_copy(tracker):
+    tracker.get_vehicle_maintenance_history('V-1').clear()
+    assert len(tracker.get_vehicle_maintenance_history('V-1')) == 2
+
+
+def test_unknown_vehicles(tracker):
+    assert tracker.get_vehicle_maintenance_history('V-404') == []
+    assert tracker.get_vehicle_maintenance_history('') == []
+    assert tracker.get_vehicle_maintenance_status('V-404') == {}
+
+
+def test_status_uses_the_first_vehicle_with_an_id(tmp_path):
+    vehicles = VEHICLES + [{'id': 'V-1', 'license_plate': '99-999-99', 'name': 'Duplicate'}]
+    tracker = MaintenanceTracker(*write_data(tmp_path, vehicles, RECORDS))
+
+    status = tracker.get_vehicle_maintenance_status('V-1')
+    assert status['license_plate'] == '11-111-11'
+    assert status['last_service_date'] == days_ago(10)
+    assert tracker.get_vehicle_maintenance_status('V-3')['status'] == 'no_records'
+
+
+def test_indexes_follow_a_reload(tmp_path, tracker):
+    assert len(tracker.get_vehicle_maintenance_history('V-1')) == 2
+    write_data(tmp_path, VEHICLES, RECORDS + [
+        {'vehicle_id': 'V-3', 'license_plate': '33-333-33', 'date': days_ago(1), 'type': 'oil_change', 'cost': 90}
+    ])
+    tracker.refresh_data()
+
+    assert len(tracker.get_vehicle_maintenance_history('V-3')) == 1
+    assert tracker.get_vehicle_maintenance_status('V-3')['last_service_date'] == days_ago(1)
+
+
+def reference_alerts(tracker, days_ahead):
+    """Per-vehicle alert loop the batch computation replaced, as comparable tuples"""
+    alerts = []
+    for vehicle in tracker._load_vehicles():
+        if not vehicle.get('id'):
+            continue
+        status = tracker.get_vehicle_maintenance_status(vehicle['id'])
+        if status['status'] == 'no_records':
+            alerts.append(('due', 'high', 0, vehicle['id'], 'general_inspection', 'Never'))
+            continue
+        days = status['days_until_next_service']
+        if days is None:
+            continue
+        if days < 0:
+            alert = ('overdue', 'critical')
+        elif days <= 7:
+            alert = ('due', 'high')
+        elif days <= days_ahead:
+            alert = ('upcoming', 'medium')
+        else:
+            continue
+        alerts.append(alert + (days, vehicle['id'], status['recommended_service'], status['last_service_date']))
+    priority_order = {'critical': 0, 'high': 1, 'medium': 2}
+    return sorted(alerts, key=lambda alert: (priority_order[alert[1]], alert[2]))
+
+
+def fleet_tracker(tmp_path):
+    # (days since the latest service, its type); None: no records, 'bad': unparseable date
+    latest = [(95, 'oil_change'), (85, 'oil_change'), (70, 'oil_change'), (10, 'oil_change'),
+              (200, 'brake_inspection'), (170, 'brake_inspection'), (None, None), ('bad', 'oil_change'),
+              (30, 'unknown_service'), (100, None)]
+    vehicles = []
+    records = []
+    for index, (days, service_type) in enumerate(latest):
+        vehicle_id = f"V-{index}"
+        vehicles.append({'id': vehicle_id, 'license_plate': f"{index:02d}-000-00", 'name': f"Vehicle {index}"})
+        if days is None:
+            continue
+        record = {'vehicle_id': vehicle_id, 'date': 'bad' if days == 'bad' else days_ago(days), 'cost': 10}
+        if service_type:
+            record['type'] = service_type
+        records.append(record)
+        # An older record never decides the alert
+        records.append({'vehicle_id': vehicle_id, 'date': days_ago(1000), 'type': 'engine_service', 'cost': 10})
+    vehicles.append({'license_plate': '99-999-99'})  # no id: never alerted
+    return MaintenanceTracker(*write_data(tmp_path, vehicles, records))
+
+
+@pytest.mark.parametrize('days_ahead', [7, 30, 90])
+def test_batch_alerts_match_the_per_vehicle_loop(tmp_path, days_ahead):
+    tracker = fleet_tracker(tmp_path)
+    expected = reference_alerts(tracker, days_ahead)
+
+    alerts = tracker.get_maintenance_alerts(days_ahead)
+
+    assert [(alert.alert_type, alert.priority, alert.days_until_due, alert.vehicle_id, alert.service_type,
+             alert.last_service_date) for alert in alerts] == expected
+
+
+def test_batch_counts_without_materializing(tmp_path):
+    tracker = fleet_tracker(tmp_path)
+    batch = tracker.get_maintenance_alerts_batch(30)
+    alerts = list(batch)
+
+    for alert_type in ('overdue', 'due', 'upcoming'):
+        assert batch.count(alert_type) == sum(alert.alert_type == alert_type for alert in alerts)
+    assert [alert.vehicle_id for alert in batch.iter_alerts(['overdue'])] == \
+        [alert.vehicle_id for alert in alerts if alert.alert_type == 'overdue']
+    assert batch[0].estimated_cost == tracker.service_costs[batch[0].service_type]
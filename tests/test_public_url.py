@@ -0,0 +1,98 @@
+"""Cached public base URL: tunnel refresh, expiry and fallbacks"""
+
+import time
+
+import pytest
+
+from src.services import public_url
+from src.services.public_url import PublicUrlProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(public_url, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def tunnel(monkeypatch):
+    """The URL the tunnel API reports next; None when the agent is down"""
+    state = {'url': 'https://abc.ngrok.io/', 'calls': 0}
+
+    def fetch(api_url, timeout):
+        state['calls'] += 1
+        return state['url']
+
+    monkeypatch.setattr(public_url, 'fetch_ngrok_url', fetch)
+    return state
+
+
+def test_base_url_without_a_tunnel(tunnel):
+    assert PublicUrlProvider().get_base_url() == 'http://localhost:5000'
+    assert PublicUrlProvider(static_base_url='https://fleet.example.com/').get_base_url() == \
+        'https://fleet.example.com'
+    # Reading the URL never queries the tunnel API
+    assert tunnel['calls'] == 0
+
+
+def test_refresh_caches_the_tunnel_url(clock, tunnel):
+    provider = PublicUrlProvider(static_base_url='https://fleet.example.com')
+    provider.refresh()
+
+    assert provider.build_url('/reports/a.pdf') == 'https://abc.ngrok.io/reports/a.pdf'
+    status = provider.get_status()
+    assert status['source'] == 'ngrok' and status['refresh_failures'] == 0
+    assert tunnel['calls'] == 1
+
+
+def test_failed_refresh_keeps_the_url_until_it_expires(clock, tunnel):
+    provider = PublicUrlProvider(static_base_url='https://fleet.example.com', ttl=60)
+    provider.refresh()
+    tunnel['url'] = None
+
+    clock.now += 30
+    provider.refresh()
+    assert provider.get_base_url() == 'https://abc.ngrok.io'
+    assert provider.get_status()['refresh_failures'] == 1
+
+    clock.now += 31
+    assert provider.get_base_url() == 'https://fleet.example.com'
+    assert provider.get_status()['source'] == 'static'
+
+
+def test_successful_refresh_extends_the_url(clock, tunnel):
+    provider = PublicUrlProvider(ttl=60)
+    provider.refresh()
+    clock.now += 50
+    tunnel['url'] = 'https://xyz.ngrok.io'
+    provider.refresh()
+    clock.now += 50
+
+    assert provider.get_base_url() == 'https://xyz.ngrok.io'
+    assert provider.get_status()['refresh_failures'] == 0
+
+
+def test_background_refresh(tunnel):
+    provider = PublicUrlProvider(refresh_interval=3600)
+    provider.start()
+    provider.start()
+    try:
+        deadline = time.monotonic() + 5
+        while provider.get_status()['source'] != 'ngrok' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert provider.get_base_url() == 'https://abc.ngrok.io'
+        assert provider.get_status()['background_refresh']
+    finally:
+        provider.stop()
+        provider._thread.join(5)
+    assert tunnel['calls'] == 1
+    assert not provider.get_status()['background_refresh']
@@ -0,0 +1,120 @@
+"""Report cache keys, and the cache index shared by several server processes"""
+
+import os
+import json
+from datetime import datetime
+
+import pytest
+
+from src.core import report_cache
+from src.core.fleet_models import MaintenanceRecord, Vehicle
+from src.core.report_cache import ReportCache, invalidate_report_cache
+
+VEHICLE = {'id': 'V-12-345-67', 'license_plate': '12-345-67', 'make': 'Toyota'}
+RECORDS = [{'vehicle_id': 'V-12-345-67', 'date': '2024-01-10', 'type': 'oil_change', 'cost': 85.0}]
+
+
+def add_report(cache, key, size=100, plate='12-345-67'):
+    path = cache.reserve_path(key)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    return cache.add(key, path, plate)
+
+
+def saved_keys(cache):
+    with open(cache.index_path, 'r', encoding='utf-8') as f:
+        return set(json.load(f)['entries'])
+
+
+def test_caches_keep_each_others_entries(tmp_path):
+    marker = str(tmp_path / 'epoch')
+    first = ReportCache(str(tmp_path), invalidation_marker=marker)
+    second = ReportCache(str(tmp_path), invalidation_marker=marker)
+
+    add_report(first, 'a' * 64)
+    add_report(second, 'b' * 64)
+    add_report(first, 'c' * 64)
+
+    assert saved_keys(first) == {'a' * 64, 'b' * 64, 'c' * 64}
+    assert ReportCache(str(tmp_path), invalidation_marker=marker).get('b' * 64) is not None
+
+
+def test_budget_applies_to_merged_entries(tmp_path):
+    marker = str(tmp_path / 'epoch')
+    first = ReportCache(str(tmp_path), max_bytes=250, invalidation_marker=marker)
+    second = ReportCache(str(tmp_path), max_bytes=250, invalidation_marker=marker)
+
+    add_report(first, 'a' * 64)
+    add_report(first, 'b' * 64)
+    add_report(second, 'c' * 64)
+
+    assert saved_keys(second) == {'b' * 64, 'c' * 64}
+    assert second.get_stats()['total_bytes'] == 200
+
+
+def test_dropped_entries_are_not_merged_back(tmp_path):
+    marker = str(tmp_path / 'epoch')
+    cache = ReportCache(str(tmp_path), invalidation_marker=marker)
+    add_report(cache, 'a' * 64, plate='11-111-11')
+    add_report(cache, 'b' * 64, plate='22-222-22')
+
+    invalidate_report_cache(marker, ['11-111-11'])
+    assert cache.get('a' * 64) is None
+
+    assert saved_keys(cache) == {'b' * 64}
+
+
+class FixedDay(datetime):
+    day_value = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.day_value
+
+
+@pytest.fixture
+def fixed_day(monkeypatch):
+    monkeypatch.setattr(report_cache, 'datetime', FixedDay)
+    monkeypatch.setattr(FixedDay, 'day_value', datetime(2024, 6, 1, 9, 0))
+    return FixedDay
+
+
+def test_key_is_stable_for_the_same_inputs(fixed_day):
+    key = ReportCache.make_key(VEHICLE, RECORDS, 'maintenance')
+
+    assert len(key) == 64
+    assert ReportCache.make_key(dict(reversed(list(VEHICLE.items()))), [dict(RECORDS[0])], 'maintenance') == key
+    # Record types hash like the dicts they were loaded from
+    assert ReportCache.make_key(Vehicle.from_dict(VEHICLE), [MaintenanceRecord.from_dict(RECORDS[0])],
+                                'maintenance') == key
+
+
+def test_key_changes_with_any_input(fixed_day, monkeypatch):
+    key = ReportCache.make_key(VEHICLE, RECORDS, 'maintenance')
+
+    assert ReportCache.make_key(VEHICLE, RECORDS, 'fault') != key
+    assert ReportCache.make_key({**VEHICLE, 'make': 'Ford'}, RECORDS, 'maintenance') != key
+    assert ReportCache.make_key(VEHICLE, RECORDS + RECORDS, 'maintenance') != key
+    assert ReportCache.make_key(VEHICLE, [], 'maintenance') != key
+
+    monkeypatch.setattr(report_cache, 'TEMPLATE_VERSION', 'next')
+    assert ReportCache.make_key(VEHICLE, RECORDS, 'maintenance') != key
+
+
+def test_key_changes_with_the_report_date(fixed_day):
+    key = ReportCache.make_key(VEHICLE, RECORDS, 'maintenance')
+    fixed_day.day_value = datetime(2024, 6, 1, 23, 59)
+    assert ReportCache.make_key(VEHICLE, RECORDS, 'maintenance') == key
+    fixed_day.day_value = datetime(2024, 6, 2, 0, 1)
+    assert ReportCache.make_key(VEHICLE, RECORDS, 'maintenance') != key
+
+
+def test_cached_report_is_served_until_its_file_is_gone(tmp_path):
+    cache = ReportCache(str(tmp_path), invalidation_marker=str(tmp_path / 'epoch'))
+    path = add_report(cache, 'a' * 64)
+
+    assert cache.get('a' * 64) == path
+    assert cache.get('b' * 64) is None
+    os.remove(path)
+    assert cache.get('a' * 64) is None
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 2
@@ -0,0 +1,155 @@
+"""Download validators, byte ranges and the report download cache"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('starlette')
+pytest.importorskip('httpx')
+
+from starlette.testclient import TestClient
+
+from src.services import simple_server
+from src.services.async_server import create_app, etag_matches, parse_byte_range
+from src.services.report_downloads import ReportDownloadCache
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 100)),
+    ('bytes=100-', (100, 1000)),
+    ('bytes=-100', (900, 1000)),
+    ('bytes=-5000', (0, 1000)),
+    ('bytes=990-2000', (990, 1000)),
+    ('bytes=1000-', ()),
+    ('bytes=500-400', ()),
+    ('bytes=0-1,5-9', None),
+    ('items=0-9', None),
+    ('bytes=a-b', None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('*', True),
+    ('"xyz"', False),
+    ('abc', False),
+    ('', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, 'abc') is expected
+
+
+def test_cache_keeps_small_reports_in_memory(tmp_path):
+    (tmp_path / 'report.pdf').write_bytes(b'%PDF small')
+    cache = ReportDownloadCache(str(tmp_path), max_file_bytes=100)
+
+    first = cache.lookup('report.pdf')
+    assert first.content == b'%PDF small'
+    assert cache.cached('report.pdf') is first
+    assert cache.get_stats()['memory_hits'] == 1
+
+
+def test_cache_streams_large_reports(tmp_path):
+    (tmp_path / 'large.pdf').write_bytes(b'x' * 200)
+    cache = ReportDownloadCache(str(tmp_path), max_file_bytes=100)
+
+    entry = cache.lookup('large.pdf')
+    assert entry.content is None and entry.size == 200
+    assert cache.cached('large.pdf') is None
+
+
+def test_etag_follows_content(tmp_path):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(b'first')
+    cache = ReportDownloadCache(str(tmp_path), revalidate_seconds=0)
+    first = cache.lookup('report.pdf').etag
+
+    path.write_bytes(b'second version')
+    assert cache.lookup('report.pdf').etag != first
+
+
+@pytest.mark.parametrize('filename', ['.report_cache_index.json', '../secret.pdf', 'sub/report.pdf', '', 'missing.pdf'])
+def test_cache_refuses_other_files(tmp_path, filename):
+    (tmp_path / '.report_cache_index.json').write_text('{}')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'report.pdf').write_bytes(b'%PDF')
+    assert ReportDownloadCache(str(tmp_path)).lookup(filename) is None
+
+
+@pytest.mark.parametrize('access_stamp_seconds, stamped', [(0, True), (3600, False)])
+def test_memory_hits_stamp_the_access_time(tmp_path, access_stamp_seconds, stamped):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(b'%PDF small')
+    cache = ReportDownloadCache(str(tmp_path), access_stamp_seconds=access_stamp_seconds)
+    cache.lookup('report.pdf')
+    os.utime(path, (1000, os.stat(path).st_mtime))
+
+    assert cache.cached('report.pdf') is not None
+    assert (os.stat(path).st_atime > 1000) is stamped
+
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def client(request, tmp_path, monkeypatch):
+    """Async server download route over a reports directory (served from memory or streamed from disk)"""
+    (tmp_path / 'report.pdf').write_bytes(CONTENT)
+    max_file_bytes = len(CONTENT) if request.param == 'memory' else 100
+    cache = ReportDownloadCache(str(tmp_path), max_file_bytes=max_file_bytes)
+    monkeypatch.setattr(simple_server, 'get_report_download_cache', lambda: cache)
+
+    # The lifespan (data preload) is not run; the route only needs the thread pool
+    app = create_app({'executor_threads': 2, 'refresh_interval_seconds': 1.0, 'backlog': 16})
+    app.state.executor = ThreadPoolExecutor(max_workers=2)
+    yield TestClient(app)
+    app.state.executor.shutdown()
+
+
+def test_download_sends_validators(client):
+    response = client.get('/download/report.pdf')
+
+    assert response.status_code == 200 and response.content == CONTENT
+    assert response.headers['etag'] and response.headers['last-modified']
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert 'report.pdf' in response.headers['content-disposition']
+
+
+def test_matching_etag_is_not_modified(client):
+    etag = client.get('/download/report.pdf').headers['etag']
+
+    response = client.get('/download/report.pdf', headers={'if-none-match': f'"other", {etag}'})
+    assert response.status_code == 304 and response.content == b''
+    assert client.get('/download/report.pdf', headers={'if-none-match': '"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize('header, start, end', [('bytes=0-99', 0, 100), ('bytes=1000-', 1000, 1024),
+                                                ('bytes=-24', 1000, 1024)])
+def test_byte_range_is_partial_content(client, header, start, end):
+    response = client.get('/download/report.pdf', headers={'range': header})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end]
+    assert response.headers['content-range'] == f"bytes {start}-{end - 1}/{len(CONTENT)}"
+
+
+def test_unsatisfiable_range(client):
+    response = client.get('/download/report.pdf', headers={'range': 'bytes=5000-'})
+
+    assert response.status_code == 416
+    assert response.headers['content-range'] == f"bytes */{len(CONTENT)}"
+
+
+def test_stale_if_range_sends_the_whole_file(client):
+    response = client.get('/download/report.pdf', headers={'range': 'bytes=0-99', 'if-range': '"stale"'})
+
+    assert response.status_code == 200 and response.content == CONTENT
+
+
+def test_unknown_report_is_not_found(client):
+    assert client.get('/download/missing.pdf').status_code == 404
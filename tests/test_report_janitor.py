@@ -0,0 +1,86 @@
+"""Report janitor retention rules"""
+
+import os
+import time
+
+from src.core.atomic_json import file_lock
+from src.services.report_janitor import SWEEP_LOCK_FILENAME, ReportJanitor, report_plate
+
+DAY = 24 * 3600
+
+
+def make_report(directory, name, size=100, age=0):
+    """Write a report last modified (and downloaded) age seconds ago"""
+    path = directory / name
+    path.write_bytes(b'x' * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_report_plate():
+    assert report_plate('maintenance_report_20260101_120000_12-345-67.pdf') == report_plate(
+        'maintenance_report_12-345-67_0123456789abcdef.pdf')
+    assert report_plate('fleet_summary.pdf') is None
+    assert report_plate('.report_cache_index.json') is None
+
+
+def test_expired_reports_are_removed_but_newest_is_kept(tmp_path):
+    newest = make_report(tmp_path, 'maintenance_report_20260101_120000_11-111-11.pdf', age=10 * DAY)
+    older = make_report(tmp_path, 'maintenance_report_20251201_120000_11-111-11.pdf', age=40 * DAY)
+    fresh = make_report(tmp_path, 'maintenance_report_20260102_120000_22-222-22.pdf', age=DAY)
+
+    result = ReportJanitor(str(tmp_path), max_age_seconds=7 * DAY).sweep()
+
+    assert result['expired'] == 1
+    assert newest.exists() and fresh.exists() and not older.exists()
+
+
+def test_budget_evicts_least_recently_downloaded(tmp_path):
+    recent = make_report(tmp_path, 'maintenance_report_20260103_120000_11-111-11.pdf', age=60)
+    stale = make_report(tmp_path, 'maintenance_report_20260102_120000_11-111-11.pdf', age=3600)
+    downloaded = make_report(tmp_path, 'maintenance_report_20260101_120000_11-111-11.pdf', age=7200)
+    # A download stamps the access time only
+    os.utime(downloaded, (time.time(), downloaded.stat().st_mtime))
+
+    result = ReportJanitor(str(tmp_path), max_bytes=200).sweep()
+
+    assert result['evicted'] == 1 and result['bytes_freed'] == 100
+    assert recent.exists() and downloaded.exists() and not stale.exists()
+
+
+def test_newest_report_survives_the_budget(tmp_path):
+    only = make_report(tmp_path, 'maintenance_report_12-345-67_0123456789abcdef.pdf', size=500)
+
+    result = ReportJanitor(str(tmp_path), max_bytes=100).sweep()
+
+    assert result['evicted'] == 0
+    assert only.exists()
+
+
+def test_abandoned_temp_files_and_other_files(tmp_path):
+    abandoned = make_report(tmp_path, '.0123456789abcdef_00000000.pdf.tmp', age=2 * 3600)
+    rendering = make_report(tmp_path, '.fedcba9876543210_00000000.pdf.tmp', age=60)
+    other = make_report(tmp_path, 'fleet_summary.pdf', age=365 * DAY)
+
+    result = ReportJanitor(str(tmp_path), max_age_seconds=DAY, max_bytes=0).sweep()
+
+    assert result['temp_files_removed'] == 1
+    assert not abandoned.exists() and rendering.exists() and other.exists()
+
+
+def test_missing_directory(tmp_path):
+    assert ReportJanitor(str(tmp_path / 'reports')).sweep()['expired'] == 0
+
+
+def test_sweep_is_skipped_while_another_process_sweeps(tmp_path):
+    expired = make_report(tmp_path, 'maintenance_report_20250101_120000_11-111-11.pdf', age=40 * DAY)
+    make_report(tmp_path, 'maintenance_report_20260101_120000_11-111-11.pdf')
+    janitor = ReportJanitor(str(tmp_path), max_age_seconds=DAY)
+
+    with file_lock(str(tmp_path / SWEEP_LOCK_FILENAME)):
+        assert janitor.sweep()['expired'] == 0
+    assert expired.exists()
+    assert janitor.get_status()['sweeps_skipped'] == 1
+
+    assert janitor.sweep()['expired'] == 1
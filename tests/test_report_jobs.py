@@ -0,0 +1,132 @@
+"""Report job queue: rendering, delivery and failure notices"""
+
+import time
+import threading
+
+import pytest
+
+from src.services import report_jobs
+from src.services.report_jobs import JOB_REFERENCE_LENGTH, ReportJobQueue
+
+VEHICLE = {'license_plate': '12-345-67'}
+
+
+def write_report(vehicle, maintenance_records, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('%PDF')
+    return file_path
+
+
+def fail_render(vehicle, maintenance_records, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('%PDF partial')
+    raise RuntimeError('font missing')
+
+
+def slow_render(vehicle, maintenance_records, file_path):
+    time.sleep(0.5)
+    return write_report(vehicle, maintenance_records, file_path)
+
+
+class Recorder:
+    """Delivery callback that records the jobs it was handed"""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.jobs = []
+        self.called = threading.Event()
+
+    def __call__(self, job):
+        self.jobs.append(job)
+        self.called.set()
+        return self.result
+
+
+def wait_for_delivery(queue, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get_job(job_id)
+        if job['delivery_status'] is not None:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} was not delivered: {queue.get_job(job_id)}")
+
+
+@pytest.fixture
+def make_queue():
+    queues = []
+
+    def make(**options):
+        queue = ReportJobQueue(max_workers=1, **options)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_rendered_report_is_delivered(tmp_path, monkeypatch, make_queue):
+    monkeypatch.setattr(report_jobs, 'render_report_pdf', write_report)
+    delivered, failed = Recorder(), Recorder()
+    queue = make_queue(on_complete=delivered, on_failure=failed)
+
+    job = queue.submit(VEHICLE, [], str(tmp_path / 'report.pdf'), '+972500000000')
+    status = wait_for_delivery(queue, job.job_id)
+
+    assert status['status'] == 'completed' and status['delivery_status'] == 'sent'
+    assert delivered.jobs[0].recipient == '+972500000000'
+    assert not failed.jobs
+    assert (tmp_path / 'report.pdf').exists()
+    assert queue.get_metrics()['delivered'] == 1
+
+
+def test_failed_render_is_cleaned_up_and_reported(tmp_path, monkeypatch, make_queue):
+    monkeypatch.setattr(report_jobs, 'render_report_pdf', fail_render)
+    delivered, failed = Recorder(), Recorder()
+    queue = make_queue(on_complete=delivered, on_failure=failed)
+
+    job = queue.submit(VEHICLE, [], str(tmp_path / '.report.pdf.tmp'), '+972500000000')
+    status = wait_for_delivery(queue, job.job_id)
+
+    assert status['status'] == 'failed' and 'font missing' in status['error']
+    assert status['delivery_status'] == 'sent'
+    assert failed.jobs[0].job_id == job.job_id and not delivered.jobs
+    assert not (tmp_path / '.report.pdf.tmp').exists()
+    assert queue.get_metrics()['failed'] == 1
+
+
+def test_job_reference_and_public_view(tmp_path, monkeypatch, make_queue):
+    monkeypatch.setattr(report_jobs, 'render_report_pdf', write_report)
+    queue = make_queue(on_complete=Recorder())
+
+    job = queue.submit(VEHICLE, [], str(tmp_path / 'report.pdf'), '+972500000000', cache_key='abc')
+    status = queue.get_job(job.job_id[:JOB_REFERENCE_LENGTH])
+
+    assert status['job_id'] == job.job_id
+    assert status['filename'] == 'report.pdf'
+    assert 'recipient' not in status and 'file_path' not in status and 'cache_key' not in status
+    assert queue.get_job(job.job_id[:JOB_REFERENCE_LENGTH - 1]) is None
+    assert queue.get_job('0' * 32) is None
+
+
+def test_full_queue_rejects_jobs(tmp_path, monkeypatch, make_queue):
+    monkeypatch.setattr(report_jobs, 'render_report_pdf', slow_render)
+    queue = make_queue(max_pending_jobs=1, on_complete=Recorder())
+
+    assert queue.submit(VEHICLE, [], str(tmp_path / 'first.pdf'), '+972500000000') is not None
+    assert queue.submit(VEHICLE, [], str(tmp_path / 'second.pdf'), '+972500000000') is None
+    assert queue.get_metrics()['rejected'] == 1
+
+
+def test_render_finishing_after_shutdown_is_not_delivered(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_jobs, 'render_report_pdf', slow_render)
+    delivered = Recorder()
+    queue = ReportJobQueue(max_workers=1, on_complete=delivered)
+
+    job = queue.submit(VEHICLE, [], str(tmp_path / 'report.pdf'), '+972500000000')
+    queue.shutdown(wait=False)
+    status = wait_for_delivery(queue, job.job_id)
+
+    assert status['delivery_status'] == 'failed'
+    assert not delivered.jobs
@@ -0,0 +1,73 @@
+"""Process-wide font and style registry shared by the PDF generators"""
+
+import os
+import shutil
+
+import pytest
+
+reportlab = pytest.importorskip('reportlab')
+
+from src.core.template_hebrew_pdf import FONT_DIRS_ENV, FontStyleRegistry, TemplateHebrewPDFGenerator
+
+VERA_PATH = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+
+VEHICLE = {'id': 'V-12-345-67', 'license_plate': '12-345-67', 'make': 'Toyota', 'model': 'Corolla'}
+RECORDS = [{'vehicle_id': 'V-12-345-67', 'date': '2024-01-10', 'type': 'oil_change', 'cost': 85.0,
+            'description': 'החלפת שמן'}]
+
+
+@pytest.fixture(autouse=True)
+def default_registry(monkeypatch):
+    monkeypatch.delenv(FONT_DIRS_ENV, raising=False)
+    FontStyleRegistry.configure()
+    yield
+    FontStyleRegistry.configure()
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    """A font directory holding a TTF under the name of one of the preferred Hebrew fonts"""
+    shutil.copy(VERA_PATH, tmp_path / 'Rubik-Regular.ttf')
+    return str(tmp_path)
+
+
+def test_generators_share_one_registry():
+    first = TemplateHebrewPDFGenerator()
+    second = TemplateHebrewPDFGenerator()
+
+    assert first.registry is second.registry is FontStyleRegistry.get_instance()
+    assert first.create_template_styles() is second.create_template_styles()
+
+
+def test_configured_font_dirs_are_searched_first(font_dir):
+    FontStyleRegistry.configure([font_dir])
+    registry = FontStyleRegistry.get_instance()
+
+    assert registry.font_dirs[0] == font_dir
+    assert registry.hebrew_font == 'Rubik'
+    assert TemplateHebrewPDFGenerator().hebrew_font == 'Rubik'
+
+
+def test_font_dirs_from_the_environment(font_dir, monkeypatch):
+    monkeypatch.setenv(FONT_DIRS_ENV, font_dir)
+    FontStyleRegistry.configure()
+
+    assert FontStyleRegistry.get_instance().hebrew_font == 'Rubik'
+
+
+def test_configure_rebuilds_on_next_use(font_dir):
+    before = FontStyleRegistry.get_instance()
+    FontStyleRegistry.configure([font_dir])
+
+    assert FontStyleRegistry.get_instance() is not before
+
+
+def test_reports_render_with_the_shared_styles(tmp_path):
+    generator = TemplateHebrewPDFGenerator()
+    output_path = tmp_path / 'report.pdf'
+    generator.generate_maintenance_report(VEHICLE, RECORDS, str(output_path))
+    combined_path = tmp_path / 'combined.pdf'
+    generator.generate_combined_report([(VEHICLE, RECORDS), (VEHICLE, [])], str(combined_path))
+
+    assert output_path.read_bytes().startswith(b'%PDF')
+    assert combined_path.read_bytes().startswith(b'%PDF')
@@ -0,0 +1,206 @@
+"""Outbound send queue: pacing, retry classification, retries and dead letters"""
+
+import json
+import time
+
+import pytest
+import requests
+
+from src.services.twilio_send_queue import IdempotencyJournal, TokenBucket, TwilioSendQueue, is_retryable
+
+twilio_exceptions = pytest.importorskip('twilio.base.exceptions')
+TwilioRestException = twilio_exceptions.TwilioRestException
+
+
+class FakeDriver:
+    """Driver whose create_message raises the scripted errors, then succeeds"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def whatsapp_message_params(self, to_number, message, media_url=None, voice_url=None):
+        return {'to': f"whatsapp:{to_number}", 'body': message}
+
+    def sms_message_params(self, to_number, message):
+        return {'to': to_number, 'body': message}
+
+    def create_message(self, params):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"SM{self.calls}"
+
+
+def make_queue(driver, tmp_path, **options):
+    settings = {'workers': 1, 'messages_per_second': 1000, 'burst': 1000, 'max_attempts': 3,
+                'backoff_base_seconds': 0.01, 'backoff_max_seconds': 0.02,
+                'dead_letter_path': str(tmp_path / 'dead_letter.jsonl'), **options}
+    return TwilioSendQueue(driver, **settings)
+
+
+def drain(queue, timeout=5.0):
+    """Wait until nothing is queued or being sent"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        metrics = queue.get_metrics()
+        if metrics['queue_depth'] == 0 and metrics['in_flight'] == 0:
+            return metrics
+        time.sleep(0.01)
+    raise AssertionError(f"send queue did not drain: {queue.get_metrics()}")
+
+
+def dead_letters(tmp_path):
+    path = tmp_path / 'dead_letter.jsonl'
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] if path.exists() else []
+
+
+def test_token_bucket_paces_after_the_burst():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+@pytest.mark.parametrize('error, expected', [
+    (TwilioRestException(429, '/Messages', 'Too Many Requests'), True),
+    (TwilioRestException(503, '/Messages', 'Service Unavailable'), True),
+    (TwilioRestException(400, '/Messages', 'Invalid To number'), False),
+    (requests.ConnectionError('connection refused'), True),
+    (requests.ConnectTimeout('connect timeout'), True),
+    (requests.ReadTimeout('read timeout'), False),
+    (ValueError('bad params'), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retryable_errors_are_retried(tmp_path):
+    driver = FakeDriver([TwilioRestException(429, '/Messages', 'Too Many Requests')])
+    queue = make_queue(driver, tmp_path)
+    queue.start()
+    message = queue.send_whatsapp('+972500000000', 'Report ready')
+
+    metrics = drain(queue)
+    queue.stop()
+
+    assert queue.get_message(message.message_id)['status'] == 'sent'
+    assert driver.calls == 2
+    assert metrics['retried'] == 1 and metrics['sent'] == 1
+    assert dead_letters(tmp_path) == []
+
+
+def test_permanent_errors_are_dead_lettered(tmp_path):
+    queue = make_queue(FakeDriver([TwilioRestException(400, '/Messages', 'Invalid To number')]), tmp_path)
+    queue.start()
+    message = queue.send_sms('+972500000000', 'Reminder')
+
+    drain(queue)
+    queue.stop()
+
+    status = queue.get_message(message.message_id)
+    assert status['status'] == 'dead' and status['attempts'] == 1
+    [letter] = dead_letters(tmp_path)
+    assert letter['message_id'] == message.message_id
+    assert letter['params'] == {'to': '+972500000000', 'body': 'Reminder'}
+
+
+def test_attempts_are_capped(tmp_path):
+    driver = FakeDriver([TwilioRestException(503, '/Messages', 'Service Unavailable')] * 10)
+    queue = make_queue(driver, tmp_path, max_attempts=3)
+    queue.start()
+    message = queue.send_whatsapp('+972500000000', 'Report ready')
+
+    metrics = drain(queue)
+    queue.stop()
+
+    assert driver.calls == 3
+    assert queue.get_message(message.message_id)['status'] == 'dead'
+    assert metrics['dead_lettered'] == 1 and len(dead_letters(tmp_path)) == 1
+
+
+def test_idempotency_key_is_sent_once(tmp_path):
+    driver = FakeDriver()
+    queue = make_queue(driver, tmp_path)
+    first = queue.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    second = queue.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    queue.start()
+
+    metrics = drain(queue)
+    queue.stop()
+
+    assert second is first
+    assert driver.calls == 1 and metrics['duplicates'] == 1
+
+
+def test_full_queue_dead_letters(tmp_path):
+    queue = make_queue(FakeDriver(), tmp_path, max_pending=1)
+    assert queue.send_sms('+972500000000', 'first') is not None
+    assert queue.send_sms('+972500000001', 'second') is None
+    assert queue.get_metrics()['rejected'] == 1
+    assert dead_letters(tmp_path)[0]['error'] == 'send queue full'
+
+
+def test_stop_requeues_a_message_waiting_for_a_token(tmp_path):
+    driver = FakeDriver()
+    queue = make_queue(driver, tmp_path, messages_per_second=0.5, burst=1)
+    queue.start()
+    for index in range(2):
+        queue.send_sms('+972500000000', f"message {index}")
+    time.sleep(0.2)
+    queue.stop()
+    time.sleep(0.1)
+
+    metrics = queue.get_metrics()
+    assert driver.calls == 1
+    assert metrics['queue_depth'] == 1 and metrics['in_flight'] == 0
+
+
+def test_idempotency_keys_are_shared_between_processes(tmp_path):
+    keys_path = str(tmp_path / 'keys.jsonl')
+    first_driver, second_driver = FakeDriver(), FakeDriver()
+    first = make_queue(first_driver, tmp_path, keys_path=keys_path)
+    second = make_queue(second_driver, tmp_path, keys_path=keys_path)
+
+    queued = first.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    duplicate = second.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    for queue in (first, second):
+        queue.start()
+        drain(queue)
+        queue.stop()
+
+    assert queued.status == 'sent' and duplicate.status == 'duplicate'
+    assert first_driver.calls == 1 and second_driver.calls == 0
+    assert second.get_metrics()['duplicates'] == 1
+
+
+def test_dead_letters_release_their_shared_key(tmp_path):
+    keys_path = str(tmp_path / 'keys.jsonl')
+    first = make_queue(FakeDriver([TwilioRestException(400, '/Messages', 'Invalid To number')]), tmp_path,
+                       keys_path=keys_path)
+    first.start()
+    first.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    drain(first)
+    first.stop()
+
+    second_driver = FakeDriver()
+    second = make_queue(second_driver, tmp_path, keys_path=keys_path)
+    second.start()
+    resent = second.send_whatsapp('+972500000000', 'Report ready', idempotency_key='report:1')
+    drain(second)
+    second.stop()
+
+    assert resent.status == 'sent' and second_driver.calls == 1
+
+
+def test_idempotency_journal_compacts(tmp_path):
+    path = str(tmp_path / 'keys.jsonl')
+    journal = IdempotencyJournal(path, max_keys=3)
+    for index in range(10):
+        assert journal.claim(f"key:{index}")
+
+    other = IdempotencyJournal(path, max_keys=3)
+    assert not other.claim('key:9')
+    assert other.claim('key:0')
+    assert len((tmp_path / 'keys.jsonl').read_text(encoding='utf-8').splitlines()) < 6
@@ -0,0 +1,125 @@
+"""In-memory vehicle repository: loading, hot reload and plate lookups"""
+
+import pytest
+
+from src.core.atomic_json import write_json_atomic
+from src.core.catalog_snapshot import write_catalog_snapshot
+from src.core.vehicle_repository import VehicleRepository
+
+VEHICLES = [
+    {'id': 'V-12-345-67', 'license_plate': '12-345-67', 'make': 'Toyota'},
+    {'id': 'V-98-765-43', 'license_plate': '98-765-43', 'make': 'Ford'},
+]
+
+RECORDS = [
+    {'vehicle_id': 'V-12-345-67', 'license_plate': '12-345-67', 'date': '2024-01-10', 'type': 'oil_change'},
+    {'vehicle_id': 'V-98-765-43', 'license_plate': '98-765-43', 'date': '2024-02-10', 'type': 'tire_rotation'},
+    {'vehicle_id': 'V-12-345-67', 'license_plate': '12-345-67', 'date': '2024-03-10', 'type': 'brake_inspection'},
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    catalog_path = str(tmp_path / 'large_vehicle_catalog.json')
+    records_path = str(tmp_path / 'maintenance_records.json')
+    write_json_atomic(catalog_path, {'vehicles': VEHICLES})
+    write_json_atomic(records_path, {'records': RECORDS})
+    return catalog_path, records_path
+
+
+def test_loads_both_files(paths):
+    repository = VehicleRepository(*paths)
+
+    assert repository.get_vehicles() == VEHICLES
+    assert repository.get_maintenance_records() == RECORDS
+    status = repository.get_status()
+    assert status['loaded'] and status['vehicle_count'] == 2 and status['maintenance_record_count'] == 3
+
+
+def test_reloads_a_file_when_its_signature_changes(paths):
+    catalog_path, records_path = paths
+    repository = VehicleRepository(catalog_path, records_path, check_interval=0)
+    records = repository.get_maintenance_records()
+
+    write_json_atomic(catalog_path, {'vehicles': VEHICLES[:1]})
+
+    assert repository.get_vehicles() == VEHICLES[:1]
+    # The unchanged file is not read again
+    assert repository.get_maintenance_records() is records
+
+
+def test_same_size_rewrite_is_caught_by_the_generation(paths):
+    catalog_path, records_path = paths
+    repository = VehicleRepository(catalog_path, records_path, check_interval=0)
+    repository.get_vehicles()
+
+    write_json_atomic(catalog_path, {'vehicles': [{**VEHICLES[0], 'make': 'Toyotb'}, VEHICLES[1]]})
+
+    assert repository.get_vehicles()[0]['make'] == 'Toyotb'
+
+
+def test_checks_files_at_most_once_per_interval(paths):
+    catalog_path, records_path = paths
+    repository = VehicleRepository(catalog_path, records_path, check_interval=3600)
+    repository.get_vehicles()
+
+    write_json_atomic(catalog_path, {'vehicles': []})
+
+    assert len(repository.get_vehicles()) == 2
+    assert repository.refresh(force=True) is True
+    assert repository.get_vehicles() == []
+
+
+def test_unreadable_file_loads_as_empty(tmp_path):
+    catalog_path = tmp_path / 'large_vehicle_catalog.json'
+    catalog_path.write_text('{not json', encoding='utf-8')
+    repository = VehicleRepository(str(catalog_path), str(tmp_path / 'missing.json'))
+
+    assert repository.get_vehicles() == []
+    assert repository.get_maintenance_records() == []
+
+
+@pytest.mark.parametrize('typed', ['12-345-67', '1234567', '12 345 67', ' 12-345-67 '])
+def test_plate_lookup_ignores_dashes_and_spaces(paths, typed):
+    repository = VehicleRepository(*paths)
+
+    assert repository.find_vehicle_by_license_plate(typed)['id'] == 'V-12-345-67'
+    assert [record['date'] for record in repository.get_maintenance_records_for_plate(typed)] == \
+        ['2024-01-10', '2024-03-10']
+
+
+def test_plate_lookup_misses(paths):
+    repository = VehicleRepository(*paths)
+
+    assert repository.find_vehicle_by_license_plate('11-111-11') is None
+    assert repository.find_vehicle_by_license_plate('') is None
+    assert repository.get_maintenance_records_for_plate(None) == []
+
+
+def test_first_vehicle_with_a_plate_wins(paths):
+    catalog_path, records_path = paths
+    write_json_atomic(catalog_path, {'vehicles': VEHICLES + [{'id': 'V-dup', 'license_plate': '1234567'}]})
+
+    assert VehicleRepository(catalog_path, records_path).find_vehicle_by_license_plate('12-345-67')['id'] == \
+        'V-12-345-67'
+
+
+def test_plate_index_follows_changed_rows(paths):
+    catalog_path, records_path = paths
+    repository = VehicleRepository(catalog_path, records_path, check_interval=0)
+    repository.get_vehicles()
+
+    write_json_atomic(catalog_path, {'vehicles': [VEHICLES[0], {**VEHICLES[1], 'license_plate': '55-555-55'}]})
+
+    assert repository.find_vehicle_by_license_plate('98-765-43') is None
+    assert repository.find_vehicle_by_license_plate('55-555-55')['id'] == 'V-98-765-43'
+    assert repository.find_vehicle_by_license_plate('12-345-67')['id'] == 'V-12-345-67'
+
+
+def test_plate_lookup_through_the_catalog_snapshot(paths):
+    catalog_path, records_path = paths
+    write_catalog_snapshot(catalog_path, {'vehicles': VEHICLES})
+    repository = VehicleRepository(catalog_path, records_path)
+
+    assert repository.find_vehicle_by_license_plate('9876543')['make'] == 'Ford'
+    assert repository.get_status()['vehicles_from_snapshot']